@@ -1,10 +1,18 @@
-from typing import Union, List, Tuple, Set, Optional, Dict
+from math import inf
+from typing import Union, List, Tuple, Set, Optional, Dict, FrozenSet
 
+from hwt.code import Concat
+from hwt.hdl.operatorDefs import OpDefinition
+from hwt.hdl.types.bits import Bits
+from hwt.interfaces.hsStructIntf import HsStructIntf
 from hwt.interfaces.std import HandshakeSync
 from hwt.pyUtils.uniqList import UniqList
 from hwt.synthesizer.interfaceLevel.unitImplHelpers import Interface_without_registration
+from hwt.synthesizer.rtlLevel.rtlSignal import RtlSignal
 from hwtHls.allocator.architecturalElement import AllocatorArchitecturalElement
 from hwtHls.allocator.fsmContainer import AllocatorFsmContainer
+from hwtHls.allocator.functionalUnitSharing import HlsFunctionalUnitSharingCostModel, \
+    HlsFunctionalUnitBinding
 from hwtHls.allocator.interArchElementNodeSharingAnalysis import InterArchElementNodeSharingAnalysis, ValuePathSpecItem
 from hwtHls.allocator.pipelineContainer import AllocatorPipelineContainer
 from hwtHls.allocator.time_independent_rtl_resource import TimeIndependentRtlResource
@@ -12,9 +20,17 @@ from hwtHls.clk_math import start_clk
 from hwtHls.netlist.analysis.fsm import HlsNetlistAnalysisPassDiscoverFsm, IoFsm
 from hwtHls.netlist.analysis.pipeline import HlsNetlistAnalysisPassDiscoverPipelines, \
     NetlistPipeline
+from hwtHls.netlist.nodes.node import HlsNetNode
+from hwtHls.netlist.nodes.ops import HlsNetNodeOperator
 from hwtHls.netlist.nodes.ports import HlsNetNodeIn, HlsNetNodeOut
+from hwtHls.scheduler.listScheduler import HlsListScheduler
+from hwtLib.handshaked.builder import HsBuilder
 from ipCorePackager.constants import INTF_DIRECTION
 
+# src element, src element clock index, dst element, dst element clock index, list of (src signal, dst signal)
+InterElementDataConnection = Tuple[AllocatorArchitecturalElement, int, AllocatorArchitecturalElement, int,
+                                   List[Tuple[AllocatorArchitecturalElement, RtlSignal, RtlSignal]]]
+
 
 class HlsAllocator():
     """
@@ -22,13 +38,35 @@ class HlsAllocator():
 
     :ivar namePrefix: name prefix for debug purposes
     :ivar parentHls: parent HLS context for this allocator
+    :ivar interElementBufferDepth: if 0 the architectural elements are connected directly and the stall
+        of the consumer stalls the producer. If > 0 the values and synchronization between architectural elements
+        are passed trough an elastic buffer of this depth (skid buffer for 1, FIFO for larger values)
+        which decouples the backpressure of the elements. The elements connected by values flowing in both directions
+        are always connected directly.
+        Use :func:`functools.partial` to specify it for a platform (e.g. ``allocator=partial(HlsAllocator, interElementBufferDepth=4)``).
+    :ivar functionalUnitSharing: if specified the operators which are never active at once (in different FSM states
+        or in exclusive branches) are realized by a shared functional unit if the cost model decides it is beneficial
+        (e.g. ``allocator=partial(HlsAllocator, functionalUnitSharing=HlsFunctionalUnitSharingCostModel())``)
+        The operators with the number of units limited by :class:`hwtHls.scheduler.listScheduler.HlsListScheduler`
+        are always shared and the pipeline which would require more units than allowed is realized as a FSM.
+    :ivar fsmRegisterSharing: if True the values with non overlapping lifetimes in FSM share a register
+        (:class:`hwtHls.allocator.fsmRegisterSharing.FsmRegisterSharing`)
     """
 
-    def __init__(self, parentHls: "HlsPipeline", namePrefix:str="hls_"):
+    def __init__(self, parentHls: "HlsPipeline", namePrefix:str="hls_", interElementBufferDepth: int=0,
+                 functionalUnitSharing: Optional[HlsFunctionalUnitSharingCostModel]=None,
+                 fsmRegisterSharing: bool=False):
+        if interElementBufferDepth < 0:
+            raise ValueError("Buffer depth must be a non-negative number", interElementBufferDepth)
         self.parentHls = parentHls
         self.namePrefix = namePrefix
+        self.interElementBufferDepth = interElementBufferDepth
+        self.functionalUnitSharing = functionalUnitSharing
+        self.fsmRegisterSharing = fsmRegisterSharing
         self._archElements: List[Union[AllocatorFsmContainer, AllocatorPipelineContainer]] = []
         self._iea: Optional[InterArchElementNodeSharingAnalysis] = None
+        # pairs of elements which are connected by values flowing in both directions, :see: _findUnbufferedElementPairs
+        self._unbufferedElmPairs: Set[FrozenSet[AllocatorArchitecturalElement]] = set()
 
     def _getArchElmBaseName(self, elm:AllocatorArchitecturalElement) -> str:
         namePrefixLen = len(self.namePrefix)
@@ -42,14 +80,80 @@ class HlsAllocator():
         namePrefix = self.namePrefix
         for i, fsm in enumerate(fsms.fsms):
             fsm: IoFsm
-            fsmCont = AllocatorFsmContainer(hls, namePrefix if onlySingleElem else f"{namePrefix:s}fsm{i:d}_", fsm)
+            fsmCont = AllocatorFsmContainer(hls, namePrefix if onlySingleElem else f"{namePrefix:s}fsm{i:d}_", fsm,
+                                            registerSharing=self.fsmRegisterSharing)
             self._archElements.append(fsmCont)
 
+        unitLimits = self._getUnitLimits()
         for i, pipe in enumerate(pipelines.pipelines):
             pipe: NetlistPipeline
-            pipeCont = AllocatorPipelineContainer(hls, namePrefix if onlySingleElem else f"{namePrefix:s}pipe{i:d}_", pipe.stages)
+            if unitLimits and self._requiresSequentialRealization(pipe, unitLimits):
+                fsmCont = AllocatorFsmContainer(hls, namePrefix if onlySingleElem else f"{namePrefix:s}pipe{i:d}_",
+                                                self._pipelineToFsm(pipe), registerSharing=self.fsmRegisterSharing)
+                self._archElements.append(fsmCont)
+                continue
+
+            pipeCont = AllocatorPipelineContainer(hls, namePrefix if onlySingleElem else f"{namePrefix:s}pipe{i:d}_", pipe.stages,
+                                                  readyRegisterPeriod=hls.platform.pipelineReadyRegisterPeriod,
+                                                  shiftRegisterMinLength=hls.platform.shiftRegisterMinLength)
             self._archElements.append(pipeCont)
 
+    def _getUnitLimits(self) -> Dict[OpDefinition, int]:
+        """
+        :return: the maximum number of units for the operators limited by the scheduler
+        """
+        scheduler = self.parentHls.scheduler
+        if isinstance(scheduler, HlsListScheduler):
+            return scheduler.resourceConstraints
+        return {}
+
+    @staticmethod
+    def _requiresSequentialRealization(pipe: NetlistPipeline, unitLimits: Dict[OpDefinition, int]) -> bool:
+        """
+        :return: True if the pipeline has more operators than the number of units,
+            the stages of the pipeline are active at once and they can not share a unit
+        """
+        instanceCnt: Dict[OpDefinition, int] = {}
+        for nodes in pipe.stages:
+            for n in UniqList(nodes):
+                if isinstance(n, HlsNetNodeOperator) and n.operator in unitLimits:
+                    instanceCnt[n.operator] = instanceCnt.get(n.operator, 0) + 1
+        return any(cnt > unitLimits[op] for op, cnt in instanceCnt.items())
+
+    @staticmethod
+    def _pipelineToFsm(pipe: NetlistPipeline) -> IoFsm:
+        """
+        Convert the pipeline to a FSM with a state for each stage, the next iteration starts after the last stage.
+        """
+        fsm = IoFsm(None, "seq")
+        usedStages = [clkI for clkI, nodes in enumerate(pipe.stages) if nodes]
+        for clkI in range(usedStages[0], usedStages[-1] + 1):
+            st: List[HlsNetNode] = fsm.addState(clkI)
+            st.extend(UniqList(pipe.stages[clkI]))
+
+        stCnt = len(fsm.states)
+        for i in range(stCnt):
+            fsm.transitionTable[i] = {(i + 1) % stCnt: 1}
+        return fsm
+
+    def _findUnbufferedElementPairs(self, iea: InterArchElementNodeSharingAnalysis):
+        """
+        Find the pairs of architectural elements which are connected by values flowing in both directions.
+        The synchronization of such a connection is shared by the values of both directions and it can not be
+        passed trough an elastic buffer, these pairs are always connected directly as if the buffering was disabled.
+        """
+        connected: Set[Tuple[AllocatorArchitecturalElement, AllocatorArchitecturalElement]] = set()
+        for o, i in iea.interElemConnections:
+            srcElm, dstElms = iea.getSrcDstsElement(o, i)
+            for dstElm in dstElms:
+                if srcElm is not dstElm:
+                    connected.add((srcElm, dstElm))
+
+        self._unbufferedElmPairs = set(frozenset((srcElm, dstElm)) for srcElm, dstElm in connected if (dstElm, srcElm) in connected)
+
+    def _useInterElementBuffer(self, srcElm: AllocatorArchitecturalElement, dstElm: AllocatorArchitecturalElement) -> bool:
+        return bool(self.interElementBufferDepth) and frozenset((srcElm, dstElm)) not in self._unbufferedElmPairs
+
     def _getFirstUseTime(self, iea: InterArchElementNodeSharingAnalysis, dstElm: AllocatorArchitecturalElement, o: HlsNetNodeOut, i: HlsNetNodeIn):
         clkPeriod = self.parentHls.normalizedClkPeriod
         useT = iea.firstUseTimeOfOutInElem[(dstElm, o)]
@@ -72,6 +176,10 @@ class HlsAllocator():
                     useT = closestClockIWithState * clkPeriod + self.parentHls.scheduler.epsilon
                     iea.firstUseTimeOfOutInElem[(dstElm, o)] = useT
                 elif isinstance(dstElm, AllocatorFsmContainer):
+                    if self._useInterElementBuffer(srcElm, dstElm):
+                        # the value will be stored in elastic buffer in the state where it was produced
+                        # :see: _finalizeInterElementsConnections
+                        return useT
                     # Need to add extra buffer between FSMs or move value load/store in states
                     # We add new pipeline to architecture adn register this pair to interElemConnections
                     srcBaseName = self._getArchElmBaseName(srcElm)
@@ -172,10 +280,10 @@ class HlsAllocator():
                     assert o in srcElm.netNodeToRtl
 
     def _finalizeInterElementsConnections(self, iea: InterArchElementNodeSharingAnalysis):
-        hls = self.parentHls
         self._expandAllOutputSynonymsInElement(iea)
         clkPeriod:int = self.parentHls.normalizedClkPeriod
-        syncAdded: Set[Tuple[int, AllocatorArchitecturalElement, AllocatorArchitecturalElement]] = set()
+        # the values which are transfered between same elements in same clock cycles share the synchronization
+        dataConnections: Dict[Tuple[AllocatorArchitecturalElement, int, AllocatorArchitecturalElement, int], InterElementDataConnection] = {}
         tirsConnected: Set[Tuple[TimeIndependentRtlResource, TimeIndependentRtlResource]] = set()
         elementIndex: Dict[AllocatorArchitecturalElement, int] = {a: i for i, a in enumerate(self._archElements)}
 
@@ -212,6 +320,8 @@ class HlsAllocator():
                 assert srcTir is not dstTir, (i, o, srcTir)
                 srcOff = dstUseClkI - srcStartClkI
                 assert srcStartClkI <= dstUseClkI, (srcStartClkI, dstUseClkI, "Source must be before first use because otherwise this should be a backedge instead.")
+                # the clock period when the value is taken from src element
+                srcSyncClkI = dstUseClkI
                 if len(srcTir.valuesInTime) <= srcOff:
                     if isinstance(srcElm, AllocatorPipelineContainer):
                         # extend the value register pipeline to get data in time when other elemnt requires it
@@ -219,30 +329,94 @@ class HlsAllocator():
                         srcElm.extendValidityOfRtlResource(srcTir, dstTir.timeOffset)
                         # assert len(srcTir.valuesInTime) == srcOff + 1
                     elif isinstance(srcElm, AllocatorFsmContainer):
-                        assert dstUseClkI in srcElm.clkIToStateI, ("Must be the case otherwise the pipeline should already been extended.")
+                        if self._useInterElementBuffer(srcElm, dstElm) and dstUseClkI not in srcElm.clkIToStateI:
+                            # the value is stored to buffer in the state where it was produced
+                            srcSyncClkI = srcStartClkI
+                        else:
+                            assert dstUseClkI in srcElm.clkIToStateI, ("Must be the case otherwise the pipeline should already been extended.")
                     else:
                         raise NotImplementedError("Need to add extra buffer between fsms", srcStartClkI, dstUseClkI, o, srcElm, dstElm)
 
-                srcSig = srcTir.get(dstUseClkI * clkPeriod).data
-                assert not dstTir.valuesInTime[0].data.drivers, ("Forward declaration signal must not have a driver yet.", dstTir, dstTir.valuesInTime[0].data.drivers)
+                srcSig = srcTir.get(srcSyncClkI * clkPeriod).data
+                dstSig = dstTir.valuesInTime[0].data
+                assert not dstSig.drivers, ("Forward declaration signal must not have a driver yet.", dstTir, dstSig.drivers)
                 srcElm._afterOutputUsed(o)
-                dstTir.valuesInTime[0].data(srcSig)
 
                 if elementIndex[srcElm] > elementIndex[dstElm]:
-                    syncCacheKey = (dstUseClkI, dstElm, srcElm)
+                    conKey = (dstElm, dstUseClkI, srcElm, srcSyncClkI)
                 else:
-                    syncCacheKey = (dstUseClkI, srcElm, dstElm)
+                    conKey = (srcElm, srcSyncClkI, dstElm, dstUseClkI)
 
-                if syncCacheKey not in syncAdded:
-                    interElmSync = HandshakeSync()
-                    srcBaseName = self._getArchElmBaseName(srcElm)
-                    dstBaseName = self._getArchElmBaseName(dstElm)
-                    interElmSync = Interface_without_registration(
-                        hls.parentUnit, interElmSync,
-                        f"{self.namePrefix:s}sync_{srcBaseName:s}_{dstBaseName:s}")
-                    srcElm.connectSync(dstUseClkI, interElmSync, INTF_DIRECTION.MASTER)
-                    dstElm.connectSync(dstUseClkI, interElmSync, INTF_DIRECTION.SLAVE)
-                    syncAdded.add(syncCacheKey)
+                con = dataConnections.get(conKey, None)
+                if con is None:
+                    # the direction of synchronization is given by the first value
+                    con = dataConnections[conKey] = (srcElm, srcSyncClkI, dstElm, dstUseClkI, [])
+                con[4].append((srcElm, srcSig, dstSig))
+
+        for con in dataConnections.values():
+            self._connectInterElementData(*con)
+
+    def _connectInterElementData(self, srcElm: AllocatorArchitecturalElement, srcClkI: int,
+                                 dstElm: AllocatorArchitecturalElement, dstClkI: int,
+                                 data: List[Tuple[AllocatorArchitecturalElement, RtlSignal, RtlSignal]]):
+        """
+        Connect the values and synchronization between architectural elements.
+        """
+        srcBaseName = self._getArchElmBaseName(srcElm)
+        dstBaseName = self._getArchElmBaseName(dstElm)
+        name = f"{self.namePrefix:s}sync_{srcBaseName:s}_{dstBaseName:s}"
+        parentUnit = self.parentHls.parentUnit
+        if not self._useInterElementBuffer(srcElm, dstElm):
+            # :note: the pairs of elements with values flowing in both directions are excluded from buffering
+            #     in _findUnbufferedElementPairs and the values are never planned to be stored into buffer
+            assert srcClkI == dstClkI, ("Only buffered connection can have a different clock period on each side",
+                                        srcElm, srcClkI, dstElm, dstClkI)
+            for _, srcSig, dstSig in data:
+                dstSig(srcSig)
+
+            interElmSync = Interface_without_registration(parentUnit, HandshakeSync(), name)
+            srcElm.connectSync(srcClkI, interElmSync, INTF_DIRECTION.MASTER)
+            dstElm.connectSync(dstClkI, interElmSync, INTF_DIRECTION.SLAVE)
+            return
+
+        srcParts = []
+        for _, srcSig, _ in data:
+            t = Bits(srcSig._dtype.bit_length())
+            if srcSig._dtype != t:
+                srcSig = srcSig._reinterpret_cast(t)
+            srcParts.append(srcSig)
+        dataT = Bits(sum(p._dtype.bit_length() for p in srcParts))
+
+        buffIn = HsStructIntf()
+        buffIn.T = dataT
+        buffIn = Interface_without_registration(parentUnit, buffIn, f"{name:s}_buffIn")
+        buffOut = HsStructIntf()
+        buffOut.T = dataT
+        buffOut = Interface_without_registration(parentUnit, buffOut, f"{name:s}_buffOut")
+
+        # first value at LSB
+        buffIn.data(Concat(*reversed(srcParts)))
+        depth = self.interElementBufferDepth
+        b = HsBuilder(parentUnit, buffIn, f"{name:s}_buff")
+        if depth == 1:
+            # :note: latency is 1-2 to break ready chain
+            b.buff(1, latency=(1, 2))
+        else:
+            b.buff(depth)
+        buffs = b.end
+        buffOut(buffs)
+
+        offset = 0
+        for p, (_, _, dstSig) in zip(srcParts, data):
+            w = p._dtype.bit_length()
+            v = buffOut.data[offset + w:offset]
+            if v._dtype != dstSig._dtype:
+                v = v._reinterpret_cast(dstSig._dtype)
+            dstSig(v)
+            offset += w
+
+        srcElm.connectSync(srcClkI, buffIn, INTF_DIRECTION.MASTER)
+        dstElm.connectSync(dstClkI, buffOut, INTF_DIRECTION.SLAVE)
 
     def allocate(self):
         """
@@ -271,14 +445,26 @@ class HlsAllocator():
         * Each arch element explicitly queries the node for the specific time (and input/output combination if node spans over more arch. elements).
         """
         self._discoverArchElements()
+        unitLimits = self._getUnitLimits()
+        if self.functionalUnitSharing is not None or unitLimits:
+            costModel = self.functionalUnitSharing
+            if costModel is None:
+                # share only the operators with a limited number of units
+                costModel = HlsFunctionalUnitSharingCostModel(minAreaGain=inf)
+            HlsFunctionalUnitBinding(self.parentHls, costModel, unitLimits).bind(self._archElements)
+
         iea = InterArchElementNodeSharingAnalysis(self.parentHls.normalizedClkPeriod)
         if len(self._archElements) > 1:
             iea._analyzeInterElementsNodeSharing(self._archElements)
             if iea.interElemConnections:
+                if self.interElementBufferDepth:
+                    self._findUnbufferedElementPairs(iea)
                 self._declareInterElemenetBoundarySignals(iea)
 
         for e in self._archElements:
             e.allocateDataPath(iea)
+            for fu in UniqList(e.functionalUnits.values()):
+                fu.allocateOperandMux(e)
 
         if iea.interElemConnections:
             self._finalizeInterElementsConnections(iea)
@@ -3,6 +3,7 @@ from typing import Union, List, Dict, Tuple, Optional
 
 from hwt.code import SwitchLogic
 from hwt.hdl.statements.statement import HdlStatement
+from hwt.hdl.types.hdlType import HdlType
 from hwt.interfaces.std import HandshakeSync, Signal
 from hwt.pyUtils.uniqList import UniqList
 from hwt.synthesizer.interface import Interface
@@ -36,6 +37,8 @@ class AllocatorArchitecturalElement():
     :ivar connections: list of rtl object allocated for each specific clock stage
     :ivar stageSignals: an object which makes connections list accessible by time
     :ivar interArchAnalysis: an object of inter architecture element sharing analysis which is set after allocation starts
+    :ivar functionalUnits: dictionary {operator node: functional unit shared with other nodes}
+        (:see: :class:`hwtHls.allocator.functionalUnitSharing.HlsFunctionalUnitBinding`)
     """
 
     def __init__(self, parentHls: "HlsPipeline", namePrefix:str,
@@ -58,28 +61,50 @@ class AllocatorArchitecturalElement():
         assert isinstance(stageSignals, SignalsOfStages), stageSignals
         self.stageSignals = stageSignals
         self.interArchAnalysis: Optional["InterArchElementNodeSharingAnalysis"] = None
+        self.functionalUnits: Dict[HlsNetNode, "HlsFunctionalUnit"] = {}
 
     def _afterNodeInstantiated(self, n: HlsNetNode, rtl: Optional[TimeIndependentRtlResource]):
         pass
 
+    def _allocateRegister(self, tir: TimeIndependentRtlResource, name: str, dtype: HdlType, clkI: int) -> RtlSignal:
+        """
+        Create a register which holds the value of tir in clock period clkI
+        """
+        return self._reg(name, dtype=dtype)
+
+    def _allocateShiftRegister(self, tir: TimeIndependentRtlResource, name: str, dtype: HdlType,
+                               clkI: int, length: int) -> Optional[RtlSignal]:
+        """
+        Optionally create a shift register which holds the value of tir in clock periods clkI to clkI + length - 1
+
+        :return: an array register where item i holds the value for clock period clkI + i,
+            None if the value should be stored in individual registers
+        """
+        return None
+
     def _afterOutputUsed(self, o: HlsNetNode):
-        clkPeriod = self.parentHls.normalizedClkPeriod
-        epsilon = self.parentHls.scheduler.epsilon
         depRtl = self.netNodeToRtl.get(o, None)
         if depRtl is not None:
-            depRtl: TimeIndependentRtlResource
-            if depRtl.timeOffset is TimeIndependentRtlResource.INVARIANT_TIME:
-                return
-            # in in this arch. element
-            # registers uses in new times
-            t = depRtl.timeOffset + (len(depRtl.valuesInTime) - 1) * clkPeriod + epsilon
-            # :note: done in reverse so we do not have to always iterater over registered prequel
-            for _ in reversed(depRtl.valuesInTime):
-                sigs = self.stageSignals.getForTime(t)
-                if depRtl in sigs:
-                    break
-                sigs.append(depRtl)
-                t -= clkPeriod
+            self._afterResourceUsed(depRtl)
+
+    def _afterResourceUsed(self, depRtl: TimeIndependentRtlResource):
+        """
+        Register the resource to all stages where it has some value (so the registers are loaded with the synchronization of stage).
+        """
+        if depRtl.timeOffset is TimeIndependentRtlResource.INVARIANT_TIME:
+            return
+        clkPeriod = self.parentHls.normalizedClkPeriod
+        epsilon = self.parentHls.scheduler.epsilon
+        # in in this arch. element
+        # registers uses in new times
+        t = depRtl.timeOffset + (len(depRtl.valuesInTime) - 1) * clkPeriod + epsilon
+        # :note: done in reverse so we do not have to always iterater over registered prequel
+        for _ in reversed(depRtl.valuesInTime):
+            sigs = self.stageSignals.getForTime(t)
+            if depRtl in sigs:
+                break
+            sigs.append(depRtl)
+            t -= clkPeriod
 
     def connectSync(self, clkI: int, intf: HandshakeSync, intfDir: INTF_DIRECTION):
         con = self.connections[clkI]
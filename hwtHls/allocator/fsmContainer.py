@@ -3,6 +3,7 @@ from typing import List, Set, Tuple, Optional, Union, Dict
 from hwt.code import SwitchLogic, Switch
 from hwt.hdl.statements.statement import HdlStatement
 from hwt.hdl.types.bits import Bits
+from hwt.hdl.types.hdlType import HdlType
 from hwt.interfaces.std import HandshakeSync
 from hwt.math import log2ceil
 from hwt.pyUtils.uniqList import UniqList
@@ -11,6 +12,7 @@ from hwt.synthesizer.rtlLevel.rtlSignal import RtlSignal
 from hwtHls.allocator.architecturalElement import AllocatorArchitecturalElement
 from hwtHls.allocator.connectionsOfStage import getIntfSyncSignals, \
     setNopValIfNotSet, SignalsOfStages, ConnectionsOfStage
+from hwtHls.allocator.fsmRegisterSharing import FsmRegisterSharing, FsmRegisterSlot
 from hwtHls.allocator.time_independent_rtl_resource import TimeIndependentRtlResource
 from hwtHls.clk_math import start_clk
 from hwtHls.netlist.analysis.fsm import IoFsm
@@ -18,15 +20,21 @@ from hwtHls.netlist.nodes.backwardEdge import HlsNetNodeReadBackwardEdge, \
     HlsNetNodeWriteBackwardEdge
 from hwtHls.netlist.nodes.io import HlsNetNodeWrite, HlsNetNodeRead
 from hwtHls.netlist.nodes.node import HlsNetNode
+from hwtHls.netlist.nodes.ports import HlsNetNodeOut
 from ipCorePackager.constants import INTF_DIRECTION
 
 
 class AllocatorFsmContainer(AllocatorArchitecturalElement):
     """
     Container class for FSM allocation objects.
+
+    :ivar stateReg: the register with the index of the current state of the FSM
+    :ivar registerSharing: if True the values with non overlapping lifetimes share a register
+    :ivar _registerSharing: the result of register lifetime analysis (if registerSharing is enabled)
+    :ivar _sharedRegOfTir: the shared register for the value which register is shared with other values
     """
 
-    def __init__(self, parentHls: "HlsPipeline", namePrefix:str, fsm: IoFsm):
+    def __init__(self, parentHls: "HlsPipeline", namePrefix:str, fsm: IoFsm, registerSharing: bool=False):
         allNodes = UniqList()
         for nodes in fsm.states:
             allNodes.extend(nodes)
@@ -37,6 +45,10 @@ class AllocatorFsmContainer(AllocatorArchitecturalElement):
         self.fsmEndClk_i = max(fsm.stateClkI.values())
         self.fsmBeginClk_i = min(fsm.stateClkI.values())
         self.clkIToStateI = clkIToStateI = {v:k for k, v in fsm.stateClkI.items()}
+        self.stateReg: Optional[RtlSignal] = None
+        self.registerSharing = registerSharing
+        self._registerSharing: Optional[FsmRegisterSharing] = None
+        self._sharedRegOfTir: Dict[TimeIndependentRtlResource, FsmRegisterSlot] = {}
 
         stateCons = [ConnectionsOfStage() for _ in fsm.states]
         stageSignals = SignalsOfStages(clkPeriod,
@@ -50,16 +62,18 @@ class AllocatorFsmContainer(AllocatorArchitecturalElement):
         # mark value in register as persistent until the end of FSM
         isTir = isinstance(rtl, TimeIndependentRtlResource)
         if rtl is None or not isTir:
-            cons = (self.netNodeToRtl[o] for o in n._outputs if o in self.netNodeToRtl)
+            cons = ((o, self.netNodeToRtl[o]) for o in n._outputs if o in self.netNodeToRtl)
         elif isTir and rtl.timeOffset == TimeIndependentRtlResource.INVARIANT_TIME:
             return
         else:
-            cons = (rtl,)
+            cons = ((o, rtl) for o in n._outputs if self.netNodeToRtl.get(o, None) is rtl)
 
         clkPeriod = self.normalizedClkPeriod
         fsmEndClk_i = self.fsmEndClk_i
+        registerSharing = self._registerSharing
 
-        for s in cons:
+        for o, s in cons:
+            o: HlsNetNodeOut
             s: TimeIndependentRtlResource
             assert len(s.valuesInTime) == 1, ("Value must not be used yet because we need to set persistence ranges first.", s)
 
@@ -67,12 +81,28 @@ class AllocatorFsmContainer(AllocatorArchitecturalElement):
                 self.stageSignals.getForTime(s.timeOffset).append(s)
                 # value for the first clock behind this clock period and the rest is persistent in this register
                 nextClkI = start_clk(s.timeOffset, clkPeriod) + 2
-                if nextClkI <= fsmEndClk_i:
-                    s.persistenceRanges.append((nextClkI, fsmEndClk_i))
+                persistentUntil = fsmEndClk_i
+                if registerSharing is not None:
+                    slot = registerSharing.slotOfValue.get(o, None)
+                    if slot is not None:
+                        # the shared register holds the value only until its last use,
+                        # if the value is required later it is copied to a private register
+                        self._sharedRegOfTir[s] = slot
+                        persistentUntil = registerSharing.lastUseClkI[o]
+
+                if nextClkI <= persistentUntil:
+                    s.persistenceRanges.append((nextClkI, persistentUntil))
 
         for dep in n.dependsOn:
             self._afterOutputUsed(dep)
 
+    def _allocateRegister(self, tir: TimeIndependentRtlResource, name: str, dtype: HdlType, clkI: int) -> RtlSignal:
+        slot = self._sharedRegOfTir.get(tir, None)
+        if slot is not None and clkI == start_clk(tir.timeOffset, self.normalizedClkPeriod) + 1 and slot.dtype == dtype:
+            return slot.getRegister(self)
+
+        return AllocatorArchitecturalElement._allocateRegister(self, tir, name, dtype, clkI)
+
     def connectSync(self, clkI: int, intf: HandshakeSync, intfDir: INTF_DIRECTION):
         try:
             stateI = self.clkIToStateI[clkI]
@@ -152,12 +182,18 @@ class AllocatorFsmContainer(AllocatorArchitecturalElement):
         """
         Instantiate logic in the states
 
-        :note: This function does not perform efficient register allocations.
-            Instead each value is store in individual register.
+        :note: Each value is stored in individual register unless registerSharing is enabled.
             The register is created when value (TimeIndependentRtlResource) is first used from other state/clock cycle.
         """
         self.interArchAnalysis = iea
+        fsm = self.fsm
+        self.stateReg = self._reg(f"{self.namePrefix}st_{fsm.name:s}",
+                                  Bits(log2ceil(len(fsm.states)), signed=False),
+                                  def_val=0)
         self._detectStateTransitions()
+        if self.registerSharing:
+            self._registerSharing = FsmRegisterSharing(self)
+            self._registerSharing.run()
         for (nodes, con) in zip(self.fsm.states, self.connections):
             ioMuxes: Dict[Interface, Tuple[Union[HlsNetNodeRead, HlsNetNodeWrite], List[HdlStatement]]] = {}
             ioSeen: UniqList[Interface] = UniqList()
@@ -185,9 +221,7 @@ class AllocatorFsmContainer(AllocatorArchitecturalElement):
     def allocateSync(self):
         fsm = self.fsm
         self._initNopValsOfIo()
-        st = self._reg(f"{self.namePrefix}st_{fsm.intf._name}",
-                       Bits(log2ceil(len(fsm.states)), signed=False),
-                       def_val=0)
+        st = self.stateReg
 
         # instantiate control of the FSM
 
@@ -202,7 +236,18 @@ class AllocatorFsmContainer(AllocatorArchitecturalElement):
                 # if the value has a register at the end of this stage
                 v = s.checkIfExistsInClockCycle(self.fsmBeginClk_i + stI + 1)
                 if v is not None and v.is_rlt_register() and not v in seenRegs:
-                    con.stDependentDrives.append(v.data.next.drivers[0])
+                    drivers = v.data.next.drivers
+                    if len(drivers) == 1:
+                        d = drivers[0]
+                    else:
+                        # shared register, select the assignment of this value
+                        prev = s.valuesInTime[s.valuesInTime.index(v) - 1].data
+                        if isinstance(prev, Interface):
+                            prev = prev._sig
+                        d = [d for d in drivers if d.src is prev]
+                        assert len(d) == 1, (s, v, d)
+                        d = d[0]
+                    con.stDependentDrives.append(d)
                     seenRegs.add(v)
 
             unconditionalTransSeen = False
@@ -0,0 +1,131 @@
+from typing import Dict, List, Optional, Set
+
+from hwt.hdl.types.hdlType import HdlType
+from hwt.synthesizer.rtlLevel.rtlSignal import RtlSignal
+from hwtHls.clk_math import start_clk
+from hwtHls.netlist.nodes.const import HlsNetNodeConst
+from hwtHls.netlist.nodes.io import HOrderingVoidT
+from hwtHls.netlist.nodes.node import HlsNetNode
+from hwtHls.netlist.nodes.ports import HlsNetNodeOut
+
+
+class FsmRegisterSlot():
+    """
+    A register shared by values which lifetimes do not overlap.
+
+    :ivar dtype: the type of the register
+    :ivar values: the values stored in this register
+    :ivar occupiedStates: indexes of the states where the register is written or where some of the values is live
+    :ivar reg: the RTL register (created on first use)
+    """
+
+    def __init__(self, index: int, dtype: HdlType):
+        self.index = index
+        self.dtype = dtype
+        self.values: List[HlsNetNodeOut] = []
+        self.occupiedStates: Set[int] = set()
+        self.reg: Optional[RtlSignal] = None
+
+    def getRegister(self, allocator: "AllocatorFsmContainer") -> RtlSignal:
+        if self.reg is None:
+            self.reg = allocator._reg(f"{allocator.namePrefix:s}sharedReg{self.index:d}", dtype=self.dtype)
+        return self.reg
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__:s} {self.index:d} {self.values} {sorted(self.occupiedStates)}>"
+
+
+class FsmRegisterSharing():
+    """
+    Lifetime analysis of the values passed between states of the FSM and the assignment of values
+    with non overlapping lifetimes to a shared register (interval graph coloring in left-edge order).
+
+    The value produced in state s and last used in clock period l is stored in the register which is written in state s
+    (in every clock period when FSM is in this state) and read in the states corresponding to clock periods (s, l].
+    The value is live also in all states from which some of its uses is reachable without passing through the state s
+    (e.g. if the FSM jumps back in a loop). The register can be shared by values which do not have any common
+    state in their sets of live states and state where the value is written.
+
+    :note: The last use is predicted from the schedule, if the value is required later
+        the value is copied to a private register in the clock period of the last predicted use.
+
+    :ivar lastUseClkI: the clock period index of last predicted use of the value
+    :ivar slotOfValue: the shared register for the value (only values sharing register with other values are present)
+    """
+
+    def __init__(self, fsmCont: "AllocatorFsmContainer"):
+        self.fsmCont = fsmCont
+        self.lastUseClkI: Dict[HlsNetNodeOut, int] = {}
+        self.slotOfValue: Dict[HlsNetNodeOut, FsmRegisterSlot] = {}
+
+    def _getPredecessorStates(self) -> List[Set[int]]:
+        fsm = self.fsmCont.fsm
+        preds = [set() for _ in fsm.states]
+        for src, transitions in fsm.transitionTable.items():
+            for dst in transitions.keys():
+                preds[dst].add(src)
+        return preds
+
+    def _resolveLastUseClkI(self, o: HlsNetNodeOut) -> Optional[int]:
+        clkPeriod = self.fsmCont.normalizedClkPeriod
+        allNodes = self.fsmCont.allNodes
+        lastUse = None
+        for u in o.obj.usedBy[o.out_i]:
+            if u.obj not in allNodes:
+                # the value is also passed to other architectural element, which may read it any time
+                return None
+            clkI = start_clk(u.obj.scheduledIn[u.in_i], clkPeriod)
+            if lastUse is None or clkI > lastUse:
+                lastUse = clkI
+        return lastUse
+
+    def _resolveOccupiedStates(self, defStI: int, useStates: List[int], preds: List[Set[int]]) -> Set[int]:
+        # the value is live in the states from which the use is reachable without passing through the definition
+        live = set()
+        toSearch = list(useStates)
+        while toSearch:
+            stI = toSearch.pop()
+            if stI == defStI or stI in live:
+                continue
+            live.add(stI)
+            toSearch.extend(preds[stI])
+        live.add(defStI)
+        return live
+
+    def run(self):
+        fsmCont = self.fsmCont
+        clkPeriod = fsmCont.normalizedClkPeriod
+        clkIToStateI = fsmCont.clkIToStateI
+        preds = self._getPredecessorStates()
+        slots: List[FsmRegisterSlot] = []
+        seen: Set[HlsNetNode] = set()
+        for defStI, nodes in enumerate(fsmCont.fsm.states):
+            for n in nodes:
+                if n in seen or not isinstance(n, HlsNetNode) or isinstance(n, HlsNetNodeConst):
+                    continue
+                seen.add(n)
+                for o, t in zip(n._outputs, n.scheduledOut):
+                    if o._dtype is HOrderingVoidT:
+                        continue
+                    defClkI = start_clk(t, clkPeriod)
+                    lastUse = self._resolveLastUseClkI(o)
+                    if lastUse is None or lastUse <= defClkI or clkIToStateI.get(defClkI, None) != defStI:
+                        # does not need a register, is not produced in this state or can not be shared
+                        continue
+                    self.lastUseClkI[o] = lastUse
+                    useStates = [clkIToStateI[clkI] for clkI in range(defClkI + 1, lastUse + 1) if clkI in clkIToStateI]
+                    occupied = self._resolveOccupiedStates(defStI, useStates, preds)
+                    # left-edge, the values are processed in the order of definition and the first free register is used
+                    for slot in slots:
+                        if slot.dtype == o._dtype and not (slot.occupiedStates & occupied):
+                            break
+                    else:
+                        slot = FsmRegisterSlot(len(slots), o._dtype)
+                        slots.append(slot)
+                    slot.values.append(o)
+                    slot.occupiedStates.update(occupied)
+
+        for slot in slots:
+            if len(slot.values) > 1:
+                for o in slot.values:
+                    self.slotOfValue[o] = slot
@@ -0,0 +1,435 @@
+from math import ceil
+from typing import Dict, List, Optional, Set, Tuple, Union
+
+from hwt.code import If, Switch
+from hwt.hdl.operatorDefs import AllOps, OpDefinition
+from hwt.hdl.types.hdlType import HdlType
+from hwt.hdl.value import HValue
+from hwt.pyUtils.uniqList import UniqList
+from hwt.synthesizer.rtlLevel.rtlSignal import RtlSignal
+from hwtHls.allocator.architecturalElement import AllocatorArchitecturalElement
+from hwtHls.allocator.fsmContainer import AllocatorFsmContainer
+from hwtHls.allocator.time_independent_rtl_resource import TimeIndependentRtlResource, \
+    TimeIndependentRtlResourceItem
+from hwtHls.clk_math import start_clk
+from hwtHls.netlist.nodes.const import HlsNetNodeConst
+from hwtHls.netlist.nodes.mux import HlsNetNodeMux
+from hwtHls.netlist.nodes.node import HlsNetNode
+from hwtHls.netlist.nodes.ops import HlsNetNodeOperator
+from hwtHls.netlist.nodes.ports import HlsNetNodeOut
+
+# operator, types of operands, type of result
+FunctionalUnitKey = Tuple[OpDefinition, Tuple[HdlType, ...], HdlType]
+
+_OPS_AREA_LINEAR = {
+    AllOps.ADD,
+    AllOps.SUB,
+    AllOps.GT,
+    AllOps.GE,
+    AllOps.LT,
+    AllOps.LE,
+}
+_OPS_AREA_QUADRATIC = {
+    AllOps.DIV,
+    AllOps.MOD,
+}
+
+
+class HlsFunctionalUnitSharingCostModel():
+    """
+    A cost model which decides if it is beneficial to realize multiple :class:`hwtHls.netlist.nodes.ops.HlsNetNodeOperator`
+    instances using a single shared functional unit (RTL operator) with multiplexers on its inputs.
+
+    The area is estimated in LUT equivalents. The unit is shared only if the area of the removed operators
+    is larger than the area of added multiplexers and if the delay of multiplexers fits into the slack
+    of the clock periods where the operators are scheduled.
+
+    :ivar dspArea: area of a single DSP block in LUT equivalents (the weight of DSPs against LUTs)
+    :ivar dspMulWidth: widths of operands of a multiplier in a single DSP block
+    :ivar minAreaGain: minimal area gain required to share the unit
+    """
+
+    def __init__(self, dspArea: float=64.0, dspMulWidth: Tuple[int, int]=(25, 18), minAreaGain: float=0.0):
+        if dspArea < 0:
+            raise ValueError("DSP area must be a non-negative number", dspArea)
+        self.dspArea = dspArea
+        self.dspMulWidth = dspMulWidth
+        self.minAreaGain = minAreaGain
+
+    def getOperatorArea(self, operator: OpDefinition, operandWidths: Tuple[int, ...]) -> Optional[float]:
+        """
+        :return: the area of a single instance of the operator or None if the operator should never be shared
+        """
+        if operator == AllOps.MUL:
+            a, b = sorted(operandWidths, reverse=True)
+            dspA, dspB = self.dspMulWidth
+            return ceil(a / dspA) * ceil(b / dspB) * self.dspArea
+        elif operator in _OPS_AREA_QUADRATIC:
+            w = max(operandWidths)
+            return w * w
+        elif operator in _OPS_AREA_LINEAR:
+            return max(operandWidths)
+        else:
+            # bitwise operators, slicing, concatenation, ... are smaller than a multiplexer
+            return None
+
+    def getMuxArea(self, width: int, inputCnt: int) -> float:
+        """
+        :return: the area of a multiplexer (a LUT6 implements 4:1 mux for a single bit)
+        """
+        if inputCnt <= 1:
+            return 0.0
+        return width * ceil((inputCnt - 1) / 3)
+
+    def getMuxDelay(self, hls: "HlsPipeline", width: int, inputCnt: int) -> int:
+        """
+        :return: the delay of a multiplexer in scheduler time units
+        """
+        if inputCnt <= 1:
+            return 0
+        r = hls.platform.get_op_realization(AllOps.TERNARY, width, inputCnt, hls.realTimeClkPeriod)
+        return int(r.latency_pre // hls.scheduler.resolution)
+
+    def getAreaGain(self, operator: OpDefinition, operandWidths: Tuple[int, ...],
+                    memberCnt: int, operandSourceCnts: List[int]) -> float:
+        """
+        :param memberCnt: the number of operators which would share the unit
+        :param operandSourceCnts: the number of unique values for each operand of the unit
+        """
+        opArea = self.getOperatorArea(operator, operandWidths)
+        if opArea is None:
+            return 0.0
+        muxArea = sum(self.getMuxArea(w, srcCnt) for w, srcCnt in zip(operandWidths, operandSourceCnts))
+        return (memberCnt - 1) * opArea - muxArea
+
+
+class HlsFunctionalUnit():
+    """
+    An RTL operator shared by multiple :class:`hwtHls.netlist.nodes.ops.HlsNetNodeOperator` instances
+    which are never active at once. The operands of the unit are selected by a multiplexer
+    and the result is used as an output of all member nodes.
+
+    :ivar name: the name prefix of RTL signals of this unit
+    :ivar members: the nodes realized by this unit
+    :ivar _inputs: signals driving the operands of the RTL operator
+    :ivar _output: the result of the RTL operator
+    :ivar _operands: the operands of each member resolved during member allocation
+    """
+
+    def __init__(self, name: str, members: List[HlsNetNodeOperator]):
+        assert len(members) > 1, members
+        self.name = name
+        self.members = members
+        self._inputs: Optional[List[RtlSignal]] = None
+        self._output: Optional[RtlSignal] = None
+        self._operands: Dict[HlsNetNodeOperator, List[TimeIndependentRtlResourceItem]] = {}
+
+    def _declareRtl(self, allocator: AllocatorArchitecturalElement):
+        if self._output is not None:
+            return
+        n0 = self.members[0]
+        self._inputs = [allocator._sig(f"{self.name:s}_in{i:d}", dep._dtype) for i, dep in enumerate(n0.dependsOn)]
+        s = n0.operator._evalFn(*self._inputs)
+        if s.hasGenericName:
+            s.name = f"{self.name:s}_out"
+        self._output = s
+
+    def allocateRtlInstance(self, allocator: AllocatorArchitecturalElement, node: HlsNetNodeOperator) -> TimeIndependentRtlResource:
+        """
+        Resolve operands of the node and use the output of this unit as an output of the node.
+        """
+        assert node in self.members, (self, node)
+        self._declareRtl(allocator)
+        self._operands[node] = [allocator.instantiateHlsNetNodeOutInTime(dep, t)
+                                for (dep, t) in zip(node.dependsOn, node.scheduledIn)]
+        s = node._convertRtlOutputSign(self._output)
+        t = node.scheduledOut[0] + node.hls.scheduler.epsilon
+        tis = TimeIndependentRtlResource(s, t, allocator)
+        allocator.netNodeToRtl[node._outputs[0]] = tis
+        return tis
+
+    def _connectOperands(self, node: HlsNetNodeOperator):
+        return [i(o.data) for i, o in zip(self._inputs, self._operands[node])]
+
+    def allocateOperandMux(self, allocator: AllocatorArchitecturalElement):
+        """
+        Instantiate the multiplexer which selects operands of the unit
+        (called once all members were allocated)
+        """
+        raise NotImplementedError("Implement in child class")
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__:s} {self.name:s} {[n._id for n in self.members]}>"
+
+
+class HlsFunctionalUnitSharedByStates(HlsFunctionalUnit):
+    """
+    A functional unit shared by operators in different states of the FSM,
+    the operands are selected by the state register.
+    """
+
+    def allocateOperandMux(self, allocator: AllocatorFsmContainer):
+        assert len(self._operands) == len(self.members), ("All members must be allocated", self, self._operands)
+        clkPeriod = allocator.normalizedClkPeriod
+        cases = []
+        for n in self.members:
+            stI = allocator.clkIToStateI[start_clk(n.scheduledIn[0], clkPeriod)]
+            cases.append((stI, self._connectOperands(n)))
+
+        Switch(allocator.stateReg)\
+            .add_cases(cases)\
+            .Default([i(None) for i in self._inputs])
+
+
+class HlsFunctionalUnitSharedByBranches(HlsFunctionalUnit):
+    """
+    A functional unit shared by operators which are used only in mutually exclusive cases of a single multiplexer,
+    the operands are selected by the conditions of the cases.
+
+    :ivar mux: the multiplexer which selects between the results of members
+        (:class:`hwtHls.netlist.nodes.mux.HlsNetNodeMux` or a ternary operator, the inputs are pairs condition, value
+        and optionally a default value at the end)
+    :ivar memberInputIndexes: for each member the index of the input of mux where the member is connected
+    """
+
+    def __init__(self, name: str, members: List[HlsNetNodeOperator], mux: HlsNetNodeOperator, memberInputIndexes: List[int]):
+        HlsFunctionalUnit.__init__(self, name, members)
+        self.mux = mux
+        self.memberInputIndexes = memberInputIndexes
+
+    def allocateOperandMux(self, allocator: AllocatorArchitecturalElement):
+        assert len(self._operands) == len(self.members), ("All members must be allocated", self, self._operands)
+        mux = self.mux
+        muxTop = None
+        lastI = len(self.members) - 1
+        for i, (n, inI) in enumerate(zip(self.members, self.memberInputIndexes)):
+            stms = self._connectOperands(n)
+            if i == lastI:
+                # if none of previous cases is selected the result of the unit is used only if the last case is selected
+                muxTop.Else(stms)
+            else:
+                c = allocator.instantiateHlsNetNodeOutInTime(mux.dependsOn[inI - 1], mux.scheduledIn[inI - 1]).data
+                if muxTop is None:
+                    muxTop = If(c, stms)
+                else:
+                    muxTop.Elif(c, stms)
+
+
+class HlsFunctionalUnitBinding():
+    """
+    Bind the scheduled :class:`hwtHls.netlist.nodes.ops.HlsNetNodeOperator` instances to functional units
+    which are shared between operators which are never active at once:
+
+    * operators used only in mutually exclusive cases of a single :class:`hwtHls.netlist.nodes.mux.HlsNetNodeMux`
+      or ternary operator (if/else branches), the operands are selected by the conditions of the cases
+
+    * operators in different states of :class:`hwtHls.allocator.fsmContainer.AllocatorFsmContainer`,
+      the operands are selected by the state register
+
+    The binding is performed after scheduling and before the allocation of architectural elements.
+    The schedule is not modified, the delay of operand multiplexers is consumed from the slack of the clock period.
+
+    :ivar costModel: the cost model which decides if the sharing is beneficial
+    :ivar unitLimits: the operators with a limited number of units, these are always shared if possible
+        (:see: :class:`hwtHls.scheduler.listScheduler.HlsListScheduler`)
+    :ivar clkSlack: the remaining time until the end of the clock period after the last operation (indexed by clock period index)
+    """
+
+    def __init__(self, hls: "HlsPipeline", costModel: HlsFunctionalUnitSharingCostModel,
+                 unitLimits: Optional[Dict[OpDefinition, int]]=None):
+        self.hls = hls
+        self.costModel = costModel
+        if unitLimits is None:
+            unitLimits = {}
+        self.unitLimits = unitLimits
+        self.clkSlack: Dict[int, int] = {}
+        self._unitCnt = 0
+        self._nodesInMultipleElements: Set[HlsNetNode] = set()
+
+    def _resolveClkSlack(self):
+        hls = self.hls
+        clkPeriod: int = hls.normalizedClkPeriod
+        ffDelay: int = hls.platform.get_ff_store_time(hls.realTimeClkPeriod, hls.scheduler.resolution)
+        clkSlack = self.clkSlack
+        for n in hls.iterAllNodes():
+            if isinstance(n, HlsNetNodeConst):
+                continue
+            for t in (*n.scheduledIn, *n.scheduledOut):
+                clkI = start_clk(t, clkPeriod)
+                slack = (clkI + 1) * clkPeriod - ffDelay - t
+                curSlack = clkSlack.get(clkI, None)
+                if curSlack is None or slack < curSlack:
+                    clkSlack[clkI] = slack
+
+    def _isCandidate(self, elm: AllocatorArchitecturalElement, n: HlsNetNodeOperator) -> bool:
+        if not isinstance(n, HlsNetNodeOperator) or isinstance(n, HlsNetNodeMux) or n in elm.functionalUnits:
+            return False
+        if n in self._nodesInMultipleElements:
+            # the node is duplicated in other element and the output may be a forward declaration
+            return False
+        if len(n._outputs) != 1 or not n.dependsOn or any(n.cycles_latency):
+            return False
+        if all(isinstance(dep.obj, HlsNetNodeConst) for dep in n.dependsOn):
+            # will be evaluated to a constant
+            return False
+        clkPeriod = self.hls.normalizedClkPeriod
+        clkI = start_clk(n.scheduledOut[0], clkPeriod)
+        if any(start_clk(t, clkPeriod) != clkI for t in n.scheduledIn):
+            return False
+        if n.operator in self.unitLimits:
+            return True
+        return self.costModel.getOperatorArea(n.operator, self._getOperandWidths(n)) is not None
+
+    @staticmethod
+    def _getKey(n: HlsNetNodeOperator) -> FunctionalUnitKey:
+        return (n.operator, tuple(dep._dtype for dep in n.dependsOn), n._outputs[0]._dtype)
+
+    @staticmethod
+    def _getOperandWidths(n: HlsNetNodeOperator) -> Tuple[int, ...]:
+        return tuple(dep._dtype.bit_length() for dep in n.dependsOn)
+
+    @staticmethod
+    def _getOperandSource(o: HlsNetNodeOut) -> Union[HlsNetNodeOut, HValue]:
+        if isinstance(o.obj, HlsNetNodeConst):
+            return o.obj.val
+        return o
+
+    def _getOperandMuxDelay(self, members: List[HlsNetNodeOperator]) -> Tuple[List[int], int]:
+        """
+        :return: the number of unique sources for each operand and the maximum delay of operand multiplexers
+        """
+        srcCnts = []
+        delay = 0
+        for i, w in enumerate(self._getOperandWidths(members[0])):
+            srcCnt = len(UniqList(self._getOperandSource(n.dependsOn[i]) for n in members))
+            srcCnts.append(srcCnt)
+            delay = max(delay, self.costModel.getMuxDelay(self.hls, w, srcCnt))
+        return srcCnts, delay
+
+    def _isBeneficial(self, members: List[HlsNetNodeOperator], operandSrcCnts: List[int]) -> bool:
+        n0 = members[0]
+        if n0.operator in self.unitLimits:
+            return True
+        gain = self.costModel.getAreaGain(n0.operator, self._getOperandWidths(n0), len(members), operandSrcCnts)
+        return gain > self.costModel.minAreaGain
+
+    def _getClkI(self, n: HlsNetNodeOperator) -> int:
+        return start_clk(n.scheduledOut[0], self.hls.normalizedClkPeriod)
+
+    def _getOperandMuxExtraDelay(self, n: HlsNetNodeOperator, muxDelay: int) -> int:
+        """
+        :return: the time the node must be delayed so the operand multiplexer fits in front of it
+            (the state register is available at the beginning of the clock period, the multiplexer delays just the operands)
+        """
+        availableT = self._getClkI(n) * self.hls.normalizedClkPeriod
+        for dep in n.dependsOn:
+            if not isinstance(dep.obj, HlsNetNodeConst):
+                availableT = max(availableT, dep.obj.scheduledOut[dep.out_i])
+        return max(0, availableT + muxDelay - min(n.scheduledIn))
+
+    def _addUnit(self, elm: AllocatorArchitecturalElement, fu: HlsFunctionalUnit, delay: int):
+        for n in fu.members:
+            elm.functionalUnits[n] = fu
+        for clkI in set(self._getClkI(n) for n in fu.members):
+            self.clkSlack[clkI] -= delay
+        self._unitCnt += 1
+
+    def _newUnitName(self, elm: AllocatorArchitecturalElement, n: HlsNetNodeOperator):
+        return f"{elm.namePrefix:s}fu{self._unitCnt:d}_{n.operator.id:s}"
+
+    def _bindMuxCases(self, elm: AllocatorArchitecturalElement):
+        clkPeriod = self.hls.normalizedClkPeriod
+        for mux in elm.allNodes:
+            if not isinstance(mux, HlsNetNodeOperator) or mux.operator != AllOps.TERNARY or len(mux._inputs) < 3:
+                continue
+            groups: Dict[FunctionalUnitKey, List[Tuple[int, HlsNetNodeOperator]]] = {}
+            # the inputs are pairs condition, value and optionally a default value at the end
+            valueInputs = list(range(1, len(mux._inputs), 2))
+            if len(mux._inputs) % 2:
+                valueInputs.append(len(mux._inputs) - 1)
+            for inI in valueInputs:
+                v = mux.dependsOn[inI]
+                n = v.obj
+                if n not in elm.allNodes or not self._isCandidate(elm, n):
+                    continue
+                uses = n.usedBy[0]
+                if len(uses) != 1 or uses[0] is not mux._inputs[inI] or self._getClkI(n) != start_clk(mux.scheduledIn[inI], clkPeriod):
+                    continue
+                groups.setdefault(self._getKey(n), []).append((inI, n))
+
+            for members in groups.values():
+                if len(members) < 2:
+                    continue
+                inputIndexes = [inI for inI, _ in members]
+                nodes = [n for _, n in members]
+                operandSrcCnts, muxDelay = self._getOperandMuxDelay(nodes)
+                if not self._isBeneficial(nodes, operandSrcCnts):
+                    continue
+
+                # the operands and conditions must be available before the operand multiplexer
+                clkI = self._getClkI(nodes[0])
+                clkBegin = clkI * clkPeriod
+                availableT = clkBegin
+                for n in nodes:
+                    for dep in n.dependsOn:
+                        if not isinstance(dep.obj, HlsNetNodeConst):
+                            availableT = max(availableT, dep.obj.scheduledOut[dep.out_i])
+                for inI in inputIndexes[:-1]:
+                    c = mux.dependsOn[inI - 1]
+                    availableT = max(availableT, c.obj.scheduledOut[c.out_i])
+                delay = max(0, max(availableT + muxDelay - max(n.scheduledIn) for n in nodes))
+                if delay > self.clkSlack[clkI]:
+                    continue
+
+                fu = HlsFunctionalUnitSharedByBranches(self._newUnitName(elm, nodes[0]), nodes, mux, inputIndexes)
+                self._addUnit(elm, fu, delay)
+
+    def _bindFsmStates(self, elm: AllocatorFsmContainer):
+        groups: Dict[FunctionalUnitKey, List[Tuple[int, HlsNetNodeOperator]]] = {}
+        for stI, nodes in enumerate(elm.fsm.states):
+            for n in nodes:
+                if self._isCandidate(elm, n):
+                    groups.setdefault(self._getKey(n), []).append((stI, n))
+
+        for members in groups.values():
+            # left-edge like assignment, the unit may be used only once in each state
+            units: List[List[Tuple[int, HlsNetNodeOperator]]] = []
+            for stI, n in members:
+                for u in units:
+                    if all(uStI != stI for uStI, _ in u):
+                        u.append((stI, n))
+                        break
+                else:
+                    units.append([(stI, n)])
+
+            for u in units:
+                nodes = [n for _, n in u]
+                while len(nodes) > 1:
+                    operandSrcCnts, muxDelay = self._getOperandMuxDelay(nodes)
+                    delays = [self._getOperandMuxExtraDelay(n, muxDelay) for n in nodes]
+                    fitting = [n for n, d in zip(nodes, delays) if self.clkSlack[self._getClkI(n)] >= d]
+                    if len(fitting) != len(nodes):
+                        # the multiplexer would be smaller without members which do not fit
+                        nodes = fitting
+                        continue
+
+                    if self._isBeneficial(nodes, operandSrcCnts):
+                        fu = HlsFunctionalUnitSharedByStates(self._newUnitName(elm, nodes[0]), nodes)
+                        self._addUnit(elm, fu, max(delays))
+                    break
+
+    def bind(self, elements: List[AllocatorArchitecturalElement]):
+        self._resolveClkSlack()
+        seen: Set[HlsNetNode] = set()
+        for elm in elements:
+            for n in elm.allNodes:
+                if n in seen:
+                    self._nodesInMultipleElements.add(n)
+                else:
+                    seen.add(n)
+
+        for elm in elements:
+            self._bindMuxCases(elm)
+        for elm in elements:
+            if isinstance(elm, AllocatorFsmContainer):
+                self._bindFsmStates(elm)
@@ -4,17 +4,20 @@ from typing import List, Type, Optional, Dict, Tuple, Union
 from hdlConvertorAst.to.hdlUtils import iter_with_last
 from hwt.code import If
 from hwt.hdl.statements.statement import HdlStatement
+from hwt.hdl.types.hdlType import HdlType
 from hwt.hdl.types.defs import BIT
 from hwt.interfaces.std import Signal, HandshakeSync
 from hwt.pyUtils.uniqList import UniqList
 from hwt.synthesizer.interface import Interface
 from hwt.synthesizer.interfaceLevel.unitImplHelpers import Interface_without_registration
+from hwt.synthesizer.rtlLevel.rtlSignal import RtlSignal
 from hwt.synthesizer.rtlLevel.rtlSyncSignal import RtlSyncSignal
 from hwtHls.allocator.architecturalElement import AllocatorArchitecturalElement
 from hwtHls.allocator.connectionsOfStage import ConnectionsOfStage, resolveStrongestSyncType, \
     SignalsOfStages
 from hwtHls.allocator.interArchElementNodeSharingAnalysis import InterArchElementNodeSharingAnalysis
-from hwtHls.allocator.time_independent_rtl_resource import TimeIndependentRtlResource
+from hwtHls.allocator.time_independent_rtl_resource import TimeIndependentRtlResource, \
+    TimeIndependentRtlResourceItem, TimeIndependentRtlResourceShiftRegisterTap
 from hwtHls.netlist.nodes.io import HlsNetNodeRead, HlsNetNodeWrite
 from hwtHls.netlist.nodes.node import HlsNetNode
 
@@ -24,22 +27,31 @@ class AllocatorPipelineContainer(AllocatorArchitecturalElement):
     A container of informations about hw pipeline allocation.
     
     :ivar stages: list of lists of nodes representing the nodes managed by this pipeline in individual clock stages
+    :ivar readyRegisterPeriod: if not None the ready signal is registered using a skid buffer after every
+        readyRegisterPeriod stages (:see: :meth:`~.allocateSkidBuffer`)
+    :ivar shiftRegisterMinLength: if not None the chains of registers of this or larger length
+        are realized as a shift register (:see: :meth:`~._allocateShiftRegister`)
     :note: stages always start in time 0 and empty lists on beginning marking where the pipeline actually starts.
         This is to have uniform index when we scope into some other element.
     """
 
-    def __init__(self, parentHls: "HlsPipeline", namePrefix:str, stages: List[List[HlsNetNode]]):
+    def __init__(self, parentHls: "HlsPipeline", namePrefix:str, stages: List[List[HlsNetNode]],
+                 readyRegisterPeriod: Optional[int]=None,
+                 shiftRegisterMinLength: Optional[int]=None):
         allNodes = UniqList()
         for nodes in stages:
             allNodes.extend(nodes)
 
         self.stages = stages
+        self.readyRegisterPeriod = readyRegisterPeriod
+        self.shiftRegisterMinLength = shiftRegisterMinLength
         stageCons = [ConnectionsOfStage() for _ in self.stages]
         stageSignals = SignalsOfStages(parentHls.normalizedClkPeriod,
                                        (con.signals for con in stageCons))
         AllocatorArchitecturalElement.__init__(self, parentHls, namePrefix, allNodes, stageCons, stageSignals)
         self._syncAllocated = False
         self._dataPathAllocated = False
+        self._hasFlowControl: Optional[bool] = None
 
     def _afterNodeInstantiated(self, n: HlsNetNode, rtl: Optional[TimeIndependentRtlResource]):
         # mark value in register as persisten until the end of fsm
@@ -57,10 +69,46 @@ class AllocatorPipelineContainer(AllocatorArchitecturalElement):
         for dep in n.dependsOn:
             self._afterOutputUsed(dep)
 
+    def _resolveHasFlowControl(self, iea: InterArchElementNodeSharingAnalysis) -> bool:
+        """
+        :return: True if the stages of the pipeline may stall, in that case each stage has its own enable
+            of the register load (:see: :meth:`~.allocateSyncForStage`)
+        """
+        if iea.interElemConnections:
+            # the synchronization with other elements is added later in :meth:`~.connectSync`
+            return True
+
+        io = []
+        for n in self.allNodes:
+            if isinstance(n, HlsNetNodeRead):
+                io.append(n.src)
+            elif isinstance(n, HlsNetNodeWrite):
+                io.append(n.dst)
+
+        return resolveStrongestSyncType(Signal, io) is not Signal
+
+    def _allocateShiftRegister(self, tir: TimeIndependentRtlResource, name: str, dtype: HdlType,
+                               clkI: int, length: int) -> Optional[RtlSignal]:
+        """
+        The shift register is an array register without reset and each item is loaded from previous item.
+        It is used only if the pipeline has no flow control, in that case the items are loaded unconditionally
+        in every clock period, each item has a single driver and the array can be mapped to SRL/LUTRAM.
+        If the stages may stall each item would need the enable of its stage, which can not be realized
+        by a shift register, and the individual registers are used instead.
+        """
+        minLength = self.shiftRegisterMinLength
+        if minLength is None or length < minLength:
+            return None
+        assert self._hasFlowControl is not None, ("Flow control has to be resolved before data path allocation", self)
+        if self._hasFlowControl:
+            return None
+        return self._reg(name, dtype[length])
+
     def allocateDataPath(self, iea: InterArchElementNodeSharingAnalysis):
         assert not self._dataPathAllocated
         assert not self._syncAllocated
         self.interArchAnalysis = iea
+        self._hasFlowControl = self._resolveHasFlowControl(iea)
 
         ioToCon: Dict[Interface, ConnectionsOfStage] = {}
         for nodes, con in zip(self.stages, self.connections):
@@ -159,11 +207,14 @@ class AllocatorPipelineContainer(AllocatorArchitecturalElement):
                 # if the value has a register at the end of this stage
                 v = s.checkIfExistsInClockCycle(pipeline_st_i + 1)
                 if v is not None and v.is_rlt_register():
+                    assert not isinstance(v, TimeIndependentRtlResourceShiftRegisterTap), (
+                        "Shift register can be used only in pipeline without flow control", self, v)
                     cur_registers.append(v)
 
             if is_last_in_pipeline:
                 to_next_stage = None
                 stage_valid = None
+                isReadyRegistered = False
             else:
                 # does not need a synchronization with next stage in pipeline
                 to_next_stage = Interface_without_registration(
@@ -172,6 +223,7 @@ class AllocatorPipelineContainer(AllocatorArchitecturalElement):
                 # if not is_first_in_pipeline:
                 # :note: that the register 0 is behind the first stage of pipeline
                 stage_valid = self._reg(f"{self.namePrefix:s}stage{pipeline_st_i:d}_valid", def_val=0)
+                isReadyRegistered = self.readyRegisterPeriod is not None and (pipeline_st_i + 1) % self.readyRegisterPeriod == 0
 
             if con.inputs or con.outputs:
                 sync = con.sync_node = self._makeSyncNode(con)
@@ -202,10 +254,10 @@ class AllocatorPipelineContainer(AllocatorArchitecturalElement):
                         sync.sync(en)
                         ack = sync.ack() & en
 
-                if cur_registers:
+                if cur_registers and not isReadyRegistered:
                     # add enable signal for register load derived from synchronization of stage
                     If(ack,
-                       *(r.data.next.drivers[0] for r in cur_registers),
+                       *(r.getRegisterDriver() for r in cur_registers),
                     )
 
             elif to_next_stage is not None:
@@ -219,7 +271,9 @@ class AllocatorPipelineContainer(AllocatorArchitecturalElement):
             else:
                 ack = BIT.from_py(1)
 
-            if to_next_stage is not None:
+            if isReadyRegistered:
+                to_next_stage = self.allocateSkidBuffer(pipeline_st_i, to_next_stage, stage_valid, ack, cur_registers)
+            elif to_next_stage is not None:
                 If(to_next_stage.rd,
                    stage_valid(to_next_stage.vld)
                 )
@@ -232,3 +286,62 @@ class AllocatorPipelineContainer(AllocatorArchitecturalElement):
             prev_st_valid = stage_valid
 
         return prev_st_sync_input, prev_st_valid, current_sync
+
+    def allocateSkidBuffer(self, pipeline_st_i: int, to_next_stage: HandshakeSync, stage_valid: RtlSyncSignal,
+                           ack: RtlSignal, cur_registers: List[TimeIndependentRtlResourceItem]) -> HandshakeSync:
+        """
+        Register the ready signal between the stage pipeline_st_i and the next stage to cut the combinational
+        path of ready signal trough whole pipeline.
+
+        The ready of this stage depends only on the occupancy of the skid buffer. If the next stage is stalled
+        the data produced in this clock period is stored in the skid buffer and this stage is stalled in next clock period.
+        The skid buffer is moved to stage registers once the next stage consumes the data from them.
+        Because of this each register at the end of this stage has a mux in front of it,
+        the delay of this mux is included in :meth:`hwtHls.platform.platform.DefaultHlsPlatform.get_ff_store_time`.
+
+        :param to_next_stage: the synchronization channel of this stage (the input of the skid buffer)
+        :param ack: the signal which enables load of the registers at the end of this stage
+        :param cur_registers: registers at the end of this stage
+        :return: the synchronization channel for the next stage (the output of the skid buffer)
+        """
+        skid_valid = self._reg(f"{self.namePrefix:s}stage{pipeline_st_i:d}_skid_valid", def_val=0)
+        from_skid = Interface_without_registration(
+            self, HandshakeSync(), f"{self.namePrefix:s}stage_sync_{pipeline_st_i:d}_skid_to_{pipeline_st_i+1:d}")
+        to_next_stage.rd(~skid_valid)
+        from_skid.vld(stage_valid)
+        # stage registers are empty or their value is consumed by next stage in this clock period
+        stage_regs_free = ~stage_valid | from_skid.rd
+
+        load_from_skid = []
+        load_from_stage = []
+        load_skid = []
+        for r in cur_registers:
+            r: TimeIndependentRtlResourceItem
+            reg: RtlSyncSignal = r.data
+            regAssign = r.getRegisterDriver()
+            skid = self._reg(f"{reg.name:s}_skid", reg._dtype)
+            load_from_stage.append(regAssign)
+            load_from_skid.append(reg(skid))
+            load_skid.append(skid(regAssign.src))
+
+        If(skid_valid,
+           # this stage is stalled, waiting until data from skid buffer can be moved to stage registers
+           If(stage_regs_free,
+              *load_from_skid,
+              stage_valid(1),
+              skid_valid(0),
+           )
+        ).Else(
+           If(stage_regs_free,
+              If(ack,
+                 *load_from_stage,
+              ),
+              stage_valid(to_next_stage.vld),
+           ).Else(
+              If(ack,
+                 *load_skid,
+              ),
+              skid_valid(to_next_stage.vld),
+           )
+        )
+        return from_skid
@@ -0,0 +1,159 @@
+from itertools import dropwhile
+from typing import List, Optional, Set, TextIO, Tuple
+
+from hwtHls.allocator.fsmContainer import AllocatorFsmContainer
+from hwtHls.allocator.pipelineContainer import AllocatorPipelineContainer
+from hwtHls.allocator.time_independent_rtl_resource import TimeIndependentRtlResource, \
+    TimeIndependentRtlResourceShiftRegisterTap
+from hwtHls.clk_math import start_clk
+from hwtHls.netlist.nodes.const import HlsNetNodeConst
+
+
+class HlsAllocatorQoRStage():
+    """
+    Quality of results of a single clock period of the schedule.
+
+    :ivar clkI: the index of the clock period
+    :ivar criticalPath: the estimated delay of the longest combinational path in this clock period in seconds
+    :ivar slack: the clock period minus the critical path and the flip-flop store time in seconds
+        (negative value means that the timing is not met)
+    """
+    __slots__ = ["clkI", "criticalPath", "slack"]
+
+    def __init__(self, clkI: int, criticalPath: float, slack: float):
+        self.clkI = clkI
+        self.criticalPath = criticalPath
+        self.slack = slack
+
+    def toJson(self):
+        return {k: getattr(self, k) for k in self.__slots__}
+
+
+class HlsAllocatorQoRReport():
+    """
+    Quality of results of a single :class:`hwtHls.hlsPipeline.HlsPipeline` after :meth:`hwtHls.allocator.allocator.HlsAllocator.allocate`.
+
+    :ivar name: the name of the thread (label of the start block)
+    :ivar pipelineDepth: the number of clock periods from the first to the last scheduled operation (the latency)
+    :ivar fsmStateCount: the number of states of all FSMs
+    :ivar pipelineStageCount: the number of stages of all pipelines
+    :ivar registerBits: the number of bits of registers inserted by :class:`hwtHls.allocator.time_independent_rtl_resource.TimeIndependentRtlResource`
+        to pass the values between clock periods
+    :ivar shiftRegisterBits: the part of registerBits which is realized as shift registers
+        (:see: :meth:`hwtHls.allocator.architecturalElement.AllocatorArchitecturalElement._allocateShiftRegister`)
+    :ivar stages: the critical path and slack for each clock period
+    :ivar worstSlack: the minimum slack of all clock periods in seconds
+    :ivar fmax: the estimated maximum frequency in Hz derived from the longest critical path
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.pipelineDepth = 0
+        self.fsmStateCount = 0
+        self.pipelineStageCount = 0
+        self.registerBits = 0
+        self.shiftRegisterBits = 0
+        self.stages: List[HlsAllocatorQoRStage] = []
+        self.worstSlack: Optional[float] = None
+        self.fmax: Optional[float] = None
+
+    @staticmethod
+    def _countRegisterBits(allocator: "HlsAllocator") -> Tuple[int, int]:
+        """
+        :return: tuple (number of all register bits, number of bits in shift registers)
+        """
+        regBits = 0
+        srlBits = 0
+        seen: Set[TimeIndependentRtlResource] = set()
+        seenRegs = set()
+        for e in allocator._archElements:
+            for tir in e.netNodeToRtl.values():
+                if not isinstance(tir, TimeIndependentRtlResource) or tir in seen:
+                    continue
+                seen.add(tir)
+                for item in tir.valuesInTime[1:]:
+                    # the register may be reused for multiple clock periods if the value is persistent
+                    # or it may be shared by multiple values
+                    if item.data in seenRegs:
+                        continue
+                    seenRegs.add(item.data)
+                    w = item.data._dtype.bit_length()
+                    regBits += w
+                    if isinstance(item, TimeIndependentRtlResourceShiftRegisterTap):
+                        srlBits += w
+        return regBits, srlBits
+
+    def _resolveTiming(self, hls: "HlsPipeline"):
+        """
+        Resolve the longest combinational path for each clock period from the schedule
+        (the times in schedule are derived from the platform delay model).
+        """
+        clkPeriod: int = hls.normalizedClkPeriod
+        resolution: float = hls.scheduler.resolution
+        ffDelay: int = hls.platform.get_ff_store_time(hls.realTimeClkPeriod, resolution)
+        criticalPath = {}
+        for n in hls.iterAllNodes():
+            if isinstance(n, HlsNetNodeConst):
+                continue
+            for t in (*n.scheduledIn, *n.scheduledOut):
+                clkI = start_clk(t, clkPeriod)
+                pathDelay = t - clkI * clkPeriod
+                if pathDelay > criticalPath.get(clkI, -1):
+                    criticalPath[clkI] = pathDelay
+
+        if not criticalPath:
+            return
+
+        minClkI = min(criticalPath.keys())
+        maxClkI = max(criticalPath.keys())
+        self.pipelineDepth = maxClkI - minClkI + 1
+        for clkI in range(minClkI, maxClkI + 1):
+            pathDelay = criticalPath.get(clkI, 0)
+            self.stages.append(HlsAllocatorQoRStage(
+                clkI, pathDelay * resolution, (clkPeriod - ffDelay - pathDelay) * resolution))
+
+        self.worstSlack = min(s.slack for s in self.stages)
+        longestPath = max(s.criticalPath for s in self.stages) + ffDelay * resolution
+        if longestPath > 0:
+            self.fmax = 1 / longestPath
+
+    def collect(self, hls: "HlsPipeline"):
+        allocator = hls.allocator
+        for e in allocator._archElements:
+            if isinstance(e, AllocatorFsmContainer):
+                self.fsmStateCount += len(e.fsm.states)
+            elif isinstance(e, AllocatorPipelineContainer):
+                # leading empty stages are just a padding to have same stage indexes as other elements
+                self.pipelineStageCount += sum(1 for _ in dropwhile(lambda st: not st, e.stages))
+            else:
+                raise NotImplementedError(e)
+
+        self.registerBits, self.shiftRegisterBits = self._countRegisterBits(allocator)
+        self._resolveTiming(hls)
+
+    def toJson(self):
+        return {
+            "name": self.name,
+            "pipelineDepth": self.pipelineDepth,
+            "fsmStateCount": self.fsmStateCount,
+            "pipelineStageCount": self.pipelineStageCount,
+            "registerBits": self.registerBits,
+            "shiftRegisterBits": self.shiftRegisterBits,
+            "worstSlack": self.worstSlack,
+            "fmax": self.fmax,
+            "stages": [s.toJson() for s in self.stages],
+        }
+
+    def dump(self, out: TextIO):
+        out.write(f"########## {self.name:s} ##########\n")
+        out.write(f"pipelineDepth: {self.pipelineDepth:d}\n")
+        out.write(f"fsmStateCount: {self.fsmStateCount:d}\n")
+        out.write(f"pipelineStageCount: {self.pipelineStageCount:d}\n")
+        out.write(f"registerBits: {self.registerBits:d}\n")
+        out.write(f"shiftRegisterBits: {self.shiftRegisterBits:d}\n")
+        if self.worstSlack is not None:
+            out.write(f"worstSlack: {self.worstSlack * 1e9:.3f}ns\n")
+        if self.fmax is not None:
+            out.write(f"fmax: {self.fmax / 1e6:.3f}MHz\n")
+        for s in self.stages:
+            out.write(f"  clk {s.clkI:d}: criticalPath {s.criticalPath * 1e9:.3f}ns, slack {s.slack * 1e9:.3f}ns\n")
@@ -1,5 +1,6 @@
 from typing import Union, List, Tuple
 
+from hwt.hdl.statements.assignmentContainer import HdlAssignmentContainer
 from hwt.hdl.value import HValue
 from hwt.synthesizer.interface import Interface
 from hwt.synthesizer.rtlLevel.rtlSignal import RtlSignal
@@ -18,10 +19,36 @@ class TimeIndependentRtlResourceItem():
         return (self.parent.valuesInTime[0] is not self or
                 isinstance(self.parent.valuesInTime[0].data, RtlSyncSignal))
 
+    def getRegisterDriver(self) -> HdlAssignmentContainer:
+        """
+        :return: the statement which loads the register
+        """
+        return self.data.next.drivers[0]
+
     def __repr__(self):
         return f"<{self.__class__.__name__:s} {self.data}>"
 
 
+class TimeIndependentRtlResourceShiftRegisterTap(TimeIndependentRtlResourceItem):
+    """
+    An item which is an output of a single stage of a shift register
+    (:see: :meth:`hwtHls.allocator.architecturalElement.AllocatorArchitecturalElement._allocateShiftRegister`)
+
+    :ivar driver: the statement which shifts the value to this stage of the shift register
+    """
+    __slots__ = ["driver"]
+
+    def __init__(self, parent:"TimeIndependentRtlResource", data:RtlSignal, driver: HdlAssignmentContainer):
+        super(TimeIndependentRtlResourceShiftRegisterTap, self).__init__(parent, data)
+        self.driver = driver
+
+    def is_rlt_register(self) -> bool:
+        return True
+
+    def getRegisterDriver(self) -> HdlAssignmentContainer:
+        return self.driver
+
+
 class TimeIndependentRtlResource():
     """
     Container of resource which manages access to resource
@@ -112,13 +139,26 @@ class TimeIndependentRtlResource():
             name = sig.data.name
         # allocate specified number of registers to pass value to specified pieline stage
         regsToAdd = requestedRegCnt - actualTimesCnt
+        firstClkI = dstClkPeriod - regsToAdd + 1
+        if not any(self._isInPersistenceRanges(clkI) for clkI in range(firstClkI, dstClkPeriod + 1)):
+            # the chain of registers without any persistent register may be realized as a shift register
+            srl = self.allocator._allocateShiftRegister(self, f"{name:s}_delay{firstClkI:d}to{dstClkPeriod:d}",
+                                                        sig.data._dtype, firstClkI, regsToAdd)
+            if srl is not None:
+                for i in range(regsToAdd):
+                    tap = srl[i]
+                    cur = TimeIndependentRtlResourceShiftRegisterTap(self, tap, tap(prev.data))
+                    self.valuesInTime.append(cur)
+                    prev = cur
+                return cur
+
         for i in reversed(range(regsToAdd)):
             if self._isInPersistenceRanges(dstClkPeriod - i):
                 cur = self.valuesInTime[-1]
                 assert cur.is_rlt_register(), cur
             else:
-                reg = self.allocator._reg(f"{name:s}_delayTo{dstClkPeriod - i:d}",
-                                          dtype=sig.data._dtype)
+                reg = self.allocator._allocateRegister(self, f"{name:s}_delayTo{dstClkPeriod - i:d}",
+                                                       sig.data._dtype, dstClkPeriod - i)
                 reg(prev.data)
                 cur = TimeIndependentRtlResourceItem(self, reg)
             self.valuesInTime.append(cur)
@@ -1,5 +1,5 @@
 from itertools import chain
-from typing import List, Union, Optional, Type
+from typing import List, Union, Optional, Type, Iterable
 
 from hwt.pyUtils.uniqList import UniqList
 from hwt.synthesizer.interface import Interface
@@ -9,6 +9,7 @@ from hwtHls.allocator.allocator import HlsAllocator
 from hwtHls.netlist.analysis.hlsNetlistAnalysisPass import HlsNetlistAnalysisPass
 from hwtHls.netlist.nodes.io import HlsNetNodeRead, HlsNetNodeWrite
 from hwtHls.netlist.nodes.node import HlsNetNode
+from hwtHls.scheduler.retiming import HlsScheduleRetimingStats
 from hwtHls.scheduler.scheduler import HlsScheduler
 from math import ceil
 
@@ -40,6 +41,8 @@ class HlsPipeline():
         the purpose of objects in this ctx is only to store the input code
         these objecs are not present in output circuit and are only form of code
         themplate which must be translated
+    :ivar retimingStats: the statistics of the post-schedule retiming of this pipeline
+        (None if the retiming was not performed)
     """
 
     def __init__(self, parentUnit: Unit,
@@ -71,6 +74,7 @@ class HlsPipeline():
         self._analysis_cache = {}
         
         self.scheduler: HlsScheduler = self.platform.scheduler(self, schedulerResolution)
+        self.retimingStats: Optional[HlsScheduleRetimingStats] = None
         self.allocator: HlsAllocator = self.platform.allocator(self)
 
     def iterAllNodes(self):
@@ -91,8 +95,28 @@ class HlsPipeline():
         self._analysis_cache[analysis_cls] = a
         return a
 
+    def _retime(self):
+        """
+        Apply post-schedule retiming if it is specified by the platform.
+
+        :see: :class:`hwtHls.scheduler.retiming.HlsScheduleRetiming`
+        """
+        retiming = self.platform.scheduleRetiming
+        if retiming is not None:
+            self.retimingStats = retiming.apply(self)
+
     def schedule(self):
         self.scheduler.schedule()
+        self._retime()
+
+    def scheduleIncremental(self, dirtyNodes: Iterable[HlsNetNode]):
+        """
+        Update the schedule after a local modification of the netlist.
+
+        :see: :meth:`hwtHls.scheduler.scheduler.HlsScheduler.scheduleIncremental`
+        """
+        self.scheduler.scheduleIncremental(dirtyNodes)
+        self._retime()
 
     def allocate(self):
         """
@@ -0,0 +1,107 @@
+from typing import List, Optional, Tuple
+
+from hwt.hdl.types.hdlType import HdlType
+from hwt.interfaces.hsStructIntf import HsStructIntf
+from hwtHls.clk_math import start_clk
+from hwtHls.netlist.nodes.io import HlsNetNodeRead, HlsNetNodeWrite
+from hwtLib.abstract.componentBuilder import AbstractComponentBuilder
+from hwtLib.handshaked.builder import HsBuilder
+
+
+class HlsStreamProcChannel():
+    """
+    A FIFO connection between threads of the same :class:`hwtHls.hlsStreamProc.streamProc.HlsStreamProc`
+    (dataflow, task level pipelining). The producer thread writes to this object, the consumer thread reads from it
+    and the FIFO between them is instantiated after all threads are scheduled.
+
+    .. code-block:: Python
+
+        ch = hls.channel(Bits(8), "ch")
+        hls.thread(hls.While(True, hls.write(hls.read(self.dataIn) + 1, ch)))
+        hls.thread(hls.While(True, hls.write(hls.read(ch) * 2, self.dataOut)))
+
+    If the depth is not specified it is resolved from the schedule of the threads. The producer
+    and the consumer are pipelines which start at the same time. If the write in the producer and the read
+    in the consumer are in different pipeline stages the FIFO has to hold the data for the number of clock periods
+    which is the difference of stage indexes, otherwise one of the threads would stall the other.
+    The FIFO has at least :attr:`~.MIN_DEPTH` items so it is also possible to break the combinational path
+    of ready signal while keeping the full throughput.
+
+    :ivar name: the name used for the interfaces and for the FIFO
+    :ivar depth: an optional depth of the FIFO specified by user
+    :ivar resolvedDepth: the depth of the FIFO after it was instantiated
+    :ivar producerIntf: the interface where producer thread writes the data (the input of the FIFO)
+    :ivar consumerIntf: the interface from where the consumer thread reads the data (the output of the FIFO)
+    """
+    MIN_DEPTH = 2
+
+    def __init__(self, hls: "HlsStreamProc", dtype: HdlType, name: str, depth: Optional[int]=None):
+        if depth is not None and depth < 1:
+            raise ValueError("Channel depth must be at least 1", depth)
+        self.hls = hls
+        self.name = name
+        self.depth = depth
+        self.resolvedDepth: Optional[int] = None
+        u = hls.parentUnit
+        nameFinder = AbstractComponentBuilder(u, None, "hls")
+
+        producerIntf = HsStructIntf()
+        producerIntf.T = dtype
+        producerName = nameFinder._findSuitableName(f"{name:s}_in")
+        setattr(u, producerName, producerIntf)
+        self.producerIntf = producerIntf
+
+        consumerIntf = HsStructIntf()
+        consumerIntf.T = dtype
+        consumerName = nameFinder._findSuitableName(f"{name:s}_out")
+        setattr(u, consumerName, consumerIntf)
+        self.consumerIntf = consumerIntf
+
+    def _collectIo(self) -> Tuple[List[HlsNetNodeWrite], List[HlsNetNodeRead]]:
+        writes = []
+        reads = []
+        for t in self.hls._threads:
+            for n in t.toHw.hls.iterAllNodes():
+                if isinstance(n, HlsNetNodeWrite) and n.dst is self.producerIntf:
+                    writes.append(n)
+                elif isinstance(n, HlsNetNodeRead) and n.src is self.consumerIntf:
+                    reads.append(n)
+
+        return writes, reads
+
+    def _resolveDepth(self) -> int:
+        writes, reads = self._collectIo()
+        if not writes:
+            raise AssertionError("Channel is not written by any thread", self)
+        if not reads:
+            raise AssertionError("Channel is not read by any thread", self)
+
+        if self.depth is not None:
+            return self.depth
+
+        latencyDiff = 0
+        for w in writes:
+            wClkPeriod = w.hls.normalizedClkPeriod
+            wClkI = start_clk(w.scheduledIn[0], wClkPeriod)
+            for r in reads:
+                rClkPeriod = r.hls.normalizedClkPeriod
+                rClkI = start_clk(r.scheduledOut[0], rClkPeriod)
+                latencyDiff = max(latencyDiff, abs(wClkI - rClkI))
+
+        return max(self.MIN_DEPTH, latencyDiff + 1)
+
+    def allocate(self):
+        """
+        Instantiate the FIFO between producer and consumer interface.
+        """
+        assert self.resolvedDepth is None, ("Channel already allocated", self)
+        depth = self._resolveDepth()
+        self.resolvedDepth = depth
+        # :note: latency is 1-2 to break ready chain
+        buffs = HsBuilder(self.hls.parentUnit, self.producerIntf, f"hls_{self.name:s}_buff")\
+            .buff(depth, latency=(1, 2))\
+            .end
+        self.consumerIntf(buffs)
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} {self.name:s}>"
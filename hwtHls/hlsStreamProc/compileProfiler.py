@@ -0,0 +1,177 @@
+from contextlib import contextmanager
+import json
+from pathlib import Path
+import sys
+from time import perf_counter
+from typing import List, Optional, Dict, Union
+
+from hwtHls.netlist.nodes.aggregatedBitwiseOps import HlsNetNodeBitwiseOps
+from hwtHls.ssa.basicBlock import SsaBasicBlock
+from hwtHls.ssa.transformation.utils.blockAnalysis import collect_all_blocks
+from hwtHls.ssa.translation.toLlvm import ToLlvmIrTranslator
+
+try:
+    import resource
+except ImportError:
+    # not available on Windows
+    resource = None
+
+
+def _getPeakRssKiB() -> Optional[int]:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        # in bytes on MacOS
+        peak //= 1024
+    return peak
+
+
+class HlsCompileProfilerRecord():
+    """
+    A record about a single step of the compilation.
+
+    :ivar name: the name of the step (usually the name of the pass)
+    :ivar category: the category of the step ("ssa", "hlsnetlist", "scheduler", "allocator", "rtlnetlist", ...)
+    :ivar threadIndex: the index of the thread in :class:`hwtHls.hlsStreamProc.streamProc.HlsStreamProc`
+        or None if the step is not specific to a single thread
+    :ivar start: start time of the step in seconds from the start of the profiling
+    :ivar duration: the wall time of the step in seconds
+    :ivar peakRssDeltaKiB: how much the peak resident set size of this process increased during this step
+    :ivar objectCounts: the numbers of objects after this step (netlist nodes, ports, SSA instructions, LLVM instructions)
+    """
+    __slots__ = ["name", "category", "threadIndex", "start", "duration", "peakRssDeltaKiB", "objectCounts"]
+
+    def __init__(self, name: str, category: str, threadIndex: Optional[int], start: float):
+        self.name = name
+        self.category = category
+        self.threadIndex = threadIndex
+        self.start = start
+        self.duration: Optional[float] = None
+        self.peakRssDeltaKiB: Optional[int] = None
+        self.objectCounts: Dict[str, int] = {}
+
+    def toJson(self):
+        return {k: getattr(self, k) for k in self.__slots__}
+
+
+class HlsCompileProfiler():
+    """
+    Collects the wall time, the increase of the peak memory and the size of the compiled program
+    for each pass and each thread during :meth:`hwtHls.hlsStreamProc.streamProc.HlsStreamProc.compile`.
+
+    Example of use:
+
+    .. code-block:: Python
+
+        p = HlsCompileProfiler()
+        to_rtl_str(u, target_platform=VirtualHlsPlatform(compileProfiler=p))
+        p.saveChromeTrace("compile.trace.json") # open in chrome://tracing or https://ui.perfetto.dev/
+
+    :ivar records: the list of records in the order of the start
+    """
+
+    def __init__(self):
+        self.records: List[HlsCompileProfilerRecord] = []
+        self._startTime = perf_counter()
+
+    @staticmethod
+    def countObjects(target: Union["AstToSsa", "SsaSegmentToHwPipeline", None]) -> Dict[str, int]:
+        """
+        Count the objects in the representation of the thread in the current stage of the compilation.
+        """
+        counts = {}
+        if target is None:
+            return counts
+
+        start = getattr(target, "start", None)
+        hls = getattr(target, "hls", None)
+        if hls is not None:
+            nodeCnt = 0
+            portCnt = 0
+            for n in hls.iterAllNodes():
+                nodeCnt += 1
+                portCnt += len(n._inputs) + len(n._outputs)
+                if isinstance(n, HlsNetNodeBitwiseOps):
+                    for subNode in n._subNodes.nodes:
+                        nodeCnt += 1
+                        portCnt += len(subNode._inputs) + len(subNode._outputs)
+            counts["nodes"] = nodeCnt
+            counts["ports"] = portCnt
+
+        elif isinstance(start, SsaBasicBlock):
+            instrCnt = 0
+            blockCnt = 0
+            for b in collect_all_blocks(start, set()):
+                blockCnt += 1
+                instrCnt += len(b.phis) + len(b.body)
+            counts["ssaBlocks"] = blockCnt
+            counts["ssaInstructions"] = instrCnt
+
+        elif isinstance(start, ToLlvmIrTranslator):
+            instrCnt = 0
+            blockCnt = 0
+            for bb in start.main:
+                blockCnt += 1
+                for _ in bb:
+                    instrCnt += 1
+            counts["llvmBlocks"] = blockCnt
+            counts["llvmInstructions"] = instrCnt
+
+        return counts
+
+    @contextmanager
+    def scope(self, name: str, category: str, threadIndex: Optional[int],
+              target: Union["AstToSsa", "SsaSegmentToHwPipeline", None]=None):
+        """
+        Measure the code in this scope.
+
+        :param target: an object representing the thread for the collection of the statistics
+        """
+        rec = HlsCompileProfilerRecord(name, category, threadIndex, perf_counter() - self._startTime)
+        self.records.append(rec)
+        rssBefore = _getPeakRssKiB()
+        t0 = perf_counter()
+        try:
+            yield rec
+        finally:
+            rec.duration = perf_counter() - t0
+            if rssBefore is not None:
+                rec.peakRssDeltaKiB = _getPeakRssKiB() - rssBefore
+            if target is not None:
+                rec.objectCounts = self.countObjects(target)
+
+    def toJson(self):
+        return [r.toJson() for r in self.records]
+
+    def saveJson(self, fileName: Union[str, Path]):
+        with open(fileName, "w") as f:
+            json.dump(self.toJson(), f, indent=2)
+
+    def toChromeTrace(self):
+        """
+        Convert records to a format of Chrome trace event format (complete events, times in microseconds)
+
+        :see: https://docs.google.com/document/d/1CvAClvFfyA5R-PhYUmn5OOQtYMH4h6I0nSsKchNAySU
+        """
+        events = []
+        for r in self.records:
+            args = dict(r.objectCounts)
+            if r.peakRssDeltaKiB is not None:
+                args["peakRssDeltaKiB"] = r.peakRssDeltaKiB
+            events.append({
+                "name": r.name,
+                "cat": r.category,
+                "ph": "X",
+                "ts": r.start * 1e6,
+                "dur": r.duration * 1e6,
+                "pid": 0,
+                # tid 0 is for steps which are not specific for any thread
+                "tid": 0 if r.threadIndex is None else r.threadIndex + 1,
+                "args": args,
+            })
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def saveChromeTrace(self, fileName: Union[str, Path]):
+        with open(fileName, "w") as f:
+            json.dump(self.toChromeTrace(), f)
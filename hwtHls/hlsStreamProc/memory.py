@@ -0,0 +1,442 @@
+from enum import Enum
+from math import ceil
+from typing import List, Optional, Sequence, Union, Tuple
+
+from hwt.code import If, Concat
+from hwt.hdl.types.bits import Bits
+from hwt.hdl.types.defs import BIT
+from hwt.hdl.value import HValue
+from hwt.interfaces.hsStructIntf import HsStructIntf
+from hwt.math import log2ceil, isPow2
+from hwt.synthesizer.interfaceLevel.unitImplHelpers import Interface_without_registration
+from hwt.synthesizer.rtlLevel.rtlSignal import RtlSignal
+from hwt.synthesizer.vectorUtils import fitTo_t
+from hwtHls.hlsStreamProc.statementsIo import HlsStreamProcRead, HlsStreamProcWrite
+from hwtLib.abstract.componentBuilder import AbstractComponentBuilder
+from hwtLib.handshaked.builder import HsBuilder
+
+
+class ARRAY_PARTITION(Enum):
+    """
+    Enum for the partitioning of :class:`~.HlsStreamProcMemory` to banks (independent memories).
+
+    .. code-block:: text
+
+        items:    0 1 2 3 4 5 6 7
+        CYCLIC:   0 1 0 1 0 1 0 1  (factor=2, bank = i % factor)
+        BLOCK:    0 0 0 0 1 1 1 1  (factor=2, bank = i // ceil(items / factor))
+        COMPLETE: 0 1 2 3 4 5 6 7  (each item in own bank)
+    """
+    CYCLIC = "CYCLIC"
+    BLOCK = "BLOCK"
+    COMPLETE = "COMPLETE"
+
+
+class HlsStreamProcMemoryPort():
+    """
+    A port of :class:`~.HlsStreamProcMemoryBank`.
+
+    :ivar request: the interface where the thread writes the address, data, write enable and read flag
+        (Concat(re, we, din, addr), the address is at LSB), the response is produced only for requests with re=1
+    :ivar response: the interface from where the thread reads the data of read request
+    :ivar hasWrite: flag which tells that some request on this port may write to the memory
+        (the scheduler uses it to order the requests on the other ports of the same bank)
+    :ivar requestCnt: the number of requests in the code which are using this port
+        (the requests may be removed by :class:`hwtHls.ssa.transformation.loopUnroll.SsaPassLoopUnroll`,
+        the port is allocated only if it is used)
+    """
+
+    def __init__(self, bank: "HlsStreamProcMemoryBank", index: int):
+        self.bank = bank
+        self.index = index
+        self.hasWrite = False
+        self.requestCnt = 0
+        memory = bank.memory
+        u = memory.hls.parentUnit
+        nameFinder = AbstractComponentBuilder(u, None, "hls")
+
+        request = HsStructIntf()
+        request.T = Bits(bank.ADDR_WIDTH + memory.dtype.bit_length() + 2)
+        # marks that the scheduler should look for the reads of the responses for the writes to this interface
+        request._hlsHasResponse = True
+        request._hlsMemoryPort = self
+        setattr(u, nameFinder._findSuitableName(f"{bank.name:s}_port{index:d}_req"), request)
+        self.request = request
+
+        response = HsStructIntf()
+        response.T = memory.dtype
+        # the read of the response can not be scheduled sooner than responseLatency clock periods after the request
+        # :see: :class:`hwtHls.netlist.nodes.io.HlsNetNodeRead`
+        response._hlsRequestLatency = (request, memory.responseLatency)
+        response._hlsMemoryPort = self
+        setattr(u, nameFinder._findSuitableName(f"{bank.name:s}_port{index:d}_resp"), response)
+        self.response = response
+
+    def allocate(self, mem: RtlSignal):
+        """
+        Instantiate the RTL of the port.
+        The port accepts a new request if there is no response or if the response is being moved to the response buffer.
+        The data is read to the register (which makes the memory inferable as BRAM), optionally
+        passes trough additional registers if readLatency > 1 and then trough the response buffer.
+        The response buffer is required because the request and the response of the previous request
+        may be in the same pipeline stage and the ready of the request would depend on the ready of the response
+        (combinational loop).
+        """
+        bank = self.bank
+        memory = bank.memory
+        u = memory.hls.parentUnit
+        name = f"hls_{bank.name:s}_port{self.index:d}"
+        ADDR_WIDTH = bank.ADDR_WIDTH
+        DATA_WIDTH = memory.dtype.bit_length()
+        req = self.request
+        addr = req.data[ADDR_WIDTH:]
+        din = req.data[ADDR_WIDTH + DATA_WIDTH:ADDR_WIDTH]
+        we = req.data[ADDR_WIDTH + DATA_WIDTH]
+        re = req.data[ADDR_WIDTH + DATA_WIDTH + 1]
+
+        dout = HsStructIntf()
+        dout.T = memory.dtype
+        dout = Interface_without_registration(u, dout, f"{name:s}_dout")
+        dout_data = u._sig(f"{name:s}_dout_data", memory.dtype)
+        dout_vld = u._reg(f"{name:s}_dout_vld", def_val=0)
+        rd = ~dout_vld | dout.rd
+        req.rd(rd)
+        If(u.clk._onRisingEdge(),
+            If(req.vld & rd,
+               If(we,
+                  mem[addr](din),
+               ),
+               dout_data(mem[addr]),
+            )
+        )
+        If(rd,
+           # write does not have a response
+           dout_vld(req.vld & re)
+        )
+        dout.data(dout_data)
+        dout.vld(dout_vld)
+
+        b = HsBuilder(u, dout, f"{name:s}_resp")
+        for _ in range(memory.readLatency - 1):
+            b.buff(1, latency=1)
+        # :note: latency is 1-2 to break ready chain
+        b.buff(2, latency=(1, 2))
+        self.response(b.end)
+
+
+class HlsStreamProcMemoryRead(HlsStreamProcRead):
+    """
+    A read from :class:`~.HlsStreamProcMemory`, it is a read of the response of the memory port
+    which has the write of the request attached. The request is written right before the read
+    is used for the first time (:see: :meth:`hwtHls.ssa.translation.fromAst.astToSsa.AstToSsa.visit_expr`).
+
+    :ivar _request: the write of the address to the request interface of the port
+    """
+
+    def __init__(self, parent: "HlsStreamProc", port: HlsStreamProcMemoryPort, request: HlsStreamProcWrite):
+        HlsStreamProcRead.__init__(self, parent, port.response, port.bank.memory.dtype)
+        self._request = request
+
+
+class HlsStreamProcMemoryBank():
+    """
+    A single physical memory of :class:`~.HlsStreamProcMemory`, each bank has its own ports.
+
+    :ivar _ports: ports which were used by some access
+    """
+
+    def __init__(self, memory: "HlsStreamProcMemory", name: str, items: int, initValues: Optional[Sequence[int]]):
+        self.memory = memory
+        self.name = name
+        self.items = items
+        self.ADDR_WIDTH = log2ceil(items)
+        self.initValues = initValues
+        self._ports: List[HlsStreamProcMemoryPort] = []
+        self._accessCnt = 0
+        self._mem: Optional[RtlSignal] = None
+
+    def _getPortByIndex(self, i: int) -> HlsStreamProcMemoryPort:
+        """
+        Get a port of this bank, the ports are created lazily so there are no unused ports.
+        """
+        i %= self.memory.ports
+        while len(self._ports) <= i:
+            self._ports.append(HlsStreamProcMemoryPort(self, len(self._ports)))
+        return self._ports[i]
+
+    def _getPort(self) -> HlsStreamProcMemoryPort:
+        """
+        Get a port for a next access (round-robin).
+        """
+        p = self._getPortByIndex(self._accessCnt)
+        self._accessCnt += 1
+        return p
+
+    def hasWrite(self) -> bool:
+        return any(p.hasWrite for p in self._ports)
+
+    def isUsed(self) -> bool:
+        return any(p.requestCnt for p in self._ports)
+
+    def _request(self, port: HlsStreamProcMemoryPort, offset: Union[int, RtlSignal, HValue],
+                 value: Union[RtlSignal, HValue, None], we: Union[RtlSignal, HValue, None]=None) -> HlsStreamProcWrite:
+        memory = self.memory
+        addrT = Bits(self.ADDR_WIDTH)
+        if isinstance(offset, int):
+            offset = addrT.from_py(offset)
+        else:
+            offset = fitTo_t(offset, addrT)
+
+        if value is None:
+            re = BIT.from_py(1)
+            we = BIT.from_py(0)
+            value = memory.dtype.from_py(0)
+        else:
+            re = BIT.from_py(0)
+            if we is None:
+                we = BIT.from_py(1)
+            port.hasWrite = True
+
+        port.requestCnt += 1
+        return HlsStreamProcWrite(memory.hls, Concat(re, we, value, offset), port.request)
+
+    def allocate(self):
+        """
+        Instantiate the memory and RTL of the ports.
+        """
+        assert self._mem is None, ("Memory already allocated", self)
+        u = self.memory.hls.parentUnit
+        self._mem = mem = u._sig(f"hls_{self.name:s}", self.memory.dtype[self.items], def_val=self.initValues)
+        for p in self._ports:
+            if p.requestCnt:
+                p.allocate(mem)
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} {self.name:s} {self.items:d}x{self.memory.dtype.bit_length():d}b>"
+
+
+class HlsStreamProcMemory():
+    """
+    An array stored in memory (BRAM/LUTRAM, depends on the size and on the synthesis tool)
+    instead of the registers. The memory has explicit ports with a read latency.
+    Each port can perform a single access in a clock period, this is resolved
+    by the scheduler because each port has its own IO interfaces (:see: :class:`hwtHls.netlist.nodes.io.HlsNetNodeRead`).
+    The accesses are assigned to ports in round-robin order as they are created in the code,
+    so the accesses from a single iteration can use all ports in parallel. The copies of the accesses
+    in unrolled loop are also moved to a next port (:see: :class:`hwtHls.ssa.transformation.loopUnroll.SsaPassLoopUnroll`).
+
+    The memory can be partitioned to several banks (:see: :class:`~.ARRAY_PARTITION`), each bank has its own ports.
+    If the index is a constant (including the Python int in the Python frontend) only the bank with the item is accessed,
+    so the accesses to a different banks can happen in parallel. If the index is not a constant all banks are accessed
+    and the result is selected from the responses of all banks, this requires the number of items in bank (for BLOCK)
+    or the number of banks (for CYCLIC) to be a power of 2. In the copies of the body of unrolled loop the bank
+    is resolved statically if the index is the induction variable with the known value of the bits which select
+    the bank (e.g. i, i + 1, ... for CYCLIC partitioning with factor equal to the unroll factor).
+
+    .. code-block:: Python
+
+        mem = hls.memory(Bits(8), 256, "mem", ports=2, initValues=[...])
+        hls.thread(hls.While(True,
+            hls.write(mem[hls.read(self.addr)], self.dataOut),
+            mem.write(hls.read(self.addr2), hls.read(self.dataIn)),
+        ))
+
+    :note: The memory has a read first behavior. The request which follows a request which may write
+        to the same bank on an other port is scheduled to a later clock period (RAW, WAW), the request on the same port
+        is always in a different clock period. The requests to a bank with a write are not reordered between
+        the iterations of the loop because all such requests which are not in a single clock period are placed
+        to a single FSM (:see: :class:`hwtHls.netlist.analysis.fsm.HlsNetlistAnalysisPassDiscoverFsm`), the next iteration
+        can not start its first access before the previous iteration performs its last access.
+
+    :ivar name: the name used for the interfaces and for the memory signal
+    :ivar dtype: type of the item
+    :ivar items: number of items in the memory
+    :ivar ports: the maximum number of ports of each bank of the memory
+    :ivar readLatency: the number of clock periods between the read request and the data on memory output
+    :ivar responseLatency: the number of clock periods between the write of the read request and the read of the data
+        in the thread (readLatency + 1 for the response buffer)
+    :ivar initValues: optional initial values of the memory
+    :ivar partition: an optional partitioning of the memory to banks
+    :ivar partitionFactor: the number of banks for CYCLIC and BLOCK partitioning
+    :ivar banks: the physical memories of this memory
+    """
+
+    def __init__(self, hls: "HlsStreamProc", name: str, dtype: Bits, items: int, ports: int=1,
+                 readLatency: int=1, initValues: Optional[Sequence[int]]=None,
+                 partition: Optional[ARRAY_PARTITION]=None, partitionFactor: Optional[int]=None):
+        if not isinstance(dtype, Bits):
+            raise NotImplementedError("Only bit vector items are supported", dtype)
+        if items < 1:
+            raise ValueError("Memory must have at least 1 item", items)
+        if ports < 1:
+            raise ValueError("Memory must have at least 1 port", ports)
+        if readLatency < 1:
+            raise ValueError("Read latency must be at least 1", readLatency)
+        if initValues is not None and len(initValues) != items:
+            raise ValueError("Number of initial values must be equal to the number of items", len(initValues), items)
+
+        if partition is None or partition == ARRAY_PARTITION.COMPLETE:
+            if partitionFactor is not None:
+                raise ValueError("Partition factor can be specified only for CYCLIC or BLOCK partitioning", partition, partitionFactor)
+            partitionFactor = 1 if partition is None else items
+        elif partition in (ARRAY_PARTITION.CYCLIC, ARRAY_PARTITION.BLOCK):
+            if partitionFactor is None or partitionFactor < 1 or partitionFactor > items:
+                raise ValueError("Partition factor must be in range <1, items>", partition, partitionFactor, items)
+        else:
+            raise ValueError("Unknown partitioning", partition)
+
+        self.hls = hls
+        self.name = name
+        self.dtype = dtype
+        self.items = items
+        self.ADDR_WIDTH = log2ceil(items)
+        self.ports = ports
+        self.readLatency = readLatency
+        self.responseLatency = readLatency + 1
+        self.initValues = initValues
+        self.partition = partition
+        self.partitionFactor = partitionFactor
+        self._blockSize = ceil(items / partitionFactor)
+
+        itemsOfBank: List[List[int]] = []
+        for i in range(items):
+            bankI, offset = self._resolveBank(i)
+            if bankI == len(itemsOfBank):
+                itemsOfBank.append([])
+            assert offset == len(itemsOfBank[bankI]), (self, i, bankI, offset)
+            itemsOfBank[bankI].append(i)
+
+        # :note: BLOCK partitioning may have less banks than partitionFactor if partitionFactor does not divide items
+        self.banks: List[HlsStreamProcMemoryBank] = [
+            HlsStreamProcMemoryBank(
+                self,
+                name if len(itemsOfBank) == 1 else f"{name:s}_b{bankI:d}",
+                len(itemIndexes),
+                None if initValues is None else [initValues[i] for i in itemIndexes])
+            for bankI, itemIndexes in enumerate(itemsOfBank)
+        ]
+
+    def _resolveBank(self, index: int) -> Tuple[int, int]:
+        """
+        :return: tuple (bank index, offset in bank) for a constant index
+        """
+        if self.partition == ARRAY_PARTITION.BLOCK:
+            return index // self._blockSize, index % self._blockSize
+        else:
+            # CYCLIC, COMPLETE or no partitioning (factor=1)
+            return index % self.partitionFactor, index // self.partitionFactor
+
+    def _resolveBankDynamic(self, index: RtlSignal) -> Tuple[RtlSignal, Union[RtlSignal, HValue]]:
+        """
+        :return: tuple (bank index, offset in bank) for an index which is not a constant
+        """
+        index = fitTo_t(index, Bits(self.ADDR_WIDTH))
+        if self.partition == ARRAY_PARTITION.COMPLETE or\
+                (self.partition == ARRAY_PARTITION.BLOCK and self._blockSize == 1):
+            # each item in own bank
+            # :note: log2ceil(1) == 1, this case can not be resolved by slicing
+            return index, 0
+        elif self.partitionFactor == 1:
+            # all items in a single bank
+            return Bits(1).from_py(0), index
+        elif self.partition == ARRAY_PARTITION.CYCLIC:
+            if not isPow2(self.partitionFactor):
+                raise NotImplementedError("Access with a non constant index to CYCLIC partitioned memory"
+                                          " requires the number of banks to be a power of 2", self, self.partitionFactor)
+            bankW = log2ceil(self.partitionFactor)
+            offset = index[:bankW] if self.ADDR_WIDTH > bankW else 0
+            return index[bankW:], offset
+        else:
+            assert self.partition == ARRAY_PARTITION.BLOCK, self.partition
+            if not isPow2(self._blockSize):
+                raise NotImplementedError("Access with a non constant index to BLOCK partitioned memory"
+                                          " requires the size of the bank to be a power of 2", self, self._blockSize)
+            offsetW = log2ceil(self._blockSize)
+            if offsetW >= self.ADDR_WIDTH:
+                # the whole index is the offset, all items are in the first bank
+                return Bits(1).from_py(0), index
+            return index[:offsetW], index[offsetW:]
+
+    def _normalizeIndex(self, index: Union[int, RtlSignal, HlsStreamProcRead, HValue]) -> Union[int, RtlSignal]:
+        if isinstance(index, HValue):
+            index = int(index)
+        elif isinstance(index, HlsStreamProcRead):
+            index = index._sig
+
+        if isinstance(index, int):
+            if index < 0 or index >= self.items:
+                raise IndexError("Index out of range", self, index)
+        return index
+
+    def _normalizeValue(self, value: Union[int, RtlSignal, HlsStreamProcRead, HValue]) -> Union[RtlSignal, HValue]:
+        if isinstance(value, int):
+            return self.dtype.from_py(value)
+        elif isinstance(value, HlsStreamProcRead):
+            return value._sig
+        return value
+
+    def read(self, index: Union[int, RtlSignal, HlsStreamProcRead]) -> Union[HlsStreamProcMemoryRead, RtlSignal]:
+        """
+        Create a read from the memory (same as mem[index]).
+        """
+        index = self._normalizeIndex(index)
+        if isinstance(index, int) or len(self.banks) == 1:
+            if isinstance(index, int):
+                bankI, offset = self._resolveBank(index)
+            else:
+                bankI, offset = 0, index
+            bank = self.banks[bankI]
+            port = bank._getPort()
+            return HlsStreamProcMemoryRead(self.hls, port, bank._request(port, offset, None))
+
+        # read from all banks and select the result
+        bankIndex, offset = self._resolveBankDynamic(index)
+        res = None
+        for bankI, bank in reversed(tuple(enumerate(self.banks))):
+            port = bank._getPort()
+            r = HlsStreamProcMemoryRead(self.hls, port, bank._request(port, offset, None))
+            if res is None:
+                res = r._sig
+            else:
+                res = bankIndex._eq(bankI)._ternary(r._sig, res)
+        return res
+
+    def __getitem__(self, index: Union[int, RtlSignal, HlsStreamProcRead]) -> Union[HlsStreamProcMemoryRead, RtlSignal]:
+        return self.read(index)
+
+    def write(self, index: Union[int, RtlSignal, HlsStreamProcRead],
+              value: Union[int, RtlSignal, HlsStreamProcRead]) -> Union[HlsStreamProcWrite, List[HlsStreamProcWrite]]:
+        """
+        Create a write statement to the memory.
+        (If the index is not a constant and the memory is partitioned the result is a list of writes to all banks.)
+        """
+        index = self._normalizeIndex(index)
+        value = self._normalizeValue(value)
+        if isinstance(index, int) or len(self.banks) == 1:
+            if isinstance(index, int):
+                bankI, offset = self._resolveBank(index)
+            else:
+                bankI, offset = 0, index
+            bank = self.banks[bankI]
+            return bank._request(bank._getPort(), offset, value)
+
+        bankIndex, offset = self._resolveBankDynamic(index)
+        return [
+            bank._request(bank._getPort(), offset, value, we=bankIndex._eq(bankI))
+            for bankI, bank in enumerate(self.banks)
+        ]
+
+    def allocate(self):
+        """
+        Instantiate the memory banks and RTL of the ports.
+        """
+        if not any(b.isUsed() for b in self.banks):
+            raise AssertionError("Memory is not accessed by any thread", self)
+        for b in self.banks:
+            # the bank is not used if all accesses have a constant index which is not in this bank
+            # or if the accesses were resolved to a different bank in the copies of unrolled loop body
+            if b.isUsed():
+                b.allocate()
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} {self.name:s} {self.items:d}x{self.dtype.bit_length():d}b>"
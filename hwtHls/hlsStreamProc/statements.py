@@ -1,5 +1,5 @@
 from io import StringIO
-from typing import Union, List
+from typing import Union, List, Optional
 
 from hdlConvertorAst.translate.common.name_scope import NameScope
 from hwt.doc_markers import internal
@@ -11,6 +11,16 @@ from hwt.hdl.value import HValue
 from hwt.synthesizer.rtlLevel.rtlSignal import RtlSignal
 
 
+def _checkInitiationInterval(maxII: Optional[int]):
+    if maxII is not None and maxII < 1:
+        raise ValueError("Maximum initiation interval must be at least 1", maxII)
+
+
+def _checkUnrollFactor(unroll: Optional[int]):
+    if unroll is not None and unroll < 1:
+        raise ValueError("Unroll factor must be at least 1", unroll)
+
+
 class HlsStreamProcStm(HdlStatement):
 
     def __init__(self, parent: "HlsStreamProc"):
@@ -95,19 +105,29 @@ class  HlsStreamProcSwitch(HlsStreamProcStm, SwitchContainer):
 class HlsStreamProcFor(HlsStreamProcStm):
     """
     The for loop statement.
+
+    :ivar maxII: an optional upper bound of the initiation interval (number of clock periods between the starts
+        of two consecutive iterations) checked for this loop
+    :ivar unroll: an optional factor of partial unrolling of this loop (the body is duplicated unroll times)
     """
 
     def __init__(self, parent: "HlsStreamProc",
                  init: List[HdlStatement],
                  cond: Union[RtlSignal, HValue],
                  step: List[HdlStatement],
-                 body: List[HdlStatement]):
+                 body: List[HdlStatement],
+                 maxII: Optional[int]=None,
+                 unroll: Optional[int]=None):
         super(HlsStreamProcFor, self).__init__(parent)
         assert isinstance(cond, (RtlSignal, HValue)), cond
+        _checkInitiationInterval(maxII)
+        _checkUnrollFactor(unroll)
         self.init = init
         self.cond = cond
         self.step = step
         self.body = body
+        self.maxII = maxII
+        self.unroll = unroll
 
     def __repr__(self):
         return f"<{self.__class__.__name__}({self.init}; {self.cond}; {self.step}): {self.body}>"
@@ -116,15 +136,25 @@ class HlsStreamProcFor(HlsStreamProcStm):
 class HlsStreamProcWhile(HlsStreamProcStm):
     """
     The while loop statement.
+
+    :ivar maxII: an optional upper bound of the initiation interval (number of clock periods between the starts
+        of two consecutive iterations) checked for this loop
+    :ivar unroll: an optional factor of partial unrolling of this loop (the body is duplicated unroll times)
     """
 
     def __init__(self, parent: "HlsStreamProc",
                  cond: Union[RtlSignal, HValue],
-                 body: List[HdlStatement]):
+                 body: List[HdlStatement],
+                 maxII: Optional[int]=None,
+                 unroll: Optional[int]=None):
         super(HlsStreamProcWhile, self).__init__(parent)
         assert isinstance(cond, (RtlSignal, HValue)), cond
+        _checkInitiationInterval(maxII)
+        _checkUnrollFactor(unroll)
         self.cond = cond
         self.body = body
+        self.maxII = maxII
+        self.unroll = unroll
 
     def __repr__(self):
         return f"<{self.__class__.__name__}({self.cond}): {self.body}>"
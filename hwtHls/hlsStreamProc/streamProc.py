@@ -2,9 +2,13 @@
 # -*- coding: utf-8 -*-
 
 from collections import deque
-from typing import Union, List, Optional, Tuple
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from multiprocessing import get_context, get_all_start_methods
+from typing import Union, List, Optional, Tuple, Sequence, Dict
 
 from hwt.hdl.statements.assignmentContainer import HdlAssignmentContainer
+from hwt.hdl.types.bits import Bits
 from hwt.hdl.types.defs import BOOL, BIT
 from hwt.hdl.types.hdlType import HdlType
 from hwt.hdl.types.typeCast import toHVal
@@ -19,6 +23,9 @@ from hwt.synthesizer.rtlLevel.constants import NOT_SPECIFIED
 from hwt.synthesizer.rtlLevel.netlist import RtlNetlist
 from hwt.synthesizer.rtlLevel.rtlSignal import RtlSignal
 from hwt.synthesizer.unit import Unit
+from hwtHls.hlsStreamProc.channel import HlsStreamProcChannel
+from hwtHls.hlsStreamProc.compileProfiler import HlsCompileProfiler
+from hwtHls.hlsStreamProc.memory import HlsStreamProcMemory, ARRAY_PARTITION
 from hwtHls.hlsStreamProc.statements import HlsStreamProcWhile, HlsStreamProcCodeBlock, \
     HlsStreamProcIf, HlsStreamProcStm, HlsStreamProcFor, HlsStreamProcBreak, \
     HlsStreamProcContinue, HlsStreamProcSwitch
@@ -26,6 +33,9 @@ from hwtHls.hlsStreamProc.statementsIo import HlsStreamProcRead, \
     HlsStreamProcWrite, IN_STREAM_POS, HlsStreamProcReadAxiStream
 from hwtHls.netlist.transformation.hlsNetlistPass import HlsNetlistPass
 from hwtHls.netlist.transformation.rtlNetlistPass import RtlNetlistPass
+from hwtHls.scheduler.retiming import HlsScheduleRetimingStats
+from hwtHls.scheduler.scheduleCache import HlsScheduleCache, NetlistSchedule, \
+    copyNetlistSchedule, applyNetlistSchedule, collectNetlistNodes
 from hwtHls.ssa.context import SsaContext
 from hwtHls.ssa.transformation.ssaPass import SsaPass
 from hwtHls.ssa.translation.fromAst.astToSsa import AstToSsa, AnyStm
@@ -87,11 +97,21 @@ class HlsStreamProc():
                  ssa_passes:Optional[List[SsaPass]]=None,
                  hlsnetlist_passes:Optional[List[HlsNetlistPass]]=None,
                  rtlnetlist_passes:Optional[List[RtlNetlistPass]]=None,
-                 freq: Optional[Union[int, float]]=None):
+                 freq: Optional[Union[int, float]]=None,
+                 compileCache: Optional[HlsScheduleCache]=NOT_SPECIFIED,
+                 parallelSchedulingJobs: int=1,
+                 compileProfiler: Optional[HlsCompileProfiler]=NOT_SPECIFIED):
         """
-        :note: ssa_passes, hlsnetlist_passes, rtlnetlist_passes parameters are meant as an override to specification from target platform
+        :note: ssa_passes, hlsnetlist_passes, rtlnetlist_passes, compileCache, compileProfiler parameters are meant as an override to specification from target platform
         :param freq: override of the clock frequency, if None the frequency of clock associated with parent is used
+        :param compileCache: an optional persistent cache of scheduling results, None to disable
+        :param parallelSchedulingJobs: the maximum number of processes used for the scheduling of independent threads,
+            the translation of threads to the netlist is always sequential
+            (:see: :meth:`~._scheduleThreadsInParallel`, if the platform does not support fork the threads are scheduled sequentially)
+        :param compileProfiler: an optional object which collects the statistics about the compilation, None to disable
         """
+        if parallelSchedulingJobs < 1:
+            raise ValueError("parallelSchedulingJobs must be at least 1", parallelSchedulingJobs)
         self.parentUnit = parentUnit
         if freq is None:
             freq = parentUnit.clk.FREQ
@@ -108,7 +128,16 @@ class HlsStreamProc():
         if rtlnetlist_passes is None:
             rtlnetlist_passes = p.rtlnetlist_passes
         self.rtlnetlist_passes = rtlnetlist_passes
+        if compileCache is NOT_SPECIFIED:
+            compileCache = p.compileCache
+        self.compileCache = compileCache
+        self.parallelSchedulingJobs = parallelSchedulingJobs
+        if compileProfiler is NOT_SPECIFIED:
+            compileProfiler = p.compileProfiler
+        self.compileProfiler = compileProfiler
         self._threads: List[HlsStreamProcThread] = []
+        self._channels: List[HlsStreamProcChannel] = []
+        self._memories: List[HlsStreamProcMemory] = []
 
     def _sig(self, name: str,
              dtype: HdlType=BIT,
@@ -132,7 +161,9 @@ class HlsStreamProc():
         """
         Create a read statement in thread.
         """
-        
+        if isinstance(src, HlsStreamProcChannel):
+            src = src.consumerIntf
+
         if isinstance(src, AxiStream):
             return HlsStreamProcReadAxiStream(self, src, type_or_size, inStreamPos)
 
@@ -180,19 +211,68 @@ class HlsStreamProc():
         """
         Create a write statement in thread.
         """
+        if isinstance(dst, HlsStreamProcChannel):
+            dst = dst.producerIntf
         return HlsStreamProcWrite(self, src, dst)
 
-    def While(self, cond: Union[RtlSignal, bool], *body: AnyStm):
+    def channel(self, dtype: HdlType, name: str="ch", depth: Optional[int]=None) -> HlsStreamProcChannel:
+        """
+        Create a FIFO channel for the communication between the threads (dataflow).
+        One thread writes to the channel using :meth:`~.write`, the other reads from it using :meth:`~.read`.
+
+        :param depth: an optional depth of the FIFO, if not specified the depth is resolved from the schedule
+            of the producer and consumer thread (:see: :class:`hwtHls.hlsStreamProc.channel.HlsStreamProcChannel`)
+        """
+        ch = HlsStreamProcChannel(self, dtype, name, depth=depth)
+        self._channels.append(ch)
+        return ch
+
+    def memory(self, dtype: Bits, items: int, name: str="mem", ports: int=1, readLatency: int=1,
+               initValues: Optional[Sequence[int]]=None,
+               partition: Optional[ARRAY_PARTITION]=None, partitionFactor: Optional[int]=None) -> HlsStreamProcMemory:
+        """
+        Create an array stored in memory (BRAM/LUTRAM) which can be accessed from threads
+        using mem[index] (read) and :meth:`hwtHls.hlsStreamProc.memory.HlsStreamProcMemory.write`.
+
+        :param ports: the maximum number of accesses to each bank of the memory in a single clock period
+        :param readLatency: the number of clock periods between the read request and the data
+        :param initValues: an optional initial content of the memory
+        :param partition: an optional partitioning of the memory to banks which can be accessed in parallel
+        :param partitionFactor: the number of banks for CYCLIC and BLOCK partitioning
+        """
+        mem = HlsStreamProcMemory(self, name, dtype, items, ports=ports, readLatency=readLatency, initValues=initValues,
+                                  partition=partition, partitionFactor=partitionFactor)
+        self._memories.append(mem)
+        return mem
+
+    def While(self, cond: Union[RtlSignal, bool], *body: AnyStm, maxII: Optional[int]=None, unroll: Optional[int]=None):
         """
         Create a while statement in thread.
+
+        :param maxII: an optional upper bound of the initiation interval of this loop, the scheduler raises
+            :class:`hwtHls.scheduler.errors.TimeConstraintError` with a description of the loop-carried dependency
+            which requires a longer initiation interval
+            (:note: this is only a check and report, the loop is not pipelined, the iterations do not overlap
+            and the loop is not rescheduled to achieve the initiation interval)
+        :param unroll: an optional factor of partial unrolling, the body of the loop is duplicated unroll times
+            by :class:`hwtHls.ssa.transformation.loopUnroll.SsaPassLoopUnroll` so the hardware executes unroll iterations
+            at once (the maxII then applies to this group of iterations)
         """
-        return HlsStreamProcWhile(self, toHVal(cond, BOOL), list(body))
+        return HlsStreamProcWhile(self, toHVal(cond, BOOL), list(body), maxII=maxII, unroll=unroll)
 
     def For(self,
             init: Union[AnyStm, Tuple[AnyStm, ...]],
             cond: Union[Tuple, RtlSignal],
             step: Union[AnyStm, Tuple[AnyStm, ...]],
-            *body: AnyStm):
+            *body: AnyStm,
+            maxII: Optional[int]=None,
+            unroll: Optional[int]=None):
+        """
+        Create a for statement in thread.
+
+        :param maxII: an optional upper bound of the initiation interval of this loop (:see: :meth:`~.While`)
+        :param unroll: an optional factor of partial unrolling (:see: :meth:`~.While`)
+        """
         if not isinstance(init, (tuple, list, deque)):
             assert isinstance(init, (HdlAssignmentContainer, HlsStreamProcStm)), init
             init = [init, ]
@@ -201,7 +281,7 @@ class HlsStreamProc():
             assert isinstance(step, (HdlAssignmentContainer, HlsStreamProcStm)), step
             step = [step, ]
 
-        return HlsStreamProcFor(self, init, cond, step, list(body))
+        return HlsStreamProcFor(self, init, cond, step, list(body), maxII=maxII, unroll=unroll)
 
     def Break(self):
         return HlsStreamProcBreak(self)
@@ -227,32 +307,147 @@ class HlsStreamProc():
         self._threads.append(t)
         return t
     
-    def compile(self):
-        for t in self._threads:
-            t: HlsStreamProcThread
-            # we have to wait with compilation until here
-            # because we need all IO and sharing constraints specified
+    def _profile(self, name: str, category: str, threadIndex: Optional[int], target=None):
+        """
+        :return: a context manager which measures the enclosed step of compilation if profiling is enabled
+        """
+        if self.compileProfiler is None:
+            return nullcontext()
+        return self.compileProfiler.scope(name, category, threadIndex, target)
+
+    def _compileThreadToHlsNetlist(self, threadIndex: int, t: HlsStreamProcThread):
+        # we have to wait with compilation until here
+        # because we need all IO and sharing constraints specified
+        with self._profile("compileToSsa", "ssa", threadIndex) as rec:
             t.compileToSsa()
-            to_ssa = t.toSsa
-            code = t.code
-            for ssa_pass in self.ssa_passes:
+            if rec is not None:
+                # the target is not available before the step
+                rec.objectCounts = self.compileProfiler.countObjects(t.toSsa)
+        to_ssa = t.toSsa
+        code = t.code
+        for ssa_pass in self.ssa_passes:
+            with self._profile(ssa_pass.__class__.__name__, "ssa", threadIndex, to_ssa):
                 ssa_pass.apply(self, to_ssa)
-    
-            t.toHw = to_hw = SsaSegmentToHwPipeline(to_ssa.start, code)
+
+        t.toHw = to_hw = SsaSegmentToHwPipeline(to_ssa.start, code)
+        with self._profile("extract_pipeline", "ssa", threadIndex):
             to_hw.extract_pipeline()
-    
+
+        with self._profile("extract_hlsnetlist", "hlsnetlist", threadIndex, to_hw):
             to_hw.extract_hlsnetlist(self.parentUnit, self.freq)
-            for hlsnetlist_pass in self.hlsnetlist_passes:
+        for hlsnetlist_pass in self.hlsnetlist_passes:
+            with self._profile(hlsnetlist_pass.__class__.__name__, "hlsnetlist", threadIndex, to_hw):
                 hlsnetlist_pass.apply(self, to_hw)
-    
-            if not to_hw.is_scheduled:
+
+    def _scheduleThread(self, threadIndex: int, t: HlsStreamProcThread):
+        to_hw = t.toHw
+        with self._profile("schedule", "scheduler", threadIndex, to_hw):
+            if self.compileCache is None:
+                to_hw.schedulerRun()
+            else:
+                to_hw.schedulerRunCached(self.compileCache, (*self.ssa_passes, *self.hlsnetlist_passes))
+
+    def _scheduleThreadsInParallel(self, threads: List[HlsStreamProcThread]):
+        """
+        Schedule threads in forked processes and apply the resulting schedules in this process.
+
+        :note: Only the scheduling (including the retiming) runs in parallel. The SSA, LLVM and netlist passes
+            run sequentially in this process because their results reference the objects of the parent unit
+            (RTL signals, interfaces) which can not be transfered back from the child process.
+            The child process returns the schedule of the nodes, the state of the scheduler
+            (:meth:`hwtHls.scheduler.scheduler.HlsScheduler.copyState`) and the statistics of the retiming
+            (:attr:`hwtHls.hlsPipeline.HlsPipeline.retimingStats`) which are applied on the netlist in this process.
+        """
+        cache = self.compileCache
+        cacheKeys = {}
+        toSchedule = []
+        for t in threads:
+            if cache is not None:
+                key = cache.getKey(t.toHw.hls, (*self.ssa_passes, *self.hlsnetlist_passes))
+                if cache.load(key, t.toHw.hls):
+                    t.toHw.is_scheduled = True
+                    continue
+                cacheKeys[t] = key
+            toSchedule.append(t)
+
+        if not toSchedule:
+            return
+
+        # the netlists are inherited by the forked processes (the arguments of initializer are not pickled),
+        # the tasks then reference the threads only by index
+        with ProcessPoolExecutor(max_workers=min(self.parallelSchedulingJobs, len(toSchedule)),
+                                 mp_context=get_context("fork"),
+                                 initializer=_initForkedSchedulingWorker,
+                                 initargs=([t.toHw for t in toSchedule],)) as pool:
+            results = list(pool.map(_scheduleThreadInForkedProcess, range(len(toSchedule))))
+
+        for t, res in zip(toSchedule, results):
+            to_hw = t.toHw
+            hls = to_hw.hls
+            for n in hls.iterAllNodes():
+                # clean the side effects of the realization resolution
+                n.resetScheduling()
+            if res is None or not applyNetlistSchedule(hls, res[0]):
+                # scheduling failed in child process, repeat it to get the original exception
                 to_hw.schedulerRun()
+            else:
+                schedule, schedulerState, retimingStats = res
+                hls.scheduler.applyState(collectNetlistNodes(hls), schedulerState)
+                hls.retimingStats = retimingStats
+                to_hw.is_scheduled = True
+
+            if cache is not None:
+                cache.store(cacheKeys[t], hls)
+
+    def compile(self):
+        for threadIndex, t in enumerate(self._threads):
+            t: HlsStreamProcThread
+            self._compileThreadToHlsNetlist(threadIndex, t)
+
+        # some optimization could call scheduling and everything after could let
+        # the netlist without modifications
+        toSchedule = [t for t in self._threads if not t.toHw.is_scheduled]
+        if self.parallelSchedulingJobs > 1 and len(toSchedule) > 1 and "fork" in get_all_start_methods():
+            with self._profile("schedule", "scheduler", None):
+                self._scheduleThreadsInParallel(toSchedule)
+        else:
+            for t in toSchedule:
+                self._scheduleThread(self._threads.index(t), t)
+
+        for ch in self._channels:
+            # the size of FIFOs between threads is derived from the schedule of the threads
+            with self._profile("allocate_channel", "allocator", None):
+                ch.allocate()
 
-            # some optimization could call scheduling and everything after could let
-            # the netlist without modifications
-        
-        for t in self._threads:
-            t.toHw.construct_rtlnetlist()
+        for mem in self._memories:
+            with self._profile("allocate_memory", "allocator", None):
+                mem.allocate()
+
+        for threadIndex, t in enumerate(self._threads):
+            with self._profile("construct_rtlnetlist", "allocator", threadIndex, t.toHw):
+                t.toHw.construct_rtlnetlist()
             for rtlnetlist_pass in self.rtlnetlist_passes:
-                rtlnetlist_pass.apply(self, t.toHw)
-              
+                with self._profile(rtlnetlist_pass.__class__.__name__, "rtlnetlist", threadIndex, t.toHw):
+                    rtlnetlist_pass.apply(self, t.toHw)
+
+
+# the pipelines to schedule in the forked worker process, set by :func:`~._initForkedSchedulingWorker`
+# (only in the worker process)
+_workerPipelines: Optional[List[SsaSegmentToHwPipeline]] = None
+
+
+def _initForkedSchedulingWorker(pipelines: List[SsaSegmentToHwPipeline]):
+    global _workerPipelines
+    _workerPipelines = pipelines
+
+
+def _scheduleThreadInForkedProcess(threadIndex: int) -> Optional[Tuple[NetlistSchedule, Dict[str, object],
+                                                                       Optional[HlsScheduleRetimingStats]]]:
+    to_hw = _workerPipelines[threadIndex]
+    try:
+        to_hw.schedulerRun()
+    except Exception:
+        # the exception may reference objects which can not be transfered between processes
+        return None
+    hls = to_hw.hls
+    return copyNetlistSchedule(hls), hls.scheduler.copyState(collectNetlistNodes(hls)), hls.retimingStats
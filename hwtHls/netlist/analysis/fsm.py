@@ -1,4 +1,4 @@
-from typing import List, Set, Union, Dict, Tuple, Callable
+from typing import List, Set, Union, Dict, Tuple, Callable, Optional
 
 from hwt.pyUtils.uniqList import UniqList
 from hwt.synthesizer.interface import Interface
@@ -13,9 +13,16 @@ from hwtHls.netlist.nodes.ports import HlsNetNodeOut, HlsNetNodeIn
 
 
 class IoFsm():
+    """
+    :ivar intf: the interface which accesses are the reason for this FSM or None if the FSM is not related to any IO
+    :ivar name: the name used for the state register
+    """
 
-    def __init__(self, intf: Interface):
+    def __init__(self, intf: Optional[Interface], name: Optional[str]=None):
         self.intf = intf
+        if name is None:
+            name = intf._name
+        self.name = name
         self.states: List[List[HlsNetNode]] = []
         self.stateClkI: Dict[int, int] = {}
         self.transitionTable: Dict[int, Dict[int, Union[bool, RtlSignal]]] = {}
@@ -91,29 +98,50 @@ class HlsNetlistAnalysisPassDiscoverFsm(HlsNetlistAnalysisPass):
 
         return inFsm, inFsmNodeParts
 
+    @staticmethod
+    def _getFsmKey(intf: Interface) -> Union[Interface, "HlsStreamProcMemoryBank"]:
+        """
+        The requests to all ports of the memory bank which is written are in a single FSM, this ensures that
+        the accesses from different iterations of the loop are not reordered (the dependencies trough memory
+        between iterations, :see: :class:`hwtHls.hlsStreamProc.memory.HlsStreamProcMemory`).
+        """
+        port = getattr(intf, "_hlsMemoryPort", None)
+        if port is not None and intf is port.request and port.bank.hasWrite():
+            return port.bank
+        return intf
+
     def run(self):
-        io_aggregation = self.hls.requestAnalysis(HlsNetlistAnalysisPassDiscoverIo).io_by_interface
+        io_aggregation: Dict[Union[Interface, "HlsStreamProcMemoryBank"], List[Union[HlsNetNodeRead, HlsNetNodeWrite]]] = {}
+        # the interface which is used for the name of FSM
+        fsmIntf: Dict[Union[Interface, "HlsStreamProcMemoryBank"], Interface] = {}
+        for intf, accesses in self.hls.requestAnalysis(HlsNetlistAnalysisPassDiscoverIo).io_by_interface.items():
+            k = self._getFsmKey(intf)
+            if k is intf:
+                fsmIntf[k] = intf
+            else:
+                fsmIntf[k] = k._ports[0].request
+            io_aggregation.setdefault(k, []).extend(accesses)
         clkPeriod = self.hls.normalizedClkPeriod
 
         def floodPredicateExcludeOtherIoWithOwnFsm(n: HlsNetNode):
             if isinstance(n, HlsNetNodeRead):
                 n: HlsNetNodeRead
-                accesses = io_aggregation.get(n.src, None)
+                accesses = io_aggregation.get(self._getFsmKey(n.src), None)
                 if accesses and len(accesses) > 1:
                     return False
             elif isinstance(n, HlsNetNodeWrite):
                 n: HlsNetNodeWrite
-                accesses = io_aggregation.get(n.dst, None)
+                accesses = io_aggregation.get(self._getFsmKey(n.dst), None)
                 if accesses and len(accesses) > 1:
                     return False
             return True
 
         alreadyUsed: Set[HlsNetNode] = set()
-        for i, accesses in sorted(io_aggregation.items(), key=lambda x: getSignalName(x[0])):
+        for i, accesses in sorted(io_aggregation.items(), key=lambda x: getSignalName(fsmIntf[x[0]])):
             if len(accesses) > 1:
                 # all accesses which are not in same clock cycle must be mapped to individual FSM state
                 # every interface may spot a FSM
-                fsm = IoFsm(i)
+                fsm = IoFsm(fsmIntf[i])
                 seenClks: Dict[int, Set[HlsNetNode]] = {}
                 for a in sorted(accesses, key=lambda a: a.scheduledIn[0] if a.scheduledIn else a.scheduledOut[0]):
                     a: Union[HlsNetNodeRead, HlsNetNodeWrite]
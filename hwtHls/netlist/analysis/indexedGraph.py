@@ -0,0 +1,137 @@
+from array import array
+from collections import deque
+from typing import Dict, Iterable, List
+
+from hwtHls.netlist.nodes.node import HlsNetNode
+
+
+class HlsNetlistIndexedGraph():
+    """
+    Compact representation of the dependencies between netlist nodes.
+    Nodes are addressed by an index and the edges are stored in flat arrays (CSR format),
+    the algorithms working over this graph do not need to hash the nodes or ports.
+
+    :note: The dependencies on nodes which are not in the graph are ignored.
+    :note: There is an edge for each connected input, there may be multiple edges between a pair of nodes.
+
+    :ivar nodes: list of nodes, the index in this list is the index of the node in this graph
+    :ivar nodeIndex: dictionary mapping the node to its index
+    :ivar depOffsets: depIndexes[depOffsets[i]:depOffsets[i + 1]] are indexes of nodes driving inputs of node i
+    :ivar depIndexes: flat array of dependencies of all nodes
+    :ivar useOffsets: useIndexes[useOffsets[i]:useOffsets[i + 1]] are indexes of nodes using outputs of node i
+    :ivar useIndexes: flat array of uses of all nodes
+    """
+
+    def __init__(self, nodes: Iterable[HlsNetNode]):
+        self.nodes: List[HlsNetNode] = list(nodes)
+        nodeIndex = self.nodeIndex = {n: i for i, n in enumerate(self.nodes)}
+        depOffsets = array("l", [0])
+        depIndexes = array("l")
+        useCnt = array("l", (0 for _ in self.nodes))
+        for n in self.nodes:
+            for dep in n.dependsOn:
+                depI = nodeIndex.get(dep.obj, None)
+                if depI is not None:
+                    depIndexes.append(depI)
+                    useCnt[depI] += 1
+            depOffsets.append(len(depIndexes))
+
+        # reverse edges, counting sort of edges by its source
+        useOffsets = array("l", [0])
+        for c in useCnt:
+            useOffsets.append(useOffsets[-1] + c)
+        useIndexes = array("l", (0 for _ in depIndexes))
+        useFill = array("l", useOffsets[:-1])
+        for nI in range(len(self.nodes)):
+            for depI in depIndexes[depOffsets[nI]:depOffsets[nI + 1]]:
+                useIndexes[useFill[depI]] = nI
+                useFill[depI] += 1
+
+        self.depOffsets = depOffsets
+        self.depIndexes = depIndexes
+        self.useOffsets = useOffsets
+        self.useIndexes = useIndexes
+
+    def iterDependencies(self, nodeI: int) -> array:
+        return self.depIndexes[self.depOffsets[nodeI]:self.depOffsets[nodeI + 1]]
+
+    def iterUses(self, nodeI: int) -> array:
+        return self.useIndexes[self.useOffsets[nodeI]:self.useOffsets[nodeI + 1]]
+
+    def getUnresolvedDependencyCounts(self) -> array:
+        depOffsets = self.depOffsets
+        return array("l", (depOffsets[i + 1] - depOffsets[i] for i in range(len(self.nodes))))
+
+    def topologicalOrder(self) -> array:
+        """
+        Kahn's algorithm, resolve an order of nodes where every node is after all nodes it depends on.
+
+        :return: indexes of nodes in topological order
+        :note: The nodes on a cycle are never released, if any node remains at the end
+            an exception with the node ids of the cycle is raised.
+        """
+        unresolvedDepCnt = self.getUnresolvedDependencyCounts()
+        useOffsets = self.useOffsets
+        useIndexes = self.useIndexes
+        order = array("l", (i for i, c in enumerate(unresolvedDepCnt) if c == 0))
+        i = 0
+        while i < len(order):
+            nI = order[i]
+            i += 1
+            for sucI in useIndexes[useOffsets[nI]:useOffsets[nI + 1]]:
+                c = unresolvedDepCnt[sucI] - 1
+                unresolvedDepCnt[sucI] = c
+                if c == 0:
+                    order.append(sucI)
+
+        if len(order) != len(self.nodes):
+            raise AssertionError("Cycle in graph", self.findCycle(unresolvedDepCnt))
+
+        return order
+
+    def findCycle(self, unresolvedDepCnt: array) -> List[int]:
+        """
+        Find a cycle in nodes which were not released by topological sort.
+        Each such a node has at least one unreleased dependency, following them must lead to a cycle.
+
+        :return: ids of nodes in the cycle
+        """
+        nI = next(i for i, c in enumerate(unresolvedDepCnt) if c)
+        path: List[int] = []
+        pathIndex: Dict[int, int] = {}
+        while nI not in pathIndex:
+            pathIndex[nI] = len(path)
+            path.append(nI)
+            nI = next(depI for depI in self.iterDependencies(nI) if unresolvedDepCnt[depI])
+
+        return [self.nodes[i]._id for i in path[pathIndex[nI]:]]
+
+    def collectReachable(self, startIndexes: Iterable[int], forward: bool) -> bytearray:
+        """
+        Collect nodes reachable from start nodes using the uses (forward=True) or dependencies (forward=False).
+
+        :return: a mask with 1 for each reachable node (including start nodes)
+        """
+        if forward:
+            offsets = self.useOffsets
+            indexes = self.useIndexes
+        else:
+            offsets = self.depOffsets
+            indexes = self.depIndexes
+
+        reachable = bytearray(len(self.nodes))
+        toSearch = deque()
+        for i in startIndexes:
+            if not reachable[i]:
+                reachable[i] = 1
+                toSearch.append(i)
+
+        while toSearch:
+            nI = toSearch.popleft()
+            for otherI in indexes[offsets[nI]:offsets[nI + 1]]:
+                if not reachable[otherI]:
+                    reachable[otherI] = 1
+                    toSearch.append(otherI)
+
+        return reachable
+
@@ -53,6 +53,9 @@ class HlsNetNodeWriteBackwardEdge(HlsNetNodeWrite):
     :ivar allocateAsBuffer: A flag which specifies how this object should be allocated.
         If True this object allocates a buffer of length specified by time difference between read/write or register if the value is False.
     :ivar channel_init_values: Optional tuple for value intialization.
+    :ivar maxII: Optional upper bound of the initiation interval of the loop where this edge is a loop-carried dependency.
+        (The number of clock periods between the read of the value and the moment when the value for the next
+        iteration is written must be lower than this number, this is only checked by the scheduler.)
     """
 
     def __init__(self, parentHls:"HlsPipeline",
@@ -63,6 +66,7 @@ class HlsNetNodeWriteBackwardEdge(HlsNetNodeWrite):
         self.associated_read: Optional[HlsNetNodeReadBackwardEdge] = None
         self.channel_init_values = channel_init_values
         self.allocateAsBuffer = True
+        self.maxII: Optional[int] = None
 
     def associate_read(self, read: HlsNetNodeReadBackwardEdge):
         assert isinstance(read, HlsNetNodeReadBackwardEdge), read
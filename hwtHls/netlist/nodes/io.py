@@ -1,4 +1,5 @@
-from typing import Union, Optional, List
+from itertools import chain
+from typing import Union, Optional, List, Generator, Tuple
 
 from hwt.hdl.statements.statement import HdlStatement
 from hwt.hdl.types.defs import BIT
@@ -168,6 +169,9 @@ class HlsNetNodeRead(HlsNetNodeExplicitSync, InterfaceBase):
 
     :ivar _sig: RTL signal in HLS context used for HLS code description
     :ivar src: original interface from which read should be performed
+    :ivar requestLatency: an optional tuple (request interface, latency) if the data on src is a response
+        for a request written to the request interface, the read is scheduled at least latency clock periods
+        after the write of the request (e.g. memory read, :see: :class:`hwtHls.hlsStreamProc.memory.HlsStreamProcMemory`)
 
     :ivar dependsOn: list of dependencies for scheduling composed of extraConds and skipWhen
     """
@@ -177,6 +181,7 @@ class HlsNetNodeRead(HlsNetNodeExplicitSync, InterfaceBase):
         self.operator = "read"
         self.src = src
         self.maxIosPerClk = 1
+        self.requestLatency: Optional[Tuple[Interface, int]] = getattr(src, "_hlsRequestLatency", None)
 
         self._init_extraCond_skipWhen()
         self._add_output(self.getRtlDataSig()._dtype)  # slot for data consummer
@@ -251,13 +256,74 @@ class HlsNetNodeRead(HlsNetNodeExplicitSync, InterfaceBase):
         else:
             return ioCnt
 
+    def iterRequestWrites(self) -> Generator["HlsNetNodeWrite", None, None]:
+        """
+        Iterate writes of requests which are answered by this read, the search goes trough ordering dependencies
+        and stops at the previous read of the same response.
+        """
+        if self.requestLatency is None:
+            return
+        reqIntf = self.requestLatency[0]
+        seen = set()
+        toSearch = [self]
+        while toSearch:
+            n = toSearch.pop()
+            for orderingIn in n.iterOrderingInputs():
+                dep = n.dependsOn[orderingIn.in_i].obj
+                if dep in seen:
+                    continue
+                seen.add(dep)
+                if isinstance(dep, HlsNetNodeWrite) and dep.dst is reqIntf:
+                    yield dep
+                elif isinstance(dep, HlsNetNodeRead) and dep.src is self.src:
+                    # the requests before this read are answered by it
+                    continue
+                else:
+                    toSearch.append(dep)
+
+    def iterResponseReads(self) -> Generator["HlsNetNodeRead", None, None]:
+        """
+        Iterate reads of the responses for the requests written by this write (reverse of :meth:`~.iterRequestWrites`).
+        """
+        seen = set()
+        toSearch = [self]
+        while toSearch:
+            n = toSearch.pop()
+            for u in n.usedBy[n.getOrderingOutPort().out_i]:
+                u = u.obj
+                if u in seen:
+                    continue
+                seen.add(u)
+                if isinstance(u, HlsNetNodeRead) and u.requestLatency is not None and u.requestLatency[0] is self.dst:
+                    yield u
+                elif isinstance(u, HlsNetNodeWrite) and u.dst is self.dst:
+                    # the response for this request is read before the next request
+                    continue
+                else:
+                    toSearch.append(u)
+
     def scheduleAlapCompaction(self, asapSchedule: SchedulizationDict):
         HlsNetNodeExplicitSync.scheduleAlapCompaction(self, asapSchedule)
+        clkPeriod = self.hls.normalizedClkPeriod
+        if isinstance(self, HlsNetNodeWrite) and getattr(self.dst, "_hlsHasResponse", False):
+            # the request must stay at least requestLatency clock periods before the read of the response
+            # and before the requests to the same memory bank on other ports if this request may write
+            maxClkI = min(chain(
+                (start_clk(r.scheduledOut[0], clkPeriod) - r.requestLatency[1] for r in self.iterResponseReads()),
+                (start_clk(n.scheduledIn[0], clkPeriod) - 1 for n in self.iterNextMemoryRequests()),
+            ), default=None)
+            if maxClkI is not None:
+                startT = self.scheduledIn[0]
+                if start_clk(startT, clkPeriod) > maxClkI:
+                    ffdelay = self.hls.platform.get_ff_store_time(self.hls.realTimeClkPeriod, self.hls.scheduler.resolution)
+                    off = (maxClkI + 1) * clkPeriod - ffdelay - startT
+                    self.scheduledIn = tuple(t + off for t in self.scheduledIn)
+                    self.scheduledOut = tuple(t + off for t in self.scheduledOut)
+
         curIoCnt = self._getNumberOfIoInThisClkPeriod(self.src if isinstance(self, HlsNetNodeRead) else self.dst, False)
         if curIoCnt > self.maxIosPerClk:
             # move to next clock cycle if IO constraint requires it
             ffdelay = self.hls.platform.get_ff_store_time(self.hls.realTimeClkPeriod, self.hls.scheduler.resolution)
-            clkPeriod = self.hls.normalizedClkPeriod
             while curIoCnt > self.maxIosPerClk:
                 if self.scheduledIn:
                     startT = self.scheduledIn[0]
@@ -274,6 +340,29 @@ class HlsNetNodeRead(HlsNetNodeExplicitSync, InterfaceBase):
     def scheduleAsap(self, pathForDebug: Optional[UniqList["HlsNetNode"]]) -> List[float]:
         # schedule all dependencies
         HlsNetNode.scheduleAsap(self, pathForDebug)
+        if isinstance(self, HlsNetNodeRead) and self.requestLatency is not None:
+            # the response can not be read sooner than requestLatency clock periods after the request
+            clkPeriod = self.hls.normalizedClkPeriod
+            startT = self.scheduledIn[0] if self.scheduledIn else self.scheduledOut[0]
+            minClkI = max((start_clk(w.scheduledIn[0], clkPeriod) + self.requestLatency[1]
+                           for w in self.iterRequestWrites()), default=0)
+            if start_clk(startT, clkPeriod) < minClkI:
+                off = minClkI * clkPeriod - startT
+                self.scheduledIn = tuple(t + off for t in self.scheduledIn)
+                self.scheduledOut = tuple(t + off for t in self.scheduledOut)
+
+        elif isinstance(self, HlsNetNodeWrite) and getattr(self.dst, "_hlsMemoryPort", None) is not None:
+            # the memory has a read first behavior, the request must be in a later clock period than the previous
+            # request which may write to the same memory bank on other port
+            clkPeriod = self.hls.normalizedClkPeriod
+            startT = self.scheduledIn[0]
+            minClkI = max((start_clk(w.scheduledIn[0], clkPeriod) + 1
+                           for w in self.iterPrevMemoryWriteRequests()), default=0)
+            if start_clk(startT, clkPeriod) < minClkI:
+                off = minClkI * clkPeriod - startT
+                self.scheduledIn = tuple(t + off for t in self.scheduledIn)
+                self.scheduledOut = tuple(t + off for t in self.scheduledOut)
+
         curIoCnt = self._getNumberOfIoInThisClkPeriod(self.src if isinstance(self, HlsNetNodeRead) else self.dst, True)
         if curIoCnt > self.maxIosPerClk:
             # move to next clock cycle if IO constraint requires it
@@ -416,6 +505,62 @@ class HlsNetNodeWrite(HlsNetNodeExplicitSync):
     def _getNumberOfIoInThisClkPeriod(self, intf: Interface, searchFromSrcToDst: bool):
         return HlsNetNodeRead._getNumberOfIoInThisClkPeriod(self, intf, searchFromSrcToDst)
 
+    def iterResponseReads(self) -> Generator[HlsNetNodeRead, None, None]:
+        return HlsNetNodeRead.iterResponseReads(self)
+
+    def _getMemoryRequestPort(self) -> Optional["HlsStreamProcMemoryPort"]:
+        port = getattr(self.dst, "_hlsMemoryPort", None)
+        if port is not None and self.dst is port.request:
+            return port
+        return None
+
+    def iterPrevMemoryWriteRequests(self) -> Generator["HlsNetNodeWrite", None, None]:
+        """
+        Iterate previous requests to the same memory bank on other ports which may write to the memory,
+        the search goes trough ordering dependencies.
+        (:see: :class:`hwtHls.hlsStreamProc.memory.HlsStreamProcMemory`)
+        """
+        port = self._getMemoryRequestPort()
+        if port is None:
+            return
+        seen = set()
+        toSearch = [self]
+        while toSearch:
+            n = toSearch.pop()
+            for orderingIn in n.iterOrderingInputs():
+                dep = n.dependsOn[orderingIn.in_i].obj
+                if dep in seen:
+                    continue
+                seen.add(dep)
+                if isinstance(dep, HlsNetNodeWrite):
+                    depPort = dep._getMemoryRequestPort()
+                    if depPort is not None and depPort is not port and depPort.bank is port.bank and depPort.hasWrite:
+                        yield dep
+                toSearch.append(dep)
+
+    def iterNextMemoryRequests(self) -> Generator["HlsNetNodeWrite", None, None]:
+        """
+        Iterate next requests to the same memory bank on other ports if this request may write to the memory
+        (reverse of :meth:`~.iterPrevMemoryWriteRequests`).
+        """
+        port = self._getMemoryRequestPort()
+        if port is None or not port.hasWrite:
+            return
+        seen = set()
+        toSearch = [self]
+        while toSearch:
+            n = toSearch.pop()
+            for u in n.usedBy[n.getOrderingOutPort().out_i]:
+                u = u.obj
+                if u in seen:
+                    continue
+                seen.add(u)
+                if isinstance(u, HlsNetNodeWrite):
+                    uPort = u._getMemoryRequestPort()
+                    if uPort is not None and uPort is not port and uPort.bank is port.bank:
+                        yield u
+                toSearch.append(u)
+
     def allocateRtlInstance(self,
                             allocator: "AllocatorArchitecturalElement",
                           ) -> List[HdlStatement]:
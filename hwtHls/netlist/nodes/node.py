@@ -163,7 +163,8 @@ class HlsNetNode():
             outTimes[oI] = oT
 
         if outTimes:
-            timeWhenEarliesOutputRequired = min(ot - lp for (ot, lp) in zip(outTimes, self.latency_post))
+            timeWhenEarliesOutputRequired = min(ot - (lp + lc * clkPeriod)
+                                                for (ot, lp, lc) in zip(outTimes, self.latency_post, self.cycles_latency))
             # we have to check if every input has enought time for its delay
             # and optionally move this node to previous vlock cycle
             for (in_delay, in_cycles) in zip(self.latency_pre, self.in_cycles_offset):
@@ -228,7 +229,7 @@ class HlsNetNode():
         self.in_cycles_offset = HlsNetNode_numberForEachInput(self, r.in_cycles_offset)
         self.latency_pre = HlsNetNode_numberForEachInputNormalized(self, r.latency_pre, schedulerResolution)
         self.latency_post = HlsNetNode_numberForEachOutputNormalized(self, r.latency_post, schedulerResolution)
-        self.cycles_latency = HlsNetNode_numberForEachOutputNormalized(self, r.cycles_latency, schedulerResolution)
+        self.cycles_latency = HlsNetNode_numberForEachOutput(self, r.cycles_latency)
         self.cycles_delay = HlsNetNode_numberForEachOutput(self, r.cycles_delay)
 
         return self
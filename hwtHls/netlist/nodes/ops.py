@@ -1,6 +1,11 @@
+from typing import Union, List, Optional, Tuple
+
+from hwt.code import Concat
 from hwt.hdl.operatorDefs import OpDefinition, AllOps
 from hwt.hdl.types.bits import Bits
+from hwt.hdl.types.defs import BIT
 from hwt.hdl.value import HValue
+from hwt.synthesizer.rtlLevel.rtlSignal import RtlSignal
 from hwtHls.allocator.time_independent_rtl_resource import TimeIndependentRtlResource
 from hwtHls.netlist.nodes.node import HlsNetNode
 from hwtHls.netlist.nodes.ports import HlsNetNodeIn, HlsNetNodeOut
@@ -58,6 +63,16 @@ class HlsNetNodeOperator(HlsNetNode):
         except KeyError:
             pass
 
+        fu = allocator.functionalUnits.get(self, None)
+        if fu is not None:
+            # the operator is realized by a functional unit shared with other nodes
+            return fu.allocateRtlInstance(allocator, self)
+
+        if self.cycles_latency[0]:
+            tis = self._allocateRtlInstanceMultiCycle(allocator)
+            allocator.netNodeToRtl[op_out] = tis
+            return tis
+
         operands = []
         for (dep, t) in zip(self.dependsOn, self.scheduledIn):
             _o = allocator.instantiateHlsNetNodeOutInTime(dep, t)
@@ -76,17 +91,173 @@ class HlsNetNodeOperator(HlsNetNode):
                 else:
                     s.name = f"v{self._id:d}"
 
-        if dtypeEqualSignIgnore(s._dtype, op_out._dtype):
-            if s._dtype.signed != op_out._dtype.signed:
-                s = s._convSign(op_out._dtype.signed)
-        else:
-            raise AssertionError("The ", self.__class__.__name__, " a signals of wrong type", s, op_out, s._dtype, op_out._dtype)
+        s = self._convertRtlOutputSign(s)
         tis = TimeIndependentRtlResource(s, t, allocator)
         
         allocator.netNodeToRtl[op_out] = tis
 
         return tis
 
+    def _allocateRtlInstanceMultiCycle(self, allocator: "AllocatorArchitecturalElement") -> TimeIndependentRtlResource:
+        """
+        Instantiate the realization with cycles_latency registers inside of the operator.
+        The operands are split to cycles_latency + 1 segments and the segment i is computed in the clock period i
+        after the clock period of inputs. The intermediate results are passed to the next clock period in registers,
+        so the delay in each clock period is the delay of a single segment
+        (:see: :meth:`hwtHls.platform.interpolations.ResourceSplineBundle.pipelined`).
+        The operands are sliced in the clock period of inputs and each segment is passed in registers only
+        to the clock period where it is used.
+
+        * ADD/SUB/MINUS_UNARY: the carry chain is split, the carry in is added using an extra bit
+          on LSB side (a, 1) + (b, carryIn), SUB is performed as a + ~b + 1.
+        * LT/LE/GT/GE: the result is the carry out of the segmented subtraction,
+          the signed operands are compared as unsigned with inverted sign bits.
+        * EQ/NE: the results of the comparison of the segments are reduced using AND.
+        * MUL: the partial products of the first operand and the segments of the second operand are accumulated.
+        """
+        op = self.operator
+        hls = self.hls
+        clkPeriod = hls.normalizedClkPeriod
+        epsilon = hls.scheduler.epsilon
+        t0 = max(self.scheduledIn)
+        stageCnt = self.cycles_latency[0] + 1
+        operands: List[Optional[TimeIndependentRtlResource]] = [allocator.instantiateHlsNetNodeOut(dep) for dep in self.dependsOn]
+        if op == AllOps.MINUS_UNARY:
+            # -a = 0 - a
+            operands.insert(0, None)
+            op = AllOps.SUB
+        elif op in (AllOps.GT, AllOps.LE):
+            # a > b is b < a
+            operands.reverse()
+            op = AllOps.LT if op == AllOps.GT else AllOps.GE
+
+        inT = self.getInputDtype(0)
+        width = inT.bit_length()
+        name = self.name if self.name is not None else f"v{self._id:d}"
+        # (low bit index, high bit index) for each clock period, some segments may be empty if the operands are narrow
+        segments = [(width * i // stageCnt, width * (i + 1) // stageCnt) for i in range(stageCnt)]
+        intermediate: List[TimeIndependentRtlResource] = []
+
+        def stageTime(stI: int):
+            return t0 + stI * clkPeriod
+
+        def declareStageResult(stI: int, v: Union[RtlSignal, HValue], suffix: str) -> TimeIndependentRtlResource:
+            s = allocator._sig(f"{name:s}_st{stI:d}_{suffix:s}", v._dtype)
+            s(v)
+            tir = TimeIndependentRtlResource(s, stageTime(stI) + epsilon, allocator)
+            intermediate.append(tir)
+            return tir
+
+        def splitOperand(operand: Optional[TimeIndependentRtlResource], operandI: int) -> List[Optional[TimeIndependentRtlResource]]:
+            """
+            Slice the operand in the clock period of inputs, the segment for the stage i is then passed in registers
+            only until the stage i.
+            """
+            if operand is None:
+                return [None for _ in segments]
+            v = operand.get(t0).data
+            return [None if lo == hi else declareStageResult(0, v[hi:lo], f"in{operandI:d}_{lo:d}")
+                    for lo, hi in segments]
+
+        def operandSegment(operandSegments: List[Optional[TimeIndependentRtlResource]], stI: int, lo: int, hi: int, invertSign: bool):
+            seg = operandSegments[stI]
+            if seg is None:
+                return Bits(hi - lo, signed=False).from_py(0)
+            v = seg.get(stageTime(stI)).data._unsigned()
+            if invertSign and hi == width:
+                v = v ^ v._dtype.from_py(1 << (hi - lo - 1))
+            return v
+
+        lastStI = stageCnt - 1
+        lastT = stageTime(lastStI)
+        if op in (AllOps.ADD, AllOps.SUB, AllOps.LT, AllOps.GE):
+            a, b = (splitOperand(o, i) for i, o in enumerate(operands))
+            invertSign = op in (AllOps.LT, AllOps.GE) and bool(inT.signed)
+            # list of tuples (TimeIndependentRtlResource of sum, width of segment)
+            sums: List[Tuple[TimeIndependentRtlResource, int]] = []
+            for stI, (lo, hi) in enumerate(segments):
+                if lo == hi:
+                    continue
+                aSeg = operandSegment(a, stI, lo, hi, invertSign)
+                bSeg = operandSegment(b, stI, lo, hi, invertSign)
+                if op != AllOps.ADD:
+                    bSeg = ~bSeg
+                if sums:
+                    prevSum, prevW = sums[-1]
+                    carryIn = prevSum.get(stageTime(stI)).data[prevW + 1]
+                else:
+                    carryIn = BIT.from_py(int(op != AllOps.ADD))
+                s = Concat(BIT.from_py(0), aSeg, BIT.from_py(1)) + Concat(BIT.from_py(0), bSeg, carryIn)
+                sums.append((declareStageResult(stI, s, "sum"), hi - lo))
+
+            if op in (AllOps.ADD, AllOps.SUB):
+                res = Concat(*(s.get(lastT).data[w + 1:1] for s, w in reversed(sums)))
+            else:
+                lastSum, lastW = sums[-1]
+                # carry out of a - b is 1 if a >= b
+                res = lastSum.get(lastT).data[lastW + 1]
+                if op == AllOps.LT:
+                    res = ~res
+
+        elif op in (AllOps.EQ, AllOps.NE):
+            a, b = (splitOperand(o, i) for i, o in enumerate(operands))
+            eq = None
+            for stI, (lo, hi) in enumerate(segments):
+                if lo == hi:
+                    continue
+                e = operandSegment(a, stI, lo, hi, False)._eq(operandSegment(b, stI, lo, hi, False))
+                if eq is not None:
+                    e = e & eq.get(stageTime(stI)).data
+                eq = declareStageResult(stI, e, "eq")
+
+            res = eq.get(lastT).data
+            if op == AllOps.NE:
+                res = ~res
+
+        elif op == AllOps.MUL:
+            # the whole first operand is required in each stage
+            a, b = operands
+            b = splitOperand(b, 1)
+            acc = None
+            for stI, (lo, hi) in enumerate(segments):
+                if lo == hi:
+                    continue
+                _a = a.get(stageTime(stI)).data._unsigned()
+                bSeg = operandSegment(b, stI, lo, hi, False)
+                if hi - lo != width:
+                    bSeg = Concat(Bits(width - (hi - lo)).from_py(0), bSeg)._unsigned()
+                p = _a * bSeg
+                if lo:
+                    p = Concat(p[width - lo:], Bits(lo).from_py(0))._unsigned()
+                if acc is not None:
+                    p = acc.get(stageTime(stI)).data + p
+                acc = declareStageResult(stI, p, "acc")
+
+            res = acc.get(lastT).data
+
+        else:
+            raise NotImplementedError("Multi-cycle realization of operator", self, self.operator)
+
+        for tir in intermediate:
+            # the registers for intermediate results are loaded with the synchronization of stage
+            allocator._afterResourceUsed(tir)
+
+        s = allocator._sig(name, res._dtype)
+        s(res)
+        return TimeIndependentRtlResource(self._convertRtlOutputSign(s), lastT + epsilon, allocator)
+
+    def _convertRtlOutputSign(self, s: Union[RtlSignal, HValue]) -> Union[RtlSignal, HValue]:
+        """
+        Convert the result of RTL operator to a signedness of the output of this node.
+        """
+        op_out = self._outputs[0]
+        if dtypeEqualSignIgnore(s._dtype, op_out._dtype):
+            if s._dtype.signed != op_out._dtype.signed:
+                s = s._convSign(op_out._dtype.signed)
+        else:
+            raise AssertionError("The ", self.__class__.__name__, " a signals of wrong type", s, op_out, s._dtype, op_out._dtype)
+        return s
+
     def __repr__(self, minify=False):
         if minify:
             return f"<{self.__class__.__name__:s} {self._id:d} {self.operator.id:s}>"
@@ -13,6 +13,7 @@ class HlsNetNodeOut():
     """
     A class for object which do represents output of HlsNetNode instance.
     """
+    __slots__ = ["obj", "out_i", "_dtype"]
 
     def __init__(self, obj: "HlsNetNode", out_i: int, dtype: HdlType):
         self.obj = obj
@@ -20,7 +21,8 @@ class HlsNetNodeOut():
         self._dtype = dtype
 
     def __hash__(self):
-        return hash((self.obj, self.out_i))
+        # avoid the construction of a tuple, this is called for every lookup in dict/set
+        return (hash(self.obj) << 8) ^ self.out_i
 
     def __eq__(self, other):
         return self is other or (self.__class__ is other.__class__ and self.obj == other.obj and self.out_i == other.out_i)
@@ -37,13 +39,14 @@ class HlsNetNodeIn():
     """
     A class for object which do represents input of HlsNetNode instance.
     """
+    __slots__ = ["obj", "in_i"]
 
     def __init__(self, obj: "HlsNetNode", in_i: int):
         self.obj = obj
         self.in_i = in_i
 
     def __hash__(self):
-        return hash((self.obj, self.in_i))
+        return (hash(self.obj) << 8) ^ self.in_i
 
     def __eq__(self, other):
         return self is other or (self.__class__ is other.__class__ and self.obj == other.obj and self.in_i == other.in_i)
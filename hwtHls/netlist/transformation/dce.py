@@ -1,6 +1,7 @@
 from itertools import chain
 from typing import Set
 
+from hwtHls.netlist.analysis.indexedGraph import HlsNetlistIndexedGraph
 from hwtHls.netlist.nodes.io import HlsNetNodeWrite, HlsNetNodeRead, HlsNetNodeExplicitSync
 from hwtHls.netlist.nodes.node import HlsNetNode
 from hwtHls.netlist.transformation.hlsNetlistPass import HlsNetlistPass
@@ -79,12 +80,15 @@ class HlsNetlistPassDCE(HlsNetlistPass):
         hlsPip = to_hw.hls
 
         while True:
-            used: Set[HlsNetNode] = set()
             # assert len(set(hlsPip.nodes)) == len(hlsPip.nodes)
-            for io in chain(hlsPip.inputs, hlsPip.outputs, (
-                    n for n in hlsPip.nodes 
-                    if isinstance(n, (HlsNetNodeRead, HlsNetNodeWrite, HlsLoopGate, HlsNetNodeExplicitSync)))):
-                self._walkDependencies(io, used)
+            graph = HlsNetlistIndexedGraph(hlsPip.iterAllNodes())
+            ioCnt = len(hlsPip.inputs)
+            nodesEnd = ioCnt + len(hlsPip.nodes)
+            roots = chain(range(ioCnt), range(nodesEnd, len(graph.nodes)), (
+                i for i in range(ioCnt, nodesEnd)
+                if isinstance(graph.nodes[i], (HlsNetNodeRead, HlsNetNodeWrite, HlsLoopGate, HlsNetNodeExplicitSync))))
+            reachable = graph.collectReachable(roots, False)
+            used: Set[HlsNetNode] = set(n for n, isUsed in zip(graph.nodes, reachable) if isUsed)
 
             nodesWithReducedOutputs = []
             if len(used) != len(hlsPip.nodes) + len(hlsPip.inputs) + len(hlsPip.outputs):
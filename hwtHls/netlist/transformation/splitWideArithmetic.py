@@ -0,0 +1,250 @@
+from math import ceil
+from typing import List, Optional, Tuple
+
+from hwt.hdl.operatorDefs import AllOps, OpDefinition
+from hwt.hdl.types.bits import Bits
+from hwt.hdl.types.defs import BIT
+from hwtHls.netlist.nodes.ops import HlsNetNodeOperator
+from hwtHls.netlist.nodes.ports import HlsNetNodeOut
+from hwtHls.netlist.transformation.hlsNetlistPass import HlsNetlistPass
+from hwtHls.netlist.utils import hls_const, hls_op, hls_op_slice, hls_op_index_bit, \
+    hls_op_concat, hls_op_not, hls_op_and_variadic, hls_op_or_variadic
+from hwtHls.scheduler.errors import TimeConstraintError
+
+
+class HlsNetlistPassSplitWideArithmetic(HlsNetlistPass):
+    """
+    Split wide ADD/SUB and comparison operators which do not fit into a clock period to segments
+    connected by a carry chain, so the scheduler can spread the segments over several clock periods.
+
+    * ADD/SUB: each segment is an adder of a slice of operands with carry in and carry out.
+      The carry in is added using an extra bit on LSB side (a, 1) + (b, carryIn)
+      which keeps a single adder per segment. SUB is performed as a + ~b + 1.
+    * LT/LE/GT/GE: the result is the carry out of the segmented subtraction,
+      the signed operands are compared as unsigned with inverted sign bits.
+    * EQ/NE: the segments are compared independently and the results are reduced using AND/OR.
+
+    :note: This pass is not in the default passes of the platforms because the split operators
+        replace the multi-cycle realization of the operator provided by the platform.
+        The operators for which the platform has any realization are not split unless maxSegmentWidth is specified.
+
+    :ivar maxSegmentWidth: an optional maximum width of a segment, if not specified the width is resolved
+        from the delay of the operator from the platform so the segment fits into a clock period
+    """
+    _CARRY_CHAIN_OPS = (AllOps.ADD, AllOps.SUB, AllOps.LT, AllOps.LE, AllOps.GT, AllOps.GE)
+    _EQ_OPS = (AllOps.EQ, AllOps.NE)
+
+    def __init__(self, maxSegmentWidth: Optional[int]=None):
+        if maxSegmentWidth is not None and maxSegmentWidth < 1:
+            raise ValueError("Segment width must be at least 1", maxSegmentWidth)
+        self.maxSegmentWidth = maxSegmentWidth
+
+    @staticmethod
+    def _fitsIntoClkPeriod(hls: "HlsPipeline", op: OpDefinition, width: int) -> bool:
+        platform = hls.platform
+        clkPeriod = hls.realTimeClkPeriod
+        resolution = hls.scheduler.resolution
+        ffDelay = platform.get_ff_store_time(clkPeriod, resolution) * resolution
+        try:
+            r = platform.get_op_realization(op, width, 2, clkPeriod)
+        except TimeConstraintError:
+            return False
+        return not r.cycles_latency and r.latency_pre + ffDelay < clkPeriod
+
+    @staticmethod
+    def _hasRealization(hls: "HlsPipeline", op: OpDefinition, width: int) -> bool:
+        """
+        :return: True if the platform has a realization of the operator (possibly multi-cycle)
+        """
+        try:
+            hls.platform.get_op_realization(op, width, 2, hls.realTimeClkPeriod)
+        except TimeConstraintError:
+            return False
+        return True
+
+    def _resolveSegmentWidth(self, hls: "HlsPipeline", op: OpDefinition, width: int, extraBits: int) -> Optional[int]:
+        """
+        :param extraBits: the number of bits added to each segment for carry
+        :return: the width of segment or None if the operator should not be split
+        """
+        if self.maxSegmentWidth is not None:
+            if width <= self.maxSegmentWidth:
+                return None
+            return self.maxSegmentWidth
+
+        if self._hasRealization(hls, op, width):
+            return None
+
+        # binary search for the widest segment which fits into clock period
+        segmentWidth = None
+        low = 1
+        high = width - 1
+        while low <= high:
+            w = (low + high) // 2
+            if self._fitsIntoClkPeriod(hls, op, w + extraBits):
+                segmentWidth = w
+                low = w + 1
+            else:
+                high = w - 1
+
+        return segmentWidth
+
+    @staticmethod
+    def _splitToSegments(width: int, maxSegmentWidth: int) -> List[Tuple[int, int]]:
+        """
+        :return: list of (low bit index, width) starting from LSB, the widths are balanced
+        """
+        segCnt = ceil(width / maxSegmentWidth)
+        segments = []
+        low = 0
+        for i in range(segCnt):
+            w = (width - low) // (segCnt - i)
+            segments.append((low, w))
+            low += w
+        return segments
+
+    @staticmethod
+    def _addSegment(hls: "HlsPipeline", a: HlsNetNodeOut, b: HlsNetNodeOut,
+                    carryIn: Optional[HlsNetNodeOut], withCarryOut: bool) -> Tuple[HlsNetNodeOut, Optional[HlsNetNodeOut]]:
+        """
+        :return: tuple (sum, carry out)
+        """
+        w = a._dtype.bit_length()
+        if withCarryOut:
+            zero = hls_const(hls, BIT.from_py(0))
+            a = hls_op_concat(hls, zero, a)
+            b = hls_op_concat(hls, zero, b)
+        lowBitNo = 0
+        if carryIn is not None:
+            a = hls_op_concat(hls, a, hls_const(hls, BIT.from_py(1)))
+            b = hls_op_concat(hls, b, carryIn)
+            lowBitNo = 1
+
+        sumWidth = a._dtype.bit_length()
+        s = hls_op(hls, AllOps.ADD, Bits(sumWidth), a, b)
+        if withCarryOut:
+            carryOut = hls_op_index_bit(hls, s, sumWidth - 1)
+        else:
+            carryOut = None
+
+        if lowBitNo != 0 or withCarryOut:
+            s = hls_op_slice(hls, s, lowBitNo + w, lowBitNo)
+
+        return s, carryOut
+
+    def _splitAddSub(self, hls: "HlsPipeline", n: HlsNetNodeOperator, segments: List[Tuple[int, int]],
+                     onlyCarry: bool, invertSign: bool):
+        """
+        :param onlyCarry: if True the result is the carry out of the last segment (for comparison)
+        :param invertSign: if True the sign bits of operands are inverted (for signed comparison)
+        """
+        a, b = n.dependsOn
+        op = n.operator
+        if op in (AllOps.GT, AllOps.LE):
+            # a > b is b < a
+            a, b = b, a
+
+        if op == AllOps.ADD:
+            carry = None
+        else:
+            # a - b = a + ~b + 1
+            carry = hls_const(hls, BIT.from_py(1))
+
+        results = []
+        for last, (low, w) in ((i == len(segments) - 1, seg) for i, seg in enumerate(segments)):
+            aSeg = hls_op_slice(hls, a, low + w, low)
+            bSeg = hls_op_slice(hls, b, low + w, low)
+            if invertSign and last:
+                signBit = hls_const(hls, aSeg._dtype.from_py(1 << (w - 1)))
+                aSeg = hls_op(hls, AllOps.XOR, aSeg._dtype, aSeg, signBit)
+                bSeg = hls_op(hls, AllOps.XOR, bSeg._dtype, bSeg, signBit)
+            if op != AllOps.ADD:
+                bSeg = hls_op(hls, AllOps.NOT, bSeg._dtype, bSeg)
+            s, carry = self._addSegment(hls, aSeg, bSeg, carry, onlyCarry or not last)
+            results.append(s)
+
+        if onlyCarry:
+            # carry out of a - b is 1 if a >= b
+            if op in (AllOps.LT, AllOps.GT):
+                return hls_op_not(hls, carry)
+            else:
+                return carry
+
+        res = results[0]
+        for i, s in enumerate(results[1:]):
+            if i == len(results) - 2:
+                res = hls_op(hls, AllOps.CONCAT, n._outputs[0]._dtype, s, res)
+            else:
+                res = hls_op_concat(hls, s, res)
+        return res
+
+    def _splitEq(self, hls: "HlsPipeline", n: HlsNetNodeOperator, segments: List[Tuple[int, int]]):
+        a, b = n.dependsOn
+        results = []
+        for low, w in segments:
+            aSeg = hls_op_slice(hls, a, low + w, low)
+            bSeg = hls_op_slice(hls, b, low + w, low)
+            results.append(hls_op(hls, n.operator, BIT, aSeg, bSeg))
+
+        if n.operator == AllOps.EQ:
+            return hls_op_and_variadic(hls, *results)
+        else:
+            return hls_op_or_variadic(hls, *results)
+
+    @staticmethod
+    def _replaceNode(n: HlsNetNodeOperator, newOut: HlsNetNodeOut):
+        for dep, i in zip(n.dependsOn, n._inputs):
+            dep.obj.usedBy[dep.out_i].remove(i)
+        for u in n.usedBy[0]:
+            u.replace_driver(newOut)
+        n.usedBy[0] = []
+
+    def _trySplit(self, hls: "HlsPipeline", n: HlsNetNodeOperator) -> bool:
+        op = n.operator
+        if len(n.dependsOn) != 2:
+            return False
+        a, b = n.dependsOn
+        t = a._dtype
+        if not isinstance(t, Bits) or b._dtype.bit_length() != t.bit_length():
+            return False
+        width = t.bit_length()
+
+        if op in self._CARRY_CHAIN_OPS:
+            isCmp = op not in (AllOps.ADD, AllOps.SUB)
+            if isCmp and bool(t.signed) != bool(b._dtype.signed):
+                return False
+            elif not isCmp and n._outputs[0]._dtype.bit_length() != width:
+                return False
+            # carry in and carry out bit
+            segW = self._resolveSegmentWidth(hls, AllOps.ADD, width, 2)
+            if segW is None:
+                return False
+            segments = self._splitToSegments(width, segW)
+            if len(segments) < 2:
+                return False
+            newOut = self._splitAddSub(hls, n, segments, isCmp, isCmp and bool(t.signed))
+
+        elif op in self._EQ_OPS:
+            segW = self._resolveSegmentWidth(hls, op, width, 0)
+            if segW is None:
+                return False
+            segments = self._splitToSegments(width, segW)
+            if len(segments) < 2:
+                return False
+            newOut = self._splitEq(hls, n, segments)
+
+        else:
+            return False
+
+        self._replaceNode(n, newOut)
+        return True
+
+    def apply(self, hls: "HlsStreamProc", to_hw: "SsaSegmentToHwPipeline"):
+        netlist = to_hw.hls
+        removed = set()
+        for n in tuple(netlist.nodes):
+            if isinstance(n, HlsNetNodeOperator) and self._trySplit(netlist, n):
+                removed.add(n)
+
+        if removed:
+            netlist.nodes = [n for n in netlist.nodes if n not in removed]
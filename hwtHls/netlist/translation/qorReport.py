@@ -0,0 +1,32 @@
+from typing import Optional, List
+
+from hwtHls.allocator.qorReport import HlsAllocatorQoRReport
+from hwtHls.netlist.transformation.rtlNetlistPass import RtlNetlistPass
+from hwtHls.platform.fileUtils import OutputStreamGetter
+
+
+class RtlNetlistPassQoRReport(RtlNetlistPass):
+    """
+    Collect :class:`hwtHls.allocator.qorReport.HlsAllocatorQoRReport` for each thread
+    and optionally write it to output stream.
+
+    :ivar reports: the list of reports in the order of the threads
+    """
+
+    def __init__(self, outStreamGetter:Optional[OutputStreamGetter]=None):
+        self.outStreamGetter = outStreamGetter
+        self.reports: List[HlsAllocatorQoRReport] = []
+
+    def apply(self, hls: "HlsStreamProc", to_hw: "SsaSegmentToHwPipeline"):
+        assert to_hw.is_scheduled
+        r = HlsAllocatorQoRReport(to_hw.start.label)
+        r.collect(to_hw.hls)
+        self.reports.append(r)
+
+        if self.outStreamGetter is not None:
+            out, doClose = self.outStreamGetter(to_hw.start.label)
+            try:
+                r.dump(out)
+            finally:
+                if doClose:
+                    out.close()
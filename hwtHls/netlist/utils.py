@@ -1,6 +1,10 @@
 from hwt.hdl.operatorDefs import AllOps, OpDefinition
-from hwt.hdl.types.defs import BIT
+from hwt.hdl.types.bits import Bits
+from hwt.hdl.types.defs import BIT, SLICE, INT
+from hwt.hdl.types.hdlType import HdlType
+from hwt.hdl.value import HValue
 from hwt.pyUtils.arrayQuery import balanced_reduce
+from hwtHls.netlist.nodes.const import HlsNetNodeConst
 from hwtHls.netlist.nodes.ops import HlsNetNodeOperator
 from hwtHls.netlist.nodes.ports import HlsNetNodeOut, link_hls_nodes
 
@@ -30,3 +34,39 @@ def _hls_op_bin(hls: "HlsPipeline", op: OpDefinition, a: HlsNetNodeOut, b: HlsNe
     link_hls_nodes(a, res._inputs[0])
     link_hls_nodes(b, res._inputs[1])
     return res._outputs[0]
+
+
+def hls_op_or_variadic(hls: "HlsPipeline", *ops: HlsNetNodeOut):
+    return balanced_reduce(ops, lambda a, b: hls_op_or(hls, a, b))
+
+
+def hls_const(hls: "HlsPipeline", v: HValue) -> HlsNetNodeOut:
+    c = HlsNetNodeConst(hls, v)
+    hls.nodes.append(c)
+    return c._outputs[0]
+
+
+def hls_op(hls: "HlsPipeline", op: OpDefinition, dtype: HdlType, *ops: HlsNetNodeOut) -> HlsNetNodeOut:
+    res = HlsNetNodeOperator(hls, op, len(ops), dtype)
+    hls.nodes.append(res)
+    for o, i in zip(ops, res._inputs):
+        link_hls_nodes(o, i)
+    return res._outputs[0]
+
+
+def hls_op_slice(hls: "HlsPipeline", a: HlsNetNodeOut, highBitNo: int, lowBitNo: int) -> HlsNetNodeOut:
+    """
+    :return: bits a[highBitNo:lowBitNo]
+    """
+    index = hls_const(hls, SLICE.from_py(slice(highBitNo, lowBitNo, -1)))
+    return hls_op(hls, AllOps.INDEX, Bits(highBitNo - lowBitNo), a, index)
+
+
+def hls_op_index_bit(hls: "HlsPipeline", a: HlsNetNodeOut, bitNo: int) -> HlsNetNodeOut:
+    index = hls_const(hls, INT.from_py(bitNo))
+    return hls_op(hls, AllOps.INDEX, BIT, a, index)
+
+
+def hls_op_concat(hls: "HlsPipeline", high: HlsNetNodeOut, low: HlsNetNodeOut) -> HlsNetNodeOut:
+    w = high._dtype.bit_length() + low._dtype.bit_length()
+    return hls_op(hls, AllOps.CONCAT, Bits(w), high, low)
@@ -3,6 +3,8 @@ from itertools import islice
 from pprint import pformat
 from typing import Tuple, Optional
 
+import numpy as np
+
 from hwtHls.scheduler.errors import TimeConstraintError
 from scipy.interpolate._interpolate import interp1d
 
@@ -16,11 +18,45 @@ class Spline(interp1d):
 
 
 class ResourceSplineBundle():
+    """
+    :ivar splines: a spline for each latency (index in this tuple is the latency in clock cycles),
+        the spline describes the delay of the longest combinational path in the component for the given bit width
+        (None if there is no such a realization)
+    """
 
     def __init__(self, *spline_for_each_possible_latency: Optional[Spline]):
         assert spline_for_each_possible_latency
         self.splines = spline_for_each_possible_latency
 
+    def pipelined(self, maxLatency: int, accumulate: Optional["ResourceSplineBundle"]=None) -> "ResourceSplineBundle":
+        """
+        Add the realizations with the latency up to maxLatency created by splitting the operands to latency + 1 segments
+        where a single segment is processed in each clock period
+        (:see: :meth:`hwtHls.netlist.nodes.ops.HlsNetNodeOperator._allocateRtlInstanceMultiCycle`).
+        The realizations which are already specified are kept.
+
+        :param accumulate: if None the delay of the stage is the delay of the combinational realization for the width of the segment
+            (+2 bits for carry in and carry out), else the stage computes the partial result for the segment and adds it
+            to the accumulated result from previous stage using this realization (multiplier)
+        """
+        comb = self.splines[0]
+        assert comb is not None, self
+        splines = list(self.splines)
+        for latency in range(len(splines), maxLatency + 1):
+            splines.append(None)
+
+        x = comb.x
+        for latency in range(1, maxLatency + 1):
+            if splines[latency] is None:
+                if accumulate is None:
+                    segmentWidth = np.maximum(x / (latency + 1), x[0])
+                    y = comb(segmentWidth + 2)
+                else:
+                    y = comb.y / (latency + 1) + accumulate.splines[0](x)
+                splines[latency] = Spline(x, y)
+
+        return self.__class__(*splines)
+
     def __call__(self, arg_cnt:int, arg_bit_width:int, min_latency: int, max_val:float) -> Tuple[int, float]:
         latency = min_latency - 1
         for s in islice(self.splines, min_latency, None):
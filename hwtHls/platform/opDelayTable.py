@@ -0,0 +1,146 @@
+from hashlib import sha256
+from pathlib import Path
+from typing import Dict, Tuple, Union, Callable, Optional
+
+from hwt.hdl.operatorDefs import OpDefinition
+from hwtHls.platform.interpolations import ResourceSplineBundle
+from hwtHls.scheduler.errors import TimeConstraintError
+import numpy as np
+
+
+def _getOpKey(op: Union[OpDefinition, type]) -> str:
+    opId = getattr(op, "id", None)
+    if opId is None:
+        # RtlResourceType classes
+        opId = getattr(op, "__name__", None)
+        if opId is None:
+            opId = repr(op)
+    return opId
+
+
+class OpDelayTable():
+    """
+    A table of precomputed delays of operators for every bit width 1..MAX_BIT_WIDTH and every latency variant.
+    The lookup is an indexing into NumPy array instead of the evaluation of the spline.
+
+    The table can be stored to a file and loaded later so the splines do not have to be evaluated again.
+
+    :ivar delays: dictionary operator id -> 2D array [latency variant, bit width - 1] of delays in seconds
+        (NaN if there is no realization of the operator with such a latency)
+    :ivar key: an optional identifier of the platform and of the delay model the table was generated from
+        (:see: :meth:`~.getKeyForSplineBundles`), stored with the table so the outdated table can be detected
+    :note: Delays for bit widths above MAX_BIT_WIDTH are linearly extrapolated from the last two items,
+        this corresponds to the extrapolation of the linear spline.
+    """
+    MAX_BIT_WIDTH = 4096
+    # name of the item with the key in the file
+    _KEY_NAME = "__key__"
+
+    def __init__(self, delays: Dict[str, np.ndarray], key: Optional[str]=None):
+        for k, d in delays.items():
+            assert d.ndim == 2 and d.shape[1] == self.MAX_BIT_WIDTH, (k, d.shape)
+        self.delays = delays
+        self.key = key
+
+    @classmethod
+    def getKeyForSplineBundles(cls, platformName: str, opDelays: Dict[Union[OpDefinition, type], ResourceSplineBundle]) -> str:
+        """
+        :param platformName: the name of the platform (device and speed grade)
+        :return: a hash of the platform name, the set of operators and the points of all splines
+        """
+        h = sha256()
+        h.update(f"{cls.MAX_BIT_WIDTH:d};{platformName:s}".encode())
+        for opKey, bundle in sorted((_getOpKey(op), bundle) for op, bundle in opDelays.items()):
+            h.update(f";{opKey:s}:{len(bundle.splines):d}".encode())
+            for s in bundle.splines:
+                if s is None:
+                    h.update(b"None")
+                else:
+                    h.update(np.ascontiguousarray(s.x, dtype=np.float64).tobytes())
+                    h.update(np.ascontiguousarray(s.y, dtype=np.float64).tobytes())
+        return h.hexdigest()
+
+    @classmethod
+    def fromSplineBundles(cls, opDelays: Dict[Union[OpDefinition, type], ResourceSplineBundle], key: Optional[str]=None) -> "OpDelayTable":
+        """
+        Evaluate all splines for all bit widths at once.
+        """
+        bitWidths = np.arange(1, cls.MAX_BIT_WIDTH + 1, dtype=np.float64)
+        # multiple operators usually share same bundle
+        evaluated: Dict[int, np.ndarray] = {}
+        delays = {}
+        for op, bundle in opDelays.items():
+            d = evaluated.get(id(bundle), None)
+            if d is None:
+                d = np.full((len(bundle.splines), cls.MAX_BIT_WIDTH), np.nan)
+                for latency, s in enumerate(bundle.splines):
+                    if s is not None:
+                        d[latency, :] = s(bitWidths)
+                evaluated[id(bundle)] = d
+            delays[_getOpKey(op)] = d
+        return cls(delays, key)
+
+    @classmethod
+    def fromFunction(cls, opDelays: Dict[Union[OpDefinition, type], float],
+                     fn: Callable[[Union[OpDefinition, type], float, np.ndarray], np.ndarray]) -> "OpDelayTable":
+        """
+        Build a table with a single latency variant for operators where the delay is a function of the bit width.
+
+        :param fn: function (operator, base delay, array of bit widths) -> array of delays
+        """
+        bitWidths = np.arange(1, cls.MAX_BIT_WIDTH + 1, dtype=np.float64)
+        delays = {}
+        for op, baseDelay in opDelays.items():
+            d = np.empty((1, cls.MAX_BIT_WIDTH))
+            d[0, :] = fn(op, baseDelay, bitWidths)
+            delays[_getOpKey(op)] = d
+        return cls(delays)
+
+    def __contains__(self, op: Union[OpDefinition, type]):
+        return _getOpKey(op) in self.delays
+
+    @classmethod
+    def _getDelayFromRow(cls, d: np.ndarray, bitWidth: int) -> float:
+        if bitWidth <= cls.MAX_BIT_WIDTH:
+            return float(d[bitWidth - 1])
+        else:
+            last = d[-1]
+            return float(last + (last - d[-2]) * (bitWidth - cls.MAX_BIT_WIDTH))
+
+    def getDelay(self, op: Union[OpDefinition, type], latency: int, bitWidth: int) -> float:
+        return self._getDelayFromRow(self.delays[_getOpKey(op)][latency], bitWidth)
+
+    def resolveLatency(self, op: Union[OpDefinition, type], bitWidth: int, minLatency: int, maxDelay: float) -> Tuple[int, float]:
+        """
+        Find the realization with the lowest latency which has delay lower or equal to maxDelay.
+
+        :see: :meth:`hwtHls.platform.interpolations.ResourceSplineBundle.__call__`
+        :return: tuple (latency, delay)
+        """
+        d = self.delays[_getOpKey(op)]
+        for latency in range(minLatency, d.shape[0]):
+            v = self._getDelayFromRow(d[latency], bitWidth)
+            if v <= maxDelay:
+                # NaN is never <= so the missing variants are skipped
+                return (latency, v)
+
+        raise TimeConstraintError("No operation realizations satisfying the constrain", op, bitWidth, minLatency, maxDelay)
+
+    def save(self, fileName: Union[str, Path]):
+        data = dict(self.delays)
+        if self.key is not None:
+            data[self._KEY_NAME] = np.array(self.key)
+        with open(fileName, "wb") as f:
+            np.savez(f, **data)
+
+    @classmethod
+    def load(cls, fileName: Union[str, Path]) -> "OpDelayTable":
+        with np.load(fileName) as data:
+            key = None
+            delays = {}
+            for k in data.files:
+                if k == cls._KEY_NAME:
+                    key = str(data[k])
+                else:
+                    delays[k] = data[k]
+            return cls(delays, key)
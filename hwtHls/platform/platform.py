@@ -0,0 +1,69 @@
+from typing import Optional, List
+
+from hwt.hdl.operatorDefs import AllOps, OpDefinition
+from hwt.serializer.resourceAnalyzer.resourceTypes import ResourceFF
+from hwt.synthesizer.dummyPlatform import DummyPlatform
+from hwtHls.hlsStreamProc.compileProfiler import HlsCompileProfiler
+from hwtHls.netlist.transformation.hlsNetlistPass import HlsNetlistPass
+from hwtHls.platform.opRealizationMeta import OpRealizationMeta
+from hwtHls.scheduler.retiming import HlsScheduleRetiming
+from hwtHls.scheduler.scheduleCache import HlsScheduleCache
+from hwtHls.ssa.transformation.ssaPass import SsaPass
+
+
+class DefaultHlsPlatform(DummyPlatform):
+    """
+    Base class of HLS platforms, contains the configuration of HLS which does not depend on the target device.
+    (The delays of the operators are provided by :meth:`~.get_op_realization` implemented in the child class.)
+    """
+
+    def __init__(self, allocator, scheduler,
+                 ssa_passes: Optional[List[SsaPass]],
+                 hlsnetlist_passes: Optional[List[HlsNetlistPass]],
+                 rtlnetlist_passes,
+                 compileCache: Optional[HlsScheduleCache]=None,
+                 compileProfiler: Optional[HlsCompileProfiler]=None,
+                 pipelineReadyRegisterPeriod: Optional[int]=None,
+                 shiftRegisterMinLength: Optional[int]=None,
+                 scheduleRetiming: Optional[HlsScheduleRetiming]=None,
+            ):
+        """
+        :param compileCache: an optional persistent cache of scheduling results
+        :param compileProfiler: an optional object which collects the statistics about the compilation
+        :param pipelineReadyRegisterPeriod: if specified the ready signal of pipelines is registered
+            using a skid buffer every pipelineReadyRegisterPeriod stages
+            (:see: :meth:`hwtHls.allocator.pipelineContainer.AllocatorPipelineContainer.allocateSkidBuffer`)
+        :param shiftRegisterMinLength: if specified the chains of pipeline registers of this or larger length
+            which are delaying a single value are allocated as a shift register which can be mapped to SRL/LUTRAM,
+            this applies only to pipelines without flow control
+            (:see: :meth:`hwtHls.allocator.pipelineContainer.AllocatorPipelineContainer._allocateShiftRegister`)
+        :param scheduleRetiming: an optional retiming which is applied on the schedule before the allocation
+            to reduce the number of register bits
+        """
+        super(DefaultHlsPlatform, self).__init__()
+        self.allocator = allocator
+        self.scheduler = scheduler  # HlsScheduler, HlsListScheduler, HlsSdcScheduler
+        self.ssa_passes = ssa_passes
+        self.hlsnetlist_passes = hlsnetlist_passes
+        self.rtlnetlist_passes = rtlnetlist_passes
+        self.compileCache = compileCache
+        self.compileProfiler = compileProfiler
+        if pipelineReadyRegisterPeriod is not None and pipelineReadyRegisterPeriod < 1:
+            raise ValueError("Ready register period must be at least 1", pipelineReadyRegisterPeriod)
+        self.pipelineReadyRegisterPeriod = pipelineReadyRegisterPeriod
+        if shiftRegisterMinLength is not None and shiftRegisterMinLength < 2:
+            raise ValueError("Shift register must have at least 2 stages", shiftRegisterMinLength)
+        self.shiftRegisterMinLength = shiftRegisterMinLength
+        self.scheduleRetiming = scheduleRetiming
+
+    def get_op_realization(self, op: OpDefinition, bit_width: int,
+                           input_cnt: int, clkPeriod: float) -> OpRealizationMeta:
+        raise NotImplementedError(
+            "Override this in your implementation of platform")
+
+    def get_ff_store_time(self, realTimeClkPeriod: float, schedulerResolution: float):
+        t = self.get_op_realization(ResourceFF, 1, 1, realTimeClkPeriod).latency_pre
+        if self.pipelineReadyRegisterPeriod is not None:
+            # the pipeline registers may be loaded from a skid buffer, there is a 2:1 mux in front of them
+            t += self.get_op_realization(AllOps.TERNARY, 1, 2, realTimeClkPeriod).latency_pre
+        return int(t // schedulerResolution)
@@ -1,11 +1,8 @@
-from functools import lru_cache
-from math import log2
 from pathlib import Path
 from typing import Dict, Union, Optional, List
 
 from hwt.hdl.operator import Operator
 from hwt.hdl.operatorDefs import AllOps, OpDefinition
-from hwt.synthesizer.dummyPlatform import DummyPlatform
 from hwtHls.allocator.allocator import HlsAllocator
 from hwtHls.netlist.analysis.consystencyCheck import HlsNetlistPassConsystencyCheck
 from hwtHls.netlist.transformation.aggregateBitwiseOpsPass import HlsNetlistPassAggregateBitwiseOps
@@ -15,13 +12,19 @@ from hwtHls.netlist.transformation.mergeExplicitSync import HlsNetlistPassMergeE
 from hwtHls.netlist.translation.dumpStreamNodes import RtlNetlistPassDumpStreamNodes
 from hwtHls.netlist.translation.toGraphwiz import HlsNetlistPassDumpToDot
 from hwtHls.netlist.translation.toTimeline import HlsNetlistPassShowTimeline
+from hwtHls.platform.opDelayTable import OpDelayTable
 from hwtHls.platform.opRealizationMeta import OpRealizationMeta
+from hwtHls.platform.platform import DefaultHlsPlatform
+from hwtHls.hlsStreamProc.compileProfiler import HlsCompileProfiler
+from hwtHls.scheduler.retiming import HlsScheduleRetiming
+from hwtHls.scheduler.scheduleCache import HlsScheduleCache
 from hwtHls.scheduler.scheduler import HlsScheduler
 from hwtHls.ssa.analysis.consystencyCheck import SsaPassConsystencyCheck
 from hwtHls.ssa.analysis.dumpPipelines import SsaPassDumpPipelines
 from hwtHls.ssa.instr import OP_ASSIGN
 from hwtHls.ssa.transformation.axiStreamReadLowering.axiStreamReadLoweringPass import SsaPassAxiStreamReadLowering
 from hwtHls.ssa.transformation.extractPartDrivers.extractPartDriversPass import SsaPassExtractPartDrivers
+from hwtHls.ssa.transformation.loopUnroll import SsaPassLoopUnroll
 from hwtHls.ssa.transformation.runLlvmOpt import SsaPassRunLlvmOpt
 from hwtHls.ssa.transformation.ssaPass import SsaPass
 from hwtHls.ssa.translation.fromLlvm import SsaPassFromLlvm
@@ -31,6 +34,7 @@ from hwtHls.ssa.translation.toLlvm import SsaPassToLlvm
 from hwtHls.netlist.translation.toTimelineArchLevel import HlsNetlistPassShowTimelineArchLevel
 from hwt.serializer.resourceAnalyzer.resourceTypes import ResourceFF
 from hwtHls.platform.fileUtils import outputFileGetter
+import numpy as np
 
 _OPS_T_GROWING_EXP = {
     AllOps.DIV,
@@ -72,6 +76,7 @@ DEFAULT_SSA_PASSES = [
     SsaPassConsystencyCheck(),
     SsaPassAxiStreamReadLowering(),
     SsaPassExtractPartDrivers(),
+    SsaPassLoopUnroll(),
     SsaPassToLlvm(),
     SsaPassRunLlvmOpt(),
     SsaPassFromLlvm(),
@@ -108,6 +113,8 @@ def makeDebugPasses(debug_file_directory: Union[str, Path], expandCompositeNodes
             SsaPassDumpToDot(outputFileGetter(debug_file_directory, ".1.dot"), extractPipeline=False),
             SsaPassExtractPartDrivers(),
             SsaPassDumpToDot(outputFileGetter(debug_file_directory, ".2.dot"), extractPipeline=False),
+            SsaPassLoopUnroll(),
+            SsaPassConsystencyCheck(),
 
             SsaPassToLlvm(),
             SsaPassDumpToLl(outputFileGetter(debug_file_directory, ".3.ll")),
@@ -137,7 +144,7 @@ def makeDebugPasses(debug_file_directory: Union[str, Path], expandCompositeNodes
     }
 
 
-class VirtualHlsPlatform(DummyPlatform):
+class VirtualHlsPlatform(DefaultHlsPlatform):
     """
     Platform with informations about target platform
     and configuration of HLS
@@ -149,10 +156,22 @@ class VirtualHlsPlatform(DummyPlatform):
                  ssa_passes:Optional[List[SsaPass]]=DEFAULT_SSA_PASSES,
                  hlsnetlist_passes: Optional[List[HlsNetlistPass]]=DEFAULT_HLSNETLIST_PASSES,
                  rtlnetlist_passes=DEFAULT_RTLNETLIST_PASSES,
+                 compileCache: Optional[HlsScheduleCache]=None,
+                 compileProfiler: Optional[HlsCompileProfiler]=None,
+                 pipelineReadyRegisterPeriod: Optional[int]=None,
+                 shiftRegisterMinLength: Optional[int]=None,
+                 scheduleRetiming: Optional[HlsScheduleRetiming]=None,
             ):
-        super(VirtualHlsPlatform, self).__init__()
-        self.allocator = allocator
-        self.scheduler = scheduler  # HlsScheduler #ForceDirectedScheduler
+        """
+        :see: :class:`hwtHls.platform.platform.DefaultHlsPlatform`
+        """
+        super(VirtualHlsPlatform, self).__init__(allocator, scheduler,
+                                                 ssa_passes, hlsnetlist_passes, rtlnetlist_passes,
+                                                 compileCache=compileCache,
+                                                 compileProfiler=compileProfiler,
+                                                 pipelineReadyRegisterPeriod=pipelineReadyRegisterPeriod,
+                                                 shiftRegisterMinLength=shiftRegisterMinLength,
+                                                 scheduleRetiming=scheduleRetiming)
 
         # operator: seconds to perform
         self._OP_DELAYS: Dict[Operator, float] = {
@@ -191,31 +210,36 @@ class VirtualHlsPlatform(DummyPlatform):
             ResourceFF: 1.2e-9,
             OP_ASSIGN: 0,
         }
-        self.ssa_passes = ssa_passes
-        self.hlsnetlist_passes = hlsnetlist_passes
-        self.rtlnetlist_passes = rtlnetlist_passes
+        self._delayTable = OpDelayTable.fromFunction(self._OP_DELAYS, self._getOpDelay)
 
-    @lru_cache()
-    def get_op_realization(self, op: OpDefinition, bit_width: int,
-                           input_cnt: int, clkPeriod: float) -> OpRealizationMeta:
-        base_delay = self._OP_DELAYS[op]
+    @staticmethod
+    def _getOpDelay(op: OpDefinition, base_delay: float, bit_width: Union[int, np.ndarray]) -> Union[float, np.ndarray]:
+        """
+        :param bit_width: the bit width of the operands (multiplied by number of inputs for TERNARY)
+        """
         if op in _OPS_T_GROWING_CONST:
-            latency_pre = base_delay
+            return base_delay + 0 * bit_width
 
         elif op in _OPS_T_GROWING_LIN:
-            latency_pre = base_delay * log2(bit_width)
+            return base_delay * np.log2(bit_width)
 
         elif op in _OPS_T_GROWING_EXP:
-            latency_pre = base_delay * bit_width
+            return base_delay * bit_width
 
         elif op == AllOps.TERNARY:
-            latency_pre = base_delay * log2(bit_width * input_cnt)
+            return base_delay * np.log2(bit_width)
 
         else:
             raise NotImplementedError(op)
 
-        return OpRealizationMeta(latency_pre=latency_pre)
+    def get_op_realization(self, op: OpDefinition, bit_width: int,
+                           input_cnt: int, clkPeriod: float) -> OpRealizationMeta:
+        if op == AllOps.TERNARY:
+            bit_width *= input_cnt
+
+        if bit_width <= OpDelayTable.MAX_BIT_WIDTH:
+            latency_pre = self._delayTable.getDelay(op, 0, bit_width)
+        else:
+            latency_pre = float(self._getOpDelay(op, self._OP_DELAYS[op], bit_width))
 
-    @lru_cache()
-    def get_ff_store_time(self, realTimeClkPeriod: float, schedulerResolution: float):
-        return int(self.get_op_realization(ResourceFF, 1, 1, realTimeClkPeriod).latency_pre // schedulerResolution)
+        return OpRealizationMeta(latency_pre=latency_pre)
@@ -1,36 +1,113 @@
-from functools import lru_cache
-from typing import Dict, Callable, Tuple
+from pathlib import Path
+from typing import Dict, Callable, Tuple, Optional, Union
 
-from hwt.hdl.operatorDefs import OpDefinition
-from hwt.synthesizer.dummyPlatform import DummyPlatform
+from hwt.hdl.operatorDefs import OpDefinition, AllOps
 from hwtHls.allocator.allocator import HlsAllocator
+from hwtHls.platform.interpolations import ResourceSplineBundle
+from hwtHls.platform.opDelayTable import OpDelayTable
 from hwtHls.platform.opRealizationMeta import OpRealizationMeta
+from hwtHls.platform.platform import DefaultHlsPlatform
 from hwtHls.platform.virtual import _OPS_T_ZERO_LATENCY, DEFAULT_SSA_PASSES, \
     DEFAULT_HLSNETLIST_PASSES, DEFAULT_RTLNETLIST_PASSES
+from hwtHls.hlsStreamProc.compileProfiler import HlsCompileProfiler
+from hwtHls.scheduler.retiming import HlsScheduleRetiming
+from hwtHls.scheduler.scheduleCache import HlsScheduleCache
 from hwtHls.scheduler.scheduler import HlsScheduler
 from hwt.serializer.resourceAnalyzer.resourceTypes import ResourceFF
 
 
-class AbstractXilinxPlatform(DummyPlatform):
+class AbstractXilinxPlatform(DefaultHlsPlatform):
     """
     :ivar _OP_DELAYS: dict operator -> function (number of args, bitwidth input, min latency in cycles, maximum_time_budget) -> delay in seconds
-
+        (not present if the delay table was specified as an :class:`hwtHls.platform.opDelayTable.OpDelayTable` instance)
+    :ivar _delayTable: the delays from _OP_DELAYS precomputed for all bit widths
+    :cvar _OP_PIPELINED_MAX_LATENCY: dict operator -> max latency of the realization with registers inside of the operator
+        which is used if the combinational realization does not fit into clock period
+        (:see: :meth:`hwtHls.netlist.nodes.ops.HlsNetNodeOperator._allocateRtlInstanceMultiCycle`)
     """
+    _OP_PIPELINED_MAX_LATENCY: Dict[OpDefinition, int] = {
+        # carry chain split by registers
+        AllOps.ADD: 8,
+        AllOps.SUB: 8,
+        AllOps.MINUS_UNARY: 8,
+        AllOps.EQ: 4,
+        AllOps.NE: 4,
+        AllOps.GE: 4,
+        AllOps.GT: 4,
+        AllOps.LE: 4,
+        AllOps.LT: 4,
+        # accumulation of partial products
+        AllOps.MUL: 16,
+    }
 
     def __init__(self, allocator=HlsAllocator,
                  scheduler=HlsScheduler,
                  ssa_passes=DEFAULT_SSA_PASSES,
                  hlsnetlist_passes=DEFAULT_HLSNETLIST_PASSES,
-                 rtlnetlist_passes=DEFAULT_RTLNETLIST_PASSES
+                 rtlnetlist_passes=DEFAULT_RTLNETLIST_PASSES,
+                 compileCache: Optional[HlsScheduleCache]=None,
+                 compileProfiler: Optional[HlsCompileProfiler]=None,
+                 opDelayTable: Optional[Union[OpDelayTable, str, Path]]=None,
+                 pipelineReadyRegisterPeriod: Optional[int]=None,
+                 shiftRegisterMinLength: Optional[int]=None,
+                 scheduleRetiming: Optional[HlsScheduleRetiming]=None,
                  ):
-        super(AbstractXilinxPlatform, self).__init__()
-        self.allocator = allocator
-        self.scheduler = scheduler  # HlsScheduler #ForceDirectedScheduler
-        self.ssa_passes = ssa_passes
-        self.hlsnetlist_passes = hlsnetlist_passes
-        self.rtlnetlist_passes = rtlnetlist_passes
+        """
+        :param opDelayTable: an optional precomputed delay table or a file with it,
+            if the file does not exist or if it was generated for a different platform or delay model
+            the table is generated and stored to this file
+        :see: :class:`hwtHls.platform.platform.DefaultHlsPlatform` for other parameters
+        """
+        super(AbstractXilinxPlatform, self).__init__(allocator, scheduler,
+                                                     ssa_passes, hlsnetlist_passes, rtlnetlist_passes,
+                                                     compileCache=compileCache,
+                                                     compileProfiler=compileProfiler,
+                                                     pipelineReadyRegisterPeriod=pipelineReadyRegisterPeriod,
+                                                     shiftRegisterMinLength=shiftRegisterMinLength,
+                                                     scheduleRetiming=scheduleRetiming)
 
+        self._initDelayTable(opDelayTable)
+
+    def _initDelayTable(self, opDelayTable: Optional[Union[OpDelayTable, str, Path]]):
+        if isinstance(opDelayTable, OpDelayTable):
+            self._delayTable = opDelayTable
+            return
+
+        # the splines are cheap to construct, only the evaluation for all bit widths is expensive
         self._init_coefs()
+        self._addPipelinedRealizations()
+        cls = self.__class__
+        key = OpDelayTable.getKeyForSplineBundles(f"{cls.__module__:s}.{cls.__qualname__:s}", self._OP_DELAYS)
+        if opDelayTable is not None and Path(opDelayTable).exists():
+            t = OpDelayTable.load(opDelayTable)
+            if t.key == key:
+                self._delayTable = t
+                return
+            # else the table was generated for a different device, speed grade, operators or coefficients
+            # and it is regenerated
+
+        self._delayTable = OpDelayTable.fromSplineBundles(self._OP_DELAYS, key)
+        if opDelayTable is not None:
+            self._delayTable.save(opDelayTable)
+
+    def _addPipelinedRealizations(self):
+        """
+        Extend the realizations in _OP_DELAYS with the pipelined realizations from _OP_PIPELINED_MAX_LATENCY
+        """
+        d = self._OP_DELAYS
+        pipelined: Dict[ResourceSplineBundle, ResourceSplineBundle] = {}
+        for op, maxLatency in self._OP_PIPELINED_MAX_LATENCY.items():
+            bundle = d.get(op, None)
+            if bundle is None:
+                continue
+            p = pipelined.get(bundle, None)
+            if p is None:
+                if op == AllOps.MUL:
+                    p = bundle.pipelined(maxLatency, accumulate=d[AllOps.ADD])
+                else:
+                    p = bundle.pipelined(maxLatency)
+                pipelined[bundle] = p
+            d[op] = p
 
     def _init_coefs(self):
         """
@@ -40,14 +117,17 @@ class AbstractXilinxPlatform(DummyPlatform):
             "Override this in your implementation of platform")
         self._OP_DELAYS: Dict[str, Callable[[int, int, int, float], Tuple[int, float]]] = {}
 
-    @lru_cache()
     def get_op_realization(self, op: OpDefinition, bit_width: int,
                            input_cnt: int, clkPeriod: float) -> OpRealizationMeta:
+        """
+        Resolve the realization with the lowest latency which fits into clock period.
+        """
         if op in _OPS_T_ZERO_LATENCY:
             return OpRealizationMeta()
-        (cycles_latency, latency_pre) = self._OP_DELAYS[op](bit_width, input_cnt, 0, clkPeriod)
-        return OpRealizationMeta(latency_pre=float(latency_pre), cycles_latency=float(cycles_latency))
-
-    @lru_cache()
-    def get_ff_store_time(self, realTimeClkPeriod: float, schedulerResolution: float):
-        return int(self.get_op_realization(ResourceFF, 1, 1, realTimeClkPeriod).latency_pre // schedulerResolution)
+        elif op is ResourceFF:
+            maxDelay = clkPeriod
+        else:
+            # the register at the end of the path requires some time to store the value
+            maxDelay = clkPeriod - self._delayTable.getDelay(ResourceFF, 0, 1)
+        (cycles_latency, latency_pre) = self._delayTable.resolveLatency(op, bit_width, 0, maxDelay)
+        return OpRealizationMeta(latency_pre=latency_pre, cycles_latency=cycles_latency)
@@ -0,0 +1,210 @@
+from heapq import heappush, heappop
+from math import ceil
+from typing import Dict, Optional, List, Tuple, Iterable
+
+from hwt.hdl.operatorDefs import OpDefinition, AllOps
+from hwtHls.clk_math import start_clk, start_of_next_clk_period
+from hwtHls.netlist.analysis.indexedGraph import HlsNetlistIndexedGraph
+from hwtHls.netlist.nodes.node import HlsNetNode
+from hwtHls.netlist.nodes.ops import HlsNetNodeOperator
+from hwtHls.scheduler.errors import TimeConstraintError
+from hwtHls.scheduler.scheduler import HlsScheduler
+
+
+class HlsListScheduler(HlsScheduler):
+    """
+    Resource constrained list scheduler.
+    The nodes are scheduled ASAP in topological order, the ready nodes are prioritized by its ALAP time
+    (the node with the lowest mobility first). If the clock period where the node should be scheduled
+    has no free unit for the operator of the node the node is moved to next clock period.
+
+    The constraints are also respected by :class:`hwtHls.allocator.allocator.HlsAllocator`, the operators of constrained
+    type scheduled in different clock periods are bound to shared units
+    (:class:`hwtHls.allocator.functionalUnitSharing.HlsFunctionalUnitBinding`). The pipeline which would require
+    more units than allowed is realized as a FSM (the next iteration starts after the last stage).
+    The scheduler reserves the time for the multiplexers on operands of the shared units.
+
+    :note: Only the operators with same types of operands and result in a single architectural element are shared.
+
+    Example of use:
+
+    .. code-block:: Python
+
+        VirtualHlsPlatform(scheduler=partial(HlsListScheduler, resourceConstraints={AllOps.MUL: 1}))
+
+    :ivar resourceConstraints: maximum number of units of specified operator
+    :ivar resourceUsage: number of used units of an operator for each clock period index
+    :ivar achievedII: the initiation interval achieved with the units, the maximum over constrained operators of
+        ceil(number of clock periods the units are occupied / number of units)
+    :ivar _operandMuxDelay: the delay of the operand multiplexer of the shared unit reserved before each operator
+    """
+
+    def __init__(self, parentHls: "HlsPipeline", resolution: float,
+                 resourceConstraints: Optional[Dict[OpDefinition, int]]=None):
+        HlsScheduler.__init__(self, parentHls, resolution)
+        if resourceConstraints is None:
+            resourceConstraints = {}
+        for op, limit in resourceConstraints.items():
+            if limit < 1:
+                raise ValueError("Resource limit must be at least 1", op, limit)
+        self.resourceConstraints = resourceConstraints
+        self.resourceUsage: Dict[OpDefinition, Dict[int, int]] = {}
+        self.achievedII = 1
+        self._operandMuxDelay: Dict[OpDefinition, int] = {}
+
+    def _getConstrainedOperator(self, node: HlsNetNode) -> Optional[OpDefinition]:
+        if isinstance(node, HlsNetNodeOperator) and node.operator in self.resourceConstraints:
+            return node.operator
+        return None
+
+    def _iterOccupiedClkIndexes(self, node: HlsNetNode, clkPeriod: int) -> Iterable[int]:
+        """
+        Clock period indexes in which the unit of this node can not process other data.
+        """
+        startClkI = start_clk(min(node.scheduledIn), clkPeriod)
+        busyCycles = max(node.cycles_delay) if node.cycles_delay else 0
+        return range(startClkI, startClkI + int(busyCycles) + 1)
+
+    def _moveToNextClkPeriod(self, node: HlsNetNode, clkPeriod: int):
+        startT = min(node.scheduledIn)
+        off = start_of_next_clk_period(startT, clkPeriod) - startT
+        self._shiftNode(node, off)
+
+    @staticmethod
+    def _shiftNode(node: HlsNetNode, off: int):
+        node.scheduledIn = tuple(t + off for t in node.scheduledIn)
+        node.scheduledOut = tuple(t + off for t in node.scheduledOut)
+
+    def _resolveOperandMuxDelays(self):
+        """
+        Resolve the delay of the operand multiplexer for each constrained operator which has more instances
+        than units. The number of multiplexer inputs is not known before the binding,
+        the worst case (the maximum number of operators bound to a single unit) is used.
+        """
+        hls = self.parentHls
+        instances: Dict[OpDefinition, List[HlsNetNodeOperator]] = {}
+        for n in hls.iterAllNodes():
+            op = self._getConstrainedOperator(n)
+            if op is not None:
+                instances.setdefault(op, []).append(n)
+
+        operandMuxDelay = self._operandMuxDelay = {}
+        for op, nodes in instances.items():
+            inputCnt = len(nodes) - self.resourceConstraints[op] + 1
+            if inputCnt <= 1:
+                continue
+            width = max(dep._dtype.bit_length() for n in nodes for dep in n.dependsOn)
+            r = hls.platform.get_op_realization(AllOps.TERNARY, width, inputCnt, hls.realTimeClkPeriod)
+            operandMuxDelay[op] = int(r.latency_pre // self.resolution)
+
+    def _reserveOperandMuxDelay(self, node: HlsNetNode, muxDelay: int, clkPeriod: int):
+        """
+        Delay the node so the operand multiplexer fits in front of it in the same clock period.
+        """
+        if not muxDelay or any(node.cycles_latency):
+            # the multi cycle operators are never shared
+            return
+        self._shiftNode(node, muxDelay)
+        if start_clk(max(node.scheduledOut), clkPeriod) != start_clk(min(node.scheduledIn), clkPeriod):
+            self._moveToNextClkPeriod(node, clkPeriod)
+            self._shiftNode(node, muxDelay)
+            if start_clk(max(node.scheduledOut), clkPeriod) != start_clk(min(node.scheduledIn), clkPeriod):
+                raise TimeConstraintError("Operator with an operand multiplexer does not fit into clock period", node, muxDelay)
+
+    def _scheduleAsapResourceConstrained(self, priority: Dict[HlsNetNode, int]):
+        """
+        List scheduling, Kahn's algorithm where ready nodes are ordered by priority.
+        """
+        clkPeriod: int = self.parentHls.normalizedClkPeriod
+        graph = HlsNetlistIndexedGraph(self.parentHls.iterAllNodes())
+        nodes = graph.nodes
+        unresolvedDepCnt = graph.getUnresolvedDependencyCounts()
+        ready: List[Tuple[int, int, int]] = []
+        for nI, n in enumerate(nodes):
+            if unresolvedDepCnt[nI] == 0:
+                heappush(ready, (priority[n], n._id, nI))
+
+        resourceUsage = self.resourceUsage = {op: {} for op in self.resourceConstraints.keys()}
+        resolvedCnt = 0
+        while ready:
+            _, _, nI = heappop(ready)
+            n = nodes[nI]
+            resolvedCnt += 1
+            n.scheduleAsap(None)
+            op = self._getConstrainedOperator(n)
+            if op is not None:
+                limit = self.resourceConstraints[op]
+                usage = resourceUsage[op]
+                muxDelay = self._operandMuxDelay.get(op, 0)
+                self._reserveOperandMuxDelay(n, muxDelay, clkPeriod)
+                while any(usage.get(clkI, 0) >= limit for clkI in self._iterOccupiedClkIndexes(n, clkPeriod)):
+                    self._moveToNextClkPeriod(n, clkPeriod)
+                    self._reserveOperandMuxDelay(n, muxDelay, clkPeriod)
+
+                for clkI in self._iterOccupiedClkIndexes(n, clkPeriod):
+                    usage[clkI] = usage.get(clkI, 0) + 1
+
+            for sucI in graph.iterUses(nI):
+                c = unresolvedDepCnt[sucI] - 1
+                unresolvedDepCnt[sucI] = c
+                if c == 0:
+                    suc = nodes[sucI]
+                    heappush(ready, (priority[suc], suc._id, sucI))
+
+        if resolvedCnt != len(nodes):
+            raise AssertionError("Cycle in graph", graph.findCycle(unresolvedDepCnt))
+
+        self.achievedII = max((ceil(sum(usage.values()) / self.resourceConstraints[op])
+                               for op, usage in resourceUsage.items()), default=1)
+
+    def copyState(self, nodes: List[HlsNetNode]) -> Dict[str, object]:
+        state = HlsScheduler.copyState(self, nodes)
+        # the operators are not transfered between processes, the usage is indexed by the order of constraints,
+        # the usage of each operator is stored as a list of pairs (clock period index, usage) because the keys
+        # of JSON objects are strings
+        state["resourceUsage"] = [None if usage is None else sorted(usage.items())
+                                  for usage in (self.resourceUsage.get(op, None) for op in self.resourceConstraints.keys())]
+        state["achievedII"] = self.achievedII
+        return state
+
+    def applyState(self, nodes: List[HlsNetNode], state: Dict[str, object]):
+        HlsScheduler.applyState(self, nodes, state)
+        self.resourceUsage = {op: {clkI: cnt for clkI, cnt in usage}
+                              for op, usage in zip(self.resourceConstraints.keys(), state["resourceUsage"])
+                              if usage is not None}
+        self.achievedII = state["achievedII"]
+
+    def getMaxUsage(self, op: OpDefinition) -> int:
+        """
+        :return: the maximum number of operators of specified type in a single clock period in the actual schedule
+            (the number of units allocated for the operator)
+        """
+        usage = self.resourceUsage.get(op, None)
+        if not usage:
+            return 0
+        return max(usage.values())
+
+    def schedule(self):
+        # the unconstrained schedule is used to resolve the mobility of the nodes
+        HlsScheduler.schedule(self)
+        priority: Dict[HlsNetNode, int] = {}
+        for n in self.parentHls.iterAllNodes():
+            if n.scheduledIn:
+                t = min(n.scheduledIn)
+            else:
+                t = min(n.scheduledOut)
+            priority[n] = t
+
+        for n in self.parentHls.iterAllNodes():
+            n.resetScheduling()
+
+        self._resolveOperandMuxDelays()
+        self._scheduleAsapResourceConstrained(priority)
+        self._checkAllNodesScheduled()
+        self._asapSchedule = None
+
+    def scheduleIncremental(self, dirtyNodes: Iterable[HlsNetNode]):
+        """
+        :note: The resource usage is global, the incremental scheduling is not supported and full scheduling is performed instead.
+        """
+        self.schedule()
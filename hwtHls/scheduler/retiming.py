@@ -0,0 +1,259 @@
+from typing import Dict, List, Set, Tuple
+
+from hwtHls.clk_math import start_clk
+from hwtHls.netlist.nodes.const import HlsNetNodeConst
+from hwtHls.netlist.nodes.io import HOrderingVoidT
+from hwtHls.netlist.nodes.node import HlsNetNode, SchedulizationDict
+from hwtHls.netlist.nodes.ops import HlsNetNodeOperator
+from hwtHls.netlist.nodes.ports import HlsNetNodeOut
+
+
+class HlsScheduleRetimingStats():
+    """
+    The result of the retiming of a single :class:`hwtHls.hlsPipeline.HlsPipeline`.
+
+    :ivar registerBitsBefore: the number of register bits before the retiming
+    :ivar registerBitsAfter: the number of register bits after the retiming
+    :ivar movedNodes: the number of moves performed by the retiming
+    """
+
+    def __init__(self, registerBitsBefore: int, registerBitsAfter: int, movedNodes: int):
+        self.registerBitsBefore = registerBitsBefore
+        self.registerBitsAfter = registerBitsAfter
+        self.movedNodes = movedNodes
+
+    def __repr__(self):
+        return (f"<{self.__class__.__name__:s} registerBits: {self.registerBitsBefore:d}->{self.registerBitsAfter:d},"
+                f" movedNodes: {self.movedNodes:d}>")
+
+
+class _HlsScheduleRetimingRun():
+    """
+    The state of a single run of :class:`~.HlsScheduleRetiming` on a single :class:`hwtHls.hlsPipeline.HlsPipeline`.
+
+    :ivar initialOutEnd: the end of the output of the movable nodes in the original schedule,
+        the original schedule may already violate the timing, such a node must not be considered invalid
+        in its original clock period
+    """
+
+    def __init__(self, hls: "HlsPipeline"):
+        scheduler = hls.scheduler
+        self.scheduler = scheduler
+        self.clkPeriod = hls.normalizedClkPeriod
+        self.epsilon = scheduler.epsilon
+        self.ffDelay = hls.platform.get_ff_store_time(hls.realTimeClkPeriod, scheduler.resolution)
+        self.nodes: List[HlsNetNode] = list(hls.iterAllNodes())
+        self.nodesInTopologicalOrder: List[HlsNetNode] = list(scheduler._iterNodesInTopologicalOrder(self.nodes))
+        self.movable: Set[HlsNetNode] = set(n for n in self.nodes if self._isMovable(n))
+        self.initialOutEnd: Dict[Tuple[HlsNetNode, int], int] = {}
+        for n in self.movable:
+            self.initialOutEnd[(n, self._getClkI(n))] = max(n.scheduledOut)
+
+    @staticmethod
+    def _isMovable(n: HlsNetNode) -> bool:
+        return isinstance(n, HlsNetNodeOperator) and\
+            bool(n._inputs) and\
+            not any(n.in_cycles_offset) and\
+            not any(n.cycles_latency)
+
+    def _getOutputRegisterBits(self, o: HlsNetNodeOut) -> int:
+        n = o.obj
+        if isinstance(n, HlsNetNodeConst) or o._dtype is HOrderingVoidT:
+            return 0
+        uses = n.usedBy[o.out_i]
+        if not uses:
+            return 0
+        clkPeriod = self.clkPeriod
+        lifetime = max(start_clk(u.obj.scheduledIn[u.in_i], clkPeriod) for u in uses) - start_clk(n.scheduledOut[o.out_i], clkPeriod)
+        if lifetime > 0:
+            return lifetime * o._dtype.bit_length()
+        return 0
+
+    def countRegisterBits(self, nodes: List[HlsNetNode]) -> int:
+        """
+        Count the number of bits of registers which are required to pass the values between clock periods.
+        """
+        return sum(self._getOutputRegisterBits(o) for n in nodes for o in n._outputs)
+
+    def _getAffectedOutputs(self, n: HlsNetNode) -> List[HlsNetNodeOut]:
+        outputs = list(n._outputs)
+        for dep in n.dependsOn:
+            if dep not in outputs:
+                outputs.append(dep)
+        return outputs
+
+    def _getClkI(self, n: HlsNetNode) -> int:
+        return start_clk(n.scheduledOut[0], self.clkPeriod)
+
+    def _canMoveTo(self, n: HlsNetNode, clkI: int) -> bool:
+        if clkI < 0:
+            return False
+        clkPeriod = self.clkPeriod
+        for dep in n.dependsOn:
+            if isinstance(dep.obj, HlsNetNodeConst):
+                continue
+            if start_clk(dep.obj.scheduledOut[dep.out_i], clkPeriod) > clkI:
+                return False
+        for uses in n.usedBy:
+            for u in uses:
+                if start_clk(u.obj.scheduledIn[u.in_i], clkPeriod) < clkI:
+                    return False
+        return True
+
+    def _scheduleInClkPeriod(self, n: HlsNetNode, clkI: int) -> bool:
+        """
+        Schedule the operator as soon as possible in the specified clock period.
+
+        :return: True if the operator fits into the clock period
+        """
+        clkPeriod = self.clkPeriod
+        clkBegin = clkI * clkPeriod
+        t = clkBegin
+        for dep, inDelay in zip(n.dependsOn, n.latency_pre):
+            if isinstance(dep.obj, HlsNetNodeConst):
+                available = clkBegin
+            else:
+                available = dep.obj.scheduledOut[dep.out_i]
+                depClkI = start_clk(available, clkPeriod)
+                if depClkI > clkI:
+                    return False
+                elif depClkI < clkI:
+                    # the value is taken from the register
+                    available = clkBegin
+            t = max(t, available + inDelay)
+
+        n.scheduledIn = tuple(t - inDelay for inDelay in n.latency_pre)
+        n.scheduledOut = tuple(t + outDelay for outDelay in n.latency_post)
+        limit = (clkI + 1) * clkPeriod - self.ffDelay - self.epsilon
+        initialOutEnd = self.initialOutEnd.get((n, clkI), None)
+        if initialOutEnd is not None and initialOutEnd > limit:
+            limit = initialOutEnd
+        return max(n.scheduledOut) <= limit
+
+    def _rescheduleClkPeriods(self, clks: Set[int], movedNode: HlsNetNode, movedNodeClkI: int) -> bool:
+        """
+        Schedule all movable nodes in specified clock periods as soon as possible and check the timing.
+        """
+        rescheduled: List[HlsNetNode] = []
+        for n in self.nodesInTopologicalOrder:
+            if n is movedNode:
+                clkI = movedNodeClkI
+            elif n in self.movable:
+                clkI = self._getClkI(n)
+                if clkI not in clks:
+                    continue
+            else:
+                continue
+
+            if not self._scheduleInClkPeriod(n, clkI):
+                return False
+            rescheduled.append(n)
+
+        for n in rescheduled:
+            for t, uses in zip(n.scheduledOut, n.usedBy):
+                for u in uses:
+                    if u.obj.scheduledIn[u.in_i] < t:
+                        return False
+        return True
+
+    def _snapshot(self, clks: Set[int], n: HlsNetNode) -> SchedulizationDict:
+        schedule: SchedulizationDict = {n: (n.scheduledIn, n.scheduledOut)}
+        for other in self.movable:
+            if self._getClkI(other) in clks:
+                schedule[other] = (other.scheduledIn, other.scheduledOut)
+        return schedule
+
+    @staticmethod
+    def _restore(schedule: SchedulizationDict):
+        for n, (inT, outT) in schedule.items():
+            n.scheduledIn = inT
+            n.scheduledOut = outT
+
+    def _tryMove(self, n: HlsNetNode, dstClkI: int) -> bool:
+        if not self._canMoveTo(n, dstClkI):
+            return False
+
+        affectedOutputs = self._getAffectedOutputs(n)
+        before = sum(self._getOutputRegisterBits(o) for o in affectedOutputs)
+        srcClkI = self._getClkI(n)
+        clks = {srcClkI, dstClkI}
+        schedule = self._snapshot(clks, n)
+        if self._rescheduleClkPeriods(clks, n, dstClkI):
+            after = sum(self._getOutputRegisterBits(o) for o in affectedOutputs)
+            if after < before:
+                return True
+
+        self._restore(schedule)
+        return False
+
+    @staticmethod
+    def _scheduleConsts(nodes: List[HlsNetNode]):
+        for n in nodes:
+            if isinstance(n, HlsNetNodeConst) and n.usedBy[0]:
+                # same as in :meth:`hwtHls.scheduler.scheduler.HlsScheduler._scheduleAlapCompactionForNodes`
+                n.scheduledOut = (min(u.obj.scheduledIn[u.in_i] for u in n.usedBy[0]),)
+
+    def run(self, maxIterations: int) -> HlsScheduleRetimingStats:
+        nodes = self.nodes
+        registerBitsBefore = self.countRegisterBits(nodes)
+        moved = 0
+        for _ in range(maxIterations):
+            changed = False
+            for n in self.nodesInTopologicalOrder:
+                if n not in self.movable:
+                    continue
+                clkI = self._getClkI(n)
+                if self._tryMove(n, clkI + 1) or self._tryMove(n, clkI - 1):
+                    moved += 1
+                    changed = True
+
+            if not changed:
+                break
+
+        if moved:
+            self._scheduleConsts(nodes)
+            self.scheduler._checkAllNodesScheduled()
+
+        return HlsScheduleRetimingStats(registerBitsBefore, self.countRegisterBits(nodes), moved)
+
+
+class HlsScheduleRetiming():
+    """
+    Post-schedule retiming which moves the clock period boundaries across operators to reduce the number
+    of register bits (e.g. a comparator of wide operands is moved to the clock period where the operands are produced
+    so only its 1b result is passed to next clock period instead of the operands).
+
+    * Only single clock period operators (:class:`hwtHls.netlist.nodes.ops.HlsNetNodeOperator`) are moved,
+      IO and all other nodes keep their position in the schedule.
+    * The operator is moved by one clock period at once if its dependencies are available in the new clock period,
+      all its users are in the same or later clock period and the move strictly reduces the number of register bits.
+    * After the move the operators in the affected clock periods are scheduled as soon as possible in their clock period,
+      the move is reverted if some operator would not fit into its clock period (including flip-flop store time)
+      or if the time of the input of some other node would not be satisfied.
+    * Moves are repeated until there is no improvement or until maxIterations passes over the netlist are performed.
+
+    Example of use:
+
+    .. code-block:: Python
+
+        VirtualHlsPlatform(scheduleRetiming=HlsScheduleRetiming())
+
+    :ivar maxIterations: the maximum number of passes over all nodes
+    :note: The statistics of the retiming are stored per pipeline in :attr:`hwtHls.hlsPipeline.HlsPipeline.retimingStats`.
+    """
+
+    def __init__(self, maxIterations: int=16):
+        if maxIterations < 1:
+            raise ValueError("Number of iterations must be at least 1", maxIterations)
+        self.maxIterations = maxIterations
+
+    def apply(self, hls: "HlsPipeline") -> HlsScheduleRetimingStats:
+        """
+        Retime the schedule of the pipeline.
+
+        :note: This object is shared by all pipelines of the platform, the state of the run is kept only
+            in :class:`~._HlsScheduleRetimingRun`.
+        :return: the statistics of this run, it is also stored in :attr:`hwtHls.hlsPipeline.HlsPipeline.retimingStats`
+            by :meth:`hwtHls.hlsPipeline.HlsPipeline._retime`
+        """
+        return _HlsScheduleRetimingRun(hls).run(self.maxIterations)
@@ -0,0 +1,281 @@
+from functools import partial
+from hashlib import sha256
+import json
+import os
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+from typing import Generator, List, Optional, Union, Sequence, Tuple
+
+from hwtHls.netlist.nodes.aggregatedBitwiseOps import HlsNetNodeBitwiseOps
+from hwtHls.netlist.nodes.backwardEdge import HlsNetNodeWriteBackwardEdge
+from hwtHls.netlist.nodes.const import HlsNetNodeConst
+from hwtHls.netlist.nodes.io import HOrderingVoidT, HlsNetNodeRead, HlsNetNodeWrite
+from hwtHls.netlist.nodes.node import HlsNetNode
+from hwtHls.netlist.nodes.ops import HlsNetNodeOperator
+from hwtHls.netlist.nodes.ports import HlsNetNodeIn
+from hwtHls.scheduler.retiming import HlsScheduleRetimingStats
+
+# for each node (times of inputs, times of outputs) and for the nodes inside of composite nodes also
+# the realization (latency_pre, latency_post, in_cycles_offset, cycles_latency, cycles_delay)
+NetlistSchedule = List[Union[Tuple[Tuple[int, ...], Tuple[int, ...]],
+                             Tuple[Tuple[int, ...], Tuple[int, ...], Tuple[Tuple[Union[int, float], ...], ...]]]]
+
+
+def _getDefaultCacheDirectory() -> Path:
+    xdgCache = os.environ.get("XDG_CACHE_HOME", None)
+    if xdgCache:
+        return Path(xdgCache) / "hwtHls"
+    return Path.home() / ".cache" / "hwtHls"
+
+
+def _reprCallableForKey(fn) -> str:
+    if isinstance(fn, partial):
+        args = [_reprCallableForKey(fn.func), *(repr(a) for a in fn.args)]
+        args.extend(f"{k}={v!r}" for k, v in sorted(fn.keywords.items()))
+        return f"partial({', '.join(args)})"
+    return f"{fn.__module__}.{fn.__qualname__}"
+
+
+def _iterNetlistNodes(hls: "HlsPipeline") -> Generator[Tuple[HlsNetNode, bool], None, None]:
+    """
+    :return: generator of tuples (node, is inside of composite node)
+    """
+    for n in hls.iterAllNodes():
+        if isinstance(n, HlsNetNodeBitwiseOps):
+            for subNode in n._subNodes.nodes:
+                yield subNode, True
+        yield n, False
+
+
+def collectNetlistNodes(hls: "HlsPipeline") -> List[HlsNetNode]:
+    """
+    Collect all nodes including nodes inside of composite nodes in deterministic order.
+    """
+    return [n for n, _ in _iterNetlistNodes(hls)]
+
+
+def copyNetlistSchedule(hls: "HlsPipeline") -> NetlistSchedule:
+    """
+    Copy the schedule of all nodes to a form which does not reference the nodes
+    and can be stored or transfered between processes.
+
+    :note: The realization of the nodes inside of :class:`hwtHls.netlist.nodes.aggregatedBitwiseOps.HlsNetNodeBitwiseOps`
+        depends on the number of inputs of the cluster resolved during scheduling, it is stored with the schedule.
+    """
+    schedule = []
+    for n, isSubNode in _iterNetlistNodes(hls):
+        if isSubNode:
+            schedule.append((n.scheduledIn, n.scheduledOut,
+                             (n.latency_pre, n.latency_post, n.in_cycles_offset, n.cycles_latency, n.cycles_delay)))
+        else:
+            schedule.append((n.scheduledIn, n.scheduledOut))
+    return schedule
+
+
+def applyNetlistSchedule(hls: "HlsPipeline", schedule: NetlistSchedule) -> bool:
+    """
+    Assign the schedule from :func:`~.copyNetlistSchedule` to nodes of the same netlist.
+
+    :return: False if the schedule does not correspond to the netlist
+    """
+    nodes = list(_iterNetlistNodes(hls))
+    if len(schedule) != len(nodes):
+        return False
+    for (_, isSubNode), sch in zip(nodes, schedule):
+        if (len(sch) == 3) != isSubNode:
+            return False
+
+    for (n, isSubNode), sch in zip(nodes, schedule):
+        if isSubNode:
+            inT, outT, (latency_pre, latency_post, in_cycles_offset, cycles_latency, cycles_delay) = sch
+            # the realization resolved for the cluster during scheduling
+            n.latency_pre = tuple(latency_pre)
+            n.latency_post = tuple(latency_post)
+            n.in_cycles_offset = tuple(in_cycles_offset)
+            n.cycles_latency = tuple(cycles_latency)
+            n.cycles_delay = tuple(cycles_delay)
+        else:
+            inT, outT = sch
+            if not isinstance(n, HlsNetNodeBitwiseOps):
+                # latencies of the nodes are later used by allocator
+                n.resolve_realization()
+        n.scheduledIn = tuple(inT)
+        n.scheduledOut = tuple(outT)
+
+    return True
+
+
+class HlsScheduleCache():
+    """
+    Persistent content-addressed cache of the results of scheduling.
+
+    The key is a hash of the netlist structure (including the operator realizations
+    resolved by the platform, which makes the key depend on the operator delay tables),
+    the clock period, the scheduler and the list of passes.
+    The value is the schedule of every node in the netlist, the state of the scheduler
+    (:meth:`hwtHls.scheduler.scheduler.HlsScheduler.copyState`) and the statistics of the retiming
+    (:attr:`hwtHls.hlsPipeline.HlsPipeline.retimingStats`).
+
+    :note: The lookup is performed on the netlist after the SSA, LLVM and netlist passes, only the scheduling
+        and the retiming is skipped on hit. The netlist and the RTL can not be stored because they reference
+        the interfaces and signals of the parent :class:`hwt.synthesizer.unit.Unit` and the results
+        of the scheduling are applied on the netlist nodes.
+
+    The cache directory is limited in size, least recently used records are removed first.
+
+    Example of use:
+
+    .. code-block:: Python
+
+        VirtualHlsPlatform(compileCache=HlsScheduleCache())
+
+    :ivar directory: the directory where the records are stored (default ~/.cache/hwtHls)
+    :ivar maxSize: the maximum size of all records in bytes
+    :ivar hits: the number of records successfully loaded
+    :ivar misses: the number of records which were not found
+    """
+    VERSION = 5
+
+    def __init__(self, directory: Optional[Union[str, Path]]=None, maxSize: int=256 * 1024 * 1024):
+        if directory is None:
+            directory = _getDefaultCacheDirectory()
+        self.directory = Path(directory)
+        if maxSize <= 0:
+            raise ValueError("Cache size must be positive", maxSize)
+        self.maxSize = maxSize
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _serializeNode(n: HlsNetNode, nodeIndex: dict) -> list:
+        deps = []
+        for dep in n.dependsOn:
+            if isinstance(dep, HlsNetNodeIn):
+                # a placeholder for an input of composite node
+                deps.append(("in", nodeIndex.get(dep.obj, -1), dep.in_i))
+            else:
+                deps.append((nodeIndex.get(dep.obj, -1), dep.out_i))
+
+        outputs = [
+            "void" if o._dtype is HOrderingVoidT else repr(o._dtype)
+            for o in n._outputs
+        ]
+        d = [n.__class__.__qualname__, n._id, deps, outputs]
+        if isinstance(n, HlsNetNodeOperator):
+            n.resolve_realization()
+            d.append(n.operator.id)
+            d.append([n.latency_pre, n.latency_post, n.in_cycles_offset, n.cycles_latency, n.cycles_delay])
+        elif isinstance(n, HlsNetNodeConst):
+            d.append(repr(n.val))
+        elif isinstance(n, HlsNetNodeRead):
+            d.append(getattr(n.src, "_name", None))
+            if n.requestLatency is not None:
+                d.append(n.requestLatency[1])
+        elif isinstance(n, HlsNetNodeWrite):
+            d.append(getattr(n.dst, "_name", None))
+            port = getattr(n.dst, "_hlsMemoryPort", None)
+            if port is not None:
+                d.append(port.hasWrite)
+            if isinstance(n, HlsNetNodeWriteBackwardEdge):
+                d.append(n.maxII)
+        return d
+
+    def getKey(self, hls: "HlsPipeline", passes: Sequence[object]) -> str:
+        """
+        :param passes: the list of passes which were applied on the netlist or which will be applied later
+        """
+        nodes = collectNetlistNodes(hls)
+        nodeIndex = {n: i for i, n in enumerate(nodes)}
+        platform = hls.platform
+        keyData = {
+            "version": self.VERSION,
+            "platform": _reprCallableForKey(platform.__class__),
+            "scheduler": _reprCallableForKey(platform.scheduler),
+            "retiming": None if platform.scheduleRetiming is None else
+                        [_reprCallableForKey(platform.scheduleRetiming.__class__), platform.scheduleRetiming.maxIterations],
+            "normalizedClkPeriod": hls.normalizedClkPeriod,
+            "resolution": hls.scheduler.resolution,
+            "ffDelay": platform.get_ff_store_time(hls.realTimeClkPeriod, hls.scheduler.resolution),
+            "passes": [_reprCallableForKey(p.__class__) for p in passes],
+            "nodes": [self._serializeNode(n, nodeIndex) for n in nodes],
+        }
+        return sha256(json.dumps(keyData, default=repr).encode()).hexdigest()
+
+    def _getRecordPath(self, key: str) -> Path:
+        return self.directory / f"{key:s}.json"
+
+    def load(self, key: str, hls: "HlsPipeline") -> bool:
+        """
+        Load the schedule and assign it to nodes, restore the state of the scheduler and the statistics of the retiming.
+
+        :return: True if the schedule was found in cache
+        """
+        p = self._getRecordPath(key)
+        try:
+            with open(p) as f:
+                record = json.load(f)
+            schedule = record["schedule"]
+            schedulerState = record["schedulerState"]
+            retimingStats = record["retimingStats"]
+        except (OSError, ValueError, KeyError, TypeError):
+            self.misses += 1
+            return False
+
+        if not applyNetlistSchedule(hls, schedule):
+            self.misses += 1
+            return False
+
+        hls.scheduler.applyState(collectNetlistNodes(hls), schedulerState)
+        hls.retimingStats = None if retimingStats is None else HlsScheduleRetimingStats(**retimingStats)
+
+        # mark as recently used
+        os.utime(p)
+        self.hits += 1
+        return True
+
+    def store(self, key: str, hls: "HlsPipeline"):
+        """
+        Store the schedule of the netlist, the state of the scheduler and the statistics of the retiming
+        and remove the least recently used records if the cache is too large.
+        """
+        retimingStats = hls.retimingStats
+        record = {
+            "schedule": copyNetlistSchedule(hls),
+            "schedulerState": hls.scheduler.copyState(collectNetlistNodes(hls)),
+            "retimingStats": None if retimingStats is None else vars(retimingStats),
+        }
+        self.directory.mkdir(parents=True, exist_ok=True)
+        # write to a temporary file first so the other processes never see the incomplete record
+        with NamedTemporaryFile("w", dir=self.directory, suffix=".tmp", delete=False) as f:
+            json.dump(record, f)
+        os.replace(f.name, self._getRecordPath(key))
+        self._evict()
+
+    def _evict(self):
+        records = []
+        totalSize = 0
+        for p in self.directory.glob("*.json"):
+            try:
+                st = p.stat()
+            except OSError:
+                # removed by other process
+                continue
+            records.append((st.st_mtime, st.st_size, p))
+            totalSize += st.st_size
+
+        if totalSize <= self.maxSize:
+            return
+
+        records.sort()
+        for _, size, p in records:
+            try:
+                p.unlink()
+            except OSError:
+                pass
+            totalSize -= size
+            if totalSize <= self.maxSize:
+                break
+
+    def clear(self):
+        for p in self.directory.glob("*.json"):
+            p.unlink()
@@ -1,9 +1,16 @@
+from collections import deque
 from math import inf, ceil
+from typing import Iterable, Generator, List, Optional, Tuple, Dict
 
 from hwt.pyUtils.uniqList import UniqList
+from hwtHls.clk_math import start_clk
+from hwtHls.netlist.analysis.indexedGraph import HlsNetlistIndexedGraph
+from hwtHls.netlist.nodes.backwardEdge import HlsNetNodeWriteBackwardEdge, \
+    HlsNetNodeReadBackwardEdge
 from hwtHls.netlist.nodes.const import HlsNetNodeConst
 from hwtHls.netlist.nodes.loopHeader import HlsLoopGate
 from hwtHls.netlist.nodes.node import HlsNetNode, SchedulizationDict
+from hwtHls.scheduler.errors import TimeConstraintError
 
 
 class HlsScheduler():
@@ -13,18 +20,46 @@ class HlsScheduler():
     :ivar parentHls: The reference on parent HLS context which is this scheduler for.
     :ivar resolution: The time resolution specified in seconds (1e-9 is 1ns). 
     :ivar epsilon: The minimal step of time allowed.
+    :ivar _asapSchedule: ASAP schedule from the last scheduling (used for incremental rescheduling)
+    :ivar _alapOffset: The time offset applied to the whole schedule after ALAP compaction in last scheduling
     """
     
     def __init__(self, parentHls: "HlsPipeline", resolution):
         self.parentHls = parentHls
         self.resolution = resolution
         self.epsilon = 1
+        self._asapSchedule: Optional[SchedulizationDict] = None
+        self._alapOffset: int = 0
 
-    def _checkAllNodesScheduled(self):
+    def copyState(self, nodes: List[HlsNetNode]) -> Dict[str, object]:
+        """
+        Copy the state of the scheduler from the last scheduling to a form which does not reference the nodes
+        and can be transfered between processes or stored as JSON.
+
+        :param nodes: all nodes of the netlist in the order of :func:`hwtHls.scheduler.scheduleCache.collectNetlistNodes`
+        """
+        asapSchedule = self._asapSchedule
+        if asapSchedule is not None:
+            asapSchedule = [asapSchedule.get(n, None) for n in nodes]
+        return {"_asapSchedule": asapSchedule, "_alapOffset": self._alapOffset}
+
+    def applyState(self, nodes: List[HlsNetNode], state: Dict[str, object]):
+        """
+        Restore the state from :meth:`~.copyState` on the scheduler of the same netlist.
+        """
+        asapSchedule = state["_asapSchedule"]
+        if asapSchedule is not None:
+            asapSchedule = {n: (tuple(sch[0]), tuple(sch[1])) for n, sch in zip(nodes, asapSchedule) if sch is not None}
+        self._asapSchedule = asapSchedule
+        self._alapOffset = state["_alapOffset"]
+
+    def _checkAllNodesScheduled(self, nodes: Optional[Iterable[HlsNetNode]]=None):
         """
         Check that all nodes do have some time resolved by scheduler.
         """
-        for node in self.parentHls.iterAllNodes():
+        if nodes is None:
+            nodes = self.parentHls.iterAllNodes()
+        for node in nodes:
             assert node.scheduledIn is not None, node
             assert node.scheduledOut is not None, node
             for i, iT, dep in zip(node._inputs, node.scheduledIn, node.dependsOn):
@@ -33,24 +68,89 @@ class HlsScheduler():
                 assert isinstance(oT, int), (dep, oT)
                 assert iT >= oT, (dep, i, oT, iT)
 
+    def _iterNodesInTopologicalOrder(self, nodes: Iterable[HlsNetNode]) -> Generator[HlsNetNode, None, None]:
+        """
+        Yield nodes so that every node is yielded after all nodes it depends on.
+        The dependencies on nodes which are not in "nodes" are considered to be already resolved.
+
+        :see: :meth:`hwtHls.netlist.analysis.indexedGraph.HlsNetlistIndexedGraph.topologicalOrder`
+        """
+        graph = HlsNetlistIndexedGraph(nodes)
+        _nodes = graph.nodes
+        for nI in graph.topologicalOrder():
+            yield _nodes[nI]
+
     def _scheduleAsap(self):
         """
         As Soon As Possible scheduler
         * The graph must not contain cycles.
-        * DFS from outputs, decorate nodes with scheduledIn,scheduledOut time.
-        """
-        try:
-            # normal run without checking for cycles
-            for o in self.parentHls.iterAllNodes():
-                o.scheduleAsap(None)
-            return
-        except RecursionError:
-            pass
-    
-        # debug run which will raise an exception containing cycle node ids
-        debugPath = UniqList()
-        for o in self.parentHls.iterAllNodes():
-            o.scheduleAsap(debugPath)
+        * Nodes are scheduled in topological order, when node is scheduled all its dependencies are already scheduled
+          and the node does not need to recursively resolve them.
+        * Cycles are detected by the topological sort.
+        """
+        for n in self._iterNodesInTopologicalOrder(self.parentHls.iterAllNodes()):
+            n.scheduleAsap(None)
+
+    def _collectLoopCarriedDependencies(self) -> List[Tuple[HlsNetNodeReadBackwardEdge, HlsNetNodeWriteBackwardEdge]]:
+        """
+        Collect the backward edges with the maximum initiation interval specified.
+        """
+        deps = []
+        for n in self.parentHls.iterAllNodes():
+            if isinstance(n, HlsNetNodeWriteBackwardEdge) and n.maxII is not None:
+                deps.append((n.associated_read, n))
+        return deps
+
+    def _resolveInitiationInterval(self, r: HlsNetNodeReadBackwardEdge, w: HlsNetNodeWriteBackwardEdge) -> int:
+        """
+        :return: the number of clock periods between the start of iteration and the start of the next iteration
+            limited by this loop-carried dependency
+        """
+        clkPeriod = self.parentHls.normalizedClkPeriod
+        return max(start_clk(w.scheduledIn[0], clkPeriod) - start_clk(r.scheduledOut[0], clkPeriod) + 1, 1)
+
+    def _formatLoopCarriedDependencyPath(self, r: HlsNetNodeReadBackwardEdge, w: HlsNetNodeWriteBackwardEdge) -> str:
+        """
+        Format the path which determines the time of the write for the error report.
+        (The latest dependency is followed from the write until the read or the node without dependencies is found.)
+        """
+        clkPeriod = self.parentHls.normalizedClkPeriod
+        path = [w]
+        n = w
+        while n is not r and n.dependsOn:
+            dep = max(n.dependsOn, key=lambda d: d.obj.scheduledOut[d.out_i])
+            n = dep.obj
+            path.append(n)
+
+        return "\n".join(f"    clk {start_clk(min(n.scheduledOut) if n.scheduledOut else min(n.scheduledIn), clkPeriod):d}: {n}"
+                         for n in reversed(path))
+
+    def _raiseInitiationIntervalError(self, r: HlsNetNodeReadBackwardEdge, w: HlsNetNodeWriteBackwardEdge):
+        achieved = self._resolveInitiationInterval(r, w)
+        raise TimeConstraintError(
+            f"Loop-carried dependency {r} -> {w} requires initiation interval {achieved:d}"
+            f" which exceeds the maximum initiation interval {w.maxII:d}, the path:\n{self._formatLoopCarriedDependencyPath(r, w):s}")
+
+    def getLoopInitiationIntervals(self) -> List[Tuple[HlsNetNodeReadBackwardEdge, HlsNetNodeWriteBackwardEdge, int]]:
+        """
+        Report the initiation interval achieved in the actual schedule for each loop-carried dependency
+        of the loops with the maximum initiation interval specified.
+        """
+        return [(r, w, self._resolveInitiationInterval(r, w)) for r, w in self._collectLoopCarriedDependencies()]
+
+    def _checkInitiationIntervals(self):
+        """
+        Check that the loop-carried dependencies of the loops do not require a longer initiation interval
+        than the maximum specified for the loop.
+
+        :note: This is only a check of the schedule, the scheduler does not reschedule the loop body
+            to achieve the initiation interval (there is no modulo scheduling and the iterations do not overlap).
+        :raise TimeConstraintError: if the path from the read to the write of the loop-carried dependency
+            is too long for the maximum initiation interval
+        """
+        for r, w in self._collectLoopCarriedDependencies():
+            if self._resolveInitiationInterval(r, w) > w.maxII:
+                self._raiseInitiationIntervalError(r, w)
 
     def _copyAndResetScheduling(self):
         currentSchedule: SchedulizationDict = {}
@@ -60,17 +160,22 @@ class HlsScheduler():
             node.resetScheduling()
             
         return currentSchedule
-        
-    def _scheduleAlapCompaction(self, asapSchedule: SchedulizationDict):
-        normalizedClkPeriod: int = self.parentHls.normalizedClkPeriod
-        for node in self.parentHls.iterAllNodes():
+
+    def _scheduleAlapCompactionForNodes(self, nodes: List[HlsNetNode], asapSchedule: SchedulizationDict) -> float:
+        """
+        Run ALAP compaction for specified nodes, the nodes which are using the outputs of this nodes
+        and are not in "nodes" are expected to be already scheduled.
+
+        :return: the minimal time found in the schedule of nodes
+        """
+        for node in nodes:
             if not node.usedBy or not any(node.usedBy):
                 # if it is terminator move to end of clk period
                 if isinstance(node, HlsLoopGate):
                     node.scheduledIn, node.scheduledOut = asapSchedule[node] 
         consts = UniqList()
         minTime = inf       
-        for node in self.parentHls.iterAllNodes():
+        for node in nodes:
             if isinstance(node, HlsNetNodeConst):
                 consts.append(node)
                 continue
@@ -90,16 +195,35 @@ class HlsScheduler():
             c.scheduledOut = (min(u.obj.scheduledIn[u.in_i] for u in c.usedBy[0]),)
             if node.scheduledOut:
                 minTime = min(minTime, min(node.scheduledOut))
+
+        return minTime
+
+    def _resolveScheduleOffset(self, minTime: float) -> Optional[int]:
+        """
+        Resolve the time offset which moves the schedule so it starts in the clock period 0.
+        """
+        normalizedClkPeriod: int = self.parentHls.normalizedClkPeriod
         if minTime < 0:
-            offset = -ceil(minTime / normalizedClkPeriod) * normalizedClkPeriod
+            return -ceil(minTime / normalizedClkPeriod) * normalizedClkPeriod
         elif minTime >= normalizedClkPeriod:
-            offset = -(minTime // normalizedClkPeriod) * normalizedClkPeriod 
+            return -(minTime // normalizedClkPeriod) * normalizedClkPeriod 
         else:
-            offset = None
+            return None
+
+    @staticmethod
+    def _applyScheduleOffset(nodes: Iterable[HlsNetNode], offset: int):
+        for node in nodes:
+            node.scheduledIn = tuple(max(t + offset, 0) for t in node.scheduledIn)
+            node.scheduledOut = tuple(max(t + offset, 0) for t in node.scheduledOut)
+
+    def _scheduleAlapCompaction(self, asapSchedule: SchedulizationDict):
+        minTime = self._scheduleAlapCompactionForNodes(list(self.parentHls.iterAllNodes()), asapSchedule)
+        offset = self._resolveScheduleOffset(minTime)
         if offset is not None:
-            for node in self.parentHls.iterAllNodes():
-                node.scheduledIn = tuple(max(t + offset, 0) for t in node.scheduledIn)
-                node.scheduledOut = tuple(max(t + offset, 0) for t in node.scheduledOut)
+            self._applyScheduleOffset(self.parentHls.iterAllNodes(), offset)
+            self._alapOffset = offset
+        else:
+            self._alapOffset = 0
 
     def schedule(self):
         self._scheduleAsap()
@@ -107,4 +231,86 @@ class HlsScheduler():
         asapSchedule = self._copyAndResetScheduling()
         self._scheduleAlapCompaction(asapSchedule)
         self._checkAllNodesScheduled()
-        
+        self._checkInitiationIntervals()
+        self._asapSchedule = asapSchedule
+
+    @staticmethod
+    def _collectCone(nodes: Iterable[HlsNetNode], forward: bool) -> UniqList[HlsNetNode]:
+        """
+        Collect nodes and all nodes transitively using their outputs (forward=True) or driving their inputs (forward=False).
+        """
+        cone: UniqList[HlsNetNode] = UniqList(nodes)
+        toSearch = deque(cone)
+        while toSearch:
+            n = toSearch.popleft()
+            if forward:
+                neighbors = (u.obj for uses in n.usedBy for u in uses)
+            else:
+                neighbors = (dep.obj for dep in n.dependsOn)
+
+            for other in neighbors:
+                if other not in cone:
+                    cone.append(other)
+                    toSearch.append(other)
+
+        return cone
+
+    def scheduleIncremental(self, dirtyNodes: Iterable[HlsNetNode]):
+        """
+        Update the schedule after a local modification of the netlist.
+        Only the ASAP times of the forward cone of dirtyNodes and the ALAP times of the backward cone
+        of this forward cone are recomputed, the schedule of the rest of the netlist is kept.
+
+        :param dirtyNodes: nodes which were added or whose ports were reconnected (including the nodes
+            which were using outputs of removed nodes)
+        :note: If the netlist was not scheduled yet a full scheduling is performed instead.
+        :note: The schedule is moved if the modified part starts before clock period 0, however
+            it is not moved to sooner times if the modification removed latency from the beginning of the netlist.
+        :note: If the modification exceeds the maximum initiation interval of some loop a full scheduling is performed.
+        """
+        asapSchedule: Optional[SchedulizationDict] = self._asapSchedule
+        if asapSchedule is None:
+            return self.schedule()
+
+        # ASAP for forward cone, all dependencies must hold its ASAP time
+        forwardCone = self._collectCone(dirtyNodes, True)
+        backwardCone = self._collectCone(forwardCone, False)
+        for n in backwardCone:
+            if n in forwardCone:
+                n.resetScheduling()
+            else:
+                n.scheduledIn, n.scheduledOut = asapSchedule[n]
+
+        for n in self._iterNodesInTopologicalOrder(forwardCone):
+            n.scheduleAsap(None)
+
+        for n in forwardCone:
+            n.copyScheduling(asapSchedule)
+
+        # ALAP for backward cone, nodes outside of this cone are already in final position
+        # and the ASAP times must be moved the same as the rest of the schedule was moved
+        alapOffset = self._alapOffset
+        if alapOffset:
+            alapAsapSchedule = {
+                n: (tuple(t + alapOffset for t in inT), tuple(t + alapOffset for t in outT))
+                for n, (inT, outT) in ((n, asapSchedule[n]) for n in backwardCone)
+            }
+        else:
+            alapAsapSchedule = asapSchedule
+
+        for n in backwardCone:
+            n.resetScheduling()
+        minTime = self._scheduleAlapCompactionForNodes(backwardCone, alapAsapSchedule)
+        if minTime < 0:
+            offset = self._resolveScheduleOffset(minTime)
+            if offset:
+                self._applyScheduleOffset(self.parentHls.iterAllNodes(), offset)
+                self._alapOffset += offset
+            self._checkAllNodesScheduled()
+        else:
+            self._checkAllNodesScheduled(backwardCone)
+
+        for r, w in self._collectLoopCarriedDependencies():
+            if self._resolveInitiationInterval(r, w) > w.maxII:
+                self.schedule()
+                break
@@ -0,0 +1,262 @@
+from math import ceil
+from time import perf_counter
+from typing import Dict, List, Optional, Tuple, Iterable
+
+from hwtHls.clk_math import start_clk
+from hwtHls.netlist.nodes.aggregatedBitwiseOps import HlsNetNodeBitwiseOps
+from hwtHls.netlist.nodes.const import HlsNetNodeConst
+from hwtHls.netlist.nodes.io import HlsNetNodeExplicitSync, HOrderingVoidT, HlsNetNodeRead, \
+    HlsNetNodeWrite
+from hwtHls.netlist.nodes.loopHeader import HlsLoopGate
+from hwtHls.netlist.nodes.node import HlsNetNode, SchedulizationDict
+from hwtHls.netlist.nodes.ports import HlsNetNodeOut
+from hwtHls.scheduler.scheduler import HlsScheduler
+import numpy as np
+from scipy.optimize import linprog
+from scipy.sparse import coo_matrix
+
+
+class HlsSdcScheduler(HlsScheduler):
+    """
+    Scheduler based on System of Difference Constraints (SDC) which minimizes the number of register bits.
+
+    * The ASAP schedule specifies the earliest time and the timing inside of clock period for every node.
+    * Each node can be moved only by a whole number of clock periods "k" from its ASAP time,
+      this preserves the timing of each node in its clock period which was already resolved by ASAP.
+    * For each dependency there is a difference constraint "k_dst - k_src >= d" derived from the slack
+      of the dependency in ASAP schedule.
+    * For each used output there is a lifetime variable "z >= clkIndex(use) - clkIndex(out)",
+      the objective is to minimize sum of lifetimes multiplied by the bit width of the output.
+    * The latency of the schedule is limited to a latency of the schedule resolved by :class:`~.HlsScheduler`.
+    * The constraint matrix of SDC is totally unimodular and the LP relaxation has an integral solution,
+      the problem is solved as LP using :func:`scipy.optimize.linprog`.
+    * If the LP solver fails, does not finish in time limit or if the result requires more register bits,
+      the schedule of :class:`~.HlsScheduler` is used.
+
+    Example of use:
+
+    .. code-block:: Python
+
+        VirtualHlsPlatform(scheduler=partial(HlsSdcScheduler, timeLimit=10.0))
+
+    :ivar timeLimit: time limit for the formulation and solving of LP in seconds
+    :ivar usedFallback: True if the schedule of :class:`~.HlsScheduler` was used in last scheduling
+    :ivar registerBits: the number of register bits required by the schedule from last scheduling
+    """
+
+    def __init__(self, parentHls: "HlsPipeline", resolution: float, timeLimit: float=10.0):
+        HlsScheduler.__init__(self, parentHls, resolution)
+        if timeLimit <= 0:
+            raise ValueError("Time limit must be positive", timeLimit)
+        self.timeLimit = timeLimit
+        self.usedFallback: Optional[bool] = None
+        self.registerBits: Optional[int] = None
+
+    def copyState(self, nodes: List[HlsNetNode]) -> Dict[str, object]:
+        state = HlsScheduler.copyState(self, nodes)
+        state["usedFallback"] = self.usedFallback
+        state["registerBits"] = self.registerBits
+        return state
+
+    def applyState(self, nodes: List[HlsNetNode], state: Dict[str, object]):
+        HlsScheduler.applyState(self, nodes, state)
+        self.usedFallback = state["usedFallback"]
+        self.registerBits = state["registerBits"]
+
+    @staticmethod
+    def _getBitWidth(o: HlsNetNodeOut) -> int:
+        t = o._dtype
+        if t is HOrderingVoidT:
+            return 0
+        return t.bit_length()
+
+    def _countRegisterBits(self) -> int:
+        """
+        Count the number of bits of registers which are required to pass the values between clock periods
+        in the current schedule.
+        """
+        clkPeriod: int = self.parentHls.normalizedClkPeriod
+        regBits = 0
+        for n in self.parentHls.iterAllNodes():
+            if isinstance(n, HlsNetNodeConst):
+                continue
+            for o, oT, uses in zip(n._outputs, n.scheduledOut, n.usedBy):
+                if not uses:
+                    continue
+                oClkI = start_clk(oT, clkPeriod)
+                lifetime = max(start_clk(u.obj.scheduledIn[u.in_i], clkPeriod) for u in uses) - oClkI
+                if lifetime > 0:
+                    regBits += lifetime * self._getBitWidth(o)
+        return regBits
+
+    @staticmethod
+    def _restoreScheduling(schedule: SchedulizationDict):
+        for n, (inT, outT) in schedule.items():
+            n.scheduledIn = inT
+            n.scheduledOut = outT
+
+    @staticmethod
+    def _iterNodeAndSubNodes(n: HlsNetNode) -> Iterable[HlsNetNode]:
+        if isinstance(n, HlsNetNodeBitwiseOps):
+            yield from n._subNodes.nodes
+        yield n
+
+    def _formulateSdc(self, nodes: List[HlsNetNode], asapSchedule: SchedulizationDict, maxClkI: int):
+        """
+        :return: tuple (c, A_ub, b_ub, bounds) for :func:`scipy.optimize.linprog`
+        """
+        clkPeriod: int = self.parentHls.normalizedClkPeriod
+        nodeIndex: Dict[HlsNetNode, int] = {n: i for i, n in enumerate(nodes)}
+        varCnt = len(nodes)
+        bounds: List[Tuple[int, Optional[int]]] = []
+        for n in nodes:
+            inT, outT = asapSchedule[n]
+            if isinstance(n, HlsLoopGate):
+                bounds.append((0, 0))
+            else:
+                nodeMaxClkI = max(start_clk(t, clkPeriod) for t in (*inT, *outT))
+                bounds.append((0, max(maxClkI - nodeMaxClkI, 0)))
+
+        c: List[int] = [0 for _ in nodes]
+        rows: List[int] = []
+        cols: List[int] = []
+        vals: List[int] = []
+        b_ub: List[int] = []
+
+        def addConstraint(coefs: List[Tuple[int, int]], ub: int):
+            rowI = len(b_ub)
+            for col, v in coefs:
+                rows.append(rowI)
+                cols.append(col)
+                vals.append(v)
+            b_ub.append(ub)
+
+        for dstI, dst in enumerate(nodes):
+            dstInT, _ = asapSchedule[dst]
+            for inT, dep in zip(dstInT, dst.dependsOn):
+                src = dep.obj
+                srcI = nodeIndex.get(src, None)
+                if srcI is None:
+                    # constant, it has no scheduling constraints
+                    continue
+                _, srcOutT = asapSchedule[src]
+                slack = inT - srcOutT[dep.out_i]
+                minDiff = ceil(-slack / clkPeriod)
+                if isinstance(src, HlsNetNodeExplicitSync) and isinstance(dst, HlsNetNodeExplicitSync):
+                    # IO nodes must not get closer to each other because of the limit of IO operations per clock period
+                    minDiff = max(minDiff, 0)
+                # k_dst - k_src >= minDiff
+                addConstraint([(srcI, 1), (dstI, -1)], -minDiff)
+
+            if isinstance(dst, HlsNetNodeRead) and dst.requestLatency is not None:
+                # the response must be read at least requestLatency clock periods after the request
+                dstClkI = start_clk(dstInT[0] if dstInT else asapSchedule[dst][1][0], clkPeriod)
+                for w in dst.iterRequestWrites():
+                    srcI = nodeIndex[w]
+                    wClkI = start_clk(asapSchedule[w][0][0], clkPeriod)
+                    # (dstClkI + k_dst) - (wClkI + k_src) >= latency
+                    addConstraint([(srcI, 1), (dstI, -1)], dstClkI - wClkI - dst.requestLatency[1])
+
+            elif isinstance(dst, HlsNetNodeWrite):
+                # the memory has a read first behavior, the request must be in a later clock period
+                # than the previous request which may write to the same memory bank on other port
+                prevWrites = tuple(dst.iterPrevMemoryWriteRequests())
+                if prevWrites:
+                    dstClkI = start_clk(dstInT[0], clkPeriod)
+                    for w in prevWrites:
+                        srcI = nodeIndex[w]
+                        wClkI = start_clk(asapSchedule[w][0][0], clkPeriod)
+                        addConstraint([(srcI, 1), (dstI, -1)], dstClkI - wClkI - 1)
+
+        for srcI, src in enumerate(nodes):
+            _, srcOutT = asapSchedule[src]
+            for o, oT, uses in zip(src._outputs, srcOutT, src.usedBy):
+                if not uses:
+                    continue
+                w = self._getBitWidth(o)
+                if w == 0:
+                    continue
+                zI = varCnt
+                varCnt += 1
+                c.append(w)
+                bounds.append((0, None))
+                oClkI = start_clk(oT, clkPeriod)
+                for u in uses:
+                    dst = u.obj
+                    dstI = nodeIndex[dst]
+                    dstInClkI = start_clk(asapSchedule[dst][0][u.in_i], clkPeriod)
+                    # z >= (dstInClkI + k_dst) - (oClkI + k_src)
+                    addConstraint([(dstI, 1), (srcI, -1), (zI, -1)], oClkI - dstInClkI)
+
+        A_ub = coo_matrix((vals, (rows, cols)), shape=(len(b_ub), varCnt))
+        return np.array(c), A_ub, np.array(b_ub), bounds
+
+    def _scheduleSdc(self, asapSchedule: SchedulizationDict, maxClkI: int, startTime: float) -> bool:
+        """
+        :return: True if the netlist was scheduled, False if the fallback schedule should be used
+        """
+        clkPeriod: int = self.parentHls.normalizedClkPeriod
+        nodes = [n for n in self.parentHls.iterAllNodes() if not isinstance(n, HlsNetNodeConst)]
+        c, A_ub, b_ub, bounds = self._formulateSdc(nodes, asapSchedule, maxClkI)
+        remainingTime = self.timeLimit - (perf_counter() - startTime)
+        if remainingTime <= 0:
+            return False
+
+        res = linprog(c, A_ub=A_ub, b_ub=b_ub, bounds=bounds, method="highs",
+                      options={"time_limit": remainingTime})
+        if res.status != 0:
+            # time limit reached or the problem is infeasible
+            return False
+
+        clkOffsets = []
+        for x in res.x[:len(nodes)]:
+            k = round(x)
+            if abs(x - k) > 1e-6:
+                return False
+            clkOffsets.append(int(k))
+
+        for n, k in zip(nodes, clkOffsets):
+            off = k * clkPeriod
+            for _n in self._iterNodeAndSubNodes(n):
+                inT, outT = asapSchedule[_n]
+                _n.scheduledIn = tuple(t + off for t in inT)
+                _n.scheduledOut = tuple(t + off for t in outT)
+
+        for n in self.parentHls.iterAllNodes():
+            if isinstance(n, HlsNetNodeConst):
+                # constants are scheduled to a time of its first use
+                n.scheduledIn = ()
+                n.scheduledOut = (min(u.obj.scheduledIn[u.in_i] for u in n.usedBy[0]),)
+
+        return True
+
+    def schedule(self):
+        startTime = perf_counter()
+        HlsScheduler.schedule(self)
+        fallbackSchedule: SchedulizationDict = {}
+        for n in self.parentHls.iterAllNodes():
+            n.copyScheduling(fallbackSchedule)
+        fallbackRegisterBits = self._countRegisterBits()
+
+        asapSchedule = self._asapSchedule
+        clkPeriod: int = self.parentHls.normalizedClkPeriod
+        maxClkI = 0
+        for inT, outT in fallbackSchedule.values():
+            for t in (*inT, *outT):
+                maxClkI = max(maxClkI, start_clk(t, clkPeriod))
+
+        # the incremental scheduling is not supported, the ASAP schedule is not stored
+        self._asapSchedule = None
+        self.usedFallback = True
+        self.registerBits = fallbackRegisterBits
+        if not self._scheduleSdc(asapSchedule, maxClkI, startTime):
+            self._restoreScheduling(fallbackSchedule)
+            return
+
+        self._checkAllNodesScheduled()
+        registerBits = self._countRegisterBits()
+        if registerBits > fallbackRegisterBits:
+            self._restoreScheduling(fallbackSchedule)
+        else:
+            self.usedFallback = False
+            self.registerBits = registerBits
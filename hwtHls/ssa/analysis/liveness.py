@@ -1,6 +1,7 @@
 # Computing Liveness Sets for SSA-Form Programs
-# Algorithm 4 Computing liveness sets by exploring paths from variable uses.
-from typing import Dict, Set, Union, Optional, Tuple
+# Iterative data-flow liveness analysis on bit vectors (python ints), each SSA value has an index of its bit.
+from collections import deque
+from typing import Dict, Set, Tuple, List, Deque
 
 from hwt.hdl.value import HValue
 from hwt.pyUtils.uniqList import UniqList
@@ -45,45 +46,135 @@ def collect_direct_provieds_and_requires(block: SsaBasicBlock):
 EdgeLivenessDict = Dict[SsaBasicBlock, Dict[SsaBasicBlock, Set[SsaValue]]]
 
 
-def recursively_add_edge_requirement_var(provides: Dict[SsaBasicBlock, UniqList[SsaValue]],
-                                         src: SsaBasicBlock,
-                                         dst: SsaBasicBlock,
-                                         v: Union[SsaValue, SsaPhi],
-                                         live: EdgeLivenessDict):
-    if isinstance(v, HValue):
-        return
-
-    _live = live[src][dst]
-
-    if v in _live:
-        return
-
-    assert isinstance(v, SsaValue), v
-
-    _live.add(v)
-    if v not in provides[src]:
-        for pred in src.predecessors:
-            recursively_add_edge_requirement_var(provides, pred, src, v, live)
+class SsaLiveness():
+    """
+    Liveness of SSA values computed by the iterative backward data-flow analysis.
+    The sets of values are represented as bit vectors (python ints) where each value has an index of its bit.
+
+    * live_in(B) = uses(B) | (live_out(B) & ~defs(B))
+    * live_out(B) = union of live(B, S) for each successor S
+    * live(P, S) = live_in(S) | phi_uses(S, P)
+
+    :note: The uses of the values by phis are not in live_in of the block with the phi, the value is live
+        only on the edge from the predecessor which is specified in the phi operand.
+
+    :ivar blocks: all blocks reachable from start block in DFS preorder
+    :ivar values: the list of values, index in list is the index of bit in bit vectors
+    :ivar valueIndex: the dictionary mapping the value to index of its bit
+    :ivar defs: the bit vector of values defined in the block (including phis)
+    :ivar uses: the bit vector of values used in block body before their definition in the block
+    :ivar phiUses: the dictionary mapping the predecessor block to a bit vector of values used by phis of the block
+    :ivar liveIn: the bit vector of values live at the beginning of the block (excluding uses in phis)
+    :ivar liveOut: the bit vector of values live at the end of the block
+    """
+
+    def __init__(self, start: SsaBasicBlock):
+        self.blocks: List[SsaBasicBlock] = list(collect_all_blocks(start, set()))
+        self.values: List[SsaValue] = []
+        self.valueIndex: Dict[SsaValue, int] = {}
+        self.defs: Dict[SsaBasicBlock, int] = {}
+        self.uses: Dict[SsaBasicBlock, int] = {}
+        self.phiUses: Dict[SsaBasicBlock, Dict[SsaBasicBlock, int]] = {}
+        self.liveIn: Dict[SsaBasicBlock, int] = {}
+        self.liveOut: Dict[SsaBasicBlock, int] = {}
+        self._collectDefsAndUses()
+        self._solve()
+
+    def _getBit(self, v: SsaValue) -> int:
+        i = self.valueIndex.get(v, None)
+        if i is None:
+            assert isinstance(v, SsaValue), v
+            i = len(self.values)
+            self.values.append(v)
+            self.valueIndex[v] = i
+        return 1 << i
+
+    def _collectDefsAndUses(self):
+        for block in self.blocks:
+            provides, requires = collect_direct_provieds_and_requires(block)
+            defs = 0
+            for v in provides:
+                defs |= self._getBit(v)
+
+            uses = 0
+            phiUses: Dict[SsaBasicBlock, int] = {}
+            for v, pred in requires:
+                b = self._getBit(v)
+                if pred is None:
+                    uses |= b
+                else:
+                    phiUses[pred] = phiUses.get(pred, 0) | b
+
+            self.defs[block] = defs
+            self.uses[block] = uses
+            self.phiUses[block] = phiUses
+            self.liveIn[block] = uses
+            self.liveOut[block] = 0
+
+    def _solve(self):
+        liveIn = self.liveIn
+        liveOut = self.liveOut
+        # backward problem, the blocks at the end of DFS preorder are likely to be near to the end of the program
+        worklist: Deque[SsaBasicBlock] = deque(reversed(self.blocks))
+        inWorklist: Set[SsaBasicBlock] = set(worklist)
+        while worklist:
+            block = worklist.popleft()
+            inWorklist.remove(block)
+
+            out = 0
+            for suc in block.successors.iterBlocks():
+                out |= liveIn[suc] | self.phiUses[suc].get(block, 0)
+            liveOut[block] = out
+
+            _in = self.uses[block] | (out & ~self.defs[block])
+            if _in != liveIn[block]:
+                liveIn[block] = _in
+                for pred in block.predecessors:
+                    if pred in liveIn and pred not in inWorklist:
+                        worklist.append(pred)
+                        inWorklist.add(pred)
+
+    def _bitsToValues(self, bits: int) -> Set[SsaValue]:
+        values = self.values
+        res: Set[SsaValue] = set()
+        while bits:
+            lowest = bits & -bits
+            res.add(values[lowest.bit_length() - 1])
+            bits ^= lowest
+        return res
+
+    def getLiveIn(self, block: SsaBasicBlock) -> Set[SsaValue]:
+        """
+        :return: values live at the beginning of the block (excluding values used only by phis of the block)
+        """
+        return self._bitsToValues(self.liveIn[block])
+
+    def getLiveOut(self, block: SsaBasicBlock) -> Set[SsaValue]:
+        """
+        :return: values live at the end of the block (including values used by phis of successors)
+        """
+        return self._bitsToValues(self.liveOut[block])
+
+    def getEdgeLive(self, src: SsaBasicBlock, dst: SsaBasicBlock) -> Set[SsaValue]:
+        """
+        :return: values live on the edge between src and dst block
+        """
+        return self._bitsToValues(self.liveIn[dst] | self.phiUses[dst].get(src, 0))
+
+    def isLiveIn(self, v: SsaValue, block: SsaBasicBlock) -> bool:
+        i = self.valueIndex.get(v, None)
+        return i is not None and bool((self.liveIn[block] >> i) & 1)
+
+    def isLiveOut(self, v: SsaValue, block: SsaBasicBlock) -> bool:
+        i = self.valueIndex.get(v, None)
+        return i is not None and bool((self.liveOut[block] >> i) & 1)
+
+    def getEdgeLivenessDict(self) -> EdgeLivenessDict:
+        live: EdgeLivenessDict = {}
+        for block in self.blocks:
+            live[block] = {suc: self.getEdgeLive(block, suc) for suc in block.successors.iterBlocks()}
+        return live
 
 
 def ssa_liveness_edge_variables(start: SsaBasicBlock) -> EdgeLivenessDict:
-    live: EdgeLivenessDict = {}
-    blocks = list(collect_all_blocks(start, set()))
-    provides: Dict[SsaBasicBlock, UniqList[SsaValue]] = {}
-    requires: Dict[SsaBasicBlock, UniqList[Tuple[SsaValue, Optional[SsaBasicBlock]]]] = {}
-    # initialization
-    for block in blocks:
-        provides[block], requires[block] = collect_direct_provieds_and_requires(block)
-        live[block] = {suc: set() for suc in block.successors.iterBlocks()}
-
-    # transitive enclosure of requires relation
-    for block in blocks:
-        for req, req_if_predecessor_is in requires[block]:
-            if req_if_predecessor_is is None:
-                # requires from all predecessors
-                for pred in block.predecessors:
-                    recursively_add_edge_requirement_var(provides, pred, block, req, live)
-            else:
-                recursively_add_edge_requirement_var(provides, req_if_predecessor_is, block, req, live)
-
-    return live
+    return SsaLiveness(start).getEdgeLivenessDict()
@@ -0,0 +1,566 @@
+from itertools import chain
+from typing import Dict, List, Optional, Set, Tuple, Union
+
+from hwt.hdl.operatorDefs import AllOps
+from hwt.hdl.types.sliceVal import HSliceVal
+from hwt.hdl.value import HValue
+from hwt.pyUtils.uniqList import UniqList
+from hwtHls.hlsStreamProc.memory import HlsStreamProcMemoryRead, HlsStreamProcMemoryPort
+from hwtHls.hlsStreamProc.statements import HlsStreamProcWhile
+from hwtHls.hlsStreamProc.statementsIo import HlsStreamProcRead, HlsStreamProcWrite
+from hwtHls.ssa.basicBlock import SsaBasicBlock
+from hwtHls.ssa.instr import SsaInstr, SsaInstrBranch
+from hwtHls.ssa.phi import SsaPhi
+from hwtHls.ssa.transformation.ssaPass import SsaPass
+from hwtHls.ssa.translation.fromAst.astToSsa import AstToSsa
+from hwtHls.ssa.translation.fromPython.markers import PythonBytecodeLoopUnroll
+from hwtHls.ssa.value import SsaValue
+
+# loop header, blocks of the loop in reverse postorder (starting with header)
+SsaLoop = Tuple[SsaBasicBlock, UniqList[SsaBasicBlock]]
+
+
+class SsaPassLoopUnroll(SsaPass):
+    """
+    Partially unroll the loops which were marked by :class:`hwtHls.hlsStreamProc.statements.HlsStreamProcWhile` unroll
+    or by :class:`hwtHls.ssa.translation.fromPython.markers.PythonBytecodeLoopUnroll`.
+
+    The blocks of the loop are duplicated factor-1 times. The latches of the original loop are connected to the header
+    of the first copy, the latches of the copy to the header of the next copy and the latches of the last copy
+    to the original header. Each copy keeps the exits of the original loop, so the loop can exit after any iteration
+    and the number of iterations does not have to be divisible by the factor.
+    The copies are just chained together, the optimization across the copies is left to LLVM.
+    The memory accesses in copies are moved to a next port of the memory
+    (:see: :class:`hwtHls.hlsStreamProc.memory.HlsStreamProcMemory`), so the copies may access the memory in parallel.
+    If the low bits of an induction variable (a phi in the header incremented by a constant) are known in a copy,
+    the instructions which depend only on them are resolved to constants. This statically resolves the bank
+    of the partitioned memory accessed with the index which is not a constant, the accesses to other banks
+    are removed from the copy.
+
+    .. code-block:: text
+
+        # before                   # after (factor=2)
+        H: x0 = phi(0, x1)         H: x0 = phi(0, x1')
+           br c, B, Exit              br c, B, Exit
+        B: x1 = x0 + r             B: x1 = x0 + r
+           br H                       br H'
+                                   H': x0' = phi(x1)
+                                      br c', B', Exit
+                                   B': x1' = x0' + r'
+                                      br H
+
+    :note: Only the natural loops with a single header are supported.
+    """
+
+    @staticmethod
+    def _collectBlocksRpo(start: SsaBasicBlock, postorder: List[SsaBasicBlock],
+                          backEdges: List[Tuple[SsaBasicBlock, SsaBasicBlock]]):
+        """
+        Collect the blocks reachable from start in DFS postorder and the edges to the blocks on the DFS stack.
+        (Without recursion so it is not limited by the recursion limit on large CFGs,
+        :see: :func:`hwtHls.ssa.transformation.utils.blockAnalysis.collect_all_blocks`.)
+        """
+        seen: Set[SsaBasicBlock] = {start, }
+        onStack: Set[SsaBasicBlock] = {start, }
+        stack = [(start, start.successors.iterBlocks())]
+        while stack:
+            b, successors = stack[-1]
+            for suc in successors:
+                if suc in onStack:
+                    backEdges.append((b, suc))
+                elif suc not in seen:
+                    seen.add(suc)
+                    onStack.add(suc)
+                    stack.append((suc, suc.successors.iterBlocks()))
+                    break
+            else:
+                stack.pop()
+                onStack.remove(b)
+                postorder.append(b)
+
+    @classmethod
+    def detectLoops(cls, start: SsaBasicBlock) -> List[SsaLoop]:
+        """
+        :return: list of natural loops, inner loops are before outer loops
+        """
+        postorder = []
+        backEdges = []
+        cls._collectBlocksRpo(start, postorder, backEdges)
+        rpoIndex = {b: i for i, b in enumerate(reversed(postorder))}
+
+        latchesOfHeader: Dict[SsaBasicBlock, List[SsaBasicBlock]] = {}
+        for latch, header in backEdges:
+            latchesOfHeader.setdefault(header, []).append(latch)
+
+        loops = []
+        for header, latches in latchesOfHeader.items():
+            body = {header, }
+            toSearch = [l for l in latches if l is not header]
+            body.update(toSearch)
+            while toSearch:
+                b = toSearch.pop()
+                for pred in b.predecessors:
+                    if pred not in body and pred in rpoIndex:
+                        body.add(pred)
+                        toSearch.append(pred)
+
+            for b in body:
+                if b is header:
+                    continue
+                for pred in b.predecessors:
+                    if pred not in body:
+                        raise NotImplementedError("Irreducible loop (loop with multiple entry points)", header, b, pred)
+
+            loops.append((header, UniqList(sorted(body, key=lambda b: rpoIndex[b]))))
+
+        loops.sort(key=lambda loop: (len(loop[1]), rpoIndex[loop[0]]))
+        return loops
+
+    @staticmethod
+    def _resolveUnrollFactor(loop: SsaLoop, loops: List[SsaLoop]) -> Optional[int]:
+        header, blocks = loop
+        factors = set()
+        for o in header.origins:
+            if isinstance(o, HlsStreamProcWhile) and o.unroll is not None:
+                factors.add(o.unroll)
+
+        for b in blocks:
+            markers = [o for o in b.origins if isinstance(o, PythonBytecodeLoopUnroll)]
+            if not markers:
+                continue
+            # the marker belongs to the innermost loop which contains the block
+            innermost = None
+            for otherLoop in loops:
+                if b in otherLoop[1]:
+                    innermost = otherLoop
+                    break
+            if innermost is loop:
+                factors.update(m.factor for m in markers)
+
+        if not factors:
+            return None
+        elif len(factors) > 1:
+            raise ValueError("Loop has multiple different unroll factors specified", header, sorted(factors))
+        return factors.pop()
+
+    @staticmethod
+    def _getUserBlock(u: Union[SsaInstr, SsaInstrBranch]) -> SsaBasicBlock:
+        if isinstance(u, SsaInstrBranch):
+            return u.parent
+        return u.block
+
+    @staticmethod
+    def _resolveInductionVariables(header: SsaBasicBlock, blocks: UniqList[SsaBasicBlock]) -> Dict[SsaPhi, Tuple[int, int]]:
+        """
+        :return: dictionary phi -> (initial value, step) for the phis in the header which have a constant value
+            on the entry to the loop and which are incremented by a constant on every backedge
+        """
+        inductionVars = {}
+        for phi in header.phis:
+            init = None
+            steps = set()
+            for v, pred in phi.operands:
+                if pred in blocks:
+                    if v.__class__ is not SsaInstr or v.operator not in (AllOps.ADD, AllOps.SUB):
+                        break
+                    a, b = v.operands
+                    if v.operator == AllOps.ADD and a is not phi:
+                        a, b = b, a
+                    if a is not phi or not isinstance(b, HValue) or not b._is_full_valid():
+                        break
+                    steps.add(-int(b) if v.operator == AllOps.SUB else int(b))
+                elif isinstance(v, HValue) and v._is_full_valid() and (init is None or init == int(v)):
+                    init = int(v)
+                else:
+                    break
+            else:
+                if init is not None and len(steps) == 1:
+                    inductionVars[phi] = (init, steps.pop())
+
+        return inductionVars
+
+    @staticmethod
+    def _resolveKnownResidues(inductionVars: Dict[SsaPhi, Tuple[int, int]], factor: int, copyIndex: int) -> Dict[SsaPhi, Tuple[int, int]]:
+        """
+        The value of the induction variable in the copy copyIndex is init + copyIndex * step + k * factor * step
+        for the k-th iteration of the unrolled loop.
+
+        :return: dictionary phi -> (residue, modulus), the value of phi in the copy is congruent to the residue modulo
+            the modulus (a power of 2, the largest one which divides factor * step and the range of the type)
+        """
+        known = {}
+        for phi, (init, step) in inductionVars.items():
+            typeRange = 1 << phi._dtype.bit_length()
+            period = (factor * step) % typeRange
+            modulus = (period & -period) if period else typeRange
+            known[phi] = ((init + copyIndex * step) % modulus, modulus)
+        return known
+
+    @staticmethod
+    def _resolveKnownBits(instr: SsaInstr, key: HValue, residue: int, modulus: int) -> Optional[HValue]:
+        """
+        :return: the value of the slice of the induction variable if all selected bits are known
+        """
+        if isinstance(key, HSliceVal):
+            hi = int(key.val.start)
+            lo = int(key.val.stop)
+        else:
+            lo = int(key)
+            hi = lo + 1
+        if modulus % (1 << hi):
+            return None
+        return instr._dtype.from_py((residue % (1 << hi)) >> lo)
+
+    @classmethod
+    def _resolveCopyReplacements(cls, blocks: UniqList[SsaBasicBlock], known: Dict[SsaPhi, Tuple[int, int]])\
+            -> Dict[SsaInstr, Union[SsaValue, HValue]]:
+        """
+        Resolve the instructions which are constant or which select a constant operand in a copy of the loop body
+        because of the known bits of the induction variables (e.g. the select of the bank of CYCLIC partitioned memory,
+        :see: :class:`hwtHls.hlsStreamProc.memory.HlsStreamProcMemory`). The values used in branch conditions are not resolved.
+
+        :return: dictionary instruction -> replacement
+        """
+        replacements: Dict[SsaInstr, Union[SsaValue, HValue]] = {}
+        for b in blocks:
+            for instr in b.body:
+                if instr.__class__ is not SsaInstr or any(isinstance(u, SsaInstrBranch) for u in instr.users):
+                    continue
+                ops = [replacements.get(o, o) if isinstance(o, SsaValue) else o for o in instr.operands]
+                v = None
+                if instr.operator == AllOps.INDEX and isinstance(ops[0], SsaPhi) and ops[0] in known:
+                    v = cls._resolveKnownBits(instr, ops[1], *known[ops[0]])
+                elif all(o is orig for o, orig in zip(ops, instr.operands)):
+                    continue
+                elif instr.operator == AllOps.TERNARY and isinstance(ops[0], HValue) and ops[0]._is_full_valid():
+                    v = ops[1] if int(ops[0]) else ops[2]
+                elif all(isinstance(o, HValue) for o in ops):
+                    v = instr.operator._evalFn(*ops)
+                    if not isinstance(v, HValue) or v._dtype.bit_length() != instr._dtype.bit_length():
+                        v = None
+
+                if v is not None:
+                    replacements[instr] = v
+
+        return replacements
+
+    @classmethod
+    def _getConstMsbs(cls, v: Union[SsaValue, HValue], bitCnt: int,
+                      replacements: Dict[SsaInstr, Union[SsaValue, HValue]]) -> Optional[int]:
+        """
+        :return: the value of bitCnt most significant bits if they are constant
+        """
+        if isinstance(v, SsaValue):
+            v = replacements.get(v, v)
+        if isinstance(v, HValue):
+            w = v._dtype.bit_length()
+            msbs = v[w:w - bitCnt]
+            return int(msbs) if msbs._is_full_valid() else None
+        elif v.__class__ is SsaInstr and v.operator == AllOps.CONCAT:
+            hi = v.operands[0]
+            if hi._dtype.bit_length() >= bitCnt:
+                return cls._getConstMsbs(hi, bitCnt, replacements)
+        return None
+
+    @classmethod
+    def _isUsedInCopy(cls, v: SsaValue, replacements: Dict[SsaInstr, Union[SsaValue, HValue]], removed: Set[SsaInstr]) -> bool:
+        for u in v.users:
+            if u in removed:
+                continue
+            r = replacements.get(u, None)
+            if r is None or (r is v and cls._isUsedInCopy(u, replacements, removed)):
+                return True
+        return False
+
+    @classmethod
+    def _resolveDeadMemoryAccesses(cls, blocks: UniqList[SsaBasicBlock],
+                                   replacements: Dict[SsaInstr, Union[SsaValue, HValue]]) -> Set[SsaInstr]:
+        """
+        Collect the memory requests which neither read nor write in a copy of the loop body (the write enable resolved to 0)
+        and the memory reads which response is not used (and their requests).
+
+        :note: The request to the memory is Concat(re, we, value, offset) (:see: :meth:`hwtHls.hlsStreamProc.memory.HlsStreamProcMemoryBank._request`)
+        """
+        dead: Set[SsaInstr] = set()
+        for b in blocks:
+            for instr in b.body:
+                if instr.__class__ is HlsStreamProcWrite and getattr(instr.dst, "_hlsMemoryPort", None) is not None\
+                        and cls._getConstMsbs(instr.getSrc(), 2, replacements) == 0:
+                    dead.add(instr)
+
+        for b in blocks:
+            for instr in b.body:
+                if instr.__class__ is HlsStreamProcMemoryRead and not cls._isUsedInCopy(instr, replacements, dead):
+                    dead.add(instr)
+                    dead.add(instr._request)
+
+        return dead
+
+    @staticmethod
+    def _removeInstr(instr: SsaInstr):
+        instr.block.body.remove(instr)
+        instr.block = None
+        for o in instr.operands:
+            if isinstance(o, SsaValue) and instr in o.users:
+                o.users.remove(instr)
+
+    @classmethod
+    def _applyReplacementsInPlace(cls, blocks: UniqList[SsaBasicBlock],
+                                  replacements: Dict[SsaInstr, Union[SsaValue, HValue]], deadAccesses: Set[SsaInstr]):
+        """
+        Replace the resolved instructions and remove the dead memory accesses in the original loop body (copy 0).
+        """
+        for b in blocks:
+            for instr in tuple(b.body):
+                if instr in deadAccesses:
+                    if instr.__class__ is HlsStreamProcWrite:
+                        instr.dst._hlsMemoryPort.requestCnt -= 1
+                    cls._removeInstr(instr)
+                else:
+                    r = replacements.get(instr, None)
+                    if r is not None:
+                        instr.replaceBy(r)
+                        cls._removeInstr(instr)
+
+    @staticmethod
+    def _getMemoryPortForCopy(intf, portOffset: int):
+        """
+        The copy of memory access is moved to a next port of the same memory bank, so the accesses
+        from the copies of the loop body may happen in parallel.
+        The request and the response are moved by the same offset, so they stay on the same port.
+        """
+        port: Optional[HlsStreamProcMemoryPort] = getattr(intf, "_hlsMemoryPort", None)
+        if port is None:
+            return None
+        copyPort = port.bank._getPortByIndex(port.index + portOffset)
+        if port.hasWrite:
+            # the copy of the request may be a write as well
+            copyPort.hasWrite = True
+        return copyPort
+
+    @classmethod
+    def _cloneInstr(cls, instr: SsaInstr, valMap: Dict[SsaValue, SsaValue], portOffset: Dict[SsaInstr, int]) -> SsaInstr:
+        """
+        :param portOffset: the offset of the memory port for the copy of each memory request
+        """
+        instrCls = instr.__class__
+        if instrCls is HlsStreamProcMemoryRead:
+            # the request of memory read is a separate HlsStreamProcWrite instruction in the SSA
+            port = cls._getMemoryPortForCopy(instr._src, portOffset[instr._request])
+            return HlsStreamProcMemoryRead(instr._parent, port, valMap[instr._request])
+
+        elif instrCls is HlsStreamProcRead:
+            return HlsStreamProcRead(instr._parent, instr._src, instr._dtypeOrig)
+
+        elif instrCls is HlsStreamProcWrite:
+            src = instr.getSrc()
+            src = valMap.get(src, src)
+            dst = instr.dst
+            port = cls._getMemoryPortForCopy(dst, portOffset.get(instr, 0))
+            if port is not None:
+                port.requestCnt += 1
+                dst = port.request
+            w = HlsStreamProcWrite(instr.parent, src, dst)
+            if isinstance(src, SsaValue):
+                src.users.append(w)
+            return w
+
+        elif instrCls is SsaInstr:
+            ops = tuple(valMap.get(o, o) for o in instr.operands)
+            return SsaInstr(instr.block.ctx, instr._dtype, instr.operator, ops, origin=instr.origin)
+
+        else:
+            raise NotImplementedError("Unroll of loop with this instruction is not supported", instr)
+
+    def _collectOutsideUses(self, blocks: UniqList[SsaBasicBlock]) -> List[Tuple[SsaValue, Union[SsaInstr, SsaInstrBranch]]]:
+        """
+        Collect uses of the values defined in the loop outside of the loop, except the uses in phis
+        of the exit blocks which are resolved by adding the operands for copies of the exiting blocks.
+        """
+        outsideUses = []
+        for b in blocks:
+            for v in chain(b.phis, b.body):
+                for u in v.users:
+                    if self._getUserBlock(u) in blocks:
+                        continue
+                    if isinstance(u, SsaPhi):
+                        inLoopPreds = [pred in blocks for (val, pred) in u.operands if val is v]
+                        if all(inLoopPreds):
+                            continue
+                        elif any(inLoopPreds):
+                            raise NotImplementedError("Phi uses the value from the loop from inside and outside of the loop", u, v)
+                    outsideUses.append((v, u))
+
+        return outsideUses
+
+    def _unrollLoop(self, loop: SsaLoop, factor: int, done: Set[SsaBasicBlock]):
+        header, blocks = loop
+        ctx = header.ctx
+        latches = [pred for pred in header.predecessors if pred in blocks]
+        exitTargets = UniqList(t for b in blocks for t in b.successors.iterBlocks() if t not in blocks)
+
+        outsideUses = self._collectOutsideUses(blocks)
+        if outsideUses:
+            if len(exitTargets) != 1:
+                raise NotImplementedError("Value from the loop used outside of the loop with multiple exits", header, outsideUses)
+            if any(pred not in blocks for pred in exitTargets[0].predecessors):
+                raise NotImplementedError("Value from the loop used outside of the loop with exit block reachable also from outside", header, outsideUses)
+
+        inductionVars = self._resolveInductionVariables(header, blocks)
+        replacements: List[Dict[SsaInstr, Union[SsaValue, HValue]]] = []
+        deadAccesses: List[Set[SsaInstr]] = []
+        for c in range(factor):
+            r = self._resolveCopyReplacements(blocks, self._resolveKnownResidues(inductionVars, factor, c))
+            replacements.append(r)
+            deadAccesses.append(self._resolveDeadMemoryAccesses(blocks, r))
+
+        # the memory requests which are not removed from the copies are moved to the consecutive ports
+        portOffsets: List[Dict[SsaInstr, int]] = [{} for _ in range(factor)]
+        for b in blocks:
+            for instr in b.body:
+                if instr.__class__ is HlsStreamProcWrite and getattr(instr.dst, "_hlsMemoryPort", None) is not None:
+                    offset = 0
+                    for c in range(factor):
+                        if instr not in deadAccesses[c]:
+                            portOffsets[c][instr] = offset
+                            offset += 1
+
+        # copy 0 is the original loop, the resolved instructions are replaced after the copies are connected
+        blockMaps: List[Dict[SsaBasicBlock, SsaBasicBlock]] = [{b: b for b in blocks}, ]
+        valMaps: List[Dict[SsaValue, Union[SsaValue, HValue]]] = [dict(replacements[0]), ]
+        for c in range(1, factor):
+            blockMap = {}
+            valMap = {}
+            for b in blocks:
+                nb = SsaBasicBlock(ctx, f"{b.label:s}_u{c:d}")
+                nb.origins.extend(b.origins)
+                blockMap[b] = nb
+                if b in done:
+                    done.add(nb)
+                for phi in b.phis:
+                    p = SsaPhi(ctx, phi._dtype, origin=phi.origin)
+                    nb.appendPhi(p)
+                    valMap[phi] = p
+
+            for b in blocks:
+                nb = blockMap[b]
+                for instr in b.body:
+                    if instr in deadAccesses[c]:
+                        continue
+                    r = replacements[c].get(instr, None)
+                    if r is None:
+                        newInstr = self._cloneInstr(instr, valMap, portOffsets[c])
+                        nb.appendInstruction(newInstr)
+                    else:
+                        newInstr = valMap.get(r, r) if isinstance(r, SsaValue) else r
+                    valMap[instr] = newInstr
+
+            blockMaps.append(blockMap)
+            valMaps.append(valMap)
+
+        # connect copies of blocks
+        # (the copies are resolved from the original blocks before the original latches and header phis are updated)
+        for c in range(1, factor):
+            blockMap = blockMaps[c]
+            valMap = valMaps[c]
+            nextHeader = blockMaps[(c + 1) % factor][header]
+            for b in blocks:
+                nb = blockMap[b]
+                for cond, t in b.successors.targets:
+                    if cond is not None:
+                        cond = valMap.get(cond, cond)
+                    if t is header:
+                        t = nextHeader
+                    elif t in blocks:
+                        t = blockMap[t]
+                    nb.successors.addTarget(cond, t)
+
+        # resolve operands of phis
+        for c in range(1, factor):
+            blockMap = blockMaps[c]
+            valMap = valMaps[c]
+            prevBlockMap = blockMaps[c - 1]
+            prevValMap = valMaps[c - 1]
+            for b in blocks:
+                nb = blockMap[b]
+                for phi, newPhi in zip(b.phis, nb.phis):
+                    for v, pred in phi.operands:
+                        if b is header:
+                            if pred not in blocks:
+                                # the entry to a loop is only to original header
+                                continue
+                            newPhi.appendOperand(prevValMap.get(v, v), prevBlockMap[pred])
+                        else:
+                            newPhi.appendOperand(valMap.get(v, v), blockMap[pred])
+
+        firstCopyHeader = blockMaps[1][header]
+        for latch in latches:
+            latch.successors.replaceTargetBlock(header, firstCopyHeader)
+            header.predecessors.remove(latch)
+            firstCopyHeader.predecessors.append(latch)
+
+        lastValMap = valMaps[-1]
+        lastBlockMap = blockMaps[-1]
+        for phi in header.phis:
+            phi: SsaPhi
+            ops = []
+            for v, pred in phi.operands:
+                if pred in blocks:
+                    # backedge from last copy
+                    ops.append((lastValMap.get(v, v), lastBlockMap[pred]))
+                else:
+                    ops.append((v, pred))
+            for v, _ in phi.operands:
+                if isinstance(v, SsaValue) and phi in v.users:
+                    v.users.remove(phi)
+            phi.operands = tuple(ops)
+            for v, _ in ops:
+                if isinstance(v, SsaValue):
+                    v.users.append(phi)
+
+        for t in exitTargets:
+            for phi in t.phis:
+                for v, pred in phi.operands:
+                    if pred in blocks:
+                        for blockMap, valMap in zip(blockMaps[1:], valMaps[1:]):
+                            phi.appendOperand(valMap.get(v, v), blockMap[pred])
+
+        # the values used outside of the loop have to be selected from the copy where the loop was exited
+        if outsideUses:
+            exitBlock = exitTargets[0]
+            exitPhis: Dict[SsaValue, SsaPhi] = {}
+            for v, u in outsideUses:
+                p = exitPhis.get(v, None)
+                if p is None:
+                    p = SsaPhi(ctx, v._dtype, origin=v.origin)
+                    exitBlock.appendPhi(p)
+                    for pred in exitBlock.predecessors:
+                        for blockMap, valMap in zip(blockMaps, valMaps):
+                            if pred in blockMap.values():
+                                p.appendOperand(valMap.get(v, v), pred)
+                                break
+                    exitPhis[v] = p
+
+                u.replaceInput(v, p)
+                if isinstance(u, SsaPhi):
+                    # SsaPhi.replaceInput does not update users of replaced value
+                    v.users.remove(u)
+
+        self._applyReplacementsInPlace(blocks, replacements[0], deadAccesses[0])
+        done.add(header)
+
+    def apply(self, hls: "HlsStreamProc", to_ssa: AstToSsa):
+        done: Set[SsaBasicBlock] = set()
+        while True:
+            loops = self.detectLoops(to_ssa.start)
+            for loop in loops:
+                if loop[0] in done:
+                    continue
+                factor = self._resolveUnrollFactor(loop, loops)
+                if factor is not None and factor > 1:
+                    self._unrollLoop(loop, factor, done)
+                    # the blocks of outer loops changed, the loops have to be detected again
+                    break
+                done.add(loop[0])
+            else:
+                break
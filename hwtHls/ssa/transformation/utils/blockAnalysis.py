@@ -4,8 +4,19 @@ from hwtHls.ssa.basicBlock import SsaBasicBlock
 
 
 def collect_all_blocks(start: SsaBasicBlock, seen_blocks: Set[SsaBasicBlock]):
+    """
+    Yield all blocks reachable from start block in DFS preorder.
+    (Without recursion so it is not limited by the recursion limit on large CFGs.)
+    """
     seen_blocks.add(start)
     yield start
-    for suc in start.successors.iterBlocks():
-        if suc not in seen_blocks:
-            yield from collect_all_blocks(suc, seen_blocks)
+    stack = [start.successors.iterBlocks()]
+    while stack:
+        for suc in stack[-1]:
+            if suc not in seen_blocks:
+                seen_blocks.add(suc)
+                yield suc
+                stack.append(suc.successors.iterBlocks())
+                break
+        else:
+            stack.pop()
@@ -14,6 +14,7 @@ from hwt.synthesizer.rtlLevel.signalUtils.exceptions import SignalDriverErr
 from hwtHls.hlsStreamProc.statements import HlsStreamProcStm, HlsStreamProcWhile, \
     HlsStreamProcCodeBlock, HlsStreamProcIf, HlsStreamProcFor, HlsStreamProcContinue, \
     HlsStreamProcBreak
+from hwtHls.hlsStreamProc.memory import HlsStreamProcMemoryRead
 from hwtHls.hlsStreamProc.statementsIo import HlsStreamProcWrite, HlsStreamProcRead
 from hwtHls.ssa.basicBlock import SsaBasicBlock
 from hwtHls.ssa.context import SsaContext
@@ -114,6 +115,9 @@ class AstToSsa():
                 block = self.visit_Break(block, o)
             elif isinstance(o, HlsStreamProcContinue):
                 block = self.visit_Continue(block, o)
+            elif isinstance(o, (list, tuple)):
+                # e.g. writes to all banks of partitioned memory
+                block = self.visit_CodeBlock_list(block, o)
             else:
                 raise NotImplementedError(o)
 
@@ -136,6 +140,9 @@ class AstToSsa():
                 elif isinstance(op, HlsStreamProcRead):
                     if op.block is None:
                         # read first used there else already visited
+                        if isinstance(op, HlsStreamProcMemoryRead) and op._request.block is None:
+                            # the request to memory must be send before the response is read
+                            block = self.visit_Write(block, op._request)
                         block.appendInstruction(op)
                         # HlsStreamProcRead is a SsaValue and thus represents "variable"
                         self.m_ssa_u.writeVariable(var, (), block, op)
@@ -153,6 +160,7 @@ class AstToSsa():
                 assert len(op.operands) == 1
                 return self.visit_expr(block, op.operands[0])
 
+            block = self._visitMemoryRequests(block, op)
             ops = []
             for o in op.operands:
                 block, _o = self.visit_expr(block, o)
@@ -171,6 +179,8 @@ class AstToSsa():
         else:
             if isinstance(var, HlsStreamProcRead):
                 if var.block is None:
+                    if isinstance(var, HlsStreamProcMemoryRead) and var._request.block is None:
+                        block = self.visit_Write(block, var._request)
                     block.appendInstruction(var)
                     # HlsStreamProcRead is a SsaValue and thus represents "variable"
                     self.m_ssa_u.writeVariable(var._sig, (), block, var)
@@ -180,7 +190,7 @@ class AstToSsa():
 
     def visit_For(self, block: SsaBasicBlock, o: HlsStreamProcFor) -> SsaBasicBlock:
         block = self.visit_CodeBlock_list(block, o.init)
-        return self.visit_While(block, HlsStreamProcWhile(o.parent, o.cond, o.body + o.step))
+        return self.visit_While(block, HlsStreamProcWhile(o.parent, o.cond, o.body + o.step, maxII=o.maxII, unroll=o.unroll))
 
     def visit_While(self, block: SsaBasicBlock, o: HlsStreamProcWhile) -> SsaBasicBlock:
         if isinstance(o.cond, HValue):
@@ -298,6 +308,26 @@ class AstToSsa():
 
         return end_if_block
 
+    def _visitMemoryRequests(self, block: SsaBasicBlock, op: Operator) -> SsaBasicBlock:
+        """
+        Write the requests of all memory reads in the expression before any response is read,
+        so the requests to the different memory ports can be issued in the same clock period.
+        """
+        for o in op.operands:
+            if not isinstance(o, RtlSignal):
+                continue
+            try:
+                d = o.singleDriver()
+            except SignalDriverErr:
+                continue
+
+            if isinstance(d, Operator):
+                block = self._visitMemoryRequests(block, d)
+            elif isinstance(d, HlsStreamProcMemoryRead) and d.block is None and d._request.block is None:
+                block = self.visit_Write(block, d._request)
+
+        return block
+
     def visit_Assignment(self, block: SsaBasicBlock, o: HdlAssignmentContainer) -> SsaBasicBlock:
         block, src = self.visit_expr(block, o.src)
         block.origins.append(o)
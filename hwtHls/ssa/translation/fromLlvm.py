@@ -583,4 +583,11 @@ class SsaPassFromLlvm():
         fromLlvm = FromLlvmIrTranslator(hls, to_ssa.ssaCtx, toLlvm.topIo)
         # print(toLlvm.main)
         to_ssa.start = fromLlvm.translate(toLlvm.main)
+        # LLVM keeps the names of blocks, copy the origins of the blocks so later stages can access
+        # the properties of the original statements (e.g. the maximum initiation interval of the loop)
+        originsByLabel = {bb.label: bb.origins for bb in toLlvm.varMap.keys() if isinstance(bb, SsaBasicBlock)}
+        for bb in fromLlvm.newBlocksBegin.values():
+            origins = originsByLabel.get(bb.label, None)
+            if origins:
+                bb.origins.extend(origins)
 
@@ -14,6 +14,7 @@ from hwt.pyUtils.uniqList import UniqList
 from hwt.synthesizer.interface import Interface
 from hwt.synthesizer.rtlLevel.rtlSignal import RtlSignal
 from hwtHls.errors import HlsSyntaxError
+from hwtHls.hlsStreamProc.memory import HlsStreamProcMemory
 from hwtHls.hlsStreamProc.statementsIo import HlsStreamProcWrite, \
     HlsStreamProcRead
 from hwtHls.hlsStreamProc.streamProc import HlsStreamProc
@@ -36,7 +37,7 @@ from hwtHls.ssa.translation.fromPython.instructions import CMP_OPS, BIN_OPS, UN_
     POP_JUMP_IF_TRUE, CALL_FUNCTION_EX
 from hwtHls.ssa.translation.fromPython.loopsDetect import PyBytecodeLoop, \
     PreprocLoopScope
-from hwtHls.ssa.translation.fromPython.markers import PythonBytecodeInPreproc
+from hwtHls.ssa.translation.fromPython.markers import PythonBytecodeInPreproc, PythonBytecodeLoopUnroll
 from hwtHls.ssa.value import SsaValue
 from ipCorePackager.constants import DIRECTION
 from hwtHls.ssa.translation.toHwtHlsNetlist.pipelineMaterialization import SsaSegmentToHwPipeline
@@ -488,6 +489,9 @@ class PythonBytecodeToSsa():
                 res = stack.pop()
                 if isinstance(res, (HlsStreamProcWrite, HlsStreamProcRead, HdlAssignmentContainer)):
                     self.to_ssa.visit_CodeBlock_list(curBlock, [res, ])
+                elif isinstance(res, PythonBytecodeLoopUnroll):
+                    # resolved later in SsaPassLoopUnroll for the innermost loop which contains this block
+                    curBlock.origins.append(res)
 
             elif opcode == LOAD_DEREF:
                 # nested scopes: access a variable through its cell object
@@ -628,6 +632,10 @@ class PythonBytecodeToSsa():
                 index = stack.pop()
                 sequence = stack.pop()
                 val = stack.pop()
+                if isinstance(sequence, HlsStreamProcMemory):
+                    self.to_ssa.visit_CodeBlock_list(curBlock, [sequence.write(index, val), ])
+                    return curBlock
+
                 if isinstance(index, (RtlSignal, SsaValue)) and not isinstance(sequence, (RtlSignal, SsaValue)):
                     return expandSetitemOnPytObjAsSwitchCase(self, curBlock, instr.offset, sequence, index, val, stack)
                 stack.append(operator.setitem(sequence, index, val))
@@ -637,7 +645,7 @@ class PythonBytecodeToSsa():
                 if binOp is not None:
                     b = stack.pop()
                     a = stack.pop()
-                    if binOp is operator.getitem and isinstance(b, (RtlSignal, Interface, SsaValue)) and not isinstance(a, (RtlSignal, SsaValue)):
+                    if binOp is operator.getitem and isinstance(b, (RtlSignal, Interface, SsaValue)) and not isinstance(a, (RtlSignal, SsaValue, HlsStreamProcMemory)):
                         # if this is indexing using hw value on non hw object we need to expand it to a switch-case on individual cases
                         # must generate blocks for switch cases,
                         # for this we need a to keep track of start/end for each block because we do not have this newly generated blocks in original CFG
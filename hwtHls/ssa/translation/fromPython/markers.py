@@ -20,3 +20,26 @@ class PythonBytecodeInPreproc():
         for i in self.ref:
             yield PythonBytecodeInPreproc(i)
 
+
+class PythonBytecodeLoopUnroll():
+    """
+    A marker of the hardware evaluated loop which should be partially unrolled.
+    The marker has to be used as a statement in the body of the loop, it applies to the innermost loop.
+
+    .. code-block:: Python
+
+        while BIT.from_py(1):
+            PythonBytecodeLoopUnroll(4)
+            ...
+
+    :note: The loops evaluated in preprocessor are fully unrolled and the marker is ignored for them.
+    :see: :class:`hwtHls.ssa.transformation.loopUnroll.SsaPassLoopUnroll`
+    """
+
+    def __init__(self, factor: int):
+        if factor < 1:
+            raise ValueError("Unroll factor must be at least 1", factor)
+        self.factor = factor
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} {self.factor:d}>"
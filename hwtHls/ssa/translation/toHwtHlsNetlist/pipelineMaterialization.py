@@ -1,8 +1,9 @@
-from typing import List, Optional
+from typing import List, Optional, Iterable, Sequence
 
 from hwt.synthesizer.unit import Unit
 from hwtHls.hlsPipeline import HlsPipeline
 from hwtHls.hlsStreamProc.statements import HlsStreamProcCodeBlock
+from hwtHls.netlist.nodes.node import HlsNetNode
 from hwtHls.ssa.analysis.blockSyncType import SaaGetBlockSyncType
 from hwtHls.ssa.analysis.liveness import ssa_liveness_edge_variables
 from hwtHls.ssa.basicBlock import SsaBasicBlock
@@ -76,5 +77,28 @@ class SsaSegmentToHwPipeline():
         self.hls.schedule()
         self.is_scheduled = True
 
+    def schedulerRunCached(self, cache: "HlsScheduleCache", passes: Sequence[object]):
+        """
+        Load the schedule from cache or run the scheduler and store the result to cache.
+
+        :see: :class:`hwtHls.scheduler.scheduleCache.HlsScheduleCache`
+        """
+        key = cache.getKey(self.hls, passes)
+        if not cache.load(key, self.hls):
+            for n in self.hls.iterAllNodes():
+                # clean the side effects of the realization resolution
+                n.resetScheduling()
+            self.hls.schedule()
+            cache.store(key, self.hls)
+        self.is_scheduled = True
+
+    def schedulerRunIncremental(self, dirtyNodes: Iterable[HlsNetNode]):
+        """
+        Reschedule only the part of the netlist affected by modification of dirtyNodes.
+        (Falls back to full scheduling if the netlist was not scheduled yet.)
+        """
+        self.hls.scheduleIncremental(dirtyNodes)
+        self.is_scheduled = True
+
     def construct_rtlnetlist(self):
         self.hls.allocate()
@@ -8,6 +8,7 @@ from hwt.synthesizer.interface import Interface
 from hwt.synthesizer.rtlLevel.constants import NOT_SPECIFIED
 from hwt.synthesizer.unit import Unit
 from hwtHls.hlsPipeline import HlsPipeline
+from hwtHls.hlsStreamProc.statements import HlsStreamProcWhile
 from hwtHls.netlist.nodes.backwardEdge import HlsNetNodeWriteBackwardEdge, \
     HlsNetNodeReadBackwardEdge
 from hwtHls.netlist.nodes.io import HlsNetNodeWrite, HlsNetNodeRead, \
@@ -209,12 +210,23 @@ class SsaToHwtHlsNetlistSyncAndIo():
         assert (src_block, dst_block) not in self._block_io
         self._block_io[(src_block, dst_block)] = BlockPortsRecord(add_control, newly_added_ports)
 
+    @staticmethod
+    def _getLoopInitiationInterval(loop_header: SsaBasicBlock) -> Optional[int]:
+        """
+        :return: the maximum initiation interval of the loop which starts in loop_header block (if any)
+        """
+        for o in loop_header.origins:
+            if isinstance(o, HlsStreamProcWhile) and o.maxII is not None:
+                return o.maxII
+        return None
+
     def finalize_block_out_of_pipeline_variable_outputs(self,
             src_block: SsaBasicBlock, dst_block: SsaBasicBlock):
         """
         :note: Needs to be done in src_block because we need the synchronization for the output.
         """
         assert self.parent._current_block is src_block
+        maxII = self._getLoopInitiationInterval(dst_block)
         block_ports = self._block_io[(src_block, dst_block)]
         # the ports are generated by init_out_of_hls_variables and should be in same order
         # as this cycle iterates
@@ -230,6 +242,7 @@ class SsaToHwtHlsNetlistSyncAndIo():
             _, w_to_out = self._add_hs_intf_and_write(f"c_{src_block.label:s}_to_{dst_block.label:s}_out", BIT,
                                                       end_val, HlsNetNodeWriteBackwardEdge)
             w_to_out.associate_read(control_ext_ports[0])
+            w_to_out.maxII = maxII
         else:
             assert control_cache_key not in self.parent._to_hls_cache._to_hls_cache, "The control must not be used anywhere if it should not exists."
 
@@ -241,6 +254,7 @@ class SsaToHwtHlsNetlistSyncAndIo():
                                                       self.parent.to_hls_expr(opv), HlsNetNodeWriteBackwardEdge)
             var_ext_ports = next(ports_it)
             w_to_out.associate_read(var_ext_ports[0])
+            w_to_out.maxII = maxII
 
     def _add_hs_intf_and_write(self, suggested_name: str, dtype:HdlType,
                                val: Union[HlsNetNodeOut, HlsNetNodeOutLazy],
@@ -276,13 +290,45 @@ class SsaToHwtHlsNetlistSyncAndIo():
             assert self._firstIoAccesOfBlock[block] is None, (block, self._firstIoAccesOfBlock[block], io)
             self._firstIoAccesOfBlock[block] = io
         else:
+            skippedResponses = ()
+            if isinstance(io, HlsNetNodeWrite) and getattr(io.dst, "_hlsHasResponse", False):
+                prevIos, skippedResponses = self._skipResponseReadsInOrdering(prevIos)
+
             for prevIo in prevIos:
                 assert isinstance(prevIo, (HlsNetNodeRead, HlsNetNodeWrite)), prevIo
                 self._addOrderingDependence(prevIo, io)
 
+            if skippedResponses:
+                # the skipped reads are still before any other following IO
+                self._blockOrderingSync[block] = UniqList((io, *skippedResponses))
+                return
+
         # the oredring in this block is tied only to this specific io access
         self._blockOrderingSync[block] = UniqList((io,))
 
+    def _skipResponseReadsInOrdering(self, prevIos: UniqList[Union[HlsNetNodeRead, HlsNetNodeWrite]]):
+        """
+        The write of the request (e.g. to memory port) does not have to wait on the read of the response for a previous
+        request (the reads of the responses are ordered by the requests), this allows to write requests to all memory ports
+        before the responses are read.
+
+        :return: tuple (ordering dependencies for the request, skipped response reads)
+        """
+        deps = UniqList()
+        skipped = UniqList()
+        firstIos = set(self._firstIoAccesOfBlock.values())
+        toSearch = list(prevIos)
+        while toSearch:
+            prevIo = toSearch.pop()
+            if isinstance(prevIo, HlsNetNodeRead) and prevIo.requestLatency is not None and prevIo not in firstIos:
+                # :note: the first IO of block may not have all ordering dependencies yet
+                skipped.append(prevIo)
+                toSearch.extend(prevIo.dependsOn[i.in_i].obj for i in prevIo.iterOrderingInputs())
+            else:
+                deps.append(prevIo)
+
+        return deps, skipped
+
     def _write_to_io(self, intf: Interface,
                      val: Union[HlsNetNodeOut, HlsNetNodeOutLazy],
                      write_cls:Type[HlsNetNodeWrite]=HlsNetNodeWrite,
@@ -4,6 +4,8 @@
 import sys
 from unittest import TestLoader, TextTestRunner, TestSuite
 
+from tests.benchmark.compileTime_test import CompileTimeBenchmark_TC
+from tests.benchmark.qor_test import QoRBenchmark_TC
 from tests.bitOpt.bitWidthReductionCmp_test import BitWidthReductionCmp_example_TC
 from tests.io.axiStream.axisPacketCntr_test import AxiSPacketCntrTC
 from tests.io.axiStream.axisParseEth_test import AxiSParseEthTC
@@ -27,6 +29,29 @@ from tests.syntaxElements.while_if_test import HlsStreamMachineWhileIf_TC
 from tests.syntehesis_checks import HlsSynthesisChecksTC
 from tests.utils.alapAsapDiffExample import AlapAsapDiffExample_TC
 from tests.utils.concatOfSlices_test import ConcatOfSlicesTC
+from tests.utils.incrementalScheduling_test import IncrementalScheduling_TC
+from tests.utils.indexedGraph_test import HlsNetlistIndexedGraph_TC
+from tests.utils.listScheduler_test import HlsListScheduler_TC
+from tests.utils.sdcScheduler_test import HlsSdcScheduler_TC
+from tests.utils.scheduleCache_test import HlsScheduleCache_TC
+from tests.utils.parallelScheduling_test import ParallelScheduling_TC
+from tests.utils.compileProfiler_test import HlsCompileProfiler_TC
+from tests.utils.opDelayTable_test import OpDelayTable_TC
+from tests.utils.multiCycleOps_test import MultiCycleOps_TC
+from tests.utils.splitWideArithmetic_test import SplitWideArithmetic_TC
+from tests.utils.loopInitiationInterval_test import LoopInitiationInterval_TC
+from tests.utils.loopUnroll_test import LoopUnroll_TC
+from tests.utils.dataflowChannel_test import DataflowChannel_TC
+from tests.utils.interElementBuffer_test import InterElementBuffer_TC
+from tests.utils.pipelineReadyRegister_test import PipelineReadyRegister_TC
+from tests.utils.memory_test import HlsMemory_TC
+from tests.utils.memoryPartition_test import HlsMemoryPartition_TC
+from tests.utils.functionalUnitSharing_test import HlsFunctionalUnitSharing_TC
+from tests.utils.fsmRegisterSharing_test import HlsFsmRegisterSharing_TC
+from tests.utils.shiftRegister_test import ShiftRegister_TC
+from tests.utils.retiming_test import HlsScheduleRetiming_TC
+from tests.utils.ssaLiveness_test import SsaLiveness_TC
+from tests.utils.parameterValidation_test import ParameterValidation_TC
 from tests.utils.phiConstructions_test import PhiConstruction_TC
 
 
@@ -48,6 +73,31 @@ suite = testSuiteFromTCs(
     *BitonicSorterHLS_TCs,
     HlsExprTree3_example_TC,
     AlapAsapDiffExample_TC,
+    IncrementalScheduling_TC,
+    HlsNetlistIndexedGraph_TC,
+    HlsListScheduler_TC,
+    HlsSdcScheduler_TC,
+    HlsScheduleCache_TC,
+    ParallelScheduling_TC,
+    HlsCompileProfiler_TC,
+    OpDelayTable_TC,
+    MultiCycleOps_TC,
+    SplitWideArithmetic_TC,
+    LoopInitiationInterval_TC,
+    LoopUnroll_TC,
+    DataflowChannel_TC,
+    InterElementBuffer_TC,
+    PipelineReadyRegister_TC,
+    HlsMemory_TC,
+    HlsMemoryPartition_TC,
+    HlsFunctionalUnitSharing_TC,
+    HlsFsmRegisterSharing_TC,
+    ShiftRegister_TC,
+    HlsScheduleRetiming_TC,
+    SsaLiveness_TC,
+    ParameterValidation_TC,
+    CompileTimeBenchmark_TC,
+    QoRBenchmark_TC,
     HlsSynthesisChecksTC,
     TwoTimesA_TC,
     HlsStreamMachineTrivial_TC,
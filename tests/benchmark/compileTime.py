@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Compile time benchmark of the designs from :func:`tests.benchmark.designs.getBenchmarkDesigns`.
+
+Example of use:
+
+.. code-block:: bash
+
+    python3 -m tests.benchmark.compileTime --output current.json
+    python3 -m tests.benchmark.compileTime --baseline current.json --filter CrcCombHls
+"""
+
+import argparse
+import json
+import re
+import sys
+from time import perf_counter
+from typing import Callable, Dict, List, Optional
+
+from hwt.synthesizer.unit import Unit
+from hwt.synthesizer.utils import to_rtl_str
+from hwtHls.hlsStreamProc.compileProfiler import HlsCompileProfiler
+from hwtHls.platform.virtual import VirtualHlsPlatform
+from tests.benchmark.designs import getBenchmarkDesigns
+
+# dict design name -> {"total": seconds, "stages": {stage name: seconds}} or {"error": str}
+CompileTimeResults = Dict[str, dict]
+
+
+def benchmarkCompileTime(constructor: Callable[[], Unit], repeat: int) -> dict:
+    """
+    Compile the design "repeat" times and take the minimal time for the total and for each stage.
+    """
+    total = None
+    stages: Dict[str, float] = {}
+    for _ in range(repeat):
+        prof = HlsCompileProfiler()
+        u = constructor()
+        t0 = perf_counter()
+        try:
+            to_rtl_str(u, target_platform=VirtualHlsPlatform(compileProfiler=prof))
+        except Exception as e:
+            return {"error": repr(e)}
+        t = perf_counter() - t0
+        total = t if total is None else min(total, t)
+
+        curStages: Dict[str, float] = {}
+        for r in prof.records:
+            curStages[r.name] = curStages.get(r.name, 0.0) + r.duration
+        for name, t in curStages.items():
+            prev = stages.get(name, None)
+            stages[name] = t if prev is None else min(prev, t)
+
+    return {"total": total, "stages": stages}
+
+
+def compareCompileTime(results: CompileTimeResults, baseline: CompileTimeResults,
+                       tolerance: float, minDiff: float) -> List[str]:
+    """
+    :param tolerance: relative increase of compilation time which is not considered to be a regression
+    :param minDiff: absolute increase of compilation time in seconds which is not considered to be a regression
+    :return: list of messages about regressions
+    """
+    regressions = []
+    for name, res in results.items():
+        base = baseline.get(name, None)
+        if base is None:
+            continue
+        if "error" in res:
+            if "error" not in base:
+                regressions.append(f"{name:s}: compilation failed {res['error']:s}")
+            continue
+        elif "error" in base:
+            continue
+
+        t = res["total"]
+        tBase = base["total"]
+        if t > tBase * (1 + tolerance) and t - tBase > minDiff:
+            slowStages = ", ".join(
+                f"{stage:s} {stageT:.3f}s (was {base['stages'][stage]:.3f}s)"
+                for stage, stageT in res["stages"].items()
+                if stage in base["stages"] and stageT > base["stages"][stage] * (1 + tolerance)
+            )
+            regressions.append(f"{name:s}: {t:.3f}s (was {tBase:.3f}s) {slowStages:s}")
+
+    return regressions
+
+
+def main(argv: Optional[List[str]]=None) -> int:
+    parser = argparse.ArgumentParser(description="hwtHls compile time benchmark")
+    parser.add_argument("--output", help="JSON file where results should be stored")
+    parser.add_argument("--baseline", help="JSON file with results from previous run to compare with")
+    parser.add_argument("--filter", default=None, help="regex for the names of designs to run")
+    parser.add_argument("--repeat", type=int, default=1, help="number of compilations of each design")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="relative time increase which is not a regression")
+    parser.add_argument("--minDiff", type=float, default=0.05, help="absolute time increase in seconds which is not a regression")
+    args = parser.parse_args(argv)
+
+    designs = getBenchmarkDesigns()
+    if args.filter is not None:
+        f = re.compile(args.filter)
+        designs = {k: v for k, v in designs.items() if f.search(k)}
+
+    results: CompileTimeResults = {}
+    for name, constructor in designs.items():
+        res = results[name] = benchmarkCompileTime(constructor, args.repeat)
+        if "error" in res:
+            print(f"{name:40s} error: {res['error']:s}")
+        else:
+            print(f"{name:40s} {res['total']:8.3f}s")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compareCompileTime(results, baseline, args.tolerance, args.minDiff)
+        for r in regressions:
+            print("REGRESSION", r)
+        if regressions:
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
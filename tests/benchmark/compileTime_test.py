@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import unittest
+
+from tests.benchmark.compileTime import compareCompileTime, benchmarkCompileTime
+from tests.benchmark.designs import getBenchmarkDesigns
+
+
+class CompileTimeBenchmark_TC(unittest.TestCase):
+
+    def test_benchmarkCompileTime(self):
+        res = benchmarkCompileTime(getBenchmarkDesigns()["HlsMAC_example2_4"], 1)
+        self.assertNotIn("error", res)
+        self.assertGreater(res["total"], 0)
+        self.assertIn("schedule", res["stages"])
+
+    def test_compareCompileTime(self):
+        baseline = {
+            "a": {"total": 1.0, "stages": {"schedule": 0.5, "SsaPassToLlvm": 0.5}},
+            "b": {"total": 1.0, "stages": {"schedule": 0.5}},
+            "c": {"total": 1.0, "stages": {}},
+        }
+        results = {
+            "a": {"total": 2.0, "stages": {"schedule": 1.5, "SsaPassToLlvm": 0.5}},
+            # within tolerance
+            "b": {"total": 1.1, "stages": {"schedule": 0.6}},
+            "c": {"error": "TimeConstraintError()"},
+            # not in baseline
+            "d": {"total": 10.0, "stages": {}},
+        }
+        regressions = compareCompileTime(results, baseline, 0.2, 0.05)
+        self.assertEqual(len(regressions), 2)
+        self.assertTrue(regressions[0].startswith("a: "))
+        self.assertIn("schedule", regressions[0])
+        self.assertNotIn("SsaPassToLlvm", regressions[0])
+        self.assertTrue(regressions[1].startswith("c: "))
+
+
+if __name__ == "__main__":
+    suite = unittest.TestSuite()
+    suite.addTest(unittest.makeSuite(CompileTimeBenchmark_TC))
+    runner = unittest.TextTestRunner(verbosity=3)
+    runner.run(suite)
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+A parametrized matrix of example designs from tests/ used for the benchmarks of the compiler.
+"""
+
+from typing import Callable, Dict
+
+from hwt.synthesizer.unit import Unit
+from hwtLib.logic.crcPoly import CRC_32
+from tests.io.axiStream.axisParseLinear import AxiSParseStructManyInts0, AxiSParse2fields
+from tests.syntaxElements.bitonicSort import BitonicSorterHLS
+from tests.syntaxElements.crc import CrcCombHls
+from tests.syntaxElements.mac import HlsMAC_example2
+from tests.syntaxElements.pid import PidControllerHls
+
+
+def _CrcCombHls(dataWidth: int) -> Unit:
+    u = CrcCombHls()
+    u.setConfig(CRC_32)
+    u.DATA_WIDTH = dataWidth
+    return u
+
+
+def _BitonicSorterHLS(items: int) -> Unit:
+    u = BitonicSorterHLS()
+    u.ITEMS = items
+    return u
+
+
+def _HlsMAC_example2(inputCnt: int) -> Unit:
+    u = HlsMAC_example2()
+    u.INPUT_CNT = inputCnt
+    return u
+
+
+def getBenchmarkDesigns() -> Dict[str, Callable[[], Unit]]:
+    """
+    :return: a dictionary name -> function which creates a new instance of the design
+    """
+    designs: Dict[str, Callable[[], Unit]] = {}
+    for dataWidth in (32, 64, 128, 256, 512, 1024):
+        designs[f"CrcCombHls_crc32_{dataWidth:d}b"] = lambda dataWidth=dataWidth: _CrcCombHls(dataWidth)
+
+    for items in (4, 8, 16, 32, 64):
+        designs[f"BitonicSorterHLS_{items:d}"] = lambda items=items: _BitonicSorterHLS(items)
+
+    for inputCnt in (4, 16, 64):
+        designs[f"HlsMAC_example2_{inputCnt:d}"] = lambda inputCnt=inputCnt: _HlsMAC_example2(inputCnt)
+
+    designs["PidControllerHls"] = PidControllerHls
+    designs["AxiSParseStructManyInts0"] = AxiSParseStructManyInts0
+    designs["AxiSParse2fields"] = AxiSParse2fields
+    return designs
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Quality of results (latency, registers, timing slack) of the designs from :func:`tests.benchmark.designs.getBenchmarkDesigns`.
+
+Example of use:
+
+.. code-block:: bash
+
+    python3 -m tests.benchmark.qor --output current.json
+    python3 -m tests.benchmark.qor --baseline current.json --filter BitonicSorterHLS
+"""
+
+import argparse
+import json
+import re
+import sys
+from typing import Callable, Dict, List, Optional
+
+from hwt.synthesizer.unit import Unit
+from hwt.synthesizer.utils import to_rtl_str
+from hwtHls.netlist.translation.qorReport import RtlNetlistPassQoRReport
+from hwtHls.platform.virtual import VirtualHlsPlatform
+from tests.benchmark.designs import getBenchmarkDesigns
+
+# dict design name -> {"latency": int, "registerBits": int, "fsmStateCount": int, "worstSlack": float, "threads": [...]}
+# or {"error": str}
+QoRResults = Dict[str, dict]
+
+
+def benchmarkQoR(constructor: Callable[[], Unit]) -> dict:
+    """
+    Compile the design and sum up the quality of results of all its threads.
+    """
+    qor = RtlNetlistPassQoRReport()
+    u = constructor()
+    try:
+        to_rtl_str(u, target_platform=VirtualHlsPlatform(rtlnetlist_passes=[qor, ]))
+    except Exception as e:
+        return {"error": repr(e)}
+
+    slacks = [r.worstSlack for r in qor.reports if r.worstSlack is not None]
+    return {
+        "latency": max((r.pipelineDepth for r in qor.reports), default=0),
+        "registerBits": sum(r.registerBits for r in qor.reports),
+        "fsmStateCount": sum(r.fsmStateCount for r in qor.reports),
+        "worstSlack": min(slacks) if slacks else None,
+        "threads": [r.toJson() for r in qor.reports],
+    }
+
+
+def compareQoR(results: QoRResults, baseline: QoRResults) -> List[str]:
+    """
+    :return: list of messages about designs which latency or number of register bits increased
+    """
+    regressions = []
+    for name, res in results.items():
+        base = baseline.get(name, None)
+        if base is None:
+            continue
+        if "error" in res:
+            if "error" not in base:
+                regressions.append(f"{name:s}: compilation failed {res['error']:s}")
+            continue
+        elif "error" in base:
+            continue
+
+        worse = []
+        for k in ("latency", "registerBits"):
+            if res[k] > base[k]:
+                worse.append(f"{k:s} {res[k]:d} (was {base[k]:d})")
+        if worse:
+            regressions.append(f"{name:s}: {', '.join(worse):s}")
+
+    return regressions
+
+
+def main(argv: Optional[List[str]]=None) -> int:
+    parser = argparse.ArgumentParser(description="hwtHls quality of results benchmark")
+    parser.add_argument("--output", help="JSON file where results should be stored")
+    parser.add_argument("--baseline", help="JSON file with results from previous run to compare with")
+    parser.add_argument("--filter", default=None, help="regex for the names of designs to run")
+    args = parser.parse_args(argv)
+
+    designs = getBenchmarkDesigns()
+    if args.filter is not None:
+        f = re.compile(args.filter)
+        designs = {k: v for k, v in designs.items() if f.search(k)}
+
+    results: QoRResults = {}
+    for name, constructor in designs.items():
+        res = results[name] = benchmarkQoR(constructor)
+        if "error" in res:
+            print(f"{name:40s} error: {res['error']:s}")
+        else:
+            slack = "-" if res["worstSlack"] is None else f"{res['worstSlack'] * 1e9:.3f}ns"
+            print(f"{name:40s} latency {res['latency']:4d} registerBits {res['registerBits']:6d}"
+                  f" fsmStates {res['fsmStateCount']:4d} worstSlack {slack:s}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compareQoR(results, baseline)
+        for r in regressions:
+            print("REGRESSION", r)
+        if regressions:
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
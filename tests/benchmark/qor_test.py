@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import unittest
+
+from tests.benchmark.designs import getBenchmarkDesigns
+from tests.benchmark.qor import benchmarkQoR, compareQoR
+
+
+class QoRBenchmark_TC(unittest.TestCase):
+
+    def test_benchmarkQoR(self):
+        res = benchmarkQoR(getBenchmarkDesigns()["HlsMAC_example2_4"])
+        self.assertNotIn("error", res)
+        self.assertGreater(res["latency"], 0)
+        self.assertGreaterEqual(res["registerBits"], 0)
+        self.assertEqual(len(res["threads"]), 1)
+        t = res["threads"][0]
+        self.assertEqual(len(t["stages"]), res["latency"])
+        for st in t["stages"]:
+            self.assertGreaterEqual(st["slack"], 0, st)
+        self.assertEqual(res["worstSlack"], min(st["slack"] for st in t["stages"]))
+
+    def test_compareQoR(self):
+        baseline = {
+            "a": {"latency": 2, "registerBits": 64},
+            "b": {"latency": 2, "registerBits": 64},
+            "c": {"latency": 2, "registerBits": 64},
+            "d": {"latency": 2, "registerBits": 64},
+        }
+        results = {
+            "a": {"latency": 3, "registerBits": 64},
+            "b": {"latency": 1, "registerBits": 32},
+            "c": {"latency": 2, "registerBits": 65},
+            "d": {"error": "TimeConstraintError()"},
+            # not in baseline
+            "e": {"latency": 10, "registerBits": 1024},
+        }
+        regressions = compareQoR(results, baseline)
+        self.assertEqual(len(regressions), 3)
+        self.assertTrue(regressions[0].startswith("a: latency"))
+        self.assertTrue(regressions[1].startswith("c: registerBits"))
+        self.assertTrue(regressions[2].startswith("d: "))
+
+
+if __name__ == "__main__":
+    suite = unittest.TestSuite()
+    suite.addTest(unittest.makeSuite(QoRBenchmark_TC))
+    runner = unittest.TextTestRunner(verbosity=3)
+    runner.run(suite)
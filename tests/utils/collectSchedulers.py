@@ -0,0 +1,13 @@
+from hwtHls.netlist.transformation.rtlNetlistPass import RtlNetlistPass
+
+
+class RtlNetlistPassCollectSchedulers(RtlNetlistPass):
+    """
+    Collect the schedulers of all compiled pipelines, used in tests to inspect the schedule and the netlist.
+    """
+
+    def __init__(self):
+        self.schedulers = []
+
+    def apply(self, hls:"HlsStreamProc", to_hw:"SsaSegmentToHwPipeline"):
+        self.schedulers.append(to_hw.hls.scheduler)
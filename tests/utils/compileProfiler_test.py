@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import json
+import os
+from tempfile import TemporaryDirectory
+import unittest
+
+from hwt.synthesizer.utils import to_rtl_str
+from hwtHls.hlsStreamProc.compileProfiler import HlsCompileProfiler
+from hwtHls.platform.virtual import VirtualHlsPlatform, DEFAULT_SSA_PASSES, \
+    DEFAULT_HLSNETLIST_PASSES
+from tests.syntaxElements.mac import HlsMAC_example
+
+
+class HlsCompileProfiler_TC(unittest.TestCase):
+
+    def test_HlsMAC_example(self):
+        prof = HlsCompileProfiler()
+        to_rtl_str(HlsMAC_example(), target_platform=VirtualHlsPlatform(compileProfiler=prof))
+        names = [r.name for r in prof.records]
+        self.assertEqual(names, [
+            "compileToSsa",
+            *(p.__class__.__name__ for p in DEFAULT_SSA_PASSES),
+            "extract_pipeline",
+            "extract_hlsnetlist",
+            *(p.__class__.__name__ for p in DEFAULT_HLSNETLIST_PASSES),
+            "schedule",
+            "construct_rtlnetlist",
+        ])
+        for r in prof.records:
+            self.assertEqual(r.threadIndex, 0)
+            self.assertGreaterEqual(r.duration, 0)
+
+        recs = {r.name: r for r in prof.records}
+        self.assertIn("ssaInstructions", recs["compileToSsa"].objectCounts)
+        self.assertIn("llvmInstructions", recs["SsaPassRunLlvmOpt"].objectCounts)
+        self.assertIn("ssaInstructions", recs["SsaPassFromLlvm"].objectCounts)
+        sched = recs["schedule"].objectCounts
+        self.assertGreater(sched["nodes"], 0)
+        self.assertGreater(sched["ports"], sched["nodes"])
+
+        with TemporaryDirectory() as d:
+            jsonFile = os.path.join(d, "profile.json")
+            prof.saveJson(jsonFile)
+            with open(jsonFile) as f:
+                self.assertEqual(len(json.load(f)), len(prof.records))
+
+            traceFile = os.path.join(d, "profile.trace.json")
+            prof.saveChromeTrace(traceFile)
+            with open(traceFile) as f:
+                trace = json.load(f)
+            self.assertEqual(len(trace["traceEvents"]), len(prof.records))
+            for e in trace["traceEvents"]:
+                self.assertEqual(e["ph"], "X")
+                self.assertEqual(e["tid"], 1)
+
+
+if __name__ == "__main__":
+    suite = unittest.TestSuite()
+    suite.addTest(unittest.makeSuite(HlsCompileProfiler_TC))
+    runner = unittest.TextTestRunner(verbosity=3)
+    runner.run(suite)
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import unittest
+
+from hwt.hdl.types.bits import Bits
+from hwt.simulator.simTestCase import SimTestCase
+from hwt.synthesizer.utils import to_rtl_str
+from hwtHls.hlsStreamProc.channel import HlsStreamProcChannel
+from hwtHls.hlsStreamProc.streamProc import HlsStreamProc
+from hwtHls.platform.virtual import VirtualHlsPlatform
+from hwtSimApi.utils import freq_to_period
+from tests.syntaxElements.trivial import WhileTrueReadWrite
+
+
+class DataflowTwoThreads(WhileTrueReadWrite):
+    """
+    Producer thread adds a constant, consumer thread multiplies,
+    the threads are connected using a channel
+    """
+
+    def _config(self):
+        super(DataflowTwoThreads, self)._config()
+        self.CHANNEL_DEPTH = None
+
+    def _impl(self) -> None:
+        hls = HlsStreamProc(self)
+        t = Bits(self.DATA_WIDTH, signed=False)
+        self.ch = ch = hls.channel(t, "ch", depth=self.CHANNEL_DEPTH)
+        hls.thread(
+            hls.While(True,
+                hls.write(hls.read(self.dataIn) + 3, ch),
+            )
+        )
+        hls.thread(
+            hls.While(True,
+                hls.write(hls.read(ch) * 5, self.dataOut),
+            )
+        )
+        hls.compile()
+
+
+class DataflowUnusedChannel(WhileTrueReadWrite):
+    """
+    A channel which is not accessed by the thread of the same :class:`HlsStreamProc`
+    """
+
+    def _impl(self) -> None:
+        hls = HlsStreamProc(self)
+        self.ch = hls.channel(self.dataIn.T, "ch")
+        hls.thread(
+            hls.While(True,
+                hls.write(hls.read(self.dataIn), self.dataOut)
+            )
+        )
+        hls.compile()
+
+
+class DataflowChannel_TC(SimTestCase):
+
+    def test_unusedChannel(self):
+        u = DataflowUnusedChannel()
+        with self.assertRaises(AssertionError) as ctx:
+            to_rtl_str(u, target_platform=VirtualHlsPlatform())
+        self.assertEqual(ctx.exception.args, ("Channel is not written by any thread", u.ch))
+
+    def _test_DataflowTwoThreads(self, u: DataflowTwoThreads):
+        self.compileSimAndStart(u, target_platform=VirtualHlsPlatform())
+        ch: HlsStreamProcChannel = u.ch
+        if u.CHANNEL_DEPTH is None:
+            self.assertGreaterEqual(ch.resolvedDepth, HlsStreamProcChannel.MIN_DEPTH)
+        else:
+            self.assertEqual(ch.resolvedDepth, u.CHANNEL_DEPTH)
+
+        inputs = list(range(16))
+        u.dataIn._ag.data.extend(inputs)
+        clkPeriod = int(freq_to_period(u.FREQ))
+        self.runSim((len(inputs) + 10) * clkPeriod)
+
+        m = (1 << u.DATA_WIDTH) - 1
+        self.assertValSequenceEqual(u.dataOut._ag.data, [((d + 3) * 5) & m for d in inputs])
+
+    def test_DataflowTwoThreads(self):
+        self._test_DataflowTwoThreads(DataflowTwoThreads())
+
+    def test_DataflowTwoThreads_explicitDepth(self):
+        u = DataflowTwoThreads()
+        u.CHANNEL_DEPTH = 4
+        self._test_DataflowTwoThreads(u)
+
+
+if __name__ == "__main__":
+    suite = unittest.TestSuite()
+    suite.addTest(unittest.makeSuite(DataflowChannel_TC))
+    runner = unittest.TextTestRunner(verbosity=3)
+    runner.run(suite)
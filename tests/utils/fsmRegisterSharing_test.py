@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from functools import partial
+import unittest
+
+from hwt.simulator.simTestCase import SimTestCase
+from hwt.synthesizer.unit import Unit
+from hwt.synthesizer.utils import to_rtl_str
+from hwtHls.allocator.allocator import HlsAllocator
+from hwtHls.allocator.fsmContainer import AllocatorFsmContainer
+from hwtHls.hlsStreamProc.streamProc import HlsStreamProc
+from hwtHls.netlist.translation.qorReport import RtlNetlistPassQoRReport
+from hwtHls.platform.virtual import VirtualHlsPlatform
+from hwtSimApi.utils import freq_to_period
+from tests.syntaxElements.trivial import WhileTrueReadWrite
+from tests.utils.collectSchedulers import RtlNetlistPassCollectSchedulers
+
+
+class TwoSumsInFsm(WhileTrueReadWrite):
+    """
+    Two sums of 2 inputs, the inputs are read from the same interface and thus
+    the first operand of each sum has to be stored in a register until the second operand is read.
+    The lifetimes of the first operands do not overlap and the register can be shared.
+    """
+
+    def _impl(self) -> None:
+        hls = HlsStreamProc(self)
+        x = hls.var("x", self.dataIn.T)
+        z = hls.var("z", self.dataIn.T)
+        hls.thread(
+            hls.While(True,
+                x(hls.read(self.dataIn)),
+                hls.write(x + hls.read(self.dataIn), self.dataOut),
+                z(hls.read(self.dataIn)),
+                hls.write(z + hls.read(self.dataIn), self.dataOut),
+            )
+        )
+        hls.compile()
+
+
+def sharingPlatform(**kwargs):
+    return VirtualHlsPlatform(allocator=partial(HlsAllocator, fsmRegisterSharing=True), **kwargs)
+
+
+class HlsFsmRegisterSharing_TC(SimTestCase):
+
+    def _getRegisterBits(self, u: Unit, platform: VirtualHlsPlatform):
+        qor = RtlNetlistPassQoRReport()
+        platform.rtlnetlist_passes = [qor, ]
+        to_rtl_str(u, target_platform=platform)
+        return sum(r.registerBits for r in qor.reports)
+
+    def test_TwoSumsInFsm_registerBits(self):
+        shared = self._getRegisterBits(TwoSumsInFsm(), sharingPlatform())
+        private = self._getRegisterBits(TwoSumsInFsm(), VirtualHlsPlatform())
+        self.assertLess(shared, private)
+
+    def test_TwoSumsInFsm_sharedSlot(self):
+        u = TwoSumsInFsm()
+        schedulers = RtlNetlistPassCollectSchedulers()
+        to_rtl_str(u, target_platform=sharingPlatform(rtlnetlist_passes=[schedulers, ]))
+        hls = schedulers.schedulers[0].parentHls
+        fsms = [e for e in hls.allocator._archElements if isinstance(e, AllocatorFsmContainer)]
+        self.assertEqual(len(fsms), 1)
+        slots = set(fsms[0]._registerSharing.slotOfValue.values())
+        self.assertTrue(slots)
+        for slot in slots:
+            self.assertGreaterEqual(len(slot.values), 2)
+            self.assertIsNotNone(slot.reg)
+
+    def test_TwoSumsInFsm(self):
+        u = TwoSumsInFsm()
+        self.compileSimAndStart(u, target_platform=sharingPlatform())
+        inputs = [0, 1, 2, 3, 5, 7, 11, 13, 255, 128, 17, 4]
+        u.dataIn._ag.data.extend(inputs)
+        self.runSim((len(inputs) * 2 + 10) * int(freq_to_period(u.FREQ)))
+        expected = [(a + b) & 0xff for a, b in zip(inputs[::2], inputs[1::2])]
+        self.assertValSequenceEqual(u.dataOut._ag.data, expected)
+
+
+if __name__ == "__main__":
+    suite = unittest.TestSuite()
+    suite.addTest(unittest.makeSuite(HlsFsmRegisterSharing_TC))
+    runner = unittest.TextTestRunner(verbosity=3)
+    runner.run(suite)
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from functools import partial
+import unittest
+
+from hwt.hdl.operator import Operator
+from hwt.hdl.operatorDefs import AllOps
+from hwt.pyUtils.uniqList import UniqList
+from hwt.simulator.simTestCase import SimTestCase
+from hwt.synthesizer.unit import Unit
+from hwt.synthesizer.utils import to_rtl_str
+from hwtHls.allocator.allocator import HlsAllocator
+from hwtHls.allocator.functionalUnitSharing import HlsFunctionalUnitSharingCostModel, \
+    HlsFunctionalUnitSharedByStates, HlsFunctionalUnitSharedByBranches
+from hwtHls.hlsStreamProc.streamProc import HlsStreamProc
+from hwtHls.platform.virtual import VirtualHlsPlatform
+from hwtSimApi.utils import freq_to_period
+from tests.syntaxElements.trivial import WhileTrueReadWrite
+from tests.utils.collectSchedulers import RtlNetlistPassCollectSchedulers
+
+
+class MulInFsmStates(WhileTrueReadWrite):
+    """
+    Product of 3 inputs, the inputs are read from the same interface
+    and thus each multiplication is in a different state of FSM
+    """
+
+    def _config(self):
+        super(MulInFsmStates, self)._config()
+        self.FREQ = int(20e6)
+
+    def _impl(self) -> None:
+        hls = HlsStreamProc(self)
+        x = hls.var("x", self.dataIn.T)
+        hls.thread(
+            hls.While(True,
+                x(hls.read(self.dataIn)),
+                x(x * hls.read(self.dataIn)),
+                hls.write(x * hls.read(self.dataIn), self.dataOut),
+            )
+        )
+        hls.compile()
+
+
+class AddInFsmStates(MulInFsmStates):
+    """
+    Sum of 3 inputs, adders are smaller than multiplexers which would be required for sharing
+    """
+
+    def _impl(self) -> None:
+        hls = HlsStreamProc(self)
+        x = hls.var("x", self.dataIn.T)
+        hls.thread(
+            hls.While(True,
+                x(hls.read(self.dataIn)),
+                x(x + hls.read(self.dataIn)),
+                hls.write(x + hls.read(self.dataIn), self.dataOut),
+            )
+        )
+        hls.compile()
+
+
+class MulInBranches(MulInFsmStates):
+    """
+    Multiplications in if/else branches
+    """
+
+    def _impl(self) -> None:
+        hls = HlsStreamProc(self)
+        a = hls.var("a", self.dataIn.T)
+        hls.thread(
+            hls.While(True,
+                a(hls.read(self.dataIn)),
+                hls.If(a[0],
+                    a(a * a),
+                ).Else(
+                    a((a + 1) * (a + 3)),
+                ),
+                hls.write(a, self.dataOut),
+            )
+        )
+        hls.compile()
+
+
+def mulInBranchesModel(a: int):
+    if a & 1:
+        return (a * a) & 0xff
+    else:
+        return ((a + 1) * (a + 3)) & 0xff
+
+
+def sharingPlatform(**kwargs):
+    return VirtualHlsPlatform(allocator=partial(HlsAllocator, functionalUnitSharing=HlsFunctionalUnitSharingCostModel()), **kwargs)
+
+
+class HlsFunctionalUnitSharing_TC(SimTestCase):
+
+    def test_costModel(self):
+        cm = HlsFunctionalUnitSharingCostModel()
+        # 8b multiplier = 1 DSP, two 2:1 muxes of 8b
+        self.assertGreater(cm.getAreaGain(AllOps.MUL, (8, 8), 2, [2, 2]), 0)
+        # the adder is not larger than a mux for each operand
+        self.assertLessEqual(cm.getAreaGain(AllOps.ADD, (8, 8), 2, [2, 2]), 0)
+        self.assertIsNone(cm.getOperatorArea(AllOps.XOR, (8, 8)))
+
+    def _getFunctionalUnits(self, u: Unit, platform: VirtualHlsPlatform):
+        schedulers = RtlNetlistPassCollectSchedulers()
+        platform.rtlnetlist_passes = [schedulers, ]
+        to_rtl_str(u, target_platform=platform)
+        hls = schedulers.schedulers[0].parentHls
+        return UniqList(fu for e in hls.allocator._archElements for fu in e.functionalUnits.values())
+
+    @staticmethod
+    def _countRtlOperators(u: Unit, operator):
+        return sum(1 for s in u._ctx.signals if isinstance(s.origin, Operator) and s.origin.operator == operator)
+
+    def test_MulInFsmStates_sharedUnit(self):
+        u = MulInFsmStates()
+        fus = self._getFunctionalUnits(u, sharingPlatform())
+        self.assertEqual(len(fus), 1)
+        fu = fus[0]
+        self.assertIsInstance(fu, HlsFunctionalUnitSharedByStates)
+        self.assertEqual(len(fu.members), 2)
+        self.assertEqual(self._countRtlOperators(u, AllOps.MUL), 1)
+
+        u = MulInFsmStates()
+        fus = self._getFunctionalUnits(u, VirtualHlsPlatform())
+        self.assertEqual(len(fus), 0)
+        self.assertEqual(self._countRtlOperators(u, AllOps.MUL), 2)
+
+    def test_AddInFsmStates_notShared(self):
+        u = AddInFsmStates()
+        fus = self._getFunctionalUnits(u, sharingPlatform())
+        self.assertEqual(len(fus), 0)
+
+    def test_MulInBranches_sharedUnit(self):
+        u = MulInBranches()
+        fus = self._getFunctionalUnits(u, sharingPlatform())
+        self.assertEqual(len(fus), 1)
+        self.assertIsInstance(fus[0], HlsFunctionalUnitSharedByBranches)
+        self.assertEqual(self._countRtlOperators(u, AllOps.MUL), 1)
+
+    def _test_sim(self, u: Unit, inputsPerOutput: int, model):
+        self.compileSimAndStart(u, target_platform=sharingPlatform())
+        inputs = [0, 1, 2, 3, 5, 7, 11, 13, 255, 128, 17, 4]
+        u.dataIn._ag.data.extend(inputs)
+        self.runSim((len(inputs) * 2 + 10) * int(freq_to_period(u.FREQ)))
+        expected = [model(*inputs[i:i + inputsPerOutput]) for i in range(0, len(inputs), inputsPerOutput)]
+        self.assertValSequenceEqual(u.dataOut._ag.data, expected)
+
+    def test_MulInFsmStates(self):
+        self._test_sim(MulInFsmStates(), 3, lambda a, b, c: (a * b * c) & 0xff)
+
+    def test_AddInFsmStates(self):
+        self._test_sim(AddInFsmStates(), 3, lambda a, b, c: (a + b + c) & 0xff)
+
+    def test_MulInBranches(self):
+        self._test_sim(MulInBranches(), 1, mulInBranchesModel)
+
+
+if __name__ == "__main__":
+    suite = unittest.TestSuite()
+    suite.addTest(unittest.makeSuite(HlsFunctionalUnitSharing_TC))
+    runner = unittest.TextTestRunner(verbosity=3)
+    runner.run(suite)
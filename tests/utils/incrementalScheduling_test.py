@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import unittest
+
+from hwt.hdl.operatorDefs import AllOps
+from hwt.synthesizer.utils import to_rtl_str
+from hwtHls.netlist.nodes.io import HlsNetNodeWrite
+from hwtHls.netlist.nodes.node import SchedulizationDict
+from hwtHls.netlist.transformation.hlsNetlistPass import HlsNetlistPass
+from hwtHls.netlist.utils import hls_op
+from hwtHls.platform.virtual import VirtualHlsPlatform, DEFAULT_HLSNETLIST_PASSES
+from tests.syntaxElements.mac import HlsMAC_example
+from tests.utils.alapAsapDiffExample import AlapAsapDiffExample
+
+
+class HlsNetlistPassCheckIncrementalScheduling(HlsNetlistPass):
+    """
+    Schedule the netlist and then reschedule a part of it incrementally, the schedule must not change.
+    """
+
+    def __init__(self, tc: unittest.TestCase):
+        self.tc = tc
+
+    def apply(self, hls:"HlsStreamProc", to_hw:"SsaSegmentToHwPipeline"):
+        to_hw.schedulerRun()
+        nodes = list(to_hw.hls.iterAllNodes())
+        fullSchedule: SchedulizationDict = {}
+        for n in nodes:
+            n.copyScheduling(fullSchedule)
+
+        for dirtyNodes in (nodes[len(nodes) // 2:], nodes[:1], nodes):
+            to_hw.schedulerRunIncremental(dirtyNodes)
+            for n in nodes:
+                self.tc.assertEqual((n.scheduledIn, n.scheduledOut), fullSchedule[n], n)
+
+
+class HlsNetlistPassCheckIncrementalSchedulingAfterEdit(HlsNetlistPass):
+    """
+    Schedule the netlist, then insert a pair of negations before the data input of each write
+    (the function of the netlist is not changed) and reschedule incrementally, the schedule must be the same
+    as the schedule of the edited netlist from a full scheduling.
+    """
+
+    def __init__(self, tc: unittest.TestCase):
+        self.tc = tc
+
+    def apply(self, hls:"HlsStreamProc", to_hw:"SsaSegmentToHwPipeline"):
+        to_hw.schedulerRun()
+        netlist = to_hw.hls
+        dirtyNodes = []
+        for w in netlist.outputs:
+            if not isinstance(w, HlsNetNodeWrite):
+                continue
+            i = w._inputs[0]
+            dep = w.dependsOn[0]
+            dep.obj.usedBy[dep.out_i].remove(i)
+            n0 = hls_op(netlist, AllOps.NOT, dep._dtype, dep)
+            n1 = hls_op(netlist, AllOps.NOT, dep._dtype, n0)
+            i.replace_driver(n1)
+            dirtyNodes.extend((n0.obj, n1.obj, w))
+
+        self.tc.assertTrue(dirtyNodes)
+        to_hw.schedulerRunIncremental(dirtyNodes)
+        nodes = list(netlist.iterAllNodes())
+        incrementalSchedule: SchedulizationDict = {}
+        for n in nodes:
+            n.copyScheduling(incrementalSchedule)
+
+        for n in nodes:
+            n.resetScheduling()
+        to_hw.schedulerRun()
+        for n in nodes:
+            self.tc.assertEqual(incrementalSchedule[n], (n.scheduledIn, n.scheduledOut), n)
+
+
+class IncrementalScheduling_TC(unittest.TestCase):
+
+    def _test(self, u, checkPass=HlsNetlistPassCheckIncrementalScheduling):
+        p = VirtualHlsPlatform(hlsnetlist_passes=[
+            *DEFAULT_HLSNETLIST_PASSES,
+            checkPass(self),
+        ])
+        to_rtl_str(u, target_platform=p)
+
+    def test_AlapAsapDiffExample(self):
+        self._test(AlapAsapDiffExample())
+
+    def test_HlsMAC_example(self):
+        self._test(HlsMAC_example())
+
+    def test_AlapAsapDiffExample_edited(self):
+        self._test(AlapAsapDiffExample(), HlsNetlistPassCheckIncrementalSchedulingAfterEdit)
+
+    def test_HlsMAC_example_edited(self):
+        self._test(HlsMAC_example(), HlsNetlistPassCheckIncrementalSchedulingAfterEdit)
+
+
+if __name__ == "__main__":
+    suite = unittest.TestSuite()
+    suite.addTest(unittest.makeSuite(IncrementalScheduling_TC))
+    runner = unittest.TextTestRunner(verbosity=3)
+    runner.run(suite)
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import unittest
+
+from hwt.hdl.operatorDefs import AllOps
+from hwt.hdl.types.defs import BIT
+from hwt.synthesizer.utils import to_rtl_str
+from hwtHls.netlist.analysis.indexedGraph import HlsNetlistIndexedGraph
+from hwtHls.netlist.nodes.ops import HlsNetNodeOperator
+from hwtHls.netlist.nodes.ports import link_hls_nodes
+from hwtHls.platform.virtual import VirtualHlsPlatform
+from tests.syntaxElements.mac import HlsMAC_example
+from tests.utils.alapAsapDiffExample import AlapAsapDiffExample
+from tests.utils.collectSchedulers import RtlNetlistPassCollectSchedulers
+
+
+class HlsNetlistIndexedGraph_TC(unittest.TestCase):
+
+    def _getNetlist(self, u):
+        schedulers = RtlNetlistPassCollectSchedulers()
+        to_rtl_str(u, target_platform=VirtualHlsPlatform(rtlnetlist_passes=[schedulers, ]))
+        self.assertEqual(len(schedulers.schedulers), 1)
+        return schedulers.schedulers[0].parentHls
+
+    def _collectReachable(self, graph: HlsNetlistIndexedGraph, startIndexes, forward: bool):
+        reachable = set()
+        toSearch = list(startIndexes)
+        while toSearch:
+            n = graph.nodes[toSearch.pop()]
+            if n in reachable:
+                continue
+            reachable.add(n)
+            if forward:
+                others = (i.obj for uses in n.usedBy for i in uses)
+            else:
+                others = (o.obj for o in n.dependsOn)
+            toSearch.extend(graph.nodeIndex[o] for o in others if o in graph.nodeIndex)
+        return reachable
+
+    def _checkGraph(self, u):
+        hls = self._getNetlist(u)
+        nodes = list(hls.iterAllNodes())
+        graph = HlsNetlistIndexedGraph(nodes)
+        self.assertEqual(graph.nodes, nodes)
+        for nI, n in enumerate(nodes):
+            self.assertEqual(graph.nodeIndex[n], nI)
+            self.assertEqual([nodes[i] for i in graph.iterDependencies(nI)], [dep.obj for dep in n.dependsOn], n)
+            self.assertEqual(sorted(graph.iterUses(nI)), sorted(graph.nodeIndex[i.obj] for uses in n.usedBy for i in uses), n)
+
+        order = graph.topologicalOrder()
+        self.assertEqual(sorted(order), list(range(len(nodes))))
+        position = {nI: i for i, nI in enumerate(order)}
+        for nI in range(len(nodes)):
+            for depI in graph.iterDependencies(nI):
+                self.assertLess(position[depI], position[nI], nodes[nI])
+
+        for startIndexes in ([0], [len(nodes) - 1], [0, len(nodes) // 2]):
+            for forward in (True, False):
+                reachable = graph.collectReachable(startIndexes, forward)
+                self.assertEqual(set(n for n, r in zip(nodes, reachable) if r),
+                                 self._collectReachable(graph, startIndexes, forward), (startIndexes, forward))
+
+    def test_HlsMAC_example(self):
+        self._checkGraph(HlsMAC_example())
+
+    def test_AlapAsapDiffExample(self):
+        self._checkGraph(AlapAsapDiffExample())
+
+    def test_cycle(self):
+        hls = self._getNetlist(HlsMAC_example())
+        # a -> b -> c -> a, c -> d, the nodes are not added to the netlist
+        a, b, c, d = [HlsNetNodeOperator(hls, AllOps.NOT, 1, BIT) for _ in range(4)]
+        for src, dst in [(a, b), (b, c), (c, a), (c, d)]:
+            link_hls_nodes(src._outputs[0], dst._inputs[0])
+
+        graph = HlsNetlistIndexedGraph([d, a, b, c])
+        with self.assertRaises(AssertionError) as ctx:
+            graph.topologicalOrder()
+        self.assertEqual(ctx.exception.args[0], "Cycle in graph")
+        self.assertSetEqual(set(ctx.exception.args[1]), {a._id, b._id, c._id})
+
+        aI = graph.nodeIndex[a]
+        dI = graph.nodeIndex[d]
+        self.assertEqual(list(graph.collectReachable([aI], True)), [1, 1, 1, 1])
+        self.assertEqual(list(graph.collectReachable([aI], False)), [0, 1, 1, 1])
+        self.assertEqual(list(graph.collectReachable([dI], False)), [1, 1, 1, 1])
+        self.assertEqual(list(graph.collectReachable([dI], True)), [1, 0, 0, 0])
+
+        # the dependencies on nodes outside of the graph are ignored
+        graph = HlsNetlistIndexedGraph([d, a])
+        self.assertEqual(list(graph.iterDependencies(0)), [])
+        self.assertEqual(list(graph.iterDependencies(1)), [])
+        self.assertEqual(list(graph.topologicalOrder()), [0, 1])
+
+
+if __name__ == "__main__":
+    suite = unittest.TestSuite()
+    suite.addTest(unittest.makeSuite(HlsNetlistIndexedGraph_TC))
+    runner = unittest.TextTestRunner(verbosity=3)
+    runner.run(suite)
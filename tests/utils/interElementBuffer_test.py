@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from functools import partial
+from typing import List
+import unittest
+
+from hwt.simulator.simTestCase import SimTestCase
+from hwt.hdl.types.bits import Bits
+from hwtHls.allocator.allocator import HlsAllocator
+from hwtHls.allocator.fsmContainer import AllocatorFsmContainer
+from hwtHls.allocator.pipelineContainer import AllocatorPipelineContainer
+from hwtHls.hlsStreamProc.streamProc import HlsStreamProc
+from hwtHls.platform.virtual import VirtualHlsPlatform
+from hwtLib.handshaked.fifo import HandshakedFifo
+from hwtLib.handshaked.reg import HandshakedReg
+from hwtSimApi.utils import freq_to_period
+from tests.utils.collectSchedulers import RtlNetlistPassCollectSchedulers
+from hwtLib.types.ctypes import uint8_t
+from tests.utils.loopUnroll_test import LoopUnrollForSum
+
+
+class LoopForSumWithOffset(LoopUnrollForSum):
+    """
+    The offset is read before the inner loop and it is used in the inner loop, the sum is computed in the loop
+    and it is written after the loop, the values flow between the elements of the inner loop and of the code
+    around it in both directions.
+    """
+
+    def _config(self):
+        super(LoopForSumWithOffset, self)._config()
+        self.UNROLL = 1
+
+    def _impl(self) -> None:
+        hls = HlsStreamProc(self)
+        res = hls.var("res", Bits(self.DATA_WIDTH, signed=False))
+        offset = hls.var("offset", Bits(self.DATA_WIDTH, signed=False))
+        i = hls.var("i", uint8_t)
+        hls.thread(
+            hls.While(True,
+                offset(hls.read(self.dataIn)),
+                res(0),
+                hls.For(i(0), i < self.ITEMS, i(i + 1),
+                    res(res + hls.read(self.dataIn) + offset),
+                    unroll=self.UNROLL,
+                ),
+                hls.write(res, self.dataOut),
+            )
+        )
+        hls.compile()
+
+    def model(self, offset: int, items: List[int]):
+        return (sum(items) + len(items) * offset) & 0xff
+
+
+class InterElementBuffer_TC(SimTestCase):
+
+    def _test_forSum(self, interElementBufferDepth: int, randomize: bool):
+        # the inner loop and the code around it are in separate architectural elements
+        u = LoopUnrollForSum()
+        u.UNROLL = 1
+        schedulers = RtlNetlistPassCollectSchedulers()
+        p = VirtualHlsPlatform(allocator=partial(HlsAllocator, interElementBufferDepth=interElementBufferDepth),
+                               rtlnetlist_passes=[schedulers, ])
+        self.compileSimAndStart(u, target_platform=p)
+        hls = schedulers.schedulers[0].parentHls
+        self.assertGreater(len(hls.allocator._archElements), 1)
+        buffers = [c for c in u._units if isinstance(c, (HandshakedReg, HandshakedFifo))]
+        if interElementBufferDepth == 0:
+            self.assertEqual(buffers, [])
+        else:
+            self.assertTrue(buffers)
+            for b in buffers:
+                if interElementBufferDepth == 1:
+                    self.assertIsInstance(b, HandshakedReg)
+                else:
+                    self.assertIsInstance(b, HandshakedFifo)
+                    self.assertEqual(b.DEPTH, interElementBufferDepth)
+
+        if randomize:
+            # the consumer stalls and the backpressure propagates trough the buffers
+            self.randomize(u.dataIn)
+            self.randomize(u.dataOut)
+
+        inputs = list(range(1, 8 * u.ITEMS + 1))
+        u.dataIn._ag.data.extend(inputs)
+        self.runSim((len(inputs) * (12 if randomize else 4) + 10) * int(freq_to_period(u.FREQ)))
+
+        expected = []
+        for i in range(0, len(inputs), u.ITEMS):
+            expected.append(sum(inputs[i:i + u.ITEMS]) & 0xff)
+        self.assertValSequenceEqual(u.dataOut._ag.data, expected)
+
+    def test_forSum_noBuffer(self):
+        self._test_forSum(0, False)
+
+    def test_forSum_skidBuffer(self):
+        self._test_forSum(1, False)
+
+    def test_forSum_fifo(self):
+        self._test_forSum(4, False)
+
+    def test_forSum_noBuffer_randomized(self):
+        self._test_forSum(0, True)
+
+    def test_forSum_skidBuffer_randomized(self):
+        self._test_forSum(1, True)
+
+    def test_forSum_fifo_randomized(self):
+        self._test_forSum(4, True)
+
+    def _test_forSumWithOffset(self, interElementBufferDepth: int):
+        u = LoopForSumWithOffset()
+        schedulers = RtlNetlistPassCollectSchedulers()
+        p = VirtualHlsPlatform(allocator=partial(HlsAllocator, interElementBufferDepth=interElementBufferDepth),
+                               rtlnetlist_passes=[schedulers, ])
+        self.compileSimAndStart(u, target_platform=p)
+        allocator = schedulers.schedulers[0].parentHls.allocator
+        if interElementBufferDepth:
+            # the elements connected in both directions are connected directly and they do not prevent the buffering
+            # of other connections
+            self.assertTrue(allocator._unbufferedElmPairs)
+            self.assertTrue(any(
+                    set(type(e) for e in pair) == {AllocatorFsmContainer, AllocatorPipelineContainer}
+                    for pair in allocator._unbufferedElmPairs
+                ), allocator._unbufferedElmPairs)
+
+        self.randomize(u.dataIn)
+        self.randomize(u.dataOut)
+        data = []
+        expected = []
+        for offset in range(1, 9):
+            items = [(offset * 13 + i * 7) & 0xff for i in range(u.ITEMS)]
+            data.append(offset)
+            data.extend(items)
+            expected.append(u.model(offset, items))
+        u.dataIn._ag.data.extend(data)
+        self.runSim((len(data) * 12 + 10) * int(freq_to_period(u.FREQ)))
+        self.assertValSequenceEqual(u.dataOut._ag.data, expected)
+
+    def test_forSumWithOffset_noBuffer(self):
+        self._test_forSumWithOffset(0)
+
+    def test_forSumWithOffset_skidBuffer(self):
+        self._test_forSumWithOffset(1)
+
+    def test_forSumWithOffset_fifo(self):
+        self._test_forSumWithOffset(4)
+
+
+if __name__ == "__main__":
+    suite = unittest.TestSuite()
+    suite.addTest(unittest.makeSuite(InterElementBuffer_TC))
+    runner = unittest.TextTestRunner(verbosity=3)
+    runner.run(suite)
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from functools import partial
+import unittest
+
+from hwt.hdl.operator import Operator
+from hwt.hdl.operatorDefs import AllOps
+from hwt.simulator.simTestCase import SimTestCase
+from hwtHls.platform.virtual import VirtualHlsPlatform
+from hwtHls.scheduler.listScheduler import HlsListScheduler
+from hwtSimApi.utils import freq_to_period
+from tests.syntaxElements.mac import HlsMAC_example
+from tests.utils.collectSchedulers import RtlNetlistPassCollectSchedulers
+from tests.utils.functionalUnitSharing_test import MulInFsmStates
+
+
+class HlsListScheduler_TC(SimTestCase):
+
+    def _test(self, u, resourceConstraints):
+        schedulers = RtlNetlistPassCollectSchedulers()
+        p = VirtualHlsPlatform(scheduler=partial(HlsListScheduler, resourceConstraints=resourceConstraints),
+                               rtlnetlist_passes=[schedulers, ])
+        self.compileSimAndStart(u, target_platform=p)
+        self.assertEqual(len(schedulers.schedulers), 1)
+        s: HlsListScheduler = schedulers.schedulers[0]
+        for op, limit in resourceConstraints.items():
+            for clkI, usage in s.resourceUsage[op].items():
+                self.assertLessEqual(usage, limit, (op, clkI))
+            opCnt = sum(1 for sig in u._ctx.signals if isinstance(sig.origin, Operator) and sig.origin.operator == op)
+            self.assertLessEqual(opCnt, limit, op)
+        return s
+
+    def _test_HlsMAC_example(self, mulLimit: int):
+        u = HlsMAC_example()
+        s = self._test(u, {AllOps.MUL: mulLimit})
+        inputs = [3, 4, 5, 6]
+        for intf, d in zip(u.dataIn, inputs):
+            intf._ag.data.append(d)
+
+        self.runSim(int(8 * freq_to_period(u.CLK_FREQ)))
+        self.assertValEqual(u.dataOut._ag.data[-1], (3 * 4) + (5 * 6))
+        return s
+
+    def test_HlsMAC_example_1mul(self):
+        # the multiplications are in different clock periods and they share a single unit,
+        # the pipeline is realized as FSM and the next iteration starts after the second multiplication
+        s = self._test_HlsMAC_example(1)
+        self.assertEqual(s.getMaxUsage(AllOps.MUL), 1)
+        self.assertEqual(len(s.resourceUsage[AllOps.MUL]), 2)
+        self.assertEqual(s.achievedII, 2)
+
+    def test_HlsMAC_example_2mul(self):
+        s = self._test_HlsMAC_example(2)
+        self.assertEqual(s.getMaxUsage(AllOps.MUL), 2)
+        self.assertEqual(len(s.resourceUsage[AllOps.MUL]), 1)
+        self.assertEqual(s.achievedII, 1)
+
+    def test_MulInFsmStates_sharedUnit(self):
+        # the multiplications are in different states of FSM and the allocator binds them to a single unit
+        u = MulInFsmStates()
+        s = self._test(u, {AllOps.MUL: 1})
+        self.assertEqual(s.getMaxUsage(AllOps.MUL), 1)
+
+        inputs = [0, 1, 2, 3, 5, 7, 11, 13, 255]
+        u.dataIn._ag.data.extend(inputs)
+        self.runSim((len(inputs) * 2 + 10) * int(freq_to_period(u.FREQ)))
+        expected = [(a * b * c) & 0xff for a, b, c in zip(inputs[::3], inputs[1::3], inputs[2::3])]
+        self.assertValSequenceEqual(u.dataOut._ag.data, expected)
+
+
+if __name__ == "__main__":
+    suite = unittest.TestSuite()
+    suite.addTest(unittest.makeSuite(HlsListScheduler_TC))
+    runner = unittest.TextTestRunner(verbosity=3)
+    runner.run(suite)
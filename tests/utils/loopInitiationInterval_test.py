@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import unittest
+
+from hwt.hdl.types.bits import Bits
+from hwt.simulator.simTestCase import SimTestCase
+from hwt.synthesizer.utils import to_rtl_str
+from hwtHls.hlsStreamProc.streamProc import HlsStreamProc
+from hwtHls.platform.virtual import VirtualHlsPlatform
+from hwtHls.platform.xilinx.artix7 import Artix7Medium
+from hwtHls.scheduler.errors import TimeConstraintError
+from hwtSimApi.utils import freq_to_period
+from tests.syntaxElements.trivial import WhileTrueReadWrite
+from tests.utils.collectSchedulers import RtlNetlistPassCollectSchedulers
+
+
+class LoopAccumulateII(WhileTrueReadWrite):
+
+    def _config(self):
+        super(LoopAccumulateII, self)._config()
+        self.MAX_II = 1
+
+    def _impl(self) -> None:
+        hls = HlsStreamProc(self)
+        acc = hls.var("acc", Bits(self.DATA_WIDTH, signed=False))
+        hls.thread(
+            acc(0),
+            hls.While(True,
+                acc(acc + hls.read(self.dataIn)),
+                hls.write(acc, self.dataOut),
+                maxII=self.MAX_II,
+            )
+        )
+        hls.compile()
+
+
+class LoopMultiplyII(LoopAccumulateII):
+
+    def _impl(self) -> None:
+        hls = HlsStreamProc(self)
+        acc = hls.var("acc", Bits(self.DATA_WIDTH, signed=False))
+        hls.thread(
+            acc(1),
+            hls.While(True,
+                acc(acc * hls.read(self.dataIn)),
+                hls.write(acc, self.dataOut),
+                maxII=self.MAX_II,
+            )
+        )
+        hls.compile()
+
+
+class LoopInitiationInterval_TC(SimTestCase):
+
+    def test_LoopAccumulateII(self):
+        u = LoopAccumulateII()
+        schedulers = RtlNetlistPassCollectSchedulers()
+        self.compileSimAndStart(u, target_platform=VirtualHlsPlatform(rtlnetlist_passes=[schedulers, ]))
+        hls = schedulers.schedulers[0].parentHls
+        loopDeps = hls.scheduler.getLoopInitiationIntervals()
+        self.assertTrue(loopDeps)
+        for r, w, achievedII in loopDeps:
+            self.assertIs(w.associated_read, r)
+            self.assertEqual(w.maxII, 1)
+            self.assertEqual(achievedII, 1)
+
+        inputs = [1, 2, 3, 4, 5, 6]
+        u.dataIn._ag.data.extend(inputs)
+        self.runSim((len(inputs) * 2 + 4) * int(freq_to_period(u.FREQ)))
+
+        expected = []
+        acc = 0
+        for d in inputs:
+            acc = (acc + d) & 0xff
+            expected.append(acc)
+        self.assertValSequenceEqual(u.dataOut._ag.data, expected)
+
+    def test_LoopMultiplyII_infeasible(self):
+        u = LoopMultiplyII()
+        u.DATA_WIDTH = 64
+        u.FREQ = int(200e6)
+        with self.assertRaises(TimeConstraintError) as cm:
+            to_rtl_str(u, target_platform=Artix7Medium())
+        msg = str(cm.exception)
+        self.assertIn("maximum initiation interval 1", msg)
+        self.assertIn("MUL", msg)
+
+    def test_LoopMultiplyII_relaxed(self):
+        u = LoopMultiplyII()
+        u.DATA_WIDTH = 64
+        u.FREQ = int(200e6)
+        u.MAX_II = 16
+        schedulers = RtlNetlistPassCollectSchedulers()
+        self.compileSimAndStart(u, target_platform=Artix7Medium(rtlnetlist_passes=[schedulers, ]))
+        hls = schedulers.schedulers[0].parentHls
+        loopDeps = hls.scheduler.getLoopInitiationIntervals()
+        self.assertTrue(loopDeps)
+        for _, w, achievedII in loopDeps:
+            self.assertEqual(w.maxII, u.MAX_II)
+            # the multiplication is multi-cycle
+            self.assertGreater(achievedII, 1)
+            self.assertLessEqual(achievedII, u.MAX_II)
+
+        inputs = [3, 5, 7, 11, 13, (1 << 63) + 1, 17]
+        u.dataIn._ag.data.extend(inputs)
+        self.runSim((len(inputs) * u.MAX_II + 20) * int(freq_to_period(u.FREQ)))
+
+        expected = []
+        acc = 1
+        m = (1 << u.DATA_WIDTH) - 1
+        for d in inputs:
+            acc = (acc * d) & m
+            expected.append(acc)
+        self.assertValSequenceEqual(u.dataOut._ag.data, expected)
+
+
+if __name__ == "__main__":
+    suite = unittest.TestSuite()
+    suite.addTest(unittest.makeSuite(LoopInitiationInterval_TC))
+    runner = unittest.TextTestRunner(verbosity=3)
+    runner.run(suite)
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import unittest
+
+from hwt.hdl.types.bits import Bits
+from hwt.hdl.types.defs import BIT
+from hwt.simulator.simTestCase import SimTestCase
+from hwt.synthesizer.utils import to_rtl_str
+from hwtHls.hlsStreamProc.streamProc import HlsStreamProc
+from hwtHls.platform.virtual import VirtualHlsPlatform, DEFAULT_SSA_PASSES
+from hwtHls.ssa.transformation.loopUnroll import SsaPassLoopUnroll
+from hwtHls.ssa.translation.fromPython.markers import PythonBytecodeLoopUnroll
+from hwtHls.ssa.translation.fromPython.thread import HlsStreamProcPyThread
+from hwtLib.types.ctypes import uint8_t
+from hwtSimApi.utils import freq_to_period
+from tests.syntaxElements.trivial import WhileTrueReadWrite
+
+
+class LoopUnrollAccumulate(WhileTrueReadWrite):
+
+    def _config(self):
+        super(LoopUnrollAccumulate, self)._config()
+        self.UNROLL = 2
+
+    def _impl(self) -> None:
+        hls = HlsStreamProc(self)
+        acc = hls.var("acc", Bits(self.DATA_WIDTH, signed=False))
+        hls.thread(
+            acc(0),
+            hls.While(True,
+                acc(acc + hls.read(self.dataIn)),
+                hls.write(acc, self.dataOut),
+                unroll=self.UNROLL,
+            )
+        )
+        hls.compile()
+
+
+class LoopUnrollForSum(LoopUnrollAccumulate):
+    """
+    Sum of ITEMS input values, the inner for loop is unrolled
+    """
+
+    def _config(self):
+        super(LoopUnrollForSum, self)._config()
+        self.ITEMS = 4
+
+    def _impl(self) -> None:
+        hls = HlsStreamProc(self)
+        res = hls.var("res", Bits(self.DATA_WIDTH, signed=False))
+        i = hls.var("i", uint8_t)
+        hls.thread(
+            hls.While(True,
+                res(0),
+                hls.For(i(0), i < self.ITEMS, i(i + 1),
+                    res(res + hls.read(self.dataIn)),
+                    unroll=self.UNROLL,
+                ),
+                hls.write(res, self.dataOut),
+            )
+        )
+        hls.compile()
+
+
+class LoopUnrollAccumulatePy(LoopUnrollAccumulate):
+
+    def mainThread(self, hls: HlsStreamProc):
+        acc = Bits(self.DATA_WIDTH, signed=False).from_py(0)
+        while BIT.from_py(1):
+            PythonBytecodeLoopUnroll(self.UNROLL)
+            acc = acc + hls.read(self.dataIn)
+            hls.write(acc, self.dataOut)
+
+    def _impl(self):
+        hls = HlsStreamProc(self)
+        hls.thread(HlsStreamProcPyThread(hls, self.mainThread, hls))
+        hls.compile()
+
+
+class LoopUnroll_TC(SimTestCase):
+
+    def test_detectLoops(self):
+        u = LoopUnrollForSum()
+        u.UNROLL = 1
+        loops = []
+
+        class SsaPassCollectLoops():
+
+            def apply(self, hls: HlsStreamProc, to_ssa):
+                loops.extend(SsaPassLoopUnroll.detectLoops(to_ssa.start))
+
+        to_rtl_str(u, target_platform=VirtualHlsPlatform(ssa_passes=[SsaPassCollectLoops(), *DEFAULT_SSA_PASSES]))
+        self.assertEqual(len(loops), 2)
+        (innerHeader, innerBlocks), (outerHeader, outerBlocks) = loops
+        self.assertLess(len(innerBlocks), len(outerBlocks))
+        self.assertIn(innerHeader, outerBlocks)
+        self.assertNotIn(outerHeader, innerBlocks)
+
+    def _test_accumulate(self, u: LoopUnrollAccumulate):
+        self.compileSimAndStart(u, target_platform=VirtualHlsPlatform())
+        inputs = [1, 2, 3, 4, 5, 6, 7]
+        u.dataIn._ag.data.extend(inputs)
+        self.runSim((len(inputs) * 2 + 6) * int(freq_to_period(u.FREQ)))
+
+        expected = []
+        acc = 0
+        for d in inputs:
+            acc = (acc + d) & 0xff
+            expected.append(acc)
+        self.assertValSequenceEqual(u.dataOut._ag.data, expected)
+
+    def test_LoopUnrollAccumulate_1(self):
+        u = LoopUnrollAccumulate()
+        u.UNROLL = 1
+        self._test_accumulate(u)
+
+    def test_LoopUnrollAccumulate_2(self):
+        self._test_accumulate(LoopUnrollAccumulate())
+
+    def test_LoopUnrollAccumulate_3(self):
+        u = LoopUnrollAccumulate()
+        u.UNROLL = 3
+        self._test_accumulate(u)
+
+    def test_LoopUnrollAccumulatePy_2(self):
+        self._test_accumulate(LoopUnrollAccumulatePy())
+
+    def _test_forSum(self, u: LoopUnrollForSum):
+        self.compileSimAndStart(u, target_platform=VirtualHlsPlatform())
+        inputs = list(range(1, 3 * u.ITEMS + 1))
+        u.dataIn._ag.data.extend(inputs)
+        self.runSim((len(inputs) * 3 + 10) * int(freq_to_period(u.FREQ)))
+
+        expected = []
+        for i in range(0, len(inputs), u.ITEMS):
+            expected.append(sum(inputs[i:i + u.ITEMS]) & 0xff)
+        self.assertValSequenceEqual(u.dataOut._ag.data, expected)
+
+    def test_LoopUnrollForSum_2(self):
+        self._test_forSum(LoopUnrollForSum())
+
+    def test_LoopUnrollForSum_4(self):
+        u = LoopUnrollForSum()
+        u.UNROLL = 4
+        self._test_forSum(u)
+
+    def test_LoopUnrollForSum_3(self):
+        # the number of iterations is not divisible by the unroll factor
+        u = LoopUnrollForSum()
+        u.UNROLL = 3
+        self._test_forSum(u)
+
+
+if __name__ == "__main__":
+    suite = unittest.TestSuite()
+    suite.addTest(unittest.makeSuite(LoopUnroll_TC))
+    runner = unittest.TextTestRunner(verbosity=3)
+    runner.run(suite)
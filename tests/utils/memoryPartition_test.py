@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import unittest
+
+from hwt.hdl.types.bits import Bits
+from hwt.simulator.simTestCase import SimTestCase
+from hwt.synthesizer.rtlLevel.netlist import RtlNetlist
+from hwt.synthesizer.utils import to_rtl_str
+from hwtHls.clk_math import start_clk
+from hwtHls.hlsStreamProc.memory import ARRAY_PARTITION, HlsStreamProcMemory
+from hwtHls.hlsStreamProc.streamProc import HlsStreamProc
+from hwtHls.netlist.nodes.io import HlsNetNodeWrite
+from hwtHls.platform.virtual import VirtualHlsPlatform
+from hwtLib.types.ctypes import uint8_t
+from hwtSimApi.utils import freq_to_period
+from tests.utils.collectSchedulers import RtlNetlistPassCollectSchedulers
+from tests.utils.memory_test import MemoryLookupTable, lookupTableValue
+
+
+class MemoryPartitionLookupTable(MemoryLookupTable):
+    """
+    Lookup table with an index which is not a constant
+    """
+
+    def _config(self):
+        super(MemoryPartitionLookupTable, self)._config()
+        self.ITEMS = 16
+        self.PARTITION = None
+        self.PARTITION_FACTOR = None
+
+    def _createMemory(self, hls: HlsStreamProc):
+        self.mem = hls.memory(Bits(self.DATA_WIDTH), self.ITEMS, "lut",
+                              ports=self.PORTS, readLatency=self.READ_LATENCY,
+                              initValues=[lookupTableValue(i) for i in range(self.ITEMS)],
+                              partition=self.PARTITION, partitionFactor=self.PARTITION_FACTOR)
+        return self.mem
+
+
+class MemoryPartitionSumConstIndex(MemoryPartitionLookupTable):
+    """
+    Add first 4 items of the memory to the input, the memory is accessed using constant indexes
+
+    :note: The requests are written in program order, the indexes are interleaved so the requests
+        to a different banks of BLOCK partitioned memory may be written at once.
+    """
+
+    def _impl(self) -> None:
+        hls = HlsStreamProc(self)
+        mem = self._createMemory(hls)
+        hls.thread(
+            hls.While(True,
+                hls.write(hls.read(self.dataIn) + mem[0] + mem[2] + mem[1] + mem[3], self.dataOut),
+            )
+        )
+        hls.compile()
+
+
+class MemoryPartitionWriteRead(MemoryPartitionLookupTable):
+    """
+    Store the input to the memory and read it back using an index which is not a constant
+    """
+
+    def _impl(self) -> None:
+        hls = HlsStreamProc(self)
+        mem = self._createMemory(hls)
+        d = hls.var("d", Bits(self.DATA_WIDTH))
+        hls.thread(
+            hls.While(True,
+                d(hls.read(self.dataIn)),
+                mem.write(d[4:], d),
+                hls.write(mem[d[4:]], self.dataOut),
+            )
+        )
+        hls.compile()
+
+
+class MemoryUnrollForSum(MemoryPartitionLookupTable):
+    """
+    Add first 4 items of the memory to the input, the items are read in unrolled loop
+    """
+
+    def _config(self):
+        super(MemoryUnrollForSum, self)._config()
+        self.UNROLL = 2
+
+    def _impl(self) -> None:
+        hls = HlsStreamProc(self)
+        mem = self._createMemory(hls)
+        res = hls.var("res", Bits(self.DATA_WIDTH))
+        i = hls.var("i", uint8_t)
+        hls.thread(
+            hls.While(True,
+                res(hls.read(self.dataIn)),
+                hls.For(i(0), i < 4, i(i + 1),
+                    res(res + mem[i]),
+                    unroll=self.UNROLL,
+                ),
+                hls.write(res, self.dataOut),
+            )
+        )
+        hls.compile()
+
+
+def sumOfFirst4(d: int):
+    return (d + sum(lookupTableValue(i) for i in range(4))) & 0xff
+
+
+class HlsMemoryPartition_TC(SimTestCase):
+
+    def test_nonConstIndexNonPow2Banks(self):
+        u = MemoryPartitionLookupTable()
+        u.PARTITION = ARRAY_PARTITION.CYCLIC
+        u.PARTITION_FACTOR = 3
+        with self.assertRaises(NotImplementedError):
+            to_rtl_str(u, target_platform=VirtualHlsPlatform())
+
+    def test_bankSizes(self):
+        for partition, factor, bankSizes in [
+                (None, None, [16]),
+                (ARRAY_PARTITION.CYCLIC, 3, [6, 5, 5]),
+                (ARRAY_PARTITION.BLOCK, 3, [6, 6, 4]),
+                (ARRAY_PARTITION.BLOCK, 6, [3, 3, 3, 3, 3, 1]),
+                (ARRAY_PARTITION.COMPLETE, None, [1 for _ in range(16)]),
+            ]:
+            u = MemoryPartitionSumConstIndex()
+            u.PARTITION = partition
+            u.PARTITION_FACTOR = factor
+            to_rtl_str(u, target_platform=VirtualHlsPlatform())
+            self.assertEqual([b.items for b in u.mem.banks], bankSizes, (partition, factor))
+
+    def test_resolveBankDynamic(self):
+        index = RtlNetlist().sig("index", Bits(4))
+        for partition, factor, bankW, offsetW in [
+                (ARRAY_PARTITION.CYCLIC, 1, 1, 4),
+                (ARRAY_PARTITION.CYCLIC, 4, 2, 2),
+                (ARRAY_PARTITION.CYCLIC, 16, 4, None),
+                (ARRAY_PARTITION.BLOCK, 1, 1, 4),
+                (ARRAY_PARTITION.BLOCK, 4, 2, 2),
+                (ARRAY_PARTITION.BLOCK, 16, 4, None),
+                (ARRAY_PARTITION.COMPLETE, None, 4, None),
+            ]:
+            mem = HlsStreamProcMemory(None, "mem", Bits(8), 16, partition=partition, partitionFactor=factor)
+            bank, offset = mem._resolveBankDynamic(index)
+            self.assertEqual(bank._dtype.bit_length(), bankW, (partition, factor))
+            if offsetW is None:
+                self.assertEqual(offset, 0, (partition, factor))
+            else:
+                self.assertEqual(offset._dtype.bit_length(), offsetW, (partition, factor))
+
+        # each bank has a single item, the whole index is the index of the bank
+        mem = HlsStreamProcMemory(None, "mem", Bits(8), 16, partition=ARRAY_PARTITION.BLOCK, partitionFactor=16)
+        bank, _ = mem._resolveBankDynamic(index)
+        self.assertIs(bank, index)
+
+    def _test_lookupTable(self, u: MemoryPartitionLookupTable, expectedFn):
+        self.compileSimAndStart(u, target_platform=VirtualHlsPlatform())
+        inputs = [0, 1, 2, 5, 255, 128, 7, 7, 3, 14, 15]
+        u.dataIn._ag.data.extend(inputs)
+        self.runSim((len(inputs) * 4 + 10) * int(freq_to_period(u.FREQ)))
+        self.assertValSequenceEqual(u.dataOut._ag.data, [expectedFn(d) for d in inputs])
+
+    def test_MemoryPartitionLookupTable(self):
+        for partition, factor in [
+                (ARRAY_PARTITION.CYCLIC, 2),
+                (ARRAY_PARTITION.CYCLIC, 16),
+                (ARRAY_PARTITION.BLOCK, 4),
+                # each item in own bank
+                (ARRAY_PARTITION.BLOCK, 16),
+                # all items in a single bank
+                (ARRAY_PARTITION.BLOCK, 1),
+                (ARRAY_PARTITION.COMPLETE, None),
+            ]:
+            u = MemoryPartitionLookupTable()
+            u.PARTITION = partition
+            u.PARTITION_FACTOR = factor
+            self._test_lookupTable(u, lambda d: lookupTableValue(d & 0xf))
+
+    def test_MemoryPartitionWriteRead(self):
+        for partition, factor in [
+                (ARRAY_PARTITION.CYCLIC, 4),
+                (ARRAY_PARTITION.BLOCK, 2),
+                (ARRAY_PARTITION.BLOCK, 16),
+                (ARRAY_PARTITION.BLOCK, 1),
+            ]:
+            u = MemoryPartitionWriteRead()
+            u.PARTITION = partition
+            u.PARTITION_FACTOR = factor
+            self._test_lookupTable(u, lambda d: d)
+
+    def test_MemoryPartitionSumConstIndex(self):
+        u = MemoryPartitionSumConstIndex()
+        u.PARTITION = ARRAY_PARTITION.CYCLIC
+        u.PARTITION_FACTOR = 4
+        self._test_lookupTable(u, sumOfFirst4)
+
+    def _getRequestClks(self, u: MemoryPartitionLookupTable):
+        schedulers = RtlNetlistPassCollectSchedulers()
+        to_rtl_str(u, target_platform=VirtualHlsPlatform(rtlnetlist_passes=[schedulers, ]))
+        hls = schedulers.schedulers[0].parentHls
+        clkPeriod = hls.normalizedClkPeriod
+        requests = [p.request for b in u.mem.banks for p in b._ports]
+        return sorted(start_clk(n.scheduledIn[0], clkPeriod)
+                      for n in hls.iterAllNodes()
+                      if isinstance(n, HlsNetNodeWrite) and n.dst in requests)
+
+    def test_partitionedRequestsInParallel(self):
+        u = MemoryPartitionSumConstIndex()
+        reqClks = self._getRequestClks(u)
+        self.assertEqual(len(reqClks), 4)
+        # single bank with a single port
+        self.assertEqual(len(set(reqClks)), 4)
+
+        u = MemoryPartitionSumConstIndex()
+        u.PARTITION = ARRAY_PARTITION.BLOCK
+        u.PARTITION_FACTOR = 8
+        reqClks = self._getRequestClks(u)
+        # 2 items in each bank, only 2 banks used
+        self.assertEqual(len([b for b in u.mem.banks if b._ports]), 2)
+        self.assertEqual(len(set(reqClks)), 2)
+
+        u = MemoryPartitionSumConstIndex()
+        u.PARTITION = ARRAY_PARTITION.CYCLIC
+        u.PARTITION_FACTOR = 4
+        reqClks = self._getRequestClks(u)
+        # each item in own bank, all requests at once
+        self.assertEqual(len(set(reqClks)), 1)
+
+    def test_MemoryUnrollForSum(self):
+        u = MemoryUnrollForSum()
+        u.PORTS = 2
+        self._test_lookupTable(u, sumOfFirst4)
+        # the copy of the loop body uses the second port
+        self.assertEqual(len(u.mem.banks[0]._ports), 2)
+
+    def test_MemoryUnrollForSum_cyclic(self):
+        for unroll in (2, 4):
+            u = MemoryUnrollForSum()
+            u.UNROLL = unroll
+            u.PARTITION = ARRAY_PARTITION.CYCLIC
+            u.PARTITION_FACTOR = 2
+            self._test_lookupTable(u, sumOfFirst4)
+            # the bank is resolved statically in each copy of the loop body, the accesses to other bank are removed
+            self.assertEqual([[p.requestCnt for p in b._ports] for b in u.mem.banks], [[unroll // 2], [unroll // 2]], unroll)
+
+    def test_unrolledRequestsInParallel(self):
+        for ports, partition, factor in [
+                (2, None, None),
+                # each copy of the loop body accesses a different bank using its only port
+                (1, ARRAY_PARTITION.CYCLIC, 2),
+            ]:
+            u = MemoryUnrollForSum()
+            u.PORTS = ports
+            u.PARTITION = partition
+            u.PARTITION_FACTOR = factor
+            reqClks = self._getRequestClks(u)
+            self.assertEqual(len(reqClks), 2, partition)
+            self.assertEqual(reqClks[0], reqClks[1], partition)
+
+    def test_unrolledDynamicIndexUnknownBank(self):
+        # the loop is unrolled 2 times but the bank is selected by 2 bits of the index,
+        # the accesses to all banks are kept
+        u = MemoryUnrollForSum()
+        u.PARTITION = ARRAY_PARTITION.CYCLIC
+        u.PARTITION_FACTOR = 4
+        to_rtl_str(u, target_platform=VirtualHlsPlatform())
+        self.assertEqual([[p.requestCnt for p in b._ports] for b in u.mem.banks], [[2], [2], [2], [2]])
+
+
+if __name__ == "__main__":
+    suite = unittest.TestSuite()
+    suite.addTest(unittest.makeSuite(HlsMemoryPartition_TC))
+    runner = unittest.TextTestRunner(verbosity=3)
+    runner.run(suite)
@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import unittest
+
+from hwt.hdl.types.bits import Bits
+from hwt.hdl.types.defs import BIT
+from hwt.simulator.simTestCase import SimTestCase
+from hwt.synthesizer.utils import to_rtl_str
+from hwtHls.clk_math import start_clk
+from hwtHls.hlsStreamProc.memory import HlsStreamProcMemory
+from hwtHls.hlsStreamProc.streamProc import HlsStreamProc
+from hwtHls.netlist.nodes.io import HlsNetNodeRead, HlsNetNodeWrite
+from hwtHls.platform.virtual import VirtualHlsPlatform
+from hwtHls.ssa.translation.fromPython.thread import HlsStreamProcPyThread
+from hwtSimApi.utils import freq_to_period
+from tests.syntaxElements.trivial import WhileTrueReadWrite
+from tests.utils.collectSchedulers import RtlNetlistPassCollectSchedulers
+
+
+def lookupTableValue(i: int):
+    return (i * 7 + 3) & 0xff
+
+
+class MemoryLookupTable(WhileTrueReadWrite):
+    """
+    Read only memory used as a lookup table
+    """
+
+    def _config(self):
+        super(MemoryLookupTable, self)._config()
+        self.ITEMS = 256
+        self.PORTS = 1
+        self.READ_LATENCY = 1
+
+    def _createMemory(self, hls: HlsStreamProc):
+        self.mem = hls.memory(Bits(self.DATA_WIDTH), self.ITEMS, "lut",
+                              ports=self.PORTS, readLatency=self.READ_LATENCY,
+                              initValues=[lookupTableValue(i) for i in range(self.ITEMS)])
+        return self.mem
+
+    def _impl(self) -> None:
+        hls = HlsStreamProc(self)
+        mem = self._createMemory(hls)
+        hls.thread(
+            hls.While(True,
+                hls.write(mem[hls.read(self.dataIn)], self.dataOut),
+            )
+        )
+        hls.compile()
+
+
+class MemoryLookupTablePy(MemoryLookupTable):
+
+    def mainThread(self, hls: HlsStreamProc, mem: HlsStreamProcMemory):
+        while BIT.from_py(1):
+            hls.write(mem[hls.read(self.dataIn)], self.dataOut)
+
+    def _impl(self) -> None:
+        hls = HlsStreamProc(self)
+        mem = self._createMemory(hls)
+        hls.thread(HlsStreamProcPyThread(hls, self.mainThread, hls, mem))
+        hls.compile()
+
+
+class MemoryLookupTableSumOfTwo(MemoryLookupTable):
+    """
+    Two reads from the memory in a single iteration
+    """
+
+    def _impl(self) -> None:
+        hls = HlsStreamProc(self)
+        mem = self._createMemory(hls)
+        addr = hls.var("addr", Bits(self.DATA_WIDTH))
+        hls.thread(
+            hls.While(True,
+                addr(hls.read(self.dataIn)),
+                hls.write(mem[addr] + mem[addr ^ 1], self.dataOut),
+            )
+        )
+        hls.compile()
+
+
+class MemoryWriteRead(MemoryLookupTable):
+    """
+    Store the input to the memory and read it back
+    """
+
+    def _config(self):
+        super(MemoryWriteRead, self)._config()
+        self.ITEMS = 16
+
+    def _impl(self) -> None:
+        hls = HlsStreamProc(self)
+        self.mem = mem = hls.memory(Bits(self.DATA_WIDTH), self.ITEMS, "mem",
+                                    ports=self.PORTS, readLatency=self.READ_LATENCY)
+        d = hls.var("d", Bits(self.DATA_WIDTH))
+        hls.thread(
+            hls.While(True,
+                d(hls.read(self.dataIn)),
+                mem.write(d[4:], d),
+                hls.write(mem[d[4:]], self.dataOut),
+            )
+        )
+        hls.compile()
+
+
+class MemoryHistogram(MemoryWriteRead):
+    """
+    Count the occurrences of the input values (read-modify-write of the memory, the iterations
+    depend on each other trough the memory)
+    """
+
+    def _impl(self) -> None:
+        hls = HlsStreamProc(self)
+        self.mem = mem = hls.memory(Bits(self.DATA_WIDTH), self.ITEMS, "mem",
+                                    ports=self.PORTS, readLatency=self.READ_LATENCY,
+                                    initValues=[0 for _ in range(self.ITEMS)])
+        d = hls.var("d", Bits(self.DATA_WIDTH))
+        cnt = hls.var("cnt", Bits(self.DATA_WIDTH))
+        hls.thread(
+            hls.While(True,
+                d(hls.read(self.dataIn)),
+                cnt(mem[d[4:]] + 1),
+                mem.write(d[4:], cnt),
+                hls.write(cnt, self.dataOut),
+            )
+        )
+        hls.compile()
+
+
+class HlsMemory_TC(SimTestCase):
+
+    def _test_lookupTable(self, u: MemoryLookupTable, expectedFn=lookupTableValue):
+        self.compileSimAndStart(u, target_platform=VirtualHlsPlatform())
+        inputs = [0, 1, 2, 5, 255, 128, 7, 7, 3]
+        u.dataIn._ag.data.extend(inputs)
+        self.runSim((len(inputs) * 3 + 10) * int(freq_to_period(u.FREQ)))
+        self.assertValSequenceEqual(u.dataOut._ag.data, [expectedFn(d) for d in inputs])
+
+    def test_MemoryLookupTable(self):
+        self._test_lookupTable(MemoryLookupTable())
+
+    def test_MemoryLookupTable_readLatency2(self):
+        u = MemoryLookupTable()
+        u.READ_LATENCY = 2
+        self._test_lookupTable(u)
+
+    def test_MemoryLookupTablePy(self):
+        self._test_lookupTable(MemoryLookupTablePy())
+
+    def test_MemoryLookupTableSumOfTwo(self):
+        self._test_lookupTable(MemoryLookupTableSumOfTwo(),
+                               lambda d: (lookupTableValue(d) + lookupTableValue(d ^ 1)) & 0xff)
+
+    def test_MemoryLookupTableSumOfTwo_2ports(self):
+        u = MemoryLookupTableSumOfTwo()
+        u.PORTS = 2
+        self._test_lookupTable(u, lambda d: (lookupTableValue(d) + lookupTableValue(d ^ 1)) & 0xff)
+
+    def _getRequestAndResponseClks(self, u: MemoryLookupTable):
+        schedulers = RtlNetlistPassCollectSchedulers()
+        to_rtl_str(u, target_platform=VirtualHlsPlatform(rtlnetlist_passes=[schedulers, ]))
+        self.assertEqual(len(schedulers.schedulers), 1)
+        hls = schedulers.schedulers[0].parentHls
+        clkPeriod = hls.normalizedClkPeriod
+        requests = [p.request for p in u.mem.banks[0]._ports]
+        responses = [p.response for p in u.mem.banks[0]._ports]
+        reqClks = []
+        respClks = []
+        for n in hls.iterAllNodes():
+            if isinstance(n, HlsNetNodeWrite) and n.dst in requests:
+                reqClks.append(start_clk(n.scheduledIn[0], clkPeriod))
+            elif isinstance(n, HlsNetNodeRead) and n.src in responses:
+                respClks.append(start_clk(n.scheduledOut[0], clkPeriod))
+        return sorted(reqClks), sorted(respClks)
+
+    def test_requestResponseLatency(self):
+        for readLatency in (1, 3):
+            u = MemoryLookupTable()
+            u.READ_LATENCY = readLatency
+            (req, ), (resp, ) = self._getRequestAndResponseClks(u)
+            self.assertGreaterEqual(resp - req, u.mem.responseLatency)
+
+    def test_portCount(self):
+        u = MemoryLookupTableSumOfTwo()
+        reqClks, _ = self._getRequestAndResponseClks(u)
+        self.assertEqual(len(u.mem.banks[0]._ports), 1)
+        self.assertEqual(len(reqClks), 2)
+        # single port, requests must be in a different clock period
+        self.assertNotEqual(reqClks[0], reqClks[1])
+
+        u = MemoryLookupTableSumOfTwo()
+        u.PORTS = 2
+        reqClks, _ = self._getRequestAndResponseClks(u)
+        self.assertEqual(len(u.mem.banks[0]._ports), 2)
+        # each request has its own port and both can be performed at once
+        self.assertEqual(reqClks[0], reqClks[1])
+
+    def test_unusedPortsNotCreated(self):
+        u = MemoryLookupTable()
+        u.PORTS = 4
+        to_rtl_str(u, target_platform=VirtualHlsPlatform())
+        self.assertEqual(len(u.mem.banks[0]._ports), 1)
+
+    def test_MemoryWriteRead(self):
+        u = MemoryWriteRead()
+        self._test_lookupTable(u, lambda d: d)
+
+    def test_MemoryWriteRead_2ports(self):
+        u = MemoryWriteRead()
+        u.PORTS = 2
+        self._test_lookupTable(u, lambda d: d)
+
+    def test_writeReadOrdering(self):
+        u = MemoryWriteRead()
+        u.PORTS = 2
+        reqClks, _ = self._getRequestAndResponseClks(u)
+        self.assertEqual(len(u.mem.banks[0]._ports), 2)
+        # the read on other port must be after the write because the memory has a read first behavior
+        self.assertEqual(len(reqClks), 2)
+        self.assertLess(reqClks[0], reqClks[1])
+
+    def _test_histogram(self, u: MemoryHistogram):
+        counts = {}
+
+        def model(d: int):
+            i = d & 0xf
+            counts[i] = counts.get(i, 0) + 1
+            return counts[i]
+
+        # :note: the repeated values check that the next iteration reads the value written by the previous one
+        self._test_lookupTable(u, model)
+
+    def test_MemoryHistogram(self):
+        self._test_histogram(MemoryHistogram())
+
+    def test_MemoryHistogram_2ports(self):
+        u = MemoryHistogram()
+        u.PORTS = 2
+        self._test_histogram(u)
+
+
+if __name__ == "__main__":
+    suite = unittest.TestSuite()
+    suite.addTest(unittest.makeSuite(HlsMemory_TC))
+    runner = unittest.TextTestRunner(verbosity=3)
+    runner.run(suite)
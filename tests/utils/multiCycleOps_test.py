@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from random import Random
+import unittest
+
+from hwt.hdl.operatorDefs import AllOps
+from hwt.serializer.resourceAnalyzer.resourceTypes import ResourceFF
+from hwt.simulator.simTestCase import SimTestCase
+from hwtHls.netlist.nodes.ops import HlsNetNodeOperator
+from hwtHls.netlist.transformation.aggregateBitwiseOpsPass import HlsNetlistPassAggregateBitwiseOps
+from hwtHls.netlist.transformation.dce import HlsNetlistPassDCE
+from hwtHls.netlist.transformation.mergeExplicitSync import HlsNetlistPassMergeExplicitSync
+from hwtHls.platform.xilinx.artix7 import Artix7Medium
+from hwtHls.scheduler.errors import TimeConstraintError
+from hwtSimApi.utils import freq_to_period
+from tests.syntaxElements.mac import HlsMAC_example
+from tests.utils.collectSchedulers import RtlNetlistPassCollectSchedulers
+from tests.utils.splitWideArithmetic_test import WideArithmetic
+
+
+class MultiCycleOps_TC(SimTestCase):
+
+    def test_platformPicksLatency(self):
+        p = Artix7Medium()
+        clkPeriod = 5e-9
+        ffDelay = p.get_op_realization(ResourceFF, 1, 1, clkPeriod).latency_pre
+        r = p.get_op_realization(AllOps.MUL, 8, 2, clkPeriod)
+        self.assertEqual(r.cycles_latency, 0)
+
+        r = p.get_op_realization(AllOps.MUL, 64, 2, clkPeriod)
+        self.assertGreater(r.cycles_latency, 0)
+        self.assertLessEqual(r.latency_pre + ffDelay, clkPeriod)
+
+        rAdd = p.get_op_realization(AllOps.ADD, 512, 2, clkPeriod)
+        self.assertGreater(rAdd.cycles_latency, 0)
+
+        with self.assertRaises(TimeConstraintError):
+            p.get_op_realization(AllOps.MUL, 4096, 2, 1e-9)
+
+    def test_HlsMAC_example_64b_200MHz(self):
+        u = HlsMAC_example()
+        u.DATA_WIDTH = 64
+        u.CLK_FREQ = int(200e6)
+        schedulers = RtlNetlistPassCollectSchedulers()
+        self.compileSimAndStart(u, target_platform=Artix7Medium(rtlnetlist_passes=[schedulers, ]))
+        self.assertEqual(len(schedulers.schedulers), 1)
+        hls = schedulers.schedulers[0].parentHls
+        muls = [n for n in hls.nodes if isinstance(n, HlsNetNodeOperator) and n.operator == AllOps.MUL]
+        self.assertEqual(len(muls), 2)
+        for m in muls:
+            self.assertGreater(m.cycles_latency[0], 0, m)
+
+        w = u.DATA_WIDTH
+        m = (1 << w) - 1
+        rand = Random(0)
+        inputs = [
+            (m, m, m, m),
+            (1 << (w - 1), 3, m, 1 << (w - 1)),
+        ]
+        for _ in range(16):
+            inputs.append(tuple(rand.getrandbits(w) for _ in range(4)))
+        for _ in range(8):
+            # values with the top bits set
+            inputs.append(tuple(rand.getrandbits(w) | (0xf << (w - 4)) for _ in range(4)))
+
+        for vals in inputs:
+            for intf, d in zip(u.dataIn, vals):
+                intf._ag.data.append(d)
+
+        self.runSim(int((len(inputs) + 32) * freq_to_period(u.CLK_FREQ)))
+
+        # the pipeline does not have any flow control, the output is sampled in every clock period
+        # and the first values are not valid
+        res = [int(d) if d._is_full_valid() else None for d in u.dataOut._ag.data]
+        ref = [(a * b + c * d) & m for a, b, c, d in inputs]
+        self.assertTrue(any(res[i:i + len(ref)] == ref for i in range(len(res) - len(ref) + 1)), (res, ref))
+
+    def test_WideArithmetic_512b_200MHz(self):
+        u = WideArithmetic()
+        u.CLK_FREQ = int(200e6)
+        schedulers = RtlNetlistPassCollectSchedulers()
+        self.compileSimAndStart(u, target_platform=Artix7Medium(
+            hlsnetlist_passes=[
+                HlsNetlistPassDCE(),
+                HlsNetlistPassMergeExplicitSync(),
+                HlsNetlistPassAggregateBitwiseOps(),
+            ],
+            rtlnetlist_passes=[schedulers, ]))
+        hls = schedulers.schedulers[0].parentHls
+        ops = [n for n in hls.nodes if isinstance(n, HlsNetNodeOperator) and n.operator in (AllOps.ADD, AllOps.SUB, AllOps.LT, AllOps.EQ)]
+        self.assertEqual(len(ops), 4)
+        for n in ops:
+            if n.operator in (AllOps.ADD, AllOps.SUB):
+                self.assertGreater(n.cycles_latency[0], 0, n)
+
+        w = u.DATA_WIDTH
+        m = (1 << w) - 1
+        rand = Random(0)
+        inputs = [
+            # carry/borrow propagated through all segments
+            (m, 1),
+            (0, 1),
+            (1 << (w - 1), (1 << (w - 1)) - 1),
+            (m, m),
+        ]
+        for _ in range(32):
+            a = rand.getrandbits(w)
+            if rand.getrandbits(1):
+                b = a ^ (1 << rand.randrange(w))
+            else:
+                b = rand.getrandbits(w)
+            inputs.append((a, b))
+
+        for a, b in inputs:
+            u.a._ag.data.append(a)
+            u.b._ag.data.append(b)
+
+        self.runSim(int((len(inputs) + 20) * freq_to_period(u.CLK_FREQ)))
+
+        # the pipeline does not have any flow control, the outputs are sampled in every clock period
+        # and the first values are not valid
+        for outIntf, model in [
+                (u.add, lambda a, b: (a + b) & m),
+                (u.sub, lambda a, b: (a - b) & m),
+                (u.lt, lambda a, b: int(a < b)),
+                (u.eq, lambda a, b: int(a == b)),
+            ]:
+            res = [int(d) if d._is_full_valid() else None for d in outIntf._ag.data]
+            ref = [model(a, b) for a, b in inputs]
+            self.assertTrue(any(res[i:i + len(ref)] == ref for i in range(len(res) - len(ref) + 1)), (outIntf, res, ref))
+
+
+if __name__ == "__main__":
+    suite = unittest.TestSuite()
+    suite.addTest(unittest.makeSuite(MultiCycleOps_TC))
+    runner = unittest.TextTestRunner(verbosity=3)
+    runner.run(suite)
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+from tempfile import TemporaryDirectory
+import unittest
+
+from hwt.hdl.operatorDefs import AllOps
+from hwt.serializer.resourceAnalyzer.resourceTypes import ResourceFF
+from hwtHls.platform.opDelayTable import OpDelayTable
+from hwtHls.platform.virtual import VirtualHlsPlatform
+from hwtHls.platform.xilinx.artix7 import Artix7Slow, Artix7Medium, Artix7Fast
+from hwtHls.scheduler.errors import TimeConstraintError
+
+
+class OpDelayTable_TC(unittest.TestCase):
+
+    def test_sameAsSplines(self):
+        p = Artix7Medium()
+        for op, bundle in p._OP_DELAYS.items():
+            for bitWidth in (1, 2, 3, 7, 32, 33, 100, 4096, 5000):
+                for maxDelay in (1e-9, 5e-9, 20e-9):
+                    try:
+                        ref = bundle(2, bitWidth, 0, maxDelay)
+                    except TimeConstraintError:
+                        with self.assertRaises(TimeConstraintError):
+                            p._delayTable.resolveLatency(op, bitWidth, 0, maxDelay)
+                        continue
+                    latency, delay = p._delayTable.resolveLatency(op, bitWidth, 0, maxDelay)
+                    self.assertEqual(latency, ref[0], (op, bitWidth))
+                    self.assertAlmostEqual(delay, float(ref[1]), delta=1e-15, msg=(op, bitWidth))
+
+    def test_virtualPlatform(self):
+        p = VirtualHlsPlatform()
+        clkPeriod = 1e-8
+        self.assertAlmostEqual(p.get_op_realization(AllOps.ADD, 8, 2, clkPeriod).latency_pre, 1.5e-9 * 3)
+        self.assertAlmostEqual(p.get_op_realization(AllOps.MUL, 8, 2, clkPeriod).latency_pre, 0.6e-9 * 8)
+        self.assertAlmostEqual(p.get_op_realization(AllOps.MUL, 8192, 2, clkPeriod).latency_pre, 0.6e-9 * 8192)
+        self.assertAlmostEqual(p.get_op_realization(AllOps.TERNARY, 8, 4, clkPeriod).latency_pre, 0.8e-9 * 5)
+        self.assertAlmostEqual(p.get_op_realization(AllOps.AND, 4000, 2, clkPeriod).latency_pre, 1.2e-9)
+
+    def test_saveLoad(self):
+        with TemporaryDirectory() as d:
+            fileName = os.path.join(d, "artix7slow.npz")
+            p0 = Artix7Slow(opDelayTable=fileName)
+            self.assertTrue(os.path.exists(fileName))
+            mtime = os.path.getmtime(fileName)
+            p1 = Artix7Slow(opDelayTable=fileName)
+            # loaded from the file, not regenerated
+            self.assertEqual(os.path.getmtime(fileName), mtime)
+            self.assertIsNotNone(p1._delayTable.key)
+            self.assertEqual(p0._delayTable.key, p1._delayTable.key)
+            for op in (AllOps.ADD, AllOps.MUL, AllOps.TERNARY, ResourceFF):
+                for bitWidth in (1, 16, 4096):
+                    self.assertEqual(p0._delayTable.getDelay(op, 0, bitWidth),
+                                     p1._delayTable.getDelay(op, 0, bitWidth))
+            self.assertEqual(p0.get_ff_store_time(1e-8, 1e-11), p1.get_ff_store_time(1e-8, 1e-11))
+
+    def test_loadDifferentPlatform(self):
+        with TemporaryDirectory() as d:
+            fileName = os.path.join(d, "artix7.npz")
+            pSlow = Artix7Slow(opDelayTable=fileName)
+            pFast = Artix7Fast(opDelayTable=fileName)
+            # the table from the file is for a different speed grade and it is regenerated
+            self.assertNotEqual(pSlow._delayTable.key, pFast._delayTable.key)
+            self.assertNotEqual(pSlow._delayTable.getDelay(AllOps.ADD, 0, 64),
+                                pFast._delayTable.getDelay(AllOps.ADD, 0, 64))
+            self.assertEqual(pFast._delayTable.getDelay(AllOps.ADD, 0, 64),
+                             Artix7Fast()._delayTable.getDelay(AllOps.ADD, 0, 64))
+            # and the file is overwritten
+            self.assertEqual(OpDelayTable.load(fileName).key, pFast._delayTable.key)
+
+    def test_sharedTable(self):
+        t = Artix7Slow()._delayTable
+        p = Artix7Slow(opDelayTable=t)
+        self.assertIs(p._delayTable, t)
+        self.assertIn(AllOps.ADD, t)
+        self.assertEqual(t.delays["ADD"].shape, (9, OpDelayTable.MAX_BIT_WIDTH))
+
+
+if __name__ == "__main__":
+    suite = unittest.TestSuite()
+    suite.addTest(unittest.makeSuite(OpDelayTable_TC))
+    runner = unittest.TextTestRunner(verbosity=3)
+    runner.run(suite)
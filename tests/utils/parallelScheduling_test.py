@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from functools import partial
+import unittest
+
+from hwt.hdl.operatorDefs import AllOps
+from hwt.interfaces.std import VectSignal
+from hwt.interfaces.utils import addClkRstn
+from hwt.synthesizer.hObjList import HObjList
+from hwt.synthesizer.param import Param
+from hwt.synthesizer.unit import Unit
+from hwt.synthesizer.utils import to_rtl_str
+from hwtHls.hlsStreamProc.streamProc import HlsStreamProc
+from hwtHls.platform.virtual import VirtualHlsPlatform
+from hwtHls.scheduler.listScheduler import HlsListScheduler
+from hwtHls.scheduler.retiming import HlsScheduleRetiming
+from tests.utils.collectSchedulers import RtlNetlistPassCollectSchedulers
+
+
+class IndependentThreadsExample(Unit):
+
+    def _config(self):
+        self.CLK_FREQ = Param(int(20e6))
+        self.DATA_WIDTH = Param(32)
+        self.THREAD_CNT = Param(3)
+        self.PARALLEL_SCHEDULING_JOBS = Param(1)
+
+    def _declr(self):
+        addClkRstn(self)
+        self.clk.FREQ = self.CLK_FREQ
+        self.dataIn = HObjList(VectSignal(self.DATA_WIDTH, signed=False)
+                               for _ in range(2 * self.THREAD_CNT))
+        self.dataOut = HObjList(VectSignal(self.DATA_WIDTH, signed=False)._m()
+                                for _ in range(self.THREAD_CNT))
+
+    def _impl(self):
+        hls = HlsStreamProc(self, parallelSchedulingJobs=self.PARALLEL_SCHEDULING_JOBS)
+        for i, dout in enumerate(self.dataOut):
+            a, b = [hls.read(intf) for intf in self.dataIn[2 * i:2 * i + 2]]
+            hls.thread(
+                hls.While(True,
+                    hls.write(a * b + i, dout),
+                )
+            )
+        hls.compile()
+
+
+class ParallelScheduling_TC(unittest.TestCase):
+
+    def test_IndependentThreadsExample_same_as_sequential(self):
+        u = IndependentThreadsExample()
+        rtlSequential = to_rtl_str(u, target_platform=VirtualHlsPlatform())
+        u = IndependentThreadsExample()
+        u.PARALLEL_SCHEDULING_JOBS = 2
+        rtlParallel = to_rtl_str(u, target_platform=VirtualHlsPlatform())
+        self.assertEqual(rtlSequential, rtlParallel)
+
+    def test_IndependentThreadsExample_schedulerState(self):
+        # the state of schedulers from child processes is transfered back
+        usage = []
+        for parallelSchedulingJobs in (1, 2):
+            u = IndependentThreadsExample()
+            u.PARALLEL_SCHEDULING_JOBS = parallelSchedulingJobs
+            schedulers = RtlNetlistPassCollectSchedulers()
+            p = VirtualHlsPlatform(scheduler=partial(HlsListScheduler, resourceConstraints={AllOps.MUL: 1}),
+                                   rtlnetlist_passes=[schedulers, ])
+            to_rtl_str(u, target_platform=p)
+            self.assertEqual(len(schedulers.schedulers), u.THREAD_CNT)
+            for s in schedulers.schedulers:
+                self.assertEqual(s.getMaxUsage(AllOps.MUL), 1)
+            usage.append([s.resourceUsage for s in schedulers.schedulers])
+
+        self.assertEqual(usage[0], usage[1])
+
+    def test_IndependentThreadsExample_retimingStats(self):
+        # the statistics of the retiming are stored per pipeline and are transfered back from child processes
+        stats = []
+        for parallelSchedulingJobs in (1, 2):
+            u = IndependentThreadsExample()
+            u.PARALLEL_SCHEDULING_JOBS = parallelSchedulingJobs
+            schedulers = RtlNetlistPassCollectSchedulers()
+            p = VirtualHlsPlatform(scheduleRetiming=HlsScheduleRetiming(), rtlnetlist_passes=[schedulers, ])
+            to_rtl_str(u, target_platform=p)
+            _stats = [s.parentHls.retimingStats for s in schedulers.schedulers]
+            self.assertEqual(len(_stats), u.THREAD_CNT)
+            self.assertEqual(len(set(id(s) for s in _stats)), u.THREAD_CNT)
+            stats.append([(s.registerBitsBefore, s.registerBitsAfter, s.movedNodes) for s in _stats])
+
+        self.assertEqual(stats[0], stats[1])
+
+
+if __name__ == "__main__":
+    suite = unittest.TestSuite()
+    suite.addTest(unittest.makeSuite(ParallelScheduling_TC))
+    runner = unittest.TextTestRunner(verbosity=3)
+    runner.run(suite)
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import unittest
+
+from hwt.hdl.operatorDefs import AllOps
+from hwt.hdl.types.bits import Bits
+from hwt.synthesizer.utils import to_rtl_str
+from hwtHls.allocator.allocator import HlsAllocator
+from hwtHls.allocator.functionalUnitSharing import HlsFunctionalUnitSharingCostModel
+from hwtHls.hlsStreamProc.memory import ARRAY_PARTITION
+from hwtHls.netlist.transformation.splitWideArithmetic import HlsNetlistPassSplitWideArithmetic
+from hwtHls.platform.virtual import VirtualHlsPlatform
+from hwtHls.scheduler.listScheduler import HlsListScheduler
+from hwtHls.scheduler.retiming import HlsScheduleRetiming
+from hwtHls.scheduler.scheduleCache import HlsScheduleCache
+from hwtHls.scheduler.sdcScheduler import HlsSdcScheduler
+from hwtHls.ssa.translation.fromPython.markers import PythonBytecodeLoopUnroll
+from tests.utils.dataflowChannel_test import DataflowTwoThreads
+from tests.utils.loopInitiationInterval_test import LoopAccumulateII
+from tests.utils.loopUnroll_test import LoopUnrollAccumulate
+from tests.utils.memoryPartition_test import MemoryPartitionLookupTable
+from tests.utils.memory_test import MemoryLookupTable
+from tests.utils.parallelScheduling_test import IndependentThreadsExample
+
+
+class ParameterValidation_TC(unittest.TestCase):
+    """
+    Check that the invalid values of parameters of components are reported by ValueError.
+    """
+
+    def test_VirtualHlsPlatform(self):
+        for kwargs in [
+                {"pipelineReadyRegisterPeriod": 0},
+                {"shiftRegisterMinLength": 1},
+            ]:
+            with self.subTest(**kwargs), self.assertRaises(ValueError):
+                VirtualHlsPlatform(**kwargs)
+
+    def test_HlsAllocator(self):
+        with self.assertRaises(ValueError):
+            HlsAllocator(None, interElementBufferDepth=-1)
+
+    def test_HlsFunctionalUnitSharingCostModel(self):
+        with self.assertRaises(ValueError):
+            HlsFunctionalUnitSharingCostModel(dspArea=-1)
+
+    def test_schedulers(self):
+        for cls, args, kwargs in [
+                (HlsListScheduler, (None, 1e-9, {AllOps.MUL: 0}), {}),
+                (HlsSdcScheduler, (None, 1e-9), {"timeLimit": 0}),
+                (HlsScheduleRetiming, (), {"maxIterations": 0}),
+                (HlsScheduleCache, (None,), {"maxSize": 0}),
+            ]:
+            with self.subTest(cls.__name__), self.assertRaises(ValueError):
+                cls(*args, **kwargs)
+
+    def test_HlsNetlistPassSplitWideArithmetic(self):
+        with self.assertRaises(ValueError):
+            HlsNetlistPassSplitWideArithmetic(0)
+
+    def test_PythonBytecodeLoopUnroll(self):
+        with self.assertRaises(ValueError):
+            PythonBytecodeLoopUnroll(0)
+
+    def test_HlsStreamProc(self):
+        # parameters of HlsStreamProc and of its threads, channels and loops
+        for unitCls, paramName, value in [
+                (IndependentThreadsExample, "PARALLEL_SCHEDULING_JOBS", 0),
+                (DataflowTwoThreads, "CHANNEL_DEPTH", 0),
+                (LoopAccumulateII, "MAX_II", 0),
+                (LoopUnrollAccumulate, "UNROLL", 0),
+            ]:
+            u = unitCls()
+            setattr(u, paramName, value)
+            with self.subTest(unitCls.__name__), self.assertRaises(ValueError):
+                to_rtl_str(u, target_platform=VirtualHlsPlatform())
+
+    def test_HlsStreamProcMemory(self):
+        for items, ports, readLatency, initValues in [
+                (0, 1, 1, None),
+                (4, 0, 1, None),
+                (4, 1, 0, None),
+                (4, 1, 1, [0, 1]),
+            ]:
+            u = MemoryLookupTable()
+            u.ITEMS = items
+            u.PORTS = ports
+            u.READ_LATENCY = readLatency
+            u._createMemory = lambda hls: hls.memory(Bits(8), items, ports=ports, readLatency=readLatency, initValues=initValues)
+            with self.subTest(items=items, ports=ports, readLatency=readLatency, initValues=initValues),\
+                    self.assertRaises(ValueError):
+                to_rtl_str(u, target_platform=VirtualHlsPlatform())
+
+        for partition, factor in [
+                (ARRAY_PARTITION.CYCLIC, None),
+                (ARRAY_PARTITION.CYCLIC, 0),
+                (ARRAY_PARTITION.BLOCK, 17),
+                (ARRAY_PARTITION.COMPLETE, 2),
+                (None, 2),
+            ]:
+            u = MemoryPartitionLookupTable()
+            u.PARTITION = partition
+            u.PARTITION_FACTOR = factor
+            with self.subTest(partition=partition, factor=factor), self.assertRaises(ValueError):
+                to_rtl_str(u, target_platform=VirtualHlsPlatform())
+
+
+if __name__ == "__main__":
+    suite = unittest.TestSuite()
+    suite.addTest(unittest.makeSuite(ParameterValidation_TC))
+    runner = unittest.TextTestRunner(verbosity=3)
+    runner.run(suite)
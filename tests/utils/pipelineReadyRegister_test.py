@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import unittest
+
+from hwt.simulator.simTestCase import SimTestCase
+from hwtHls.hlsStreamProc.streamProc import HlsStreamProc
+from hwtHls.platform.virtual import VirtualHlsPlatform
+from hwtSimApi.utils import freq_to_period
+from tests.syntaxElements.trivial import WhileTrueReadWrite
+
+
+class PipelineMulChain(WhileTrueReadWrite):
+    """
+    A chain of multiplications which results in a pipeline with multiple stages
+    """
+
+    def _config(self):
+        super(PipelineMulChain, self)._config()
+        self.FREQ = int(250e6)
+
+    def _impl(self) -> None:
+        hls = HlsStreamProc(self)
+        hls.thread(
+            hls.While(True,
+                hls.write((((hls.read(self.dataIn) * 3) + 5) * 7 + 1) * 11, self.dataOut)
+            )
+        )
+        hls.compile()
+
+    @staticmethod
+    def model(x: int):
+        return ((((x * 3) + 5) * 7 + 1) * 11) & 0xff
+
+
+class PipelineReadyRegister_TC(SimTestCase):
+
+    def test_ffStoreTimeIncludesSkidMux(self):
+        clkPeriod = 4e-9
+        resolution = 1e-12
+        t0 = VirtualHlsPlatform().get_ff_store_time(clkPeriod, resolution)
+        t1 = VirtualHlsPlatform(pipelineReadyRegisterPeriod=1).get_ff_store_time(clkPeriod, resolution)
+        self.assertGreater(t1, t0)
+
+    def _test_PipelineMulChain(self, pipelineReadyRegisterPeriod: int):
+        u = PipelineMulChain()
+        self.compileSimAndStart(u, target_platform=VirtualHlsPlatform(pipelineReadyRegisterPeriod=pipelineReadyRegisterPeriod))
+        # the consumer stalls randomly so the data has to be stored in skid buffers
+        self.randomize(u.dataIn)
+        self.randomize(u.dataOut)
+        inputs = list(range(32))
+        u.dataIn._ag.data.extend(inputs)
+        self.runSim((len(inputs) * 4 + 20) * int(freq_to_period(u.FREQ)))
+
+        self.assertValSequenceEqual(u.dataOut._ag.data, [u.model(d) for d in inputs])
+
+    def test_PipelineMulChain_noReadyRegister(self):
+        self._test_PipelineMulChain(None)
+
+    def test_PipelineMulChain_readyRegisterEveryStage(self):
+        self._test_PipelineMulChain(1)
+
+    def test_PipelineMulChain_readyRegisterEvery2Stages(self):
+        self._test_PipelineMulChain(2)
+
+
+if __name__ == "__main__":
+    suite = unittest.TestSuite()
+    suite.addTest(unittest.makeSuite(PipelineReadyRegister_TC))
+    runner = unittest.TextTestRunner(verbosity=3)
+    runner.run(suite)
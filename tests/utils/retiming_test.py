@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import unittest
+
+from hwt.code import Concat
+from hwt.hdl.types.bits import Bits
+from hwt.simulator.simTestCase import SimTestCase
+from hwt.synthesizer.utils import to_rtl_str
+from hwtHls.hlsStreamProc.streamProc import HlsStreamProc
+from hwtHls.netlist.nodes.io import HlsNetNodeRead, HlsNetNodeWrite
+from hwtHls.platform.virtual import VirtualHlsPlatform
+from hwtHls.scheduler.retiming import HlsScheduleRetiming
+from hwtSimApi.utils import freq_to_period
+from tests.utils.collectSchedulers import RtlNetlistPassCollectSchedulers
+from tests.utils.pipelineReadyRegister_test import PipelineMulChain
+
+
+class PipelineMulChainLateCmp(PipelineMulChain):
+    """
+    A chain of multiplications and a comparison of the input which result is used at the end of the chain.
+    The comparison is scheduled by ALAP at the end of the chain and the 8b input has to be passed trough all stages,
+    the retiming moves it to the first stage and only the 1b result is passed trough stages.
+    """
+
+    def _impl(self) -> None:
+        hls = HlsStreamProc(self)
+        x = hls.var("x", self.dataIn.T)
+        hls.thread(
+            hls.While(True,
+                x(hls.read(self.dataIn)),
+                hls.write((((x * 3) + 5) * 7 + 1) * 11 + Concat(Bits(7).from_py(0), x > 100), self.dataOut)
+            )
+        )
+        hls.compile()
+
+    @staticmethod
+    def model(x: int):
+        return ((((x * 3) + 5) * 7 + 1) * 11 + int(x > 100)) & 0xff
+
+
+class HlsScheduleRetiming_TC(SimTestCase):
+
+    def _getIoSchedule(self, retiming: HlsScheduleRetiming):
+        schedulers = RtlNetlistPassCollectSchedulers()
+        to_rtl_str(PipelineMulChainLateCmp(), target_platform=VirtualHlsPlatform(rtlnetlist_passes=[schedulers, ],
+                                                                                 scheduleRetiming=retiming))
+        hls = schedulers.schedulers[0].parentHls
+        return hls.retimingStats, [(n.scheduledIn, n.scheduledOut) for n in hls.iterAllNodes() if isinstance(n, (HlsNetNodeRead, HlsNetNodeWrite))]
+
+    def test_PipelineMulChainLateCmp_registerBits(self):
+        retiming = HlsScheduleRetiming()
+        stats, ioWithRetiming = self._getIoSchedule(retiming)
+        self.assertGreater(stats.movedNodes, 0)
+        self.assertLess(stats.registerBitsAfter, stats.registerBitsBefore)
+        # the state of the run is not kept in the object shared by all pipelines of the platform
+        self.assertFalse(hasattr(retiming, "movable"))
+
+        # the position of IO is not modified
+        stats, ioWithoutRetiming = self._getIoSchedule(None)
+        self.assertIsNone(stats)
+        self.assertSequenceEqual(ioWithRetiming, ioWithoutRetiming)
+
+    def test_PipelineMulChainLateCmp(self):
+        u = PipelineMulChainLateCmp()
+        self.compileSimAndStart(u, target_platform=VirtualHlsPlatform(scheduleRetiming=HlsScheduleRetiming()))
+        self.randomize(u.dataIn)
+        self.randomize(u.dataOut)
+        inputs = [0, 1, 99, 100, 101, 102, 200, 255, 7, 128, 3, 64]
+        u.dataIn._ag.data.extend(inputs)
+        self.runSim((len(inputs) * 4 + 20) * int(freq_to_period(u.FREQ)))
+
+        self.assertValSequenceEqual(u.dataOut._ag.data, [u.model(d) for d in inputs])
+
+
+if __name__ == "__main__":
+    suite = unittest.TestSuite()
+    suite.addTest(unittest.makeSuite(HlsScheduleRetiming_TC))
+    runner = unittest.TextTestRunner(verbosity=3)
+    runner.run(suite)
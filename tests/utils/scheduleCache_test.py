@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from functools import partial
+from tempfile import TemporaryDirectory
+import unittest
+
+from hwt.hdl.operatorDefs import AllOps
+from hwt.synthesizer.utils import to_rtl_str
+from hwtHls.netlist.nodes.aggregatedBitwiseOps import HlsNetNodeBitwiseOps
+from hwtHls.platform.virtual import VirtualHlsPlatform
+from hwtHls.scheduler.listScheduler import HlsListScheduler
+from hwtHls.scheduler.retiming import HlsScheduleRetiming
+from hwtHls.scheduler.scheduleCache import HlsScheduleCache, collectNetlistNodes
+from tests.syntaxElements.mac import HlsMAC_example
+from tests.utils.alapAsapDiffExample import AlapAsapDiffExample
+from tests.utils.collectSchedulers import RtlNetlistPassCollectSchedulers
+
+
+class HlsScheduleCache_TC(unittest.TestCase):
+
+    def test_HlsMAC_example_hit(self):
+        with TemporaryDirectory() as d:
+            cache = HlsScheduleCache(d)
+            p = VirtualHlsPlatform(compileCache=cache)
+            rtl0 = to_rtl_str(HlsMAC_example(), target_platform=p)
+            self.assertEqual((cache.hits, cache.misses), (0, 1))
+            rtl1 = to_rtl_str(HlsMAC_example(), target_platform=p)
+            self.assertEqual((cache.hits, cache.misses), (1, 1))
+            self.assertEqual(rtl0, rtl1)
+
+            # the result must be the same as without the cache
+            rtl2 = to_rtl_str(HlsMAC_example(), target_platform=VirtualHlsPlatform())
+            self.assertEqual(rtl0, rtl2)
+
+    def test_different_designs(self):
+        with TemporaryDirectory() as d:
+            cache = HlsScheduleCache(d)
+            p = VirtualHlsPlatform(compileCache=cache)
+            to_rtl_str(HlsMAC_example(), target_platform=p)
+            to_rtl_str(AlapAsapDiffExample(), target_platform=p)
+            self.assertEqual((cache.hits, cache.misses), (0, 2))
+            self.assertEqual(len(list(cache.directory.glob("*.json"))), 2)
+
+    def test_eviction(self):
+        with TemporaryDirectory() as d:
+            cache = HlsScheduleCache(d, maxSize=1)
+            p = VirtualHlsPlatform(compileCache=cache)
+            to_rtl_str(HlsMAC_example(), target_platform=p)
+            to_rtl_str(AlapAsapDiffExample(), target_platform=p)
+            self.assertEqual(len(list(cache.directory.glob("*.json"))), 0)
+
+    def test_AlapAsapDiffExample_bitwiseOpsRealization(self):
+        # the realization of the nodes in aggregated bitwise operators depends on the cluster
+        # and must be restored from the cache
+        with TemporaryDirectory() as d:
+            cache = HlsScheduleCache(d)
+            realizations = []
+            rtls = []
+            for _ in range(2):
+                schedulers = RtlNetlistPassCollectSchedulers()
+                p = VirtualHlsPlatform(compileCache=cache, rtlnetlist_passes=[schedulers, ])
+                rtls.append(to_rtl_str(AlapAsapDiffExample(), target_platform=p))
+                hls = schedulers.schedulers[0].parentHls
+                subNodes = [subNode
+                            for n in hls.iterAllNodes() if isinstance(n, HlsNetNodeBitwiseOps)
+                            for subNode in n._subNodes.nodes]
+                self.assertTrue(subNodes)
+                realizations.append([(n.latency_pre, n.latency_post, n.in_cycles_offset, n.cycles_latency, n.cycles_delay)
+                                     for n in subNodes])
+
+            self.assertEqual((cache.hits, cache.misses), (1, 1))
+            self.assertEqual(realizations[0], realizations[1])
+            self.assertEqual(rtls[0], rtls[1])
+
+    def test_HlsMAC_example_schedulerState(self):
+        # the state of the scheduler and the statistics of the retiming must be restored from the cache
+        with TemporaryDirectory() as d:
+            cache = HlsScheduleCache(d)
+            states = []
+            for _ in range(2):
+                schedulers = RtlNetlistPassCollectSchedulers()
+                p = VirtualHlsPlatform(scheduler=partial(HlsListScheduler, resourceConstraints={AllOps.MUL: 1}),
+                                       scheduleRetiming=HlsScheduleRetiming(),
+                                       compileCache=cache, rtlnetlist_passes=[schedulers, ])
+                to_rtl_str(HlsMAC_example(), target_platform=p)
+                s: HlsListScheduler = schedulers.schedulers[0]
+                hls = s.parentHls
+                self.assertIsNotNone(hls.retimingStats)
+                states.append((s.copyState(collectNetlistNodes(hls)), vars(hls.retimingStats)))
+
+            self.assertEqual((cache.hits, cache.misses), (1, 1))
+            self.assertEqual(states[0], states[1])
+            self.assertEqual(len(states[1][0]["resourceUsage"][0]), 2)
+
+
+if __name__ == "__main__":
+    suite = unittest.TestSuite()
+    suite.addTest(unittest.makeSuite(HlsScheduleCache_TC))
+    runner = unittest.TextTestRunner(verbosity=3)
+    runner.run(suite)
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from functools import partial
+import unittest
+
+from hwt.synthesizer.utils import to_rtl_str
+from hwtHls.clk_math import start_clk
+from hwtHls.platform.virtual import VirtualHlsPlatform
+from hwtHls.scheduler.scheduler import HlsScheduler
+from hwtHls.scheduler.sdcScheduler import HlsSdcScheduler
+from tests.syntaxElements.mac import HlsMAC_example
+from tests.utils.alapAsapDiffExample import AlapAsapDiffExample
+from tests.utils.collectSchedulers import RtlNetlistPassCollectSchedulers
+
+
+class HlsSdcScheduler_TC(unittest.TestCase):
+
+    @staticmethod
+    def _getLatency(s: HlsScheduler) -> int:
+        """
+        :return: the index of the last clock period used in the schedule
+        """
+        clkPeriod = s.parentHls.normalizedClkPeriod
+        return max(start_clk(t, clkPeriod)
+                   for n in s.parentHls.iterAllNodes()
+                   for t in (*n.scheduledIn, *n.scheduledOut))
+
+    def _getReferenceLatency(self, u) -> int:
+        """
+        :return: the latency of the schedule of :class:`hwtHls.scheduler.scheduler.HlsScheduler` (ASAP + ALAP compaction)
+        """
+        schedulers = RtlNetlistPassCollectSchedulers()
+        to_rtl_str(u, target_platform=VirtualHlsPlatform(rtlnetlist_passes=[schedulers, ]))
+        return self._getLatency(schedulers.schedulers[0])
+
+    def _test(self, u, timeLimit: float) -> HlsSdcScheduler:
+        schedulers = RtlNetlistPassCollectSchedulers()
+        p = VirtualHlsPlatform(scheduler=partial(HlsSdcScheduler, timeLimit=timeLimit),
+                               rtlnetlist_passes=[schedulers, ])
+        to_rtl_str(u, target_platform=p)
+        self.assertEqual(len(schedulers.schedulers), 1)
+        s: HlsSdcScheduler = schedulers.schedulers[0]
+        s._checkAllNodesScheduled()
+        self.assertEqual(s.registerBits, s._countRegisterBits())
+        return s
+
+    def _test_sdc(self, unitCls):
+        s = self._test(unitCls(), 10.0)
+        self.assertIs(s.usedFallback, False)
+        self.assertLessEqual(self._getLatency(s), self._getReferenceLatency(unitCls()))
+
+    def test_HlsMAC_example(self):
+        self._test_sdc(HlsMAC_example)
+
+    def test_AlapAsapDiffExample(self):
+        self._test_sdc(AlapAsapDiffExample)
+
+    def test_HlsMAC_example_timeLimit(self):
+        s = self._test(HlsMAC_example(), 1e-12)
+        self.assertTrue(s.usedFallback)
+
+
+if __name__ == "__main__":
+    suite = unittest.TestSuite()
+    suite.addTest(unittest.makeSuite(HlsSdcScheduler_TC))
+    runner = unittest.TextTestRunner(verbosity=3)
+    runner.run(suite)
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import unittest
+
+from hwt.interfaces.std import VectSignal
+from hwt.interfaces.utils import addClkRstn
+from hwt.simulator.simTestCase import SimTestCase
+from hwt.synthesizer.unit import Unit
+from hwt.synthesizer.utils import to_rtl_str
+from hwtHls.hlsStreamProc.streamProc import HlsStreamProc
+from hwtHls.netlist.translation.qorReport import RtlNetlistPassQoRReport
+from hwtHls.platform.virtual import VirtualHlsPlatform
+from hwtSimApi.utils import freq_to_period
+from tests.utils.pipelineReadyRegister_test import PipelineMulChain
+
+
+class PipelineMulChainWithBypass(PipelineMulChain):
+    """
+    A chain of multiplications where the input is also used at the end of the chain,
+    the input has to be delayed by multiple registers
+    """
+
+    def _impl(self) -> None:
+        hls = HlsStreamProc(self)
+        x = hls.var("x", self.dataIn.T)
+        hls.thread(
+            hls.While(True,
+                x(hls.read(self.dataIn)),
+                hls.write((((x * 3) + 5) * 7 + 1) * 11 + x, self.dataOut)
+            )
+        )
+        hls.compile()
+
+    @staticmethod
+    def model(x: int):
+        return ((((x * 3) + 5) * 7 + 1) * 11 + x) & 0xff
+
+
+class PipelineMulChainWithBypassNoSync(PipelineMulChainWithBypass):
+    """
+    :class:`~.PipelineMulChainWithBypass` with IO without any synchronization,
+    the pipeline does not have any flow control and all registers are loaded in every clock period
+    """
+
+    def _declr(self):
+        addClkRstn(self)
+        self.clk.FREQ = self.FREQ
+        self.dataIn = VectSignal(self.DATA_WIDTH, signed=False)
+        self.dataOut = VectSignal(self.DATA_WIDTH, signed=False)._m()
+
+
+class ShiftRegister_TC(SimTestCase):
+
+    def _getQoR(self, u: Unit, shiftRegisterMinLength: int):
+        qor = RtlNetlistPassQoRReport()
+        to_rtl_str(u, target_platform=VirtualHlsPlatform(rtlnetlist_passes=[qor, ],
+                                                         shiftRegisterMinLength=shiftRegisterMinLength))
+        return qor.reports[0]
+
+    def test_PipelineMulChainWithBypassNoSync_qor(self):
+        ref = self._getQoR(PipelineMulChainWithBypassNoSync(), None)
+        self.assertEqual(ref.shiftRegisterBits, 0)
+
+        srl = self._getQoR(PipelineMulChainWithBypassNoSync(), 2)
+        self.assertGreater(srl.shiftRegisterBits, 0)
+        # the registers are just realized differently
+        self.assertEqual(srl.registerBits, ref.registerBits)
+
+        srl = self._getQoR(PipelineMulChainWithBypassNoSync(), 1000)
+        self.assertEqual(srl.shiftRegisterBits, 0)
+
+    def test_PipelineMulChainWithBypass_qor(self):
+        # the stages of pipeline with flow control stall independently and can not be realized as a shift register
+        ref = self._getQoR(PipelineMulChainWithBypass(), None)
+        srl = self._getQoR(PipelineMulChainWithBypass(), 2)
+        self.assertEqual(srl.shiftRegisterBits, 0)
+        self.assertEqual(srl.registerBits, ref.registerBits)
+
+    def test_PipelineMulChainWithBypassNoSync(self):
+        u = PipelineMulChainWithBypassNoSync()
+        self.compileSimAndStart(u, target_platform=VirtualHlsPlatform(shiftRegisterMinLength=2))
+        inputs = list(range(32))
+        u.dataIn._ag.data.extend(inputs)
+        self.runSim((len(inputs) + 20) * int(freq_to_period(u.FREQ)))
+
+        # the output is sampled in every clock period, the values before the first input reaches
+        # the end of the pipeline are not valid
+        res = [int(d) if d._is_full_valid() else None for d in u.dataOut._ag.data]
+        ref = [u.model(d) for d in inputs]
+        self.assertTrue(any(res[i:i + len(ref)] == ref for i in range(len(res) - len(ref) + 1)), (res, ref))
+
+    def test_PipelineMulChainWithBypass_randomized(self):
+        u = PipelineMulChainWithBypass()
+        self.compileSimAndStart(u, target_platform=VirtualHlsPlatform(shiftRegisterMinLength=2))
+        # the stages of pipeline are stalled independently
+        self.randomize(u.dataIn)
+        self.randomize(u.dataOut)
+        inputs = list(range(32))
+        u.dataIn._ag.data.extend(inputs)
+        self.runSim((len(inputs) * 4 + 20) * int(freq_to_period(u.FREQ)))
+
+        self.assertValSequenceEqual(u.dataOut._ag.data, [u.model(d) for d in inputs])
+
+
+if __name__ == "__main__":
+    suite = unittest.TestSuite()
+    suite.addTest(unittest.makeSuite(ShiftRegister_TC))
+    runner = unittest.TextTestRunner(verbosity=3)
+    runner.run(suite)
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from random import Random
+import unittest
+
+from hwt.hdl.operatorDefs import AllOps
+from hwt.interfaces.std import VectSignal, Signal
+from hwt.interfaces.utils import addClkRstn
+from hwt.simulator.simTestCase import SimTestCase
+from hwt.synthesizer.param import Param
+from hwt.synthesizer.unit import Unit
+from hwt.synthesizer.utils import to_rtl_str
+from hwtHls.hlsStreamProc.streamProc import HlsStreamProc
+from hwtHls.netlist.nodes.ops import HlsNetNodeOperator
+from hwtHls.netlist.transformation.aggregateBitwiseOpsPass import HlsNetlistPassAggregateBitwiseOps
+from hwtHls.netlist.transformation.dce import HlsNetlistPassDCE
+from hwtHls.netlist.transformation.mergeExplicitSync import HlsNetlistPassMergeExplicitSync
+from hwtHls.netlist.transformation.splitWideArithmetic import HlsNetlistPassSplitWideArithmetic
+from hwtHls.platform.virtual import VirtualHlsPlatform
+from hwtHls.scheduler.errors import TimeConstraintError
+from hwtSimApi.utils import freq_to_period
+from tests.utils.collectSchedulers import RtlNetlistPassCollectSchedulers
+
+
+class WideArithmetic(Unit):
+
+    def _config(self):
+        self.CLK_FREQ = Param(int(100e6))
+        self.DATA_WIDTH = Param(512)
+        self.SIGNED = Param(False)
+
+    def _declr(self):
+        addClkRstn(self)
+        self.clk.FREQ = self.CLK_FREQ
+        self.a = VectSignal(self.DATA_WIDTH, signed=self.SIGNED)
+        self.b = VectSignal(self.DATA_WIDTH, signed=self.SIGNED)
+        self.add = VectSignal(self.DATA_WIDTH, signed=self.SIGNED)._m()
+        self.sub = VectSignal(self.DATA_WIDTH, signed=self.SIGNED)._m()
+        self.lt = Signal()._m()
+        self.eq = Signal()._m()
+
+    def _impl(self):
+        hls = HlsStreamProc(self)
+        a = hls.read(self.a)
+        b = hls.read(self.b)
+        hls.thread(
+            hls.While(True,
+                hls.write(a + b, self.add),
+                hls.write(a - b, self.sub),
+                hls.write(a < b, self.lt),
+                hls.write(a._eq(b), self.eq),
+            )
+        )
+        hls.compile()
+
+
+class SplitWideArithmetic_TC(SimTestCase):
+
+    def test_segments(self):
+        self.assertEqual(HlsNetlistPassSplitWideArithmetic._splitToSegments(512, 56),
+                         [(0, 51), (51, 51), (102, 51), (153, 51), (204, 51),
+                          (255, 51), (306, 51), (357, 51), (408, 52), (460, 52)])
+        self.assertEqual(HlsNetlistPassSplitWideArithmetic._splitToSegments(8, 8), [(0, 8)])
+
+    def test_withoutSplitFails(self):
+        u = WideArithmetic()
+        p = VirtualHlsPlatform(hlsnetlist_passes=[
+            HlsNetlistPassDCE(),
+            HlsNetlistPassMergeExplicitSync(),
+            HlsNetlistPassAggregateBitwiseOps(),
+        ])
+        with self.assertRaises(TimeConstraintError):
+            to_rtl_str(u, target_platform=p)
+
+    def _test(self, u: WideArithmetic, p: VirtualHlsPlatform, schedulers: RtlNetlistPassCollectSchedulers):
+        self.compileSimAndStart(u, target_platform=p)
+        hls = schedulers.schedulers[0].parentHls
+        clkPeriod = hls.normalizedClkPeriod
+        for n in hls.nodes:
+            if isinstance(n, HlsNetNodeOperator) and n.operator in (AllOps.ADD, AllOps.SUB):
+                self.assertLess(n.getInputDtype(0).bit_length(), u.DATA_WIDTH, n)
+                self.assertEqual(min(n.scheduledIn) // clkPeriod, n.scheduledOut[0] // clkPeriod, n)
+
+        w = u.DATA_WIDTH
+        m = (1 << w) - 1
+        rand = Random(0)
+        inputs = [
+            # carry/borrow propagated through all segments
+            (m, 1),
+            (0, 1),
+            ((1 << (w - 1)) + 0x1234, (1 << 300) | 0xffff_ffff),
+            (m, m),
+        ]
+        for _ in range(32):
+            a = rand.getrandbits(w)
+            if rand.getrandbits(1):
+                # operands which differ only in a single bit, all other segments are equal
+                b = a ^ (1 << rand.randrange(w))
+            else:
+                b = rand.getrandbits(w)
+            inputs.append((a, b))
+
+        def wrap(v: int):
+            v &= m
+            if u.SIGNED and v >> (w - 1):
+                # two's complement
+                v -= 1 << w
+            return v
+
+        if u.SIGNED:
+            inputs = [(wrap(a), wrap(b)) for a, b in inputs]
+
+        for a, b in inputs:
+            u.a._ag.data.append(a)
+            u.b._ag.data.append(b)
+
+        self.runSim(int((len(inputs) + 30) * freq_to_period(u.CLK_FREQ)))
+
+        # the pipeline does not have any flow control, the outputs are sampled in every clock period
+        # and the first values are not valid
+        for outIntf, model in [
+                (u.add, lambda a, b: wrap(a + b)),
+                (u.sub, lambda a, b: wrap(a - b)),
+                (u.lt, lambda a, b: int(a < b)),
+                (u.eq, lambda a, b: int(a == b)),
+            ]:
+            res = [int(d) if d._is_full_valid() else None for d in outIntf._ag.data]
+            ref = [model(a, b) for a, b in inputs]
+            self.assertTrue(any(res[i:i + len(ref)] == ref for i in range(len(res) - len(ref) + 1)), (outIntf, res, ref))
+
+    def test_512b_100MHz(self):
+        u = WideArithmetic()
+        schedulers = RtlNetlistPassCollectSchedulers()
+        p = VirtualHlsPlatform(
+            hlsnetlist_passes=[
+                HlsNetlistPassDCE(),
+                HlsNetlistPassMergeExplicitSync(),
+                HlsNetlistPassSplitWideArithmetic(),
+                HlsNetlistPassAggregateBitwiseOps(),
+            ],
+            rtlnetlist_passes=[schedulers, ])
+        self._test(u, p, schedulers)
+
+    def test_512b_100MHz_explicitSegmentWidth(self):
+        u = WideArithmetic()
+        schedulers = RtlNetlistPassCollectSchedulers()
+        p = VirtualHlsPlatform(
+            hlsnetlist_passes=[
+                HlsNetlistPassDCE(),
+                HlsNetlistPassMergeExplicitSync(),
+                HlsNetlistPassSplitWideArithmetic(32),
+                HlsNetlistPassAggregateBitwiseOps(),
+            ],
+            rtlnetlist_passes=[schedulers, ])
+        self._test(u, p, schedulers)
+
+    def test_512b_100MHz_signed(self):
+        u = WideArithmetic()
+        u.SIGNED = True
+        schedulers = RtlNetlistPassCollectSchedulers()
+        p = VirtualHlsPlatform(
+            hlsnetlist_passes=[
+                HlsNetlistPassDCE(),
+                HlsNetlistPassMergeExplicitSync(),
+                HlsNetlistPassSplitWideArithmetic(),
+                HlsNetlistPassAggregateBitwiseOps(),
+            ],
+            rtlnetlist_passes=[schedulers, ])
+        self._test(u, p, schedulers)
+        hls = schedulers.schedulers[0].parentHls
+        self.assertFalse([n for n in hls.nodes if isinstance(n, HlsNetNodeOperator) and n.operator == AllOps.LT],
+                         "The signed comparison must be split")
+
+
+if __name__ == "__main__":
+    suite = unittest.TestSuite()
+    suite.addTest(unittest.makeSuite(SplitWideArithmetic_TC))
+    runner = unittest.TextTestRunner(verbosity=3)
+    runner.run(suite)
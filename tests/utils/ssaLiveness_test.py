@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import unittest
+
+from hwt.hdl.operatorDefs import AllOps
+from hwt.hdl.types.bits import Bits
+from hwt.hdl.types.defs import BIT
+from hwtHls.ssa.analysis.liveness import SsaLiveness, ssa_liveness_edge_variables
+from hwtHls.ssa.basicBlock import SsaBasicBlock
+from hwtHls.ssa.context import SsaContext
+from hwtHls.ssa.instr import SsaInstr, OP_ASSIGN
+from hwtHls.ssa.phi import SsaPhi
+
+
+class SsaLiveness_TC(unittest.TestCase):
+
+    def _loop(self):
+        """
+        .. code-block:: text
+
+            entry:
+                a = 1
+            loop:
+                p = phi [a, entry], [n, loop]
+                n = p + a
+                c = n < 10
+                br c loop, exit
+            exit:
+                r = n
+        """
+        ctx = SsaContext()
+        t = Bits(8)
+        entry = SsaBasicBlock(ctx, "entry")
+        loop = SsaBasicBlock(ctx, "loop")
+        exit_ = SsaBasicBlock(ctx, "exit")
+
+        a = SsaInstr(ctx, t, OP_ASSIGN, (t.from_py(1),), name="a")
+        entry.appendInstruction(a)
+        entry.successors.addTarget(None, loop)
+
+        p = SsaPhi(ctx, t, name="p")
+        loop.appendPhi(p)
+        n = SsaInstr(ctx, t, AllOps.ADD, (p, a), name="n")
+        loop.appendInstruction(n)
+        c = SsaInstr(ctx, BIT, AllOps.LT, (n, t.from_py(10)), name="c")
+        loop.appendInstruction(c)
+        p.appendOperand(a, entry)
+        p.appendOperand(n, loop)
+        loop.successors.addTarget(c, loop)
+        loop.successors.addTarget(None, exit_)
+
+        r = SsaInstr(ctx, t, OP_ASSIGN, (n,), name="r")
+        exit_.appendInstruction(r)
+        return entry, loop, exit_, a, n
+
+    def test_loop_edges(self):
+        entry, loop, exit_, a, n = self._loop()
+        live = ssa_liveness_edge_variables(entry)
+        self.assertDictEqual(live, {
+            entry: {loop: {a}},
+            loop: {loop: {a, n}, exit_: {n}},
+            exit_: {},
+        })
+
+    def test_loop_liveInOut(self):
+        entry, loop, exit_, a, n = self._loop()
+        live = SsaLiveness(entry)
+        self.assertSetEqual(live.getLiveIn(entry), set())
+        self.assertSetEqual(live.getLiveOut(entry), {a})
+        # n is used by phi only on the backedge
+        self.assertSetEqual(live.getLiveIn(loop), {a})
+        self.assertSetEqual(live.getLiveOut(loop), {a, n})
+        self.assertSetEqual(live.getLiveIn(exit_), {n})
+        self.assertSetEqual(live.getLiveOut(exit_), set())
+
+        self.assertTrue(live.isLiveIn(a, loop))
+        self.assertFalse(live.isLiveIn(n, loop))
+        self.assertTrue(live.isLiveOut(n, loop))
+        self.assertFalse(live.isLiveOut(a, exit_))
+
+    def test_long_chain(self):
+        # the number of blocks is larger than the default recursion limit
+        ctx = SsaContext()
+        t = Bits(8)
+        blocks = [SsaBasicBlock(ctx, f"b{i:d}") for i in range(3000)]
+        for b0, b1 in zip(blocks, blocks[1:]):
+            b0.successors.addTarget(None, b1)
+
+        a = SsaInstr(ctx, t, OP_ASSIGN, (t.from_py(1),), name="a")
+        blocks[0].appendInstruction(a)
+        r = SsaInstr(ctx, t, OP_ASSIGN, (a,), name="r")
+        blocks[-1].appendInstruction(r)
+
+        live = SsaLiveness(blocks[0])
+        self.assertEqual(len(live.blocks), len(blocks))
+        for b0, b1 in zip(blocks, blocks[1:]):
+            self.assertSetEqual(live.getEdgeLive(b0, b1), {a})
+        self.assertSetEqual(live.getLiveIn(blocks[0]), set())
+        self.assertSetEqual(live.getLiveOut(blocks[-1]), set())
+
+
+if __name__ == "__main__":
+    suite = unittest.TestSuite()
+    suite.addTest(unittest.makeSuite(SsaLiveness_TC))
+    runner = unittest.TextTestRunner(verbosity=3)
+    runner.run(suite)